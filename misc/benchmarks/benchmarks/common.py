@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic input data shared by the benchmarks.
+"""
+import numpy as np
+
+from obspy import Stream, Trace, UTCDateTime
+
+
+STARTTIME = UTCDateTime(2020, 1, 1)
+
+
+def synthetic_data(npts, dtype=np.int32, seed=42):
+    """
+    Returns a random walk resembling broadband seismic data.
+    """
+    rng = np.random.RandomState(seed)
+    data = np.cumsum(rng.randint(-500, 501, npts)).astype(np.float64)
+    # keep the signal centered so that it fits any integer dtype
+    data -= np.convolve(data, np.ones(101) / 101.0, mode='same')
+    return data.astype(dtype)
+
+
+def synthetic_stream(ntraces=10, npts=360000, sampling_rate=100.0,
+                     dtype=np.int32, network='XX', station='BENCH'):
+    """
+    Returns a stream of continuous traces with distinct channel codes.
+    """
+    st = Stream()
+    for i in range(ntraces):
+        header = {'network': network, 'station': station,
+                  'location': '00', 'channel': 'HH%d' % (i % 10),
+                  'sampling_rate': sampling_rate, 'starttime': STARTTIME}
+        if i >= 10:
+            header['location'] = '%02d' % (i // 10)
+        st.append(Trace(data=synthetic_data(npts, dtype, seed=i),
+                        header=header))
+    return st
+
+
+def fragmented_stream(nfragments=2000, npts=1000, sampling_rate=100.0,
+                      seed=42):
+    """
+    Returns a single channel split into many fragments with small gaps and
+    overlaps, in shuffled order.
+    """
+    rng = np.random.RandomState(seed)
+    data = synthetic_data(nfragments * npts)
+    st = Stream()
+    for i in range(nfragments):
+        # shift fragments by up to 5 samples creating gaps and overlaps
+        shift = rng.randint(-5, 6) if i else 0
+        start = i * npts + shift
+        header = {'network': 'XX', 'station': 'BENCH', 'location': '00',
+                  'channel': 'HHZ', 'sampling_rate': sampling_rate,
+                  'starttime': STARTTIME + start / sampling_rate}
+        st.append(Trace(data=data[start:start + npts].copy(), header=header))
+    st.traces = [st.traces[i] for i in rng.permutation(nfragments)]
+    return st
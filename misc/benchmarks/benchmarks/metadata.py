@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for reading station and event metadata.
+"""
+import os
+
+from obspy import UTCDateTime, read_events, read_inventory
+from obspy.core.event import Catalog, Event, Magnitude, Origin, Pick
+from obspy.core.event import WaveformStreamID
+from obspy.core.inventory import Channel, Inventory, Network, Station
+
+
+def _synthetic_inventory(nstations=200):
+    """
+    Returns an inventory of three component stations, all channels with the
+    full response of the example inventory's BW.RJOB..EHZ channel.
+    """
+    response = read_inventory().select(
+        station='RJOB', channel='EHZ')[0][0][0].response
+    stations = []
+    for i in range(nstations):
+        channels = [
+            Channel(code='EH' + component, location_code='',
+                    latitude=40.0 + i * 0.01, longitude=10.0, elevation=0.0,
+                    depth=0.0, azimuth=0.0, dip=-90.0 if component == 'Z'
+                    else 0.0, sample_rate=100.0,
+                    start_date=UTCDateTime(2000, 1, 1), response=response)
+            for component in 'ZNE']
+        stations.append(Station(
+            code='S%04d' % i, latitude=40.0 + i * 0.01, longitude=10.0,
+            elevation=0.0, start_date=UTCDateTime(2000, 1, 1),
+            channels=channels))
+    return Inventory(networks=[Network(code='XX', stations=stations)],
+                     source='ObsPy benchmarks')
+
+
+def _synthetic_catalog(nevents=2000, npicks=10):
+    """
+    Returns a catalog of events with an origin, a magnitude and picks each.
+    """
+    catalog = Catalog()
+    for i in range(nevents):
+        time = UTCDateTime(2020, 1, 1) + i * 600
+        event = Event(
+            origins=[Origin(time=time, latitude=40.0 + (i % 100) * 0.01,
+                            longitude=10.0, depth=10000.0)],
+            magnitudes=[Magnitude(mag=1.0 + (i % 40) * 0.1,
+                                  magnitude_type='ML')])
+        event.picks = [
+            Pick(time=time + 5 + j,
+                 waveform_id=WaveformStreamID(
+                     network_code='XX', station_code='S%04d' % j,
+                     channel_code='EHZ'), phase_hint='P')
+            for j in range(npicks)]
+        catalog.append(event)
+    return catalog
+
+
+class ReadInventory(object):
+    """
+    Reading a StationXML file of 200 stations with full responses.
+    """
+    timeout = 300
+
+    def setup_cache(self):
+        filename = os.path.abspath('inventory.xml')
+        _synthetic_inventory().write(filename, format='STATIONXML')
+        return filename
+
+    def time_read_inventory(self, filename):
+        read_inventory(filename, format='STATIONXML')
+
+    def peakmem_read_inventory(self, filename):
+        read_inventory(filename, format='STATIONXML')
+
+
+class ReadEvents(object):
+    """
+    Reading a QuakeML file of 2000 events with ten picks each.
+    """
+    timeout = 300
+
+    def setup_cache(self):
+        filename = os.path.abspath('catalog.xml')
+        _synthetic_catalog().write(filename, format='QUAKEML')
+        return filename
+
+    def time_read_events(self, filename):
+        read_events(filename, format='QUAKEML')
+
+    def peakmem_read_events(self, filename):
+        read_events(filename, format='QUAKEML')
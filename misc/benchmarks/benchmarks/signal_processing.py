@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for obspy.signal.
+"""
+import warnings
+
+import numpy as np
+
+from obspy import UTCDateTime, read_inventory
+from obspy.signal import PPSD
+from obspy.signal.cross_correlation import (correlate_template,
+                                            correlation_detector)
+from obspy.signal.trigger import classic_sta_lta, recursive_sta_lta
+
+from .common import synthetic_data, synthetic_stream
+
+
+class PPSDAdd(object):
+    """
+    Adding a day of data to a probabilistic power spectral density.
+    """
+    timeout = 600
+
+    def setup(self):
+        self.inventory = read_inventory()
+        self.stream = synthetic_stream(ntraces=1, npts=8640000)
+        tr = self.stream[0]
+        tr.stats.update({'network': 'BW', 'station': 'RJOB',
+                         'location': '', 'channel': 'EHZ',
+                         'starttime': UTCDateTime(2009, 8, 24)})
+
+    def _add(self):
+        ppsd = PPSD(self.stream[0].stats, metadata=self.inventory)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            ppsd.add(self.stream)
+        return ppsd
+
+    def time_add(self):
+        self._add()
+
+    def peakmem_add(self):
+        self._add()
+
+
+class CorrelateTemplate(object):
+    """
+    Normalized cross-correlation of a template with an hour of data.
+    """
+    params = ([100, 1000, 10000], ['direct', 'fft'])
+    param_names = ['template_length', 'method']
+
+    def setup(self, template_length, method):
+        if method == 'direct' and template_length > 1000:
+            raise NotImplementedError('too slow')
+        self.data = synthetic_data(360000, dtype=np.float64)
+        self.template = self.data[200000:200000 + template_length].copy()
+
+    def time_correlate_template(self, template_length, method):
+        correlate_template(self.data, self.template, method=method)
+
+    def peakmem_correlate_template(self, template_length, method):
+        correlate_template(self.data, self.template, method=method)
+
+
+class CorrelationDetector(object):
+    """
+    Matched-filter detection with many templates in an hour of three
+    component data.
+    """
+    params = [1, 10, 100]
+    param_names = ['templates']
+    timeout = 300
+
+    def setup(self, templates):
+        self.stream = synthetic_stream(ntraces=3, npts=360000,
+                                       dtype=np.float64)
+        start = self.stream[0].stats.starttime
+        self.templates = [self.stream.slice(start + 60 + 30 * i,
+                                            start + 70 + 30 * i)
+                          for i in range(templates)]
+
+    def time_correlation_detector(self, templates):
+        correlation_detector(self.stream, self.templates, 0.7, 10)
+
+
+class STALTA(object):
+    """
+    STA/LTA characteristic functions of a day at 100 Hz.
+    """
+    def setup(self):
+        self.data = synthetic_data(8640000, dtype=np.float64)
+        self.nsta = 100
+        self.nlta = 1000
+
+    def time_classic_sta_lta(self):
+        classic_sta_lta(self.data, self.nsta, self.nlta)
+
+    def time_recursive_sta_lta(self):
+        recursive_sta_lta(self.data, self.nsta, self.nlta)
+
+    def peakmem_classic_sta_lta(self):
+        classic_sta_lta(self.data, self.nsta, self.nlta)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for Stream processing methods.
+"""
+import warnings
+
+from obspy import UTCDateTime, read_inventory
+
+from .common import fragmented_stream, synthetic_stream
+
+
+class Merge(object):
+    """
+    Merging a channel split into many fragments with gaps and overlaps.
+    """
+    params = ([100, 1000, 10000], [0, 1])
+    param_names = ['fragments', 'method']
+    timeout = 300
+
+    def setup(self, fragments, method):
+        self.stream = fragmented_stream(nfragments=fragments)
+
+    def time_merge(self, fragments, method):
+        self.stream.copy().merge(method=method)
+
+    def peakmem_merge(self, fragments, method):
+        self.stream.copy().merge(method=method)
+
+
+class Slice(object):
+    """
+    Slicing many short windows out of day long traces.
+    """
+    def setup(self):
+        self.stream = synthetic_stream(ntraces=3, npts=8640000)
+        start = self.stream[0].stats.starttime
+        self.windows = [(start + i * 864, start + i * 864 + 60)
+                        for i in range(100)]
+
+    def time_slice(self):
+        for starttime, endtime in self.windows:
+            self.stream.slice(starttime, endtime)
+
+    def time_slide(self):
+        for _ in self.stream.slide(window_length=600, step=300):
+            pass
+
+
+class _Processing(object):
+    params = ([1, 30], [360000])
+    param_names = ['traces', 'npts']
+
+    def setup(self, traces, npts):
+        self.stream = synthetic_stream(ntraces=traces, npts=npts,
+                                       dtype='float64')
+
+
+class Filter(_Processing):
+    """
+    Filtering hour long traces.
+    """
+    def time_bandpass(self, traces, npts):
+        self.stream.copy().filter('bandpass', freqmin=1.0, freqmax=10.0)
+
+    def time_bandpass_zerophase(self, traces, npts):
+        self.stream.copy().filter('bandpass', freqmin=1.0, freqmax=10.0,
+                                  zerophase=True)
+
+    def time_lowpass_cheby_2(self, traces, npts):
+        self.stream.copy().filter('lowpass_cheby_2', freq=10.0)
+
+    def peakmem_bandpass(self, traces, npts):
+        self.stream.copy().filter('bandpass', freqmin=1.0, freqmax=10.0)
+
+
+class Resample(_Processing):
+    """
+    Downsampling hour long traces.
+    """
+    def time_resample(self, traces, npts):
+        self.stream.copy().resample(40.0)
+
+    def time_resample_polyphase(self, traces, npts):
+        self.stream.copy().resample(40.0, method='polyphase')
+
+    def time_decimate(self, traces, npts):
+        self.stream.copy().decimate(5, no_filter=True)
+
+    def time_interpolate(self, traces, npts):
+        self.stream.copy().interpolate(40.0, method='lanczos', a=20)
+
+    def peakmem_resample(self, traces, npts):
+        self.stream.copy().resample(40.0)
+
+    def peakmem_resample_polyphase(self, traces, npts):
+        self.stream.copy().resample(40.0, method='polyphase')
+
+
+class RemoveResponse(object):
+    """
+    Removing the instrument response of day long traces.
+    """
+    params = ['VEL', 'DISP']
+    param_names = ['output']
+    timeout = 300
+
+    def setup(self, output):
+        self.inventory = read_inventory()
+        self.stream = synthetic_stream(ntraces=3, npts=8640000,
+                                       dtype='float64')
+        for tr, component in zip(self.stream, 'ZNE'):
+            tr.stats.update({'network': 'BW', 'station': 'RJOB',
+                             'location': '', 'channel': 'EH' + component,
+                             'starttime': UTCDateTime(2009, 8, 24)})
+
+    def time_remove_response(self, output):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.stream.copy().remove_response(
+                inventory=self.inventory, output=output,
+                pre_filt=(0.01, 0.02, 30.0, 40.0))
+
+    def peakmem_remove_response(self, output):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.stream.copy().remove_response(
+                inventory=self.inventory, output=output,
+                pre_filt=(0.01, 0.02, 30.0, 40.0))
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for travel time calculations with obspy.taup.
+"""
+import numpy as np
+
+from obspy.taup import TauPyModel
+
+
+class GetTravelTimes(object):
+    """
+    Travel times of all phases for many distances and a few source depths.
+    """
+    params = ([10.0, 300.0], [['ttall'], ['P', 'S']])
+    param_names = ['source_depth_in_km', 'phase_list']
+
+    def setup(self, source_depth_in_km, phase_list):
+        self.model = TauPyModel(model='iasp91')
+        self.distances = np.linspace(1.0, 179.0, 50)
+
+    def time_get_travel_times(self, source_depth_in_km, phase_list):
+        for distance in self.distances:
+            self.model.get_travel_times(
+                source_depth_in_km=source_depth_in_km,
+                distance_in_degree=distance, phase_list=phase_list)
+
+    def time_get_travel_times_batch(self, source_depth_in_km, phase_list):
+        self.model.get_travel_times_batch(
+            source_depth_in_km=source_depth_in_km,
+            distance_in_degree=self.distances, phase_list=phase_list)
+
+    def time_load_model(self, source_depth_in_km, phase_list):
+        TauPyModel(model='iasp91').get_travel_times(
+            source_depth_in_km=source_depth_in_km, distance_in_degree=50.0,
+            phase_list=phase_list)
+
+    def peakmem_get_travel_times(self, source_depth_in_km, phase_list):
+        for distance in self.distances[:5]:
+            self.model.get_travel_times(
+                source_depth_in_km=source_depth_in_km,
+                distance_in_degree=distance, phase_list=phase_list)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for reading and writing waveform files.
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from obspy import read
+
+from .common import synthetic_stream
+
+
+# Per format: keyword arguments for writing and for the synthetic stream, SAC
+# files hold a single trace and SEG Y limits the number of samples per trace.
+FORMATS = {
+    'MSEED': ({'encoding': 'STEIM2', 'reclen': 4096},
+              {'ntraces': 10, 'npts': 1000000}),
+    'SAC': ({}, {'ntraces': 1, 'npts': 10000000, 'dtype': np.float32}),
+    'SEGY': ({'data_encoding': 5},
+             {'ntraces': 1000, 'npts': 10000, 'sampling_rate': 1000.0,
+              'dtype': np.float32}),
+    'GSE2': ({}, {'ntraces': 10, 'npts': 1000000}),
+}
+
+
+def _write_files():
+    """
+    Writes one file per format to the current directory, which asv removes
+    after the benchmarks ran.
+    """
+    filenames = {}
+    for format, (write_kwargs, stream_kwargs) in FORMATS.items():
+        filenames[format] = os.path.abspath('data.' + format.lower())
+        synthetic_stream(**stream_kwargs).write(
+            filenames[format], format=format, **write_kwargs)
+    return filenames
+
+
+class Read(object):
+    """
+    Reading waveform files with and without format autodetection.
+    """
+    params = sorted(FORMATS)
+    param_names = ['format']
+    timeout = 300
+
+    def setup_cache(self):
+        return _write_files()
+
+    def time_read(self, filenames, format):
+        read(filenames[format], format=format)
+
+    def time_read_autodetect(self, filenames, format):
+        read(filenames[format])
+
+    def time_read_headonly(self, filenames, format):
+        read(filenames[format], format=format, headonly=True)
+
+    def peakmem_read(self, filenames, format):
+        read(filenames[format], format=format)
+
+
+class Write(object):
+    """
+    Writing waveform files.
+    """
+    params = sorted(FORMATS)
+    param_names = ['format']
+    timeout = 300
+
+    def setup(self, format):
+        write_kwargs, stream_kwargs = FORMATS[format]
+        self.stream = synthetic_stream(**stream_kwargs)
+        self.write_kwargs = write_kwargs
+        self.tempdir = tempfile.mkdtemp(prefix='obspy-benchmark-')
+        self.filename = os.path.join(self.tempdir, 'data.' + format.lower())
+
+    def teardown(self, format):
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+    def time_write(self, format):
+        self.stream.write(self.filename, format=format, **self.write_kwargs)
+
+    def peakmem_write(self, format):
+        self.stream.write(self.filename, format=format, **self.write_kwargs)
+
+
+class ReadMSEEDTimeWindow(object):
+    """
+    Reading ten minutes out of a day long, three channel MiniSEED file.
+    """
+    params = [False, True]
+    param_names = ['mmap']
+    timeout = 300
+
+    def setup_cache(self):
+        filename = os.path.abspath('day.mseed')
+        st = synthetic_stream(ntraces=3, npts=8640000)
+        st.write(filename, format='MSEED', encoding='STEIM2', reclen=4096)
+        starttime = st[0].stats.starttime + 43200
+        return filename, starttime, starttime + 600
+
+    def time_read_time_window(self, cache, mmap):
+        filename, starttime, endtime = cache
+        read(filename, starttime=starttime, endtime=endtime, mmap=mmap)
+
+    def peakmem_read_time_window(self, cache, mmap):
+        filename, starttime, endtime = cache
+        read(filename, starttime=starttime, endtime=endtime, mmap=mmap)
@@ -45,7 +45,7 @@ import numpy as np
 
 from obspy import Stream, read, UTCDateTime
 from obspy.core.stream import _headonly_warning_msg
-from obspy.core.util.misc import BAND_CODE
+from obspy.core.util.misc import BAND_CODE, get_gaps_from_times
 from obspy.io.mseed import ObsPyMSEEDFilesizeTooSmallError
 
 
@@ -350,8 +350,12 @@ class Client(object):
 
         total_duration = endtime - starttime
         # sum up gaps in the middle
-        gaps = [gap[6] for gap in st.get_gaps()]
-        gap_sum = np.sum(gaps)
+        gaps = get_gaps_from_times(
+            [tr.stats.starttime.ns for tr in st],
+            [tr.stats.endtime.ns for tr in st],
+            [tr.stats.sampling_rate for tr in st],
+            ids=[tr.id for tr in st])
+        gap_sum = np.sum(gaps['duration'])
         gap_count = len(gaps)
         # check if we have a gap at start or end
         earliest = min([tr.stats.starttime for tr in st])
@@ -117,7 +117,7 @@ supported formats.
 .. _NumPy: http://www.numpy.org
 """
 # don't change order
-from obspy.core.utcdatetime import UTCDateTime  # NOQA
+from obspy.core.utcdatetime import UTCDateTime, UTCDateTimeArray  # NOQA
 from obspy.core.util.attribdict import AttribDict  # NOQA
 from obspy.core.trace import Stats, Trace  # NOQA
 from obspy.core.stream import Stream, read  # NOQA
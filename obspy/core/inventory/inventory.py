@@ -9,6 +9,7 @@ Provides the Inventory class.
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
+from bisect import bisect_right
 import copy
 import fnmatch
 import textwrap
@@ -21,7 +22,7 @@ from obspy.core.util.decorator import map_example_filename, uncompress_file
 from obspy.core.util.misc import buffered_load_entry_point
 from obspy.core.util.obspy_types import ObsPyException, ZeroSamplingRate
 
-from .network import Network
+from .network import Network, _channel_metadata
 from .util import _unified_content_strings, _textwrap, _response_plot_label
 
 # Make sure this is consistent with obspy.io.stationxml! Importing it
@@ -30,6 +31,109 @@ SOFTWARE_MODULE = "ObsPy %s" % obspy.__version__
 SOFTWARE_URI = "https://www.obspy.org"
 
 
+class _ChannelIndex(object):
+    """
+    Index of the channel epochs of an inventory by SEED ID.
+
+    The epochs of each SEED ID are sorted by start date along with the
+    running maximum of their end dates, so the epochs possibly containing a
+    time are found by a binary search followed by a scan over the matching
+    epochs only. Each entry remembers the position of its channel in the
+    inventory. Entries whose channel moved, was removed or changed its codes
+    or dates as well as stations or channels added to or removed from the
+    networks and stations of a SEED ID are detected on lookup and make the
+    index stale.
+    """
+    # Dates are compared with a margin, the exact comparison (respecting
+    # the precision of UTCDateTime) is left to the caller.
+    _MARGIN = 10 ** 9
+
+    def __init__(self, networks):
+        self._networks_id = id(networks)
+        self._num_networks = len(networks)
+        epochs = {}
+        self._containers = {}
+        order = 0
+        for i, net in enumerate(networks):
+            self._containers.setdefault(net.code, []).append(
+                (i, net, net.stations, len(net.stations)))
+            for j, sta in enumerate(net.stations):
+                self._containers.setdefault((net.code, sta.code), []).append(
+                    (None, sta, sta.channels, len(sta.channels)))
+                for k, cha in enumerate(sta.channels):
+                    seed_id = "%s.%s.%s.%s" % (net.code, sta.code,
+                                               cha.location_code, cha.code)
+                    start = float("-inf") if cha.start_date is None \
+                        else cha.start_date.ns
+                    end = float("inf") if cha.end_date is None \
+                        else cha.end_date.ns
+                    epochs.setdefault(seed_id, []).append(
+                        (start, order, end, (i, j, k), net, sta, cha,
+                         cha.start_date, cha.end_date))
+                    order += 1
+        self._index = {}
+        for seed_id, entries in epochs.items():
+            entries.sort(key=lambda x: x[:2])
+            max_ends = []
+            for entry in entries:
+                max_ends.append(max(entry[2], max_ends[-1]) if max_ends
+                                else entry[2])
+            self._index[seed_id] = ([entry[0] for entry in entries],
+                                    max_ends, entries)
+
+    def __contains__(self, seed_id):
+        return seed_id in self._index
+
+    def lookup(self, networks, seed_id, datetime):
+        """
+        Return the channels of a SEED ID whose epoch may contain a time.
+
+        :returns: List of ``(network, station, channel)`` in inventory order
+            (all epochs if ``datetime`` is not a
+            :class:`~obspy.core.utcdatetime.UTCDateTime`) or ``None`` if the
+            index is stale.
+        """
+        if id(networks) != self._networks_id or \
+                len(networks) != self._num_networks:
+            return None
+        try:
+            starts, max_ends, entries = self._index[seed_id]
+        except KeyError:
+            return []
+        if isinstance(datetime, obspy.UTCDateTime):
+            t = datetime.ns
+            candidates = []
+            for n in range(bisect_right(starts, t + self._MARGIN) - 1, -1,
+                           -1):
+                if max_ends[n] < t - self._MARGIN:
+                    break
+                if entries[n][2] >= t - self._MARGIN:
+                    candidates.append(entries[n])
+        else:
+            candidates = list(entries)
+        network, station, location, channel = seed_id.split(".")
+        for i, node, items, length in (self._containers[network] +
+                                       self._containers[network, station]):
+            if i is not None and networks[i] is not node:
+                return None
+            if getattr(node, 'stations' if i is not None else 'channels') \
+                    is not items or len(items) != length:
+                return None
+        for _, _, _, (i, j, k), net, sta, cha, start, end in candidates:
+            try:
+                moved = (networks[i] is not net or
+                         net.stations[j] is not sta or
+                         sta.channels[k] is not cha)
+            except IndexError:
+                return None
+            if moved or net.code != network or sta.code != station or \
+                    cha.location_code != location or cha.code != channel or \
+                    cha.start_date is not start or cha.end_date is not end:
+                return None
+        return [entry[4:7] for entry in sorted(candidates,
+                                               key=lambda x: x[1])]
+
+
 def _create_example_inventory():
     """
     Create an example inventory.
@@ -128,6 +232,7 @@ class Inventory(ComparingObject):
             StationXML standard and how to output it to StationXML
             see the :ref:`ObsPy Tutorial <stationxml-extra>`.
         """
+        self._channel_index = None
         self.networks = networks if networks is not None else []
         self.source = source
         self.sender = sender
@@ -165,6 +270,16 @@ class Inventory(ComparingObject):
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __getstate__(self):
+        # the channel index is rebuilt on demand
+        state = self.__dict__.copy()
+        state['_channel_index'] = None
+        return state
+
+    def __setstate__(self, state):
+        state.setdefault('_channel_index', None)
+        self.__dict__.update(state)
+
     def __add__(self, other):
         new = copy.copy(self)
         new += other
@@ -181,6 +296,7 @@ class Inventory(ComparingObject):
             msg = ("Only Inventory and Network objects can be added to "
                    "an Inventory.")
             raise TypeError(msg)
+        self._channel_index = None
         return self
 
     def __len__(self):
@@ -312,6 +428,7 @@ class Inventory(ComparingObject):
         else:
             msg = 'Extend only supports a list of Network objects as argument.'
             raise TypeError(msg)
+        self._channel_index = None
 
     def write(self, path_or_file_object, format, **kwargs):
         """
@@ -400,6 +517,40 @@ class Inventory(ComparingObject):
             msg = "networks can only contain Network objects."
             raise ValueError(msg)
         self._networks = value
+        self._channel_index = None
+
+    def _get_channels(self, seed_id, datetime):
+        """
+        Return the channels of a SEED ID possibly in use at a given time.
+
+        Uses an index of the channels built on first use, so that the
+        lookups of e.g. all traces of a stream do not each walk the whole
+        inventory. The index is rebuilt whenever networks are set or added
+        or it turns out to be stale.
+
+        :rtype: list
+        :returns: ``(network, station, channel)`` tuples in inventory order,
+            the caller has to check the epochs against ``datetime``.
+        """
+        candidates = None
+        if self._channel_index is not None:
+            candidates = self._channel_index.lookup(self._networks, seed_id,
+                                                    datetime)
+        if candidates is None:
+            self._channel_index = _ChannelIndex(self._networks)
+            candidates = self._channel_index.lookup(self._networks, seed_id,
+                                                    datetime)
+        if not candidates and seed_id not in self._channel_index:
+            # channels added in place are only found by walking the inventory
+            network, station, location, channel = seed_id.split(".")
+            candidates = [
+                (net, sta, cha) for net in self._networks
+                if net.code == network for sta in net.stations
+                if sta.code == station for cha in sta.channels
+                if cha.code == channel and cha.location_code == location]
+            if candidates:
+                self._channel_index = None
+        return candidates
 
     def get_response(self, seed_id, datetime):
         """
@@ -425,14 +576,14 @@ class Inventory(ComparingObject):
         :rtype: :class:`~obspy.core.inventory.response.Response`
         :returns: Response for time series specified by input arguments.
         """
-        network, _, _, _ = seed_id.split(".")
-
         responses = []
-        for net in self.networks:
-            if net.code != network:
-                continue
+        for net, sta, cha in self._get_channels(seed_id, datetime):
             try:
-                responses.append(net.get_response(seed_id, datetime))
+                if (cha.start_date is None or cha.start_date <= datetime) \
+                        and (cha.end_date is None or
+                             cha.end_date >= datetime) and \
+                        cha.response is not None:
+                    responses.append(cha.response)
             except Exception:
                 pass
         if len(responses) > 1:
@@ -455,16 +606,14 @@ class Inventory(ComparingObject):
         :return: Dictionary containing coordinates and orientation (latitude,
             longitude, elevation, azimuth, dip)
         """
-        network, _, _, _ = seed_id.split(".")
-
         metadata = []
-        for net in self.networks:
-            if net.code != network:
-                continue
+        for net, sta, cha in self._get_channels(seed_id, datetime):
             try:
-                metadata.append(net.get_channel_metadata(seed_id, datetime))
+                data = _channel_metadata(net, sta, cha, datetime)
             except Exception:
-                pass
+                continue
+            if data is not None:
+                metadata.append(data)
         if len(metadata) > 1:
             msg = ("Found more than one matching channel metadata. "
                    "Returning first.")
@@ -276,14 +276,6 @@ class Network(BaseNode):
                 # skip wrong station
                 if sta.code != station:
                     continue
-                # check datetime only if given
-                if datetime:
-                    # skip if start date before given datetime
-                    if sta.start_date and sta.start_date > datetime:
-                        continue
-                    # skip if end date before given datetime
-                    if sta.end_date and sta.end_date < datetime:
-                        continue
                 for cha in sta.channels:
                     # skip wrong channel
                     if cha.code != channel:
@@ -291,27 +283,9 @@ class Network(BaseNode):
                     # skip wrong location
                     if cha.location_code != location:
                         continue
-                    # check datetime only if given
-                    if datetime:
-                        # skip if start date before given datetime
-                        if cha.start_date and cha.start_date > datetime:
-                            continue
-                        # skip if end date before given datetime
-                        if cha.end_date and cha.end_date < datetime:
-                            continue
-                    # prepare coordinates
-                    data = {}
-                    for key in ('latitude', 'longitude', 'elevation'):
-                        value = getattr(cha, key, None)
-                        # if channel latitude/longitude/elevation is not given
-                        # use station information
-                        if value is None:
-                            value = getattr(sta, key, None)
-                        data[key] = value
-                    data['local_depth'] = cha.depth
-                    data['azimuth'] = cha.azimuth
-                    data['dip'] = cha.dip
-                    metadata.append(data)
+                    data = _channel_metadata(self, sta, cha, datetime)
+                    if data is not None:
+                        metadata.append(data)
         if len(metadata) > 1:
             msg = ("Found more than one matching channel metadata. "
                    "Returning first.")
@@ -752,6 +726,46 @@ class Network(BaseNode):
         return fig
 
 
+def _channel_metadata(net, sta, cha, datetime=None):
+    """
+    Return basic metadata of a channel if it is in use at a given time.
+
+    :rtype: dict or None
+    :return: Dictionary containing coordinates and orientation (latitude,
+        longitude, elevation, local_depth, azimuth, dip) or ``None`` if the
+        network, station or channel is not in use at ``datetime``.
+    """
+    if net.start_date and net.start_date > datetime:
+        return None
+    if net.end_date and net.end_date < datetime:
+        return None
+    # check datetime only if given
+    if datetime:
+        # skip if start date before given datetime
+        if sta.start_date and sta.start_date > datetime:
+            return None
+        # skip if end date before given datetime
+        if sta.end_date and sta.end_date < datetime:
+            return None
+        if cha.start_date and cha.start_date > datetime:
+            return None
+        if cha.end_date and cha.end_date < datetime:
+            return None
+    # prepare coordinates
+    data = {}
+    for key in ('latitude', 'longitude', 'elevation'):
+        value = getattr(cha, key, None)
+        # if channel latitude/longitude/elevation is not given
+        # use station information
+        if value is None:
+            value = getattr(sta, key, None)
+        data[key] = value
+    data['local_depth'] = cha.depth
+    data['azimuth'] = cha.azimuth
+    data['dip'] = cha.dip
+    return data
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -11,7 +11,6 @@ Module for handling ObsPy Stream objects.
 import collections
 import copy
 import fnmatch
-import math
 import os
 import pickle
 import re
@@ -21,25 +20,36 @@ from glob import glob, has_magic
 import numpy as np
 
 from obspy.core import compatibility
-from obspy.core.trace import Trace
+from obspy.core.trace import (Trace, _detrend_data, _get_processing_info,
+                              _get_polyphase_ratio, _get_taper_window,
+                              _resample_fourier, _resample_polyphase)
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util.attribdict import AttribDict
 from obspy.core.util.base import (ENTRY_POINTS, _get_function_from_entry_point,
-                                  _read_from_plugin, _generic_reader)
+                                  _read_from_plugin, _generic_reader,
+                                  _map_threads, create_empty_data_chunk)
 from obspy.core.util.decorator import (map_example_filename,
                                        raise_if_masked, uncompress_file)
-from obspy.core.util.misc import get_window_times, buffered_load_entry_point
+from obspy.core.util.misc import (buffered_load_entry_point,
+                                  get_gaps_from_times, get_window_times)
 from obspy.core.util.obspy_types import ObsPyException
 
 
 _headonly_warning_msg = (
     "Keyword headonly cannot be combined with starttime, endtime or dtype.")
 
+# filter and detrend types whose functions operate along the last axis of
+# multi-dimensional arrays and thus can be used for batched processing
+_BATCH_FILTER_TYPES = ('bandpass', 'bandstop', 'lowpass', 'highpass',
+                       'lowpass_cheby_2')
+_BATCH_DETREND_TYPES = ('simple', 'linear', 'constant', 'demean')
+
 
 @map_example_filename("pathname_or_url")
 def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
          endtime=None, nearest_sample=True, dtype=None, apply_calib=False,
-         check_compression=True, **kwargs):
+         check_compression=True, workers=None, executor="thread", lazy=False,
+         **kwargs):
     """
     Read waveform files into an ObsPy Stream object.
 
@@ -84,6 +94,27 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
     :param check_compression: Check for compression on file and decompress
         if needed. This may be disabled for a moderate speed up.
     :type check_compression: bool, optional
+    :type workers: int, optional
+    :param workers: If larger than one and multiple files match the given
+        wildcard pattern, read up to this many files concurrently. The traces
+        are always ordered as if the files were read one after another.
+    :type executor: str, optional
+    :param executor: Kind of worker pool used with ``workers``. Either
+        ``"thread"`` or ``"process"``. Processes avoid contention on the
+        global interpreter lock (e.g. while Python code parses headers) at the
+        cost of transferring the decoded traces between processes. Code
+        using ``executor="process"`` has to be guarded by
+        ``if __name__ == "__main__":`` on platforms spawning new processes.
+    :type lazy: bool, optional
+    :param lazy: If set to ``True``, read only the data headers and defer
+        decoding the samples of each trace until its ``.data`` attribute is
+        accessed for the first time. Traces can be selected, trimmed and
+        sliced before that in which case only the remaining samples are
+        decoded, e.g. the ``starttime`` and ``endtime`` options do not lead
+        to decoding of the samples outside the requested time window.
+        Currently supported for MiniSEED, SAC and SEG Y/SU files given by
+        file name, other formats are read as usual. Has no effect if
+        ``headonly`` is set. Defaults to ``False``.
     :param kwargs: Additional keyword arguments passed to the underlying
         waveform reader method.
     :return: An ObsPy :class:`~obspy.core.stream.Stream` object.
@@ -139,6 +170,12 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
         .RJOB..Z | 2005-08-31T02:33:49.850000Z - ... | 200.0 Hz, 12000 samples
         .RNON..Z | 2004-06-09T20:05:59.850000Z - ... | 200.0 Hz, 12000 samples
 
+        Many files can be decoded concurrently with a pool of worker
+        processes (or threads with ``executor="thread"``).
+
+        >>> st = read("/path/to/loc_R*.z", workers=4,
+        ...           executor="process")  # doctest: +SKIP
+
     (2) Reading a local file without format detection.
 
         Using the ``format`` parameter disables the automatic detection and
@@ -199,12 +236,15 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
     kwargs['check_compression'] = check_compression
     kwargs['headonly'] = headonly
     kwargs['format'] = format
+    if lazy and not headonly:
+        kwargs['lazy'] = True
 
     if pathname_or_url is None:
         # if no pathname or URL specified, return example stream
         st = _create_example_stream(headonly=headonly)
     else:
-        st = _generic_reader(pathname_or_url, _read, **kwargs)
+        st = _generic_reader(pathname_or_url, _read, workers=workers,
+                             executor=executor, **kwargs)
 
     if len(st) == 0:
         # try to give more specific information why the stream is empty
@@ -329,7 +369,18 @@ class Stream(object):
         Contains the number of traces in the Stream object and returns the
         value of each Trace's __str__ method.
         See also: :meth:`Stream.__str__`.
+
+    .. note::
+
+        :meth:`filter`, :meth:`detrend`, :meth:`taper` and :meth:`resample`
+        process all traces that share sampling rate, number of samples and
+        dtype as a single two-dimensional array. Afterwards the ``.data``
+        attributes of these traces are views into the rows of the processed
+        array. Experts can opt-out by setting
+        ``Stream._batch_processing = False``, in this case all traces are
+        processed one by one.
     """
+    _batch_processing = True
 
     def __init__(self, traces=None):
         self.traces = []
@@ -772,74 +823,39 @@ class Stream(object):
         BW.RJOB..EHZ      2009-08-24T00:20:13.000000Z ...
         Total: 1 gap(s) and 0 overlap(s)
         """
-        # Create shallow copy of the traces to be able to sort them later on.
-        copied_traces = copy.copy(self.traces)
-        self.sort()
+        traces = self.traces
+        # integer codes for the SEED ids, ordered like the sorted ids
+        keys = [(tr.stats.network, tr.stats.station, tr.stats.location,
+                 tr.stats.channel) for tr in traces]
+        codes = {key: _i for _i, key in enumerate(sorted(set(keys)))}
+        ids = np.array([codes[key] for key in keys], dtype=np.int64)
+        starttimes = np.array([tr.stats.starttime.ns for tr in traces],
+                              dtype=np.int64)
+        endtimes = np.array([tr.stats.endtime.ns for tr in traces],
+                            dtype=np.int64)
+        sampling_rates = np.array([tr.stats.sampling_rate for tr in traces],
+                                  dtype=np.float64)
+        gaps = get_gaps_from_times(starttimes, endtimes, sampling_rates,
+                                   ids=ids, min_gap=min_gap, max_gap=max_gap)
+        # gaps are sorted like the traces, gaps inside masked traces are
+        # inserted before the gap following the respective trace
+        order = np.lexsort((endtimes, starttimes, ids))
+        position = np.empty(len(traces), dtype=np.int64)
+        position[order] = np.arange(len(traces))
+        masked = [_i for _i in order
+                  if isinstance(traces[_i].data, np.ma.masked_array)]
         gap_list = []
-        for _i in range(len(self.traces)):
-            # if the trace is masked, break it up and run get_gaps on the
-            # resulting stream
-            if isinstance(self.traces[_i].data, np.ma.masked_array):
-                gap_list.extend(self.traces[_i].split().get_gaps())
-            if _i + 1 == len(self.traces):
-                # reached the last trace
-                break
-            # skip traces with different network, station, location or channel
-            if self.traces[_i].id != self.traces[_i + 1].id:
-                continue
-            # different sampling rates should always result in a gap or overlap
-            if self.traces[_i].stats.delta == self.traces[_i + 1].stats.delta:
-                same_sampling_rate = True
-            else:
-                same_sampling_rate = False
-            stats = self.traces[_i].stats
-            stime = min(stats['endtime'], self.traces[_i + 1].stats['endtime'])
-            etime = self.traces[_i + 1].stats['starttime']
-            # last sample of earlier trace represents data up to time of last
-            # sample (stats.endtime) plus one delta
-            delta = etime.timestamp - (stime.timestamp + stats.delta)
-            # Check that any overlap is not larger than the trace coverage
-            if delta < 0:
-                temp = self.traces[_i + 1].stats['endtime'].timestamp - \
-                    etime.timestamp
-                if (delta * -1) > temp:
-                    delta = -1 * temp
-            # Check gap/overlap criteria
-            if min_gap and delta < min_gap:
-                continue
-            if max_gap and delta > max_gap:
-                continue
-            # Number of missing samples
-            nsamples = int(compatibility.round_away(math.fabs(delta) *
-                                                    stats['sampling_rate']))
-            if delta < 0:
-                nsamples = -nsamples
-            # skip if is equal to delta (1 / sampling rate)
-            if same_sampling_rate and nsamples == 0:
-                continue
-            # check if gap is already covered in trace before:
-            covered = False
-            # only need to check previous traces because the traces are sorted
-            for prev_trace in self.traces[:_i]:
-                prev_stats = prev_trace.stats
-                # look if trace is contained in other trace
-                prev_start = prev_stats['starttime']
-                prev_end = prev_stats['endtime']
-                if not (prev_start < stime < etime < prev_end):
-                    continue
-                # don't look in traces of other measurements
-                elif self.traces[_i].id != prev_trace.id:
-                    continue
-                else:
-                    covered = True
-                    break
-            if covered:
-                continue
+        for gap in gaps:
+            while masked and position[masked[0]] <= position[gap['index']]:
+                gap_list.extend(traces[masked.pop(0)].split().get_gaps())
+            stats = traces[gap['index']].stats
             gap_list.append([stats['network'], stats['station'],
                              stats['location'], stats['channel'],
-                             stime, etime, delta, nsamples])
-        # Set the original traces to not alter the stream object.
-        self.traces = copied_traces
+                             UTCDateTime(ns=int(gap['starttime'])),
+                             UTCDateTime(ns=int(gap['endtime'])),
+                             float(gap['duration']), int(gap['nsamples'])])
+        for _i in masked:
+            gap_list.extend(traces[_i].split().get_gaps())
         return gap_list
 
     def insert(self, position, object):
@@ -2012,16 +2028,10 @@ class Stream(object):
         # clear traces of current stream
         self.traces = []
         # loop through ids
-        for _id in traces_dict.keys():
-            cur_trace = traces_dict[_id].pop(0)
-            # loop through traces of same id
-            for _i in range(len(traces_dict[_id])):
-                trace = traces_dict[_id].pop(0)
-                # disable sanity checks because there are already done
-                cur_trace = cur_trace.__add__(
-                    trace, method, fill_value=fill_value, sanity_checks=False,
-                    interpolation_samples=interpolation_samples)
-            self.traces.append(cur_trace)
+        for traces in traces_dict.values():
+            self.traces.append(_merge_traces(
+                traces, method, fill_value=fill_value,
+                interpolation_samples=interpolation_samples))
 
         # trying to restore order, newly created traces are placed at
         # start
@@ -2192,17 +2202,31 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             st.filter("highpass", freq=1.0)
             st.plot()
         """
-        for tr in self:
+        if type.lower() in _BATCH_FILTER_TYPES and \
+                not options.get('ba') and not options.get('freq_passband'):
+            batches, traces = self._get_batches()
+        else:
+            batches, traces = [], self.traces
+        for batch in batches:
+            data = self._filter_batch(batch, self._stack_batch(batch),
+                                      type, **options)
+            self._unstack_batch(batch, data)
+        for tr in traces:
             tr.filter(type, **options)
         return self
 
-    def trigger(self, type, **options):
+    def trigger(self, type, workers=None, **options):
         """
         Run a triggering algorithm on all traces in the stream.
 
         :param type: String that specifies which trigger is applied (e.g.
             ``'recstalta'``). See the `Supported Trigger`_ section below for
             further details.
+        :type workers: int
+        :param workers: Number of threads processing traces in parallel,
+            defaults to the number of CPUs. The C routines of the STA/LTA
+            triggers release the global interpreter lock, ``1`` processes
+            all traces in the calling thread.
         :param options: Necessary keyword arguments for the respective
             trigger that will be passed on. (e.g. ``sta=3``, ``lta=10``)
             Arguments ``sta`` and ``lta`` (seconds) will be mapped to ``nsta``
@@ -2264,12 +2288,17 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             st.trigger('recstalta', sta=1, lta=4)
             st.plot()
         """
-        for tr in self:
-            tr.trigger(type, **options)
+        # load the entry point in this thread, the traces only look it up
+        _get_function_from_entry_point('trigger', type)
+        # a trace contained more than once is triggered repeatedly in order
+        if len(set(map(id, self.traces))) < len(self.traces):
+            workers = 1
+        _map_threads(lambda tr: tr.trigger(type, **options), self.traces,
+                     workers=workers)
         return self
 
     def resample(self, sampling_rate, window='hanning', no_filter=True,
-                 strict_length=False):
+                 strict_length=False, method='fourier'):
         """
         Resample data in all traces of stream using Fourier method.
 
@@ -2278,13 +2307,17 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :type window: array_like, callable, str, float, or tuple, optional
         :param window: Specifies the window applied to the signal in the
             Fourier domain. Defaults ``'hanning'`` window. See
-            :func:`scipy.signal.resample` for details.
+            :func:`scipy.signal.resample` for details. Only used by the
+            Fourier method.
         :type no_filter: bool, optional
         :param no_filter: Deactivates automatic filtering if set to ``True``.
             Defaults to ``True``.
         :type strict_length: bool, optional
         :param strict_length: Leave traces unchanged for which end time of
             trace would change. Defaults to ``False``.
+        :type method: str, optional
+        :param method: ``'fourier'`` (default) or ``'polyphase'``, see
+            :meth:`~obspy.core.trace.Trace.resample`.
 
         .. note::
 
@@ -2323,9 +2356,15 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         BW.RJOB..EHN | 2009-08-24T00:20:03.000000Z ... | 10.0 Hz, 300 samples
         BW.RJOB..EHE | 2009-08-24T00:20:03.000000Z ... | 10.0 Hz, 300 samples
         """
-        for tr in self:
+        batches, traces = self._get_batches()
+        for batch in batches:
+            self._resample_batch(batch, sampling_rate, window=window,
+                                 no_filter=no_filter,
+                                 strict_length=strict_length, method=method)
+        for tr in traces:
             tr.resample(sampling_rate, window=window,
-                        no_filter=no_filter, strict_length=strict_length)
+                        no_filter=no_filter, strict_length=strict_length,
+                        method=method)
         return self
 
     def decimate(self, factor, no_filter=False, strict_length=False):
@@ -2487,7 +2526,15 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             original data, use :meth:`~obspy.core.stream.Stream.copy` to create
             a copy of your stream object.
         """
-        for tr in self:
+        if type.lower() in _BATCH_DETREND_TYPES and not options:
+            batches, traces = self._get_batches()
+        else:
+            batches, traces = [], self.traces
+        for batch in batches:
+            info = _get_processing_info(Trace.detrend, batch[0], type=type)
+            data = _detrend_data(self._stack_batch(batch), type)
+            self._unstack_batch(batch, data, info)
+        for tr in traces:
             tr.detrend(type=type, **options)
         return self
 
@@ -2505,7 +2552,19 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             original data, use :meth:`~obspy.core.stream.Stream.copy` to create
             a copy of your stream object.
         """
-        for tr in self:
+        batches, traces = self._get_batches()
+        for batch in batches:
+            info = _get_processing_info(Trace.taper, batch[0], *args, **kwargs)
+            stats = batch[0].stats
+            taper = _get_taper_window(stats.npts, stats.sampling_rate,
+                                      *args, **kwargs)
+            data = self._stack_batch(batch)
+            # Convert data if it's not a floating point type.
+            if not np.issubdtype(data.dtype, np.floating):
+                data = np.require(data, dtype=np.float64)
+            data *= taper
+            self._unstack_batch(batch, data, info)
+        for tr in traces:
             tr.taper(*args, **kwargs)
         return self
 
@@ -2970,14 +3029,20 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             cur_trace = trace_list.pop(0)
             delta = cur_trace.stats.delta
             allowed_micro_shift = misalignment_threshold * delta
+            # directly adjacent traces are only collected and get merged in
+            # one go once the merged trace is needed, the number of samples
+            # and end time of the merged trace are kept track of meanwhile
+            adjacent = [cur_trace]
+            npts = cur_trace.stats.npts
             # work through all traces of same id
             while trace_list:
                 trace = trace_list.pop(0)
+                endtime = cur_trace.stats.starttime + float(npts - 1) * delta
                 # `gap` is the deviation (in seconds) of the actual start
                 # time of the second trace from the expected start time
                 # (for the ideal case of directly adjacent and perfectly
                 # aligned traces).
-                gap = trace.stats.starttime - (cur_trace.stats.endtime + delta)
+                gap = trace.stats.starttime - (endtime + delta)
                 # if `gap` is larger than the designated allowed shift,
                 # we treat it as a real gap and leave as is.
                 if misalignment_threshold > 0 and gap <= allowed_micro_shift:
@@ -3026,11 +3091,12 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                     cur_trace.stats.starttime.timestamp) % delta / delta
                 subsample_shift_percentage = min(
                     subsample_shift_percentage, 1 - subsample_shift_percentage)
-                if (trace.stats.starttime <= cur_trace.stats.endtime and
+                if (trace.stats.starttime <= endtime and
                         subsample_shift_percentage < misalignment_threshold):
+                    cur_trace = _merge_traces(adjacent)
                     # check if common time slice [t1 --> t2] is equal:
                     t1 = trace.stats.starttime
-                    t2 = min(cur_trace.stats.endtime, trace.stats.endtime)
+                    t2 = min(endtime, trace.stats.endtime)
                     # if consistent: add them together
                     if np.array_equal(cur_trace.slice(t1, t2).data,
                                       trace.slice(t1, t2).data):
@@ -3039,16 +3105,20 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                     else:
                         self.traces.append(cur_trace)
                         cur_trace = trace
+                    adjacent = [cur_trace]
+                    npts = cur_trace.stats.npts
                 # traces are perfectly adjacent: add them together
-                elif trace.stats.starttime == cur_trace.stats.endtime + \
-                        cur_trace.stats.delta:
-                    cur_trace += trace
+                elif trace.stats.starttime == endtime + delta:
+                    adjacent.append(trace)
+                    npts += trace.stats.npts
                 # no common parts (gap):
                 # leave traces alone and add current to list
                 else:
-                    self.traces.append(cur_trace)
+                    self.traces.append(_merge_traces(adjacent))
                     cur_trace = trace
-            self.traces.append(cur_trace)
+                    adjacent = [cur_trace]
+                    npts = cur_trace.stats.npts
+            self.traces.append(_merge_traces(adjacent))
         self.traces = [tr for tr in self.traces if tr.stats.npts]
         return self
 
@@ -3370,6 +3440,118 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             groups[group_by.format(**tr.stats)].append(tr)
         return dict(groups)
 
+    def _get_batches(self):
+        """
+        Group traces for batched processing.
+
+        Traces with equal sampling rate, number of samples and dtype are
+        grouped, so that they can be processed as a single two-dimensional
+        array. Empty traces and traces with masked data are never grouped.
+
+        :rtype: tuple
+        :returns: List of batches (lists of at least two traces each) and
+            list of all remaining traces that have to be processed one by one.
+        """
+        if not self._batch_processing:
+            return [], self.traces
+        groups = collections.OrderedDict()
+        traces = []
+        for tr in self:
+            if not len(tr.data) or isinstance(tr.data, np.ma.MaskedArray):
+                traces.append(tr)
+                continue
+            key = (tr.stats.sampling_rate, len(tr.data), tr.data.dtype)
+            groups.setdefault(key, []).append(tr)
+        batches = []
+        for group in groups.values():
+            if len(group) > 1:
+                batches.append(group)
+            else:
+                traces.extend(group)
+        return batches, traces
+
+    @staticmethod
+    def _stack_batch(batch):
+        """
+        Stack the data of a batch of traces into one two-dimensional array.
+        """
+        return np.vstack([tr.data for tr in batch])
+
+    @staticmethod
+    def _unstack_batch(batch, data, info=None):
+        """
+        Set the rows of a processed batch array as data of the traces and
+        optionally add an entry to their processing information.
+        """
+        for tr, row in zip(batch, data):
+            tr.data = row
+            if info is not None:
+                tr._internal_add_processing_info(info)
+
+    @staticmethod
+    def _filter_batch(batch, data, type, **options):
+        """
+        Filter the stacked data of a batch of traces, see
+        :meth:`~obspy.core.trace.Trace.filter`.
+
+        Processing information is added to the traces right away, the
+        filtered data is returned.
+        """
+        info = _get_processing_info(Trace.filter, batch[0], type, **options)
+        func = _get_function_from_entry_point('filter', type.lower())
+        data = func(data, df=batch[0].stats.sampling_rate, **options)
+        for tr in batch:
+            tr._internal_add_processing_info(info)
+        return data
+
+    def _resample_batch(self, batch, sampling_rate, window='hanning',
+                        no_filter=True, strict_length=False,
+                        method='fourier'):
+        """
+        Resample a batch of traces, see
+        :meth:`~obspy.core.trace.Trace.resample`.
+        """
+        info = _get_processing_info(
+            Trace.resample, batch[0], sampling_rate, window=window,
+            no_filter=no_filter, strict_length=strict_length, method=method)
+        old_sampling_rate = batch[0].stats.sampling_rate
+        if method not in ('fourier', 'polyphase'):
+            msg = "method must be either 'fourier' or 'polyphase', not '%s'"
+            raise ValueError(msg % method)
+        if method == 'polyphase':
+            # fail early for ratios not supported
+            _get_polyphase_ratio(old_sampling_rate, sampling_rate)
+        factor = old_sampling_rate / float(sampling_rate)
+        # check if end time changes and this is not explicitly allowed
+        if strict_length:
+            if len(batch[0].data) % factor != 0.0:
+                msg = "End time of trace would change and strict_length=True."
+                raise ValueError(msg)
+        data = self._stack_batch(batch)
+        # do automatic lowpass filtering
+        if not no_filter:
+            # be sure filter still behaves good
+            if factor > 16:
+                msg = "Automatic filter design is unstable for resampling " + \
+                      "factors (current sampling rate/new sampling rate) " + \
+                      "above 16. Manual resampling is necessary."
+                raise ArithmeticError(msg)
+            freq = old_sampling_rate * 0.5 / float(factor)
+            data = self._filter_batch(batch, data, 'lowpass_cheby_2',
+                                      freq=freq, maxorder=12)
+        if method == 'polyphase':
+            data = _resample_polyphase(data, old_sampling_rate,
+                                       sampling_rate)
+        else:
+            # resample in the frequency domain. Make sure the byteorder is
+            # native.
+            data = _resample_fourier(data.newbyteorder("="),
+                                     old_sampling_rate, sampling_rate,
+                                     window=window)
+        for tr in batch:
+            tr.stats.sampling_rate = sampling_rate
+        self._unstack_batch(batch, data, info)
+
     def _trim_common_channels(self):
         """
         Trim all channels that have the same ID down to the component character
@@ -3530,6 +3712,190 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         return self
 
 
+def _merge_traces(traces, method=0, fill_value=None,
+                  interpolation_samples=0):
+    """
+    Merge a list of traces with the same id, sorted by start and end time.
+
+    The result is the same as successively adding up the traces with
+    :meth:`Trace.__add__ <obspy.core.trace.Trace.__add__>` (without sanity
+    checks). Whenever possible the traces are merged in a single pass by
+    :func:`_merge_traces_single_pass`, otherwise they are added up pairwise.
+
+    :rtype: :class:`~obspy.core.trace.Trace`
+    :returns: Merged trace (or the only trace in ``traces``).
+    """
+    if len(traces) == 1:
+        return traces[0]
+    out = _merge_traces_single_pass(
+        traces, method=method, fill_value=fill_value,
+        interpolation_samples=interpolation_samples)
+    if out is not None:
+        return out
+    out = traces[0]
+    for trace in traces[1:]:
+        # disable sanity checks because there are already done
+        out = out.__add__(
+            trace, method, fill_value=fill_value, sanity_checks=False,
+            interpolation_samples=interpolation_samples)
+    return out
+
+
+def _merge_traces_single_pass(traces, method=0, fill_value=None,
+                              interpolation_samples=0):
+    """
+    Merge a list of traces with the same id, sorted by start and end time, in
+    a single pass.
+
+    Adding up many traces pairwise copies the ever growing merged data array
+    on every addition. Instead, the sample offsets of all traces and the final
+    extent are determined first, then a single output array is allocated and
+    every trace is copied into place once, replicating the handling of gaps
+    and overlaps of :meth:`Trace.__add__ <obspy.core.trace.Trace.__add__>`.
+    A mask is only allocated once a masked gap is written.
+
+    :rtype: :class:`~obspy.core.trace.Trace` or ``None``
+    :returns: Merged trace or ``None`` if the traces can not be merged in a
+        single pass and have to be added up pairwise (masked input data,
+        unsupported methods, sub-sample misalignments that make the overlap
+        handling ambiguous or fill values taken from masked samples).
+    """
+    if method not in (0, 1) or interpolation_samples < -1:
+        return None
+    for trace in traces:
+        if isinstance(trace.data, np.ma.MaskedArray):
+            return None
+    stats = traces[0].stats
+    starttime = stats.starttime
+    sampling_rate = stats.sampling_rate
+    delta = stats.delta
+    dtype = traces[0].data.dtype
+    # first pass: sample offset of each trace relative to the first one,
+    # overlap type and total number of samples, computed exactly like in
+    # Trace.__add__ from the end time of the trace merged so far
+    npts = len(traces[0].data)
+    offsets = []
+    for trace in traces[1:]:
+        endtime = starttime + float(npts - 1) * delta
+        shift = (trace.stats.starttime - endtime) * sampling_rate
+        offset = npts + int(compatibility.round_away(shift)) - 1
+        end = offset + len(trace.data)
+        if offset >= npts:
+            contained = False
+        else:
+            contained = endtime - trace.stats.endtime >= 0
+            # overlap type as determined from the end times has to agree with
+            # the rounded sample offsets
+            if contained != (end <= npts):
+                return None
+        offsets.append((offset, contained))
+        npts = max(npts, end)
+    # second pass: copy data into place
+    data = np.empty(npts, dtype=dtype)
+    mask = None
+    npts = len(traces[0].data)
+    data[:npts] = traces[0].data
+    for trace, (offset, contained) in zip(traces[1:], offsets):
+        rt = trace.data
+        end = offset + len(rt)
+        # check whether to use the latest value to fill a gap
+        fill = fill_value
+        if fill_value in ("latest", "interpolate"):
+            if mask is not None and mask[npts - 1]:
+                return None
+            if fill_value == "latest":
+                fill = data[npts - 1]
+            else:
+                fill = (data[npts - 1], rt[0])
+        if offset >= npts:
+            # exact fit or gap
+            if offset > npts:
+                mask = _put_data_chunk(
+                    data, mask, npts,
+                    create_empty_data_chunk(offset - npts, dtype, fill))
+            data[offset:end] = rt
+            npts = end
+            continue
+        if contained:
+            length = len(rt)
+        else:
+            length = npts - offset
+        common = data[offset:offset + length]
+        if mask is not None and mask[offset:offset + length].any():
+            common = np.ma.masked_array(
+                common, mask=mask[offset:offset + length])
+        if contained:
+            # contained trace, masked samples are treated as equal
+            equal = np.all(np.ma.masked_array(common == rt).filled())
+            if equal:
+                if isinstance(common, np.ma.MaskedArray):
+                    # fill in missing samples from the contained trace
+                    missing = common.mask
+                    data[offset:end][missing] = rt[missing]
+                    mask[offset:end] = False
+            elif method == 0:
+                mask = _put_data_chunk(
+                    data, mask, offset,
+                    create_empty_data_chunk(length, dtype, fill))
+            continue
+        # overlap
+        if np.all(np.equal(common, rt[:length])):
+            data[offset:end] = rt
+            if mask is not None:
+                mask[offset:npts] = False
+        elif method == 0:
+            mask = _put_data_chunk(
+                data, mask, offset,
+                create_empty_data_chunk(length, dtype, fill))
+            data[npts:end] = rt[length:]
+        else:
+            if offset > 0:
+                left = offset - 1
+            else:
+                left = 0
+            if mask is not None and mask[left]:
+                return None
+            samples = interpolation_samples
+            if samples == -1 or samples > length:
+                samples = length
+            # include left and right sample (samples + 2), cut them and
+            # ensure correct data type
+            interpolation = np.linspace(data[left], rt[samples], samples + 2)
+            data[offset:offset + samples] = np.require(
+                interpolation[1:-1], dtype)
+            data[offset + samples:end] = rt[samples:]
+            if mask is not None:
+                mask[offset:npts] = False
+        npts = end
+    out = traces[0].__class__(header=copy.deepcopy(stats))
+    if mask is not None and mask.any():
+        out.data = np.ma.masked_array(data, mask=mask)
+    else:
+        out.data = data
+    return out
+
+
+def _put_data_chunk(data, mask, start, chunk):
+    """
+    Helper function for :func:`_merge_traces_single_pass`.
+
+    Write a data chunk as returned by
+    :func:`~obspy.core.util.base.create_empty_data_chunk` into the merged
+    data and return the (possibly newly allocated) mask.
+    """
+    end = start + len(chunk)
+    if isinstance(chunk, np.ma.MaskedArray):
+        data[start:end] = chunk.data
+        if mask is None:
+            mask = np.zeros(len(data), dtype=bool)
+        mask[start:end] = True
+    else:
+        data[start:end] = chunk
+        if mask is not None:
+            mask[start:end] = False
+    return mask
+
+
 def _is_pickle(filename):  # @UnusedVariable
     """
     Check whether a file is a pickled ObsPy Stream file.
@@ -176,6 +176,82 @@ class InventoryTestCase(unittest.TestCase):
         # 3 - unknown SEED ID should raise exception
         self.assertRaises(Exception, inv.get_orientation, 'BW.RJOB..XXX')
 
+    def test_channel_index(self):
+        """
+        Lookups by SEED ID find the right channel epoch and notice changes
+        of the inventory.
+        """
+        def channel(start, end, azimuth, location_code=''):
+            return Channel(code='BHZ', location_code=location_code,
+                           latitude=1.0, longitude=2.0, elevation=3.0,
+                           depth=0.0, azimuth=azimuth, dip=-90.0,
+                           start_date=start and UTCDateTime(start),
+                           end_date=end and UTCDateTime(end),
+                           response=Response(str(azimuth)))
+
+        channels = [channel('2010-01-01', '2011-01-01', 1.0),
+                    channel('2000-01-01', '2005-01-01', 2.0),
+                    channel('2005-01-01', '2010-01-01', 3.0),
+                    channel('2011-01-01', None, 4.0),
+                    channel(None, None, 5.0, location_code='00')]
+        station = Station(code='STA', latitude=1.0, longitude=2.0,
+                          elevation=3.0, channels=channels)
+        inv = Inventory(networks=[Network('XX', stations=[station])],
+                        source='TEST')
+        for t, azimuth in (('2000-01-01', 2.0), ('2003-05-01', 2.0),
+                           ('2007-01-01', 3.0), ('2010-06-01', 1.0),
+                           ('2030-01-01', 4.0)):
+            t = UTCDateTime(t)
+            self.assertEqual(inv.get_orientation('XX.STA..BHZ', t),
+                             {'azimuth': azimuth, 'dip': -90.0})
+            self.assertEqual(
+                inv.get_response('XX.STA..BHZ', t).resource_id,
+                str(azimuth))
+        self.assertEqual(
+            inv.get_orientation('XX.STA.00.BHZ', UTCDateTime(0))['azimuth'],
+            5.0)
+        self.assertRaises(Exception, inv.get_response, 'XX.STA..BHZ',
+                          UTCDateTime('1999-01-01'))
+        self.assertRaises(Exception, inv.get_response, 'XX.STA..BHN',
+                          UTCDateTime('2010-06-01'))
+        self.assertRaises(ValueError, inv.get_response, 'XX.STA.BHZ',
+                          UTCDateTime('2010-06-01'))
+        # epochs touching at their boundaries both match
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            response = inv.get_response('XX.STA..BHZ',
+                                        UTCDateTime('2010-01-01'))
+        self.assertEqual(response.resource_id, '1.0')
+        self.assertEqual(len(w), 1)
+        self.assertIn('more than one matching', str(w[0].message))
+        t = UTCDateTime('2012-01-01')
+        # channels changed in place
+        channels[3].end_date = UTCDateTime('2011-06-01')
+        self.assertRaises(Exception, inv.get_response, 'XX.STA..BHZ', t)
+        channels.append(channel('2011-06-01', None, 6.0))
+        self.assertEqual(inv.get_response('XX.STA..BHZ', t).resource_id,
+                         '6.0')
+        channels.pop(0)
+        self.assertEqual(inv.get_response('XX.STA..BHZ', t).resource_id,
+                         '6.0')
+        channels[1].code = 'BHN'
+        self.assertEqual(
+            inv.get_orientation('XX.STA..BHN', UTCDateTime('2007-01-01')),
+            {'azimuth': 3.0, 'dip': -90.0})
+        # new and replaced networks
+        other = Station(code='STA', latitude=1.0, longitude=2.0,
+                        elevation=3.0, channels=[channel(None, None, 7.0)])
+        inv += Network('YY', stations=[other])
+        self.assertEqual(inv.get_response('YY.STA..BHZ', t).resource_id,
+                         '7.0')
+        inv.networks = inv.networks[1:]
+        self.assertRaises(Exception, inv.get_response, 'XX.STA..BHZ', t)
+        # copies do not share the index
+        inv2 = inv.copy()
+        inv2[0][0][0].azimuth = 8.0
+        self.assertEqual(inv.get_orientation('YY.STA..BHZ')['azimuth'], 7.0)
+        self.assertEqual(inv2.get_orientation('YY.STA..BHZ')['azimuth'], 8.0)
+
     def test_response_plot(self):
         """
         Tests the response plot.
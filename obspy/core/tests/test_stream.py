@@ -14,9 +14,11 @@ import numpy as np
 
 from obspy import Stream, Trace, UTCDateTime, read, read_inventory
 from obspy.core.inventory import Channel, Inventory, Network, Station
-from obspy.core.stream import _is_pickle, _read_pickle, _write_pickle
+from obspy.core.stream import (_is_pickle, _merge_traces_single_pass,
+                               _read_pickle, _write_pickle)
 from obspy.core.util.attribdict import AttribDict
 from obspy.core.util.base import NamedTemporaryFile, _get_entry_points
+from obspy.core.util.misc import TemporaryWorkingDirectory
 from obspy.core.util.obspy_types import ObsPyException
 from obspy.core.util.testing import streams_almost_equal
 from obspy.io.xseed import Parser
@@ -1958,6 +1960,25 @@ class StreamTestCase(unittest.TestCase):
         st = read(data_path)
         self.assertIsInstance(st, Stream)
 
+    def test_read_with_workers(self):
+        """
+        Reading multiple files concurrently has to result in the same stream
+        as reading them one after another.
+        """
+        with TemporaryWorkingDirectory():
+            for i, tr in enumerate(read() * 3):
+                tr.stats.station = 'ST%02i' % i
+                tr.write('%02i.mseed' % i, format='MSEED')
+            st = read('*.mseed')
+            self.assertEqual(len(st), 9)
+            for executor in ('thread', 'process'):
+                st2 = read('*.mseed', workers=3, executor=executor)
+                self.assertEqual(st2, st)
+                self.assertEqual([tr.id for tr in st2],
+                                 [tr.id for tr in st])
+            with self.assertRaises(ValueError):
+                read('*.mseed', workers=2, executor='fiber')
+
     def test_copy(self):
         """
         Testing the copy method of the Stream object.
@@ -1986,6 +2007,59 @@ class StreamTestCase(unittest.TestCase):
         st.merge(fill_value='interpolate')
         self.assertEqual(len(st), 1)
 
+    def test_merge_many_fragments(self):
+        """
+        Merging many fragments in a single pass must give the same result as
+        adding them up pairwise.
+        """
+        np.random.seed(42)
+        data = np.random.randint(-100, 100, 2000).astype(np.int32)
+        starttime = UTCDateTime(2020, 1, 1)
+        traces = []
+        for _i in range(300):
+            start = np.random.randint(0, 1900)
+            npts = np.random.randint(1, 100)
+            chunk = data[start:start + npts].copy()
+            # some fragments with deviating data in overlaps
+            if _i % 7 == 0:
+                chunk += 1
+            traces.append(Trace(data=chunk, header={
+                'starttime': starttime + start * 0.01,
+                'sampling_rate': 100.0}))
+        traces.sort(key=lambda tr: (tr.stats.starttime, tr.stats.endtime))
+        for method, fill_value, interpolation_samples in (
+                (0, None, 0), (0, 0, 0), (0, 'latest', 0),
+                (0, 'interpolate', 0), (1, None, 0), (1, None, 2),
+                (1, 'latest', -1)):
+            expected = traces[0]
+            for tr in traces[1:]:
+                expected = expected.__add__(
+                    tr, method=method, fill_value=fill_value,
+                    interpolation_samples=interpolation_samples)
+            got = _merge_traces_single_pass(
+                traces, method=method, fill_value=fill_value,
+                interpolation_samples=interpolation_samples)
+            self.assertEqual(got.stats, expected.stats)
+            self.assertEqual(type(got.data), type(expected.data))
+            self.assertEqual(got.data.dtype, expected.data.dtype)
+            if isinstance(expected.data, np.ma.MaskedArray):
+                np.testing.assert_array_equal(got.data.mask,
+                                              expected.data.mask)
+            np.testing.assert_array_equal(got.data, expected.data)
+        # directly adjacent fragments and gaps
+        st = Stream([Trace(data=data[i:i + 10], header={
+            'starttime': starttime + i * 0.01, 'sampling_rate': 100.0})
+            for i in range(0, 2000, 10) if i not in (500, 510, 1230)])
+        st.merge(method=-1)
+        self.assertEqual(len(st), 3)
+        st.merge(fill_value=0)
+        self.assertEqual(len(st), 1)
+        self.assertEqual(st[0].stats.starttime, starttime)
+        expected = data.copy()
+        expected[500:520] = 0
+        expected[1230:1240] = 0
+        np.testing.assert_array_equal(st[0].data, expected)
+
     def test_rotate(self):
         """
         Testing the rotate method.
@@ -2814,6 +2888,78 @@ class StreamTestCase(unittest.TestCase):
         self.assertEqual(np.sum(np.abs(st4[0].data[same_sign]) <=
                                 np.abs(st2[0].data[same_sign])), npts)
 
+    def test_batch_processing(self):
+        """
+        Processing traces with equal sampling rate and npts as one 2-D array
+        must give the same results as processing them one by one.
+        """
+        st = read()
+        st += read()[:2]
+        for tr in st[3:]:
+            tr.data = tr.data.astype(np.int32)
+        # traces that can not be batched
+        st.append(Trace(data=np.arange(100, dtype=np.float64),
+                        header={'sampling_rate': 100.0}))
+
+        def _process(st, batch_processing):
+            with mock.patch.object(Stream, '_batch_processing',
+                                   batch_processing):
+                st.detrend('linear')
+                st.detrend('simple')
+                st.taper(max_percentage=0.05, type='cosine')
+                st.filter('bandpass', freqmin=1.0, freqmax=10.0,
+                          zerophase=True)
+                st.resample(40.0, window='hann', no_filter=False)
+            return st
+
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter("ignore")
+            st_batch = _process(st.copy(), True)
+            st_single = _process(st.copy(), False)
+        self.assertEqual(len(st_batch), len(st_single))
+        for tr_batch, tr_single in zip(st_batch, st_single):
+            self.assertEqual(tr_batch.stats, tr_single.stats)
+            self.assertEqual(tr_batch.data.dtype, tr_single.data.dtype)
+            np.testing.assert_allclose(tr_batch.data, tr_single.data,
+                                       rtol=1e-9, atol=1e-9)
+        self.assertEqual(len(st_batch[0].stats.processing), 6)
+        # data of batched traces are views into one processed array
+        self.assertIs(st_batch[0].data.base, st_batch[1].data.base)
+        self.assertIsNot(st_batch[0].data.base, st_batch[5].data.base)
+        self.assertTrue(st_batch[0].data.flags.c_contiguous)
+
+    def test_batch_processing_polyphase_resample(self):
+        """
+        Polyphase resampling of batched traces gives the same results and
+        processing history as resampling them one by one, also for traces
+        already at the target sampling rate.
+        """
+        st = read()
+        st += read()[:2]
+        for tr in st[3:]:
+            tr.stats.sampling_rate = 40.0
+
+        def _process(st, batch_processing):
+            with mock.patch.object(Stream, '_batch_processing',
+                                   batch_processing):
+                st.resample(40.0, method='polyphase')
+            return st
+
+        st_batch = _process(st.copy(), True)
+        st_single = _process(st.copy(), False)
+        for tr_batch, tr_single in zip(st_batch, st_single):
+            self.assertEqual(tr_batch.stats, tr_single.stats)
+            np.testing.assert_allclose(tr_batch.data, tr_single.data,
+                                       rtol=1e-9, atol=1e-9)
+            self.assertEqual(tr_batch.stats.sampling_rate, 40.0)
+            self.assertEqual(len(tr_batch.stats.processing), 1)
+            self.assertIn("method='polyphase'",
+                          tr_batch.stats.processing[0])
+        self.assertEqual(st_batch[0].stats.npts, 1200)
+        # traces at the target sampling rate are unchanged
+        for tr_batch, tr in zip(st_batch[3:], st[3:]):
+            np.testing.assert_array_equal(tr_batch.data, tr.data)
+
 
 def suite():
     suite = unittest.TestSuite()
@@ -12,6 +12,8 @@ import numpy.ma as ma
 
 from obspy import Stream, Trace, UTCDateTime, __version__, read, read_inventory
 from obspy.core import Stats
+from obspy.core.trace import LazyData
+from obspy.core.util import NamedTemporaryFile
 from obspy.core.util.testing import ImageComparison
 from obspy.io.xseed import Parser
 
@@ -2169,6 +2171,63 @@ class TraceTestCase(unittest.TestCase):
         self.assertRaises(ValueError, tr.resample,
                           sampling_rate=0.5, window=window, no_filter=True)
 
+    def test_resample_polyphase(self):
+        """
+        Tests polyphase resampling against scipy.signal.resample_poly.
+        """
+        from scipy.signal import resample_poly
+        from obspy.core.trace import (_get_polyphase_filter,
+                                      _resample_polyphase)
+        np.random.seed(815)
+        data = np.random.randn(10007)
+        for old_sr, new_sr, up, down in ((100.0, 40.0, 2, 5),
+                                         (200.0, 50.0, 1, 4),
+                                         (1.0, 0.75, 3, 4),
+                                         (20.0, 50.0, 5, 2)):
+            tr = Trace(data.copy(), {'sampling_rate': old_sr,
+                                     'starttime': UTCDateTime(0)})
+            tr.resample(new_sr, method='polyphase')
+            npts = len(data) * up // down
+            expected = resample_poly(data, up, down)[:npts]
+            self.assertEqual(tr.stats.sampling_rate, new_sr)
+            self.assertEqual(tr.stats.npts, npts)
+            self.assertEqual(tr.stats.starttime, UTCDateTime(0))
+            np.testing.assert_allclose(tr.data, expected, rtol=1e-10,
+                                       atol=1e-12)
+            # results do not depend on the chunk size
+            for chunk_size in (1, 7, 1000):
+                np.testing.assert_allclose(
+                    _resample_polyphase(data, old_sr, new_sr,
+                                        chunk_size=chunk_size),
+                    expected, rtol=1e-10, atol=1e-12)
+            # filters are designed once per ratio
+            self.assertIs(_get_polyphase_filter(up, down),
+                          _get_polyphase_filter(up, down))
+        # integer data and two-dimensional arrays
+        tr = Trace(np.arange(1000, dtype=np.int32),
+                   {'sampling_rate': 100.0})
+        tr.resample(40.0, method='polyphase')
+        np.testing.assert_allclose(
+            tr.data, resample_poly(np.arange(1000.0), 2, 5), atol=1e-9)
+        np.testing.assert_allclose(
+            _resample_polyphase(np.vstack([data, -data]), 100.0, 40.0,
+                                chunk_size=333),
+            np.vstack([resample_poly(data, 2, 5)[:4002],
+                       -resample_poly(data, 2, 5)[:4002]]),
+            rtol=1e-10, atol=1e-12)
+        # ratios that are no simple fractions and unknown methods
+        tr = Trace(data.copy(), {'sampling_rate': 100.0})
+        self.assertRaises(ValueError, tr.resample, 100.0 / math.pi,
+                          method='polyphase')
+        self.assertRaises(ValueError, tr.resample, 40.0, method='spline')
+        np.testing.assert_array_equal(tr.data, data)
+        # same sampling rate leaves the data unchanged
+        tr.resample(100.0, method='polyphase')
+        self.assertEqual(tr.stats.sampling_rate, 100.0)
+        self.assertEqual(tr.data.dtype, np.float64)
+        np.testing.assert_array_equal(tr.data, data)
+        self.assertIsNot(_resample_polyphase(data, 100.0, 100.0), data)
+
     def test_slide(self):
         """
         Tests for sliding a window across a trace object.
@@ -2771,6 +2830,43 @@ class TraceTestCase(unittest.TestCase):
         self.assertEqual(sr1, 1e5)
         self.assertEqual(sr2, sr1)
 
+    def test_lazy_data(self):
+        """
+        Lazy data handles are only narrowed down by trimming and decoded on
+        first access of Trace.data.
+        """
+        full = np.arange(100, dtype=np.int32)
+        calls = []
+
+        class _LazyData(LazyData):
+            def _read(self, start, npts):
+                calls.append((start, npts))
+                return full[start:start + npts].copy()
+
+        with NamedTemporaryFile() as tf:
+            tr = Trace(data=_LazyData(tf.name, 100, np.int32))
+            self.assertEqual(tr.stats.npts, 100)
+            self.assertEqual(len(tr), 100)
+            str(tr)
+            t = tr.stats.starttime
+            tr2 = tr.slice(t + 10, t + 29)
+            tr.trim(t + 5)
+            self.assertEqual(calls, [])
+            self.assertEqual(tr2.stats.npts, 20)
+            self.assertEqual(tr.stats.npts, 95)
+            np.testing.assert_array_equal(tr2.data, full[10:30])
+            self.assertEqual(calls, [(10, 20)])
+            # decoded only once
+            tr2.data
+            self.assertEqual(calls, [(10, 20)])
+            np.testing.assert_array_equal(tr.data, full[5:])
+            self.assertEqual(calls, [(10, 20), (5, 95)])
+            # padding decodes the data first
+            tr = Trace(data=_LazyData(tf.name, 100, np.int32))
+            tr.trim(t - 1, t + 200, pad=True)
+            self.assertIsInstance(tr.data, np.ma.MaskedArray)
+            self.assertEqual(calls[-1], (0, 100))
+
 
 def suite():
     suite = unittest.TestSuite()
@@ -10,6 +10,7 @@ from operator import ge, eq, lt, le, gt, ne
 import numpy as np
 
 from obspy import UTCDateTime
+from obspy.core.utcdatetime import UTCDateTimeArray
 from obspy.core.util.deprecation_helpers import ObsPyDeprecationWarning
 
 
@@ -1564,8 +1565,144 @@ class UTCDateTimeTestCase(unittest.TestCase):
                          UTCDateTime(2019, 1, 1, 2, 2, 33))
 
 
+class UTCDateTimeArrayTestCase(unittest.TestCase):
+    """
+    Test suite for obspy.core.utcdatetime.UTCDateTimeArray.
+    """
+    def setUp(self):
+        np.random.seed(815)
+        # covers negative times and both sides of the rounding boundaries
+        self.ns = np.concatenate([
+            [0, -1, 999999999, 1500000, -500, 2500, 1999999500],
+            np.random.randint(-3 * 10 ** 18, 4 * 10 ** 18, 500,
+                              dtype=np.int64)])
+
+    def test_conversion_roundtrip(self):
+        """
+        Conversion to and from UTCDateTime and numpy.datetime64 has to be
+        lossless.
+        """
+        times = UTCDateTimeArray(ns=self.ns)
+        utcs = [UTCDateTime(ns=int(ns)) for ns in self.ns]
+        self.assertEqual(times.tolist(), utcs)
+        self.assertEqual([t.ns for t in times], self.ns.tolist())
+        np.testing.assert_array_equal(UTCDateTimeArray(utcs).ns, self.ns)
+        np.testing.assert_array_equal(
+            np.asarray(times), self.ns.astype('datetime64[ns]'))
+        np.testing.assert_array_equal(
+            UTCDateTimeArray(times.datetime64).ns, self.ns)
+        np.testing.assert_array_equal(
+            UTCDateTimeArray(self.ns / 1e9).ns,
+            [UTCDateTime(ns / 1e9).ns for ns in self.ns])
+        # indexing
+        self.assertEqual(times[3], utcs[3])
+        self.assertIsInstance(times[3:5], UTCDateTimeArray)
+        self.assertEqual(times[times.ns < 0].tolist(),
+                         [t for t in utcs if t.ns < 0])
+        # a copy of the input is stored
+        copied = UTCDateTimeArray(times)
+        copied[0] = UTCDateTime(1)
+        self.assertEqual(times[0], UTCDateTime(0))
+        self.assertEqual(copied[0], UTCDateTime(1))
+
+    def test_calendar_and_formatting(self):
+        """
+        Calendar attributes and string representations have to match those
+        of UTCDateTime for all precisions.
+        """
+        fmt = '%Y-%m-%d %j %H:%M:%S.%f %%'
+        for precision in range(10):
+            times = UTCDateTimeArray(ns=self.ns, precision=precision)
+            utcs = [UTCDateTime(ns=int(ns), precision=precision)
+                    for ns in self.ns]
+            for attr in ('year', 'month', 'day', 'julday', 'weekday', 'hour',
+                         'minute', 'second', 'microsecond'):
+                self.assertEqual(getattr(times, attr).tolist(),
+                                 [getattr(t, attr) for t in utcs])
+            self.assertEqual(times.isoformat().tolist(),
+                             [str(t) for t in utcs])
+            self.assertEqual(times.strftime(fmt).tolist(),
+                             [t.strftime(fmt) for t in utcs])
+            # non vectorized directive
+            self.assertEqual(times[:3].strftime('%b %Y').tolist(),
+                             [t.strftime('%b %Y') for t in utcs[:3]])
+            # parsing the formatted strings reproduces the rounded times
+            parsed = UTCDateTimeArray(times.isoformat(), precision=precision)
+            self.assertTrue(np.all(parsed == times))
+
+    def test_parsing(self):
+        """
+        Strings are parsed like UTCDateTime does, no matter if the fast
+        NumPy parser can handle them or not.
+        """
+        strings = [
+            ['2009-08-24T00:20:03.5Z', '2009-08-24 00:20', '2009-08-24'],
+            ['2019-01-01T02-02:33', '2019-01-01 02-02:33',
+             '2009-236T00:00'],
+            [b'20090824T002003', '1970,01,01,12:23:34', '2009-08-24T00']]
+        for values in strings:
+            self.assertEqual(UTCDateTimeArray(values).tolist(),
+                             [UTCDateTime(v) for v in values])
+        times = UTCDateTimeArray(np.array(strings[0] * 2).reshape(2, 3))
+        self.assertEqual(times.shape, (2, 3))
+        self.assertEqual(times[1, 0], UTCDateTime(2009, 8, 24, 0, 20, 3.5))
+        # NumPy would parse a bare year
+        self.assertRaises(ValueError, UTCDateTimeArray, ['2009'])
+        self.assertRaises(TypeError, UTCDateTimeArray, ['2009-08-24', ''])
+
+    def test_arithmetic_and_comparison(self):
+        """
+        Arithmetic and rich comparison operators act element-wise just like
+        their UTCDateTime counterparts.
+        """
+        times = UTCDateTimeArray(ns=self.ns)
+        others = UTCDateTimeArray(ns=self.ns[::-1])
+        utcs = times.tolist()
+        for delta in (1, 1.25, -0.0000005, 86400 * 365.25):
+            self.assertEqual((times + delta).tolist(),
+                             [t + delta for t in utcs])
+            self.assertEqual((delta + times).tolist(),
+                             [t + delta for t in utcs])
+            self.assertEqual((times - delta).tolist(),
+                             [t - delta for t in utcs])
+        deltas = np.arange(len(times)) * 0.5
+        self.assertEqual((times + deltas).tolist(),
+                         [t + d for t, d in zip(utcs, deltas)])
+        self.assertEqual((times + np.timedelta64(1500, 'ms')).tolist(),
+                         [t + 1.5 for t in utcs])
+        self.assertEqual((times + datetime.timedelta(days=1)).tolist(),
+                         [t + 86400 for t in utcs])
+        np.testing.assert_allclose(
+            times - others, [a - b for a, b in zip(utcs, others)],
+            rtol=1e-14, atol=1e-6)
+        np.testing.assert_allclose(
+            times - utcs[5], [t - utcs[5] for t in utcs],
+            rtol=1e-14, atol=1e-6)
+        np.testing.assert_allclose(
+            utcs[5] - times, [utcs[5] - t for t in utcs],
+            rtol=1e-14, atol=1e-6)
+        self.assertRaises(TypeError, lambda: times + utcs[0])
+        self.assertRaises(TypeError, lambda: times + others)
+        for op in (ge, eq, lt, le, gt, ne):
+            self.assertEqual(op(times, others).tolist(),
+                             [op(a, b) for a, b in zip(utcs, others)])
+            self.assertEqual(op(times, utcs[5]).tolist(),
+                             [op(t, utcs[5]) for t in utcs])
+            self.assertEqual(op(utcs[5], times).tolist(),
+                             [op(utcs[5], t) for t in utcs])
+        # comparison uses the precision like UTCDateTime
+        times = UTCDateTimeArray(ns=[0, 400, 600], precision=6)
+        self.assertEqual((times == UTCDateTime(0)).tolist(),
+                         [True, True, False])
+        self.assertEqual(times.min(), UTCDateTime(0))
+        self.assertEqual(times.max().ns, 600)
+
+
 def suite():
-    return unittest.makeSuite(UTCDateTimeTestCase, 'test')
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(UTCDateTimeTestCase, 'test'))
+    suite.addTest(unittest.makeSuite(UTCDateTimeArrayTestCase, 'test'))
+    return suite
 
 
 if __name__ == '__main__':
@@ -6,10 +6,12 @@ import unittest
 import warnings
 from unittest import mock
 
+import numpy as np
+
 from obspy import UTCDateTime, read
 from obspy.core.event import ResourceIdentifier as ResId
 from obspy.core.util.misc import CatchOutput, get_window_times, \
-    _ENTRY_POINT_CACHE, _yield_obj_parent_attr
+    get_gaps_from_times, _ENTRY_POINT_CACHE, _yield_obj_parent_attr
 from obspy.core.util.testing import WarningsCapture
 
 
@@ -298,6 +300,62 @@ class UtilMiscTestCase(unittest.TestCase):
         self.assertEqual(len(w), 1)
         self.assertIn('something bad', str(w.captured_warnings[0].message))
 
+    def test_get_gaps_from_times(self):
+        """
+        Tests for the vectorized gap/overlap detection.
+        """
+        second = 10 ** 9
+        # segments of 10 samples at 1 Hz, given unsorted and with two ids
+        starttimes = np.array([30, 0, 10, 0, 22, 31, 15]) * second
+        endtimes = starttimes + 9 * second
+        sampling_rates = np.ones(7)
+        ids = np.array(['A', 'A', 'A', 'B', 'B', 'B', 'A'])
+        gaps = get_gaps_from_times(starttimes, endtimes, sampling_rates,
+                                   ids=ids)
+        self.assertEqual(gaps['index'].tolist(), [2, 6, 3, 4])
+        self.assertEqual(gaps['next_index'].tolist(), [6, 0, 4, 5])
+        self.assertEqual(gaps['starttime'].tolist(),
+                         [19 * second, 24 * second, 9 * second,
+                          31 * second])
+        self.assertEqual(gaps['endtime'].tolist(),
+                         [15 * second, 30 * second, 22 * second,
+                          31 * second])
+        self.assertEqual(gaps['duration'].tolist(), [-5.0, 5.0, 12.0, -1.0])
+        self.assertEqual(gaps['nsamples'].tolist(), [-5, 5, 12, -1])
+        # min_gap and max_gap
+        gaps = get_gaps_from_times(starttimes, endtimes, sampling_rates,
+                                   ids=ids, max_gap=10)
+        self.assertEqual(gaps['duration'].tolist(), [-5.0, 5.0, -1.0])
+        gaps = get_gaps_from_times(starttimes, endtimes, sampling_rates,
+                                   ids=ids, min_gap=1)
+        self.assertEqual(gaps['duration'].tolist(), [5.0, 12.0])
+        # gap between contained segments is covered by the first segment,
+        # overlap is limited to the contained segment
+        starttimes = np.array([0, 2, 6]) * second
+        endtimes = np.array([20, 3, 7]) * second
+        gaps = get_gaps_from_times(starttimes, endtimes, np.ones(3))
+        self.assertEqual(gaps['duration'].tolist(), [-1.0])
+        # compare to Stream.get_gaps()
+        st = read()
+        tr = st[0].copy()
+        st[0].trim(endtime=tr.stats.starttime + 10)
+        tr.trim(starttime=tr.stats.starttime + 11)
+        st.append(tr)
+        gaps = get_gaps_from_times(
+            [tr.stats.starttime.ns for tr in st],
+            [tr.stats.endtime.ns for tr in st],
+            [tr.stats.sampling_rate for tr in st], ids=[tr.id for tr in st])
+        expected = st.get_gaps()
+        self.assertEqual(len(gaps), len(expected))
+        self.assertEqual(gaps['duration'].tolist(),
+                         [gap[6] for gap in expected])
+        self.assertEqual(gaps['nsamples'].tolist(),
+                         [gap[7] for gap in expected])
+        self.assertEqual(gaps['starttime'].tolist(),
+                         [gap[4].ns for gap in expected])
+        # empty input
+        self.assertEqual(len(get_gaps_from_times([], [], [])), 0)
+
 
 def suite():
     return unittest.makeSuite(UtilMiscTestCase, 'test')
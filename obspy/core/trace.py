@@ -8,10 +8,13 @@ Module for handling ObsPy Trace objects.
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
+import functools
 import inspect
 import math
+import os
 import warnings
 from copy import copy, deepcopy
+from fractions import Fraction
 
 import numpy as np
 from decorator import decorator
@@ -254,11 +257,10 @@ class Stats(AttribDict):
         self.__setitem__('sampling_rate', state['sampling_rate'])
 
 
-@decorator
-def _add_processing_info(func, *args, **kwargs):
+def _get_processing_info(func, *args, **kwargs):
     """
-    This is a decorator that attaches information about a processing call as a
-    string to the Trace.stats.processing list.
+    Build the string describing a processing call as it is attached to the
+    Trace.stats.processing list.
     """
     callargs = inspect.getcallargs(func, *args, **kwargs)
     callargs.pop("self")
@@ -275,7 +277,16 @@ def _add_processing_info(func, *args, **kwargs):
         ["%s=%s" % (k, repr(v)) if not isinstance(v, str) else
          "%s='%s'" % (k, v) for k, v in kwargs_.items()]
     arguments.sort()
-    info = info % "::".join(arguments)
+    return info % "::".join(arguments)
+
+
+@decorator
+def _add_processing_info(func, *args, **kwargs):
+    """
+    This is a decorator that attaches information about a processing call as a
+    string to the Trace.stats.processing list.
+    """
+    info = _get_processing_info(func, *args, **kwargs)
     self = args[0]
     result = func(*args, **kwargs)
     # Attach after executing the function to avoid having it attached
@@ -284,6 +295,71 @@ def _add_processing_info(func, *args, **kwargs):
     return result
 
 
+class LazyData(object):
+    """
+    Deferred handle to the data samples of a trace stored in a file.
+
+    Waveform plugins supporting the ``lazy`` option of
+    :func:`~obspy.core.stream.read` assign an instance of a subclass to
+    :attr:`Trace.data`. Only the header information is read in this case and
+    the samples are decoded from the file on first access of
+    :attr:`Trace.data`. Trimming and slicing a trace holding a handle only
+    narrows the range of samples to be decoded later on.
+
+    Subclasses have to implement :meth:`_read` which decodes ``npts``
+    samples starting at sample index ``start`` of the trace as originally
+    stored in the file.
+
+    :type filename: str
+    :param filename: Name of the file holding the data.
+    :type npts: int
+    :param npts: Number of samples stored in the file.
+    :type dtype: :class:`numpy.dtype`
+    :param dtype: Data type of the decoded samples.
+    """
+    def __init__(self, filename, npts, dtype):
+        self.filename = filename
+        self.npts = int(npts)
+        self.dtype = np.dtype(dtype)
+        self.start = 0
+        self.mtime = os.path.getmtime(filename)
+
+    def __len__(self):
+        return self.npts
+
+    def __getitem__(self, index):
+        """
+        Narrow the handle to a contiguous range of samples without decoding.
+        """
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            msg = "Only contiguous slices of lazy data are supported."
+            raise TypeError(msg)
+        start, stop, _ = index.indices(self.npts)
+        new = copy(self)
+        new.start = self.start + start
+        new.npts = max(stop - start, 0)
+        return new
+
+    def load(self):
+        """
+        Decode and return the samples.
+
+        :rtype: :class:`numpy.ndarray`
+        """
+        if not self.npts:
+            return np.empty(0, dtype=self.dtype)
+        mtime = os.path.getmtime(self.filename)
+        if mtime != self.mtime:
+            msg = "File '%s' changed since reading headers" % self.filename
+            msg += "; data may be read incorrectly "
+            msg += "(modification time = %s)." % mtime
+            warnings.warn(msg)
+        return self._read(self.start, self.npts)
+
+    def _read(self, start, npts):
+        raise NotImplementedError
+
+
 class Trace(object):
     """
     An object containing data of a continuous series, such as a seismic trace.
@@ -299,6 +375,13 @@ class Trace(object):
     :var data: Data samples in a :class:`~numpy.ndarray` or
         :class:`~numpy.ma.MaskedArray`
 
+    .. note::
+
+        Traces read with ``lazy=True`` (see :func:`~obspy.core.stream.read`)
+        hold a :class:`LazyData` handle instead of the samples. The samples
+        are decoded from the file on first access of ``.data``, trimming or
+        slicing before that only narrows the range of samples to decode.
+
     .. note::
 
         The ``.data`` attribute containing the time series samples as a
@@ -326,9 +409,11 @@ class Trace(object):
     _always_contiguous = True
 
     def __init__(self, data=np.array([]), header=None):
+        lazy = isinstance(data, LazyData)
         # make sure Trace gets initialized with suitable ndarray as self.data
         # otherwise we could end up with e.g. a list object in self.data
-        _data_sanity_checks(data)
+        if not lazy:
+            _data_sanity_checks(data)
         # set some defaults if not set yet
         if header is None:
             header = {}
@@ -336,7 +421,7 @@ class Trace(object):
         header.setdefault('npts', len(data))
         self.stats = Stats(header)
         # set data without changing npts in stats object (for headonly option)
-        super(Trace, self).__setattr__('data', data)
+        super(Trace, self).__setattr__('_lazy_data' if lazy else 'data', data)
 
     @property
     def meta(self):
@@ -444,7 +529,8 @@ class Trace(object):
                     "%(starttime)s - %(endtime)s | " + \
                     "%(sampling_rate).1f Hz, %(npts)d samples"
         # check for masked array
-        if np.ma.count_masked(self.data):
+        if '_lazy_data' not in self.__dict__ and \
+                np.ma.count_masked(self.data):
             out += ' (masked)'
         return trace_id + out % (self.stats)
 
@@ -466,6 +552,8 @@ class Trace(object):
         >>> len(trace)
         4
         """
+        if '_lazy_data' in self.__dict__:
+            return len(self._lazy_data)
         return len(self.data)
 
     count = __len__
@@ -476,12 +564,28 @@ class Trace(object):
         """
         # any change in Trace.data will dynamically set Trace.stats.npts
         if key == 'data':
-            _data_sanity_checks(value)
-            if self._always_contiguous:
-                value = np.require(value, requirements=['C_CONTIGUOUS'])
+            if isinstance(value, LazyData):
+                self.__dict__.pop('data', None)
+                key = '_lazy_data'
+            else:
+                _data_sanity_checks(value)
+                if self._always_contiguous:
+                    value = np.require(value, requirements=['C_CONTIGUOUS'])
+                self.__dict__.pop('_lazy_data', None)
             self.stats.npts = len(value)
         return super(Trace, self).__setattr__(key, value)
 
+    def __getattr__(self, key):
+        """
+        Decodes lazily read data on first access of ``Trace.data``.
+        """
+        if key == 'data' and '_lazy_data' in self.__dict__:
+            self.data = self.__dict__['_lazy_data'].load()
+            return self.__dict__['data']
+        msg = "'%s' object has no attribute '%s'" % (
+            self.__class__.__name__, key)
+        raise AttributeError(msg)
+
     def __getitem__(self, index):
         """
         __getitem__ method of Trace object.
@@ -1013,7 +1117,11 @@ class Trace(object):
         >>> tr.stats.starttime
         UTCDateTime(1970, 1, 1, 0, 0, 8)
         """
-        org_dtype = self.data.dtype
+        # lazily read data is only narrowed down but not decoded
+        data = None if pad else self.__dict__.get('_lazy_data')
+        if data is None:
+            data = self.data
+        org_dtype = data.dtype
         if isinstance(starttime, float) or isinstance(starttime, int):
             starttime = UTCDateTime(self.stats.starttime) + starttime
         elif not isinstance(starttime, UTCDateTime):
@@ -1057,7 +1165,7 @@ class Trace(object):
             return self
         elif delta > 0:
             try:
-                self.data = self.data[delta:]
+                self.data = data[delta:]
             except IndexError:
                 # a huge numbers for delta raises an IndexError
                 # here we just create empty array with same dtype
@@ -1080,7 +1188,11 @@ class Trace(object):
         >>> tr.stats.endtime
         UTCDateTime(1970, 1, 1, 0, 0, 2)
         """
-        org_dtype = self.data.dtype
+        # lazily read data is only narrowed down but not decoded
+        data = None if pad else self.__dict__.get('_lazy_data')
+        if data is None:
+            data = self.data
+        org_dtype = data.dtype
         if isinstance(endtime, float) or isinstance(endtime, int):
             endtime = UTCDateTime(self.stats.endtime) - endtime
         elif not isinstance(endtime, UTCDateTime):
@@ -1118,10 +1230,10 @@ class Trace(object):
             return self
         # cut from right
         delta = abs(delta)
-        total = len(self.data) - delta
+        total = len(data) - delta
         if endtime == self.stats.starttime:
             total = 1
-        self.data = self.data[:total]
+        self.data = data[:total]
         return self
 
     @_add_processing_info
@@ -1643,7 +1755,7 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
     @skip_if_no_data
     @_add_processing_info
     def resample(self, sampling_rate, window='hanning', no_filter=True,
-                 strict_length=False):
+                 strict_length=False, method='fourier'):
         """
         Resample trace data using Fourier method. Spectra are linearly
         interpolated if required.
@@ -1653,13 +1765,22 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :type window: array_like, callable, str, float, or tuple, optional
         :param window: Specifies the window applied to the signal in the
             Fourier domain. Defaults to ``'hanning'`` window. See
-            :func:`scipy.signal.resample` for details.
+            :func:`scipy.signal.resample` for details. Only used by the
+            Fourier method.
         :type no_filter: bool, optional
         :param no_filter: Deactivates automatic filtering if set to ``True``.
             Defaults to ``True``.
         :type strict_length: bool, optional
         :param strict_length: Leave traces unchanged for which end time of
             trace would change. Defaults to ``False``.
+        :type method: str, optional
+        :param method: ``'fourier'`` (default) resamples the whole trace in
+            the frequency domain. ``'polyphase'`` applies a polyphase FIR
+            filter like :func:`scipy.signal.resample_poly` (including its
+            anti-alias filter) in chunks, which is much faster for long
+            traces and uses bounded temporary memory but requires the ratio
+            of the sampling rates to be a fraction of small integers (e.g.
+            100 Hz to 40 Hz). The signal is not assumed to be periodic.
 
         .. note::
 
@@ -1697,9 +1818,21 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         4.0
         >>> tr.data  # doctest: +NORMALIZE_WHITESPACE +ELLIPSIS
         array([ 0.5       ,  0.40432914,  0.3232233 ,  0.26903012,  0.25 ...
-        """
-        from scipy.signal import get_window
-        from scipy.fftpack import rfft, irfft
+
+        Polyphase resampling from 100 Hz to 40 Hz:
+
+        >>> tr = Trace(data=np.ones(1000), header={'sampling_rate': 100.0})
+        >>> tr.resample(40.0, method='polyphase')  # doctest: +ELLIPSIS
+        <...Trace object at 0x...>
+        >>> len(tr)
+        400
+        """
+        if method not in ('fourier', 'polyphase'):
+            msg = "method must be either 'fourier' or 'polyphase', not '%s'"
+            raise ValueError(msg % method)
+        if method == 'polyphase':
+            # fail early for ratios not supported
+            _get_polyphase_ratio(self.stats.sampling_rate, sampling_rate)
         factor = self.stats.sampling_rate / float(sampling_rate)
         # check if end time changes and this is not explicitly allowed
         if strict_length:
@@ -1717,46 +1850,15 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             freq = self.stats.sampling_rate * 0.5 / float(factor)
             self.filter('lowpass_cheby_2', freq=freq, maxorder=12)
 
-        # resample in the frequency domain. Make sure the byteorder is native.
-        x = rfft(self.data.newbyteorder("="))
-        # Cast the value to be inserted to the same dtype as the array to avoid
-        # issues with numpy rule 'safe'.
-        x = np.insert(x, 1, x.dtype.type(0))
-        if self.stats.npts % 2 == 0:
-            x = np.append(x, [0])
-        x_r = x[::2]
-        x_i = x[1::2]
-
-        if window is not None:
-            if callable(window):
-                large_w = window(np.fft.fftfreq(self.stats.npts))
-            elif isinstance(window, np.ndarray):
-                if window.shape != (self.stats.npts,):
-                    msg = "Window has the wrong shape. Window length must " + \
-                          "equal the number of points."
-                    raise ValueError(msg)
-                large_w = window
-            else:
-                large_w = np.fft.ifftshift(get_window(window,
-                                                      self.stats.npts))
-            x_r *= large_w[:self.stats.npts // 2 + 1]
-            x_i *= large_w[:self.stats.npts // 2 + 1]
-
-        # interpolate
-        num = int(self.stats.npts / factor)
-        df = 1.0 / (self.stats.npts * self.stats.delta)
-        d_large_f = 1.0 / num * sampling_rate
-        f = df * np.arange(0, self.stats.npts // 2 + 1, dtype=np.int32)
-        n_large_f = num // 2 + 1
-        large_f = d_large_f * np.arange(0, n_large_f, dtype=np.int32)
-        large_y = np.zeros((2 * n_large_f))
-        large_y[::2] = np.interp(large_f, f, x_r)
-        large_y[1::2] = np.interp(large_f, f, x_i)
-
-        large_y = np.delete(large_y, 1)
-        if num % 2 == 0:
-            large_y = np.delete(large_y, -1)
-        self.data = irfft(large_y) * (float(num) / float(self.stats.npts))
+        if method == 'polyphase':
+            self.data = _resample_polyphase(
+                self.data, self.stats.sampling_rate, sampling_rate)
+        else:
+            # resample in the frequency domain. Make sure the byteorder is
+            # native.
+            self.data = _resample_fourier(
+                self.data.newbyteorder("="), self.stats.sampling_rate,
+                sampling_rate, window=window)
         self.stats.sampling_rate = sampling_rate
 
         return self
@@ -2012,27 +2114,7 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         ... # doctest: +ELLIPSIS
         <...Trace object at 0x...>
         """
-        type = type.lower()
-        # retrieve function call from entry points
-        func = _get_function_from_entry_point('detrend', type)
-
-        # handle function specific settings
-        if func.__module__.startswith('scipy'):
-            # SciPy need to set the type keyword
-            if type == 'demean':
-                type = 'constant'
-            options['type'] = type
-            original_dtype = self.data.dtype
-
-        # detrending
-        self.data = func(self.data, **options)
-
-        # Ugly workaround for old scipy versions that might unnecessarily
-        # change the dtype of the data.
-        if func.__module__.startswith('scipy'):
-            if original_dtype == np.float32 and self.data.dtype != np.float32:
-                self.data = np.require(self.data, dtype=np.float32)
-
+        self.data = _detrend_data(self.data, type, **options)
         return self
 
     @skip_if_no_data
@@ -2126,48 +2208,9 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         ``'triang'``
             Triangular window. (uses: :func:`scipy.signal.triang`)
         """
-        type = type.lower()
-        side = side.lower()
-        side_valid = ['both', 'left', 'right']
-        npts = self.stats.npts
-        if side not in side_valid:
-            raise ValueError("'side' has to be one of: %s" % side_valid)
-        # retrieve function call from entry points
-        func = _get_function_from_entry_point('taper', type)
-        # store all constraints for maximum taper length
-        max_half_lenghts = []
-        if max_percentage is not None:
-            max_half_lenghts.append(int(max_percentage * npts))
-        if max_length is not None:
-            max_half_lenghts.append(int(max_length * self.stats.sampling_rate))
-        if np.all([2 * mhl > npts for mhl in max_half_lenghts]):
-            msg = "The requested taper is longer than the trace. " \
-                  "The taper will be shortened to trace length."
-            warnings.warn(msg)
-        # add full trace length to constraints
-        max_half_lenghts.append(int(npts / 2))
-        # select shortest acceptable window half-length
-        wlen = min(max_half_lenghts)
-        # obspy.signal.cosine_taper has a default value for taper percentage,
-        # we need to override is as we control percentage completely via npts
-        # of taper function and insert ones in the middle afterwards
-        if type == "cosine":
-            kwargs['p'] = 1.0
-        # tapering. tapering functions are expected to accept the number of
-        # samples as first argument and return an array of values between 0 and
-        # 1 with the same length as the data
-        if 2 * wlen == npts:
-            taper_sides = func(2 * wlen, **kwargs)
-        else:
-            taper_sides = func(2 * wlen + 1, **kwargs)
-        if side == 'left':
-            taper = np.hstack((taper_sides[:wlen], np.ones(npts - wlen)))
-        elif side == 'right':
-            taper = np.hstack((np.ones(npts - wlen),
-                               taper_sides[len(taper_sides) - wlen:]))
-        else:
-            taper = np.hstack((taper_sides[:wlen], np.ones(npts - 2 * wlen),
-                               taper_sides[len(taper_sides) - wlen:]))
+        taper = _get_taper_window(
+            self.stats.npts, self.stats.sampling_rate, max_percentage,
+            type=type, max_length=max_length, side=side, **kwargs)
 
         # Convert data if it's not a floating point type.
         if not np.issubdtype(self.data.dtype, np.floating):
@@ -2972,6 +3015,253 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         return self
 
 
+def _detrend_data(data, type='simple', **options):
+    """
+    Detrend data as done by :meth:`Trace.detrend`.
+
+    See :meth:`Trace.detrend` for a description of the parameters.
+    """
+    type = type.lower()
+    # retrieve function call from entry points
+    func = _get_function_from_entry_point('detrend', type)
+
+    # handle function specific settings
+    if func.__module__.startswith('scipy'):
+        # SciPy need to set the type keyword
+        if type == 'demean':
+            type = 'constant'
+        options['type'] = type
+        original_dtype = data.dtype
+
+    # detrending
+    data = func(data, **options)
+
+    # Ugly workaround for old scipy versions that might unnecessarily
+    # change the dtype of the data.
+    if func.__module__.startswith('scipy'):
+        if original_dtype == np.float32 and data.dtype != np.float32:
+            data = np.require(data, dtype=np.float32)
+    return data
+
+
+def _get_taper_window(npts, sampling_rate, max_percentage, type='hann',
+                      max_length=None, side='both', **kwargs):
+    """
+    Compute the taper window applied by :meth:`Trace.taper`.
+
+    See :meth:`Trace.taper` for a description of the parameters.
+
+    :rtype: :class:`numpy.ndarray`
+    :returns: Taper window of length ``npts``.
+    """
+    type = type.lower()
+    side = side.lower()
+    side_valid = ['both', 'left', 'right']
+    if side not in side_valid:
+        raise ValueError("'side' has to be one of: %s" % side_valid)
+    # retrieve function call from entry points
+    func = _get_function_from_entry_point('taper', type)
+    # store all constraints for maximum taper length
+    max_half_lenghts = []
+    if max_percentage is not None:
+        max_half_lenghts.append(int(max_percentage * npts))
+    if max_length is not None:
+        max_half_lenghts.append(int(max_length * sampling_rate))
+    if np.all([2 * mhl > npts for mhl in max_half_lenghts]):
+        msg = "The requested taper is longer than the trace. " \
+              "The taper will be shortened to trace length."
+        warnings.warn(msg)
+    # add full trace length to constraints
+    max_half_lenghts.append(int(npts / 2))
+    # select shortest acceptable window half-length
+    wlen = min(max_half_lenghts)
+    # obspy.signal.cosine_taper has a default value for taper percentage,
+    # we need to override is as we control percentage completely via npts
+    # of taper function and insert ones in the middle afterwards
+    if type == "cosine":
+        kwargs['p'] = 1.0
+    # tapering. tapering functions are expected to accept the number of
+    # samples as first argument and return an array of values between 0 and
+    # 1 with the same length as the data
+    if 2 * wlen == npts:
+        taper_sides = func(2 * wlen, **kwargs)
+    else:
+        taper_sides = func(2 * wlen + 1, **kwargs)
+    if side == 'left':
+        taper = np.hstack((taper_sides[:wlen], np.ones(npts - wlen)))
+    elif side == 'right':
+        taper = np.hstack((np.ones(npts - wlen),
+                           taper_sides[len(taper_sides) - wlen:]))
+    else:
+        taper = np.hstack((taper_sides[:wlen], np.ones(npts - 2 * wlen),
+                           taper_sides[len(taper_sides) - wlen:]))
+    return taper
+
+
+def _resample_fourier(data, old_sampling_rate, sampling_rate,
+                      window='hanning'):
+    """
+    Fourier resampling as done by :meth:`Trace.resample`, without the
+    optional lowpass filtering.
+
+    Works along the last axis of ``data`` so that several traces with equal
+    sampling rate and number of samples can be resampled in one go.
+
+    :type data: :class:`numpy.ndarray`
+    :param data: Data to resample (native byte order).
+    :type old_sampling_rate: float
+    :param old_sampling_rate: Sampling rate of ``data``.
+    :type sampling_rate: float
+    :param sampling_rate: The sampling rate of the resampled signal.
+    :param window: See :meth:`Trace.resample`.
+    """
+    from scipy.signal import get_window
+    from scipy.fftpack import rfft, irfft
+    npts = data.shape[-1]
+    factor = old_sampling_rate / float(sampling_rate)
+    x = rfft(data)
+    # Cast the value to be inserted to the same dtype as the array to avoid
+    # issues with numpy rule 'safe'.
+    x = np.insert(x, 1, x.dtype.type(0), axis=-1)
+    if npts % 2 == 0:
+        x = np.append(x, np.zeros(x.shape[:-1] + (1,), dtype=x.dtype),
+                      axis=-1)
+    x_r = x[..., ::2]
+    x_i = x[..., 1::2]
+
+    if window is not None:
+        if callable(window):
+            large_w = window(np.fft.fftfreq(npts))
+        elif isinstance(window, np.ndarray):
+            if window.shape != (npts,):
+                msg = "Window has the wrong shape. Window length must " + \
+                      "equal the number of points."
+                raise ValueError(msg)
+            large_w = window
+        else:
+            large_w = np.fft.ifftshift(get_window(window, npts))
+        x_r *= large_w[:npts // 2 + 1]
+        x_i *= large_w[:npts // 2 + 1]
+
+    # interpolate
+    num = int(npts / factor)
+    df = 1.0 / (npts * (1.0 / old_sampling_rate))
+    d_large_f = 1.0 / num * sampling_rate
+    f = df * np.arange(0, npts // 2 + 1, dtype=np.int32)
+    n_large_f = num // 2 + 1
+    large_f = d_large_f * np.arange(0, n_large_f, dtype=np.int32)
+    large_y = np.zeros(x.shape[:-1] + (2 * n_large_f,))
+    if data.ndim == 1:
+        large_y[::2] = np.interp(large_f, f, x_r)
+        large_y[1::2] = np.interp(large_f, f, x_i)
+    else:
+        # linear interpolation with weights shared by all rows, same as
+        # np.interp (which only handles 1-D input) including the clipping
+        # at the frequency range boundaries
+        idx = np.clip(np.searchsorted(f, large_f, side='right') - 1,
+                      0, len(f) - 1)
+        idx_next = np.minimum(idx + 1, len(f) - 1)
+        weight = np.clip((large_f - f[idx]) / df, 0.0, 1.0)
+        for x_, target in ((x_r, large_y[..., ::2]),
+                           (x_i, large_y[..., 1::2])):
+            target[...] = (x_[..., idx] * (1.0 - weight) +
+                           x_[..., idx_next] * weight)
+
+    large_y = np.delete(large_y, 1, axis=-1)
+    if num % 2 == 0:
+        large_y = np.delete(large_y, -1, axis=-1)
+    return irfft(large_y) * (float(num) / float(npts))
+
+
+def _get_polyphase_ratio(old_sampling_rate, sampling_rate,
+                         max_denominator=1000):
+    """
+    Returns the resampling ratio as coprime integers ``(up, down)``.
+
+    Raises a :class:`ValueError` if the ratio of the sampling rates can not
+    be expressed with integers up to ``max_denominator``.
+    """
+    ratio = (Fraction(sampling_rate) / Fraction(old_sampling_rate))
+    ratio = ratio.limit_denominator(max_denominator)
+    exact = sampling_rate / float(old_sampling_rate)
+    if not ratio or abs(float(ratio) - exact) > 1e-9 * exact:
+        msg = ("Ratio of sampling rates %s / %s is not a rational number "
+               "with terms up to %d, use the Fourier method instead.") % (
+            sampling_rate, old_sampling_rate, max_denominator)
+        raise ValueError(msg)
+    return ratio.numerator, ratio.denominator
+
+
+@functools.lru_cache(maxsize=32)
+def _get_polyphase_filter(up, down):
+    """
+    Anti-alias FIR filter for polyphase resampling by ``up / down``.
+
+    Same Kaiser window design as :func:`scipy.signal.resample_poly`, padded
+    in front so that the filter delay is a multiple of ``down``. Designed
+    filters are cached per ratio.
+
+    :rtype: tuple
+    :returns: Read-only filter coefficients and filter delay in output
+        samples.
+    """
+    from scipy.signal import firwin
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    h = firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+    n_pre_pad = down - half_len % down
+    h = np.concatenate((np.zeros(n_pre_pad), h * up))
+    h.flags.writeable = False
+    return h, (half_len + n_pre_pad) // down
+
+
+def _resample_polyphase(data, old_sampling_rate, sampling_rate,
+                        chunk_size=65536):
+    """
+    Polyphase FIR resampling as done by :meth:`Trace.resample` with
+    ``method='polyphase'``, without the optional lowpass filtering.
+
+    The output is the same as that of :func:`scipy.signal.resample_poly`
+    (with the number of output samples rounded down like the Fourier
+    method), but it is computed in chunks of ``chunk_size`` output samples
+    so that temporary memory use does not depend on the length of the data.
+    Works along the last axis of ``data``.
+
+    :type data: :class:`numpy.ndarray`
+    :param data: Data to resample.
+    :type old_sampling_rate: float
+    :param old_sampling_rate: Sampling rate of ``data``.
+    :type sampling_rate: float
+    :param sampling_rate: The sampling rate of the resampled signal.
+    """
+    from scipy.signal import upfirdn
+    up, down = _get_polyphase_ratio(old_sampling_rate, sampling_rate)
+    if up == down:
+        # same sampling rate, like scipy.signal.resample_poly
+        return np.array(data, dtype=np.float64)
+    h, delay = _get_polyphase_filter(up, down)
+    data = np.asarray(data, dtype=np.float64)
+    npts = data.shape[-1]
+    num = npts * up // down
+    out = np.empty(data.shape[:-1] + (num,), dtype=np.float64)
+    for start in range(0, num, chunk_size):
+        stop = min(start + chunk_size, num)
+        # output sample m is sum_k h[k] * x_up[(m + delay) * down - k] with
+        # x_up the input zero-stuffed by up, so the chunk needs the input
+        # samples first to last (first rounded down to a multiple of down to
+        # keep upfirdn's output grid aligned)
+        first = ((start + delay) * down - len(h) + 1) // up
+        first -= first % down
+        last = (stop - 1 + delay) * down // up
+        chunk = np.zeros(data.shape[:-1] + (last + 1 - first,))
+        chunk[..., max(-first, 0):min(npts, last + 1) - first] = \
+            data[..., max(first, 0):min(npts, last + 1)]
+        offset = start + delay - first * up // down
+        out[..., start:stop] = upfirdn(h, chunk, up, down)[
+            ..., offset:offset + stop - start]
+    return out
+
+
 def _data_sanity_checks(value):
     """
     Check if a given input is suitable to be used for Trace.data. Raises the
@@ -1027,6 +1027,8 @@ class UTCDateTime(object):
         """
         if isinstance(value, UTCDateTime):
             return round((self._ns - value._ns) / 1e9, self.__precision)
+        elif isinstance(value, UTCDateTimeArray):
+            return NotImplemented
         elif isinstance(value, datetime.timedelta):
             # see datetime.timedelta.total_seconds
             value = (value.microseconds + (value.seconds + value.days *
@@ -1082,6 +1084,8 @@ class UTCDateTime(object):
             a = round(self._ns, ndigits)
             b = round(other._ns, ndigits)
             return op_func(a, b)
+        elif isinstance(other, UTCDateTimeArray):
+            return NotImplemented
         else:
             try:
                 return self._operate(UTCDateTime(other), op_func)
@@ -1134,7 +1138,10 @@ class UTCDateTime(object):
         >>> t1 == t2
         False
         """
-        return not self.__eq__(other)
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
 
     def __lt__(self, other):
         """
@@ -1715,6 +1722,437 @@ class UTCDateTime(object):
         return date2num(self.datetime)
 
 
+class UTCDateTimeArray(object):
+    """
+    An array of UTC-based datetimes.
+
+    Vectorized counterpart to :class:`UTCDateTime` for bulk time computations.
+    Internally all times are stored in a single NumPy ``int64`` array of
+    nanoseconds elapsed since midnight Coordinated Universal Time (UTC) of
+    Thursday, January 1, 1970, i.e. the same representation as
+    :attr:`UTCDateTime.ns`, so that converting between both is lossless.
+
+    :type values: array_like, optional
+    :param values: Times to store. Can be a
+        :class:`~obspy.core.utcdatetime.UTCDateTimeArray`, an array of
+        ``numpy.datetime64`` values, an array of POSIX timestamps in seconds
+        (int or float), an array of strings or any sequence of objects
+        accepted by :class:`~obspy.core.utcdatetime.UTCDateTime`. ISO8601
+        strings are parsed by NumPy in a vectorized fashion, all other
+        strings fall back to parsing with
+        :class:`~obspy.core.utcdatetime.UTCDateTime` element by element.
+    :type ns: array_like of int, optional
+    :param ns: POSIX timestamps as integer nanoseconds. Can not be used
+        together with ``values``.
+    :type precision: int, optional
+    :param precision: Sets the precision used by the rich comparison
+        operators, string formatting and the calendar attributes, see
+        :class:`~obspy.core.utcdatetime.UTCDateTime`. Defaults to the
+        precision of ``values`` if it is a
+        :class:`~obspy.core.utcdatetime.UTCDateTimeArray`, otherwise to
+        ``6``.
+
+    .. rubric:: Supported Operations
+
+    ``UTCDateTimeArray = UTCDateTimeArray + delta``
+        Adds/removes ``delta`` seconds (given as int, float, array or
+        ``numpy.timedelta64``) and returns a new ``UTCDateTimeArray``.
+
+    ``delta = UTCDateTimeArray - UTCDateTimeArray``
+        Calculates the time differences in seconds as a float array.
+        The other operand may also be a single
+        :class:`~obspy.core.utcdatetime.UTCDateTime`.
+
+    ``UTCDateTimeArray == UTCDateTime``, ``UTCDateTimeArray < ...``, ...
+        Element-wise comparison, returns a boolean array.
+
+    Indexing with an integer returns a
+    :class:`~obspy.core.utcdatetime.UTCDateTime`, indexing with slices,
+    index arrays or boolean masks returns a new ``UTCDateTimeArray``.
+
+    .. rubric:: Examples
+
+    >>> times = UTCDateTimeArray(["2009-08-24T00:20:03.5Z",
+    ...                           "2009-08-24T00:20:07"])
+    >>> times  # doctest: +NORMALIZE_WHITESPACE
+    UTCDateTimeArray(['2009-08-24T00:20:03.500000Z',
+                      '2009-08-24T00:20:07.000000Z'])
+    >>> times[1]
+    UTCDateTime(2009, 8, 24, 0, 20, 7)
+    >>> (times + 1.5).second.tolist()
+    [5, 8]
+    >>> (times - times[0]).tolist()
+    [0.0, 3.5]
+    >>> (times > UTCDateTime(2009, 8, 24, 0, 20, 5)).tolist()
+    [False, True]
+    >>> times.ns.tolist()
+    [1251073203500000000, 1251073207000000000]
+    """
+    # let NumPy defer binary operations with arrays to our own operators
+    __array_ufunc__ = None
+    __hash__ = None
+
+    def __init__(self, values=None, ns=None, precision=None):
+        if ns is not None:
+            if values is not None:
+                msg = "Only one of 'values' and 'ns' can be specified."
+                raise ValueError(msg)
+            ns = np.array(ns, dtype=np.int64)
+        elif values is None:
+            ns = np.empty(0, dtype=np.int64)
+        else:
+            ns = _to_ns_array(values)
+            # make sure we never share memory with the input
+            if ns is getattr(values, 'ns', None):
+                ns = ns.copy()
+        if precision is None:
+            precision = getattr(values, 'precision',
+                                UTCDateTime.DEFAULT_PRECISION)
+        if precision > 9:
+            msg = 'UTCDateTime precision above 9 is not supported, using 9'
+            warnings.warn(msg)
+            precision = 9
+        self.ns = ns
+        self.precision = int(precision)
+
+    def _new(self, ns):
+        return self.__class__(ns=ns, precision=self.precision)
+
+    def __len__(self):
+        return len(self.ns)
+
+    def __iter__(self):
+        for ns in self.ns.flat:
+            yield UTCDateTime(ns=int(ns), precision=self.precision)
+
+    def __getitem__(self, index):
+        ns = self.ns[index]
+        if np.ndim(ns) == 0:
+            return UTCDateTime(ns=int(ns), precision=self.precision)
+        return self._new(ns)
+
+    def __setitem__(self, index, value):
+        self.ns[index] = _to_ns_array(value)
+
+    def __array__(self, dtype=None):
+        return self.datetime64.astype(dtype or 'datetime64[ns]', copy=False)
+
+    def __repr__(self):
+        values = np.array2string(self.isoformat(), separator=', ',
+                                 prefix='%s(' % self.__class__.__name__)
+        return '%s(%s)' % (self.__class__.__name__, values)
+
+    def __str__(self):
+        return np.array2string(self.isoformat())
+
+    @property
+    def shape(self):
+        return self.ns.shape
+
+    @property
+    def size(self):
+        return self.ns.size
+
+    @property
+    def ndim(self):
+        return self.ns.ndim
+
+    @property
+    def timestamp(self):
+        """
+        POSIX timestamps in seconds as a float array.
+        """
+        return self.ns / 1e9
+
+    @property
+    def datetime64(self):
+        """
+        Times as a ``numpy.datetime64[ns]`` array (sharing memory).
+        """
+        return self.ns.view('datetime64[ns]')
+
+    def _rounded_ns(self, precision=None):
+        if precision is None:
+            precision = self.precision
+        return _round_ns(self.ns, precision)
+
+    def _calendar(self):
+        """
+        Returns rounded nanoseconds and day/month/year datetime64 arrays.
+        """
+        ns = self._rounded_ns()
+        dt = ns.view('datetime64[ns]')
+        days = dt.astype('datetime64[D]')
+        return ns, days, dt.astype('datetime64[M]'), dt.astype('datetime64[Y]')
+
+    @property
+    def year(self):
+        return self._calendar()[3].astype(np.int64) + 1970
+
+    @property
+    def month(self):
+        return self._calendar()[2].astype(np.int64) % 12 + 1
+
+    @property
+    def day(self):
+        _, days, months, _ = self._calendar()
+        return (days - months.astype('datetime64[D]')).astype(np.int64) + 1
+
+    @property
+    def julday(self):
+        _, days, _, years = self._calendar()
+        return (days - years.astype('datetime64[D]')).astype(np.int64) + 1
+
+    @property
+    def weekday(self):
+        """
+        Day of the week as integer array, Monday is 0 and Sunday is 6.
+        """
+        # 1970-01-01 was a Thursday
+        return (self._calendar()[1].astype(np.int64) + 3) % 7
+
+    def _seconds_of_day(self):
+        ns, days, _, _ = self._calendar()
+        return ns - days.astype('datetime64[ns]').view(np.int64)
+
+    @property
+    def hour(self):
+        return self._seconds_of_day() // (3600 * 10**9)
+
+    @property
+    def minute(self):
+        return self._seconds_of_day() // (60 * 10**9) % 60
+
+    @property
+    def second(self):
+        return self._seconds_of_day() // 10**9 % 60
+
+    @property
+    def microsecond(self):
+        return self._rounded_ns() % 10**9 // 1000
+
+    def copy(self):
+        return self._new(self.ns.copy())
+
+    def tolist(self):
+        """
+        Returns the times as a (nested) list of
+        :class:`~obspy.core.utcdatetime.UTCDateTime` objects.
+        """
+        def _convert(ns):
+            if isinstance(ns, list):
+                return [_convert(x) for x in ns]
+            return UTCDateTime(ns=ns, precision=self.precision)
+        return _convert(self.ns.tolist())
+
+    def min(self):
+        return self[np.argmin(self.ns)]
+
+    def max(self):
+        return self[np.argmax(self.ns)]
+
+    def argsort(self, *args, **kwargs):
+        return self.ns.argsort(*args, **kwargs)
+
+    def sort(self, *args, **kwargs):
+        """
+        Sorts the times in-place.
+        """
+        self.ns.sort(*args, **kwargs)
+
+    def __add__(self, value):
+        if isinstance(value, (UTCDateTime, UTCDateTimeArray)):
+            msg = ("unsupported operand type(s) for +: '%s' and '%s'" % (
+                self.__class__.__name__, value.__class__.__name__))
+            raise TypeError(msg)
+        return self._new(self.ns + _seconds_to_ns(value))
+
+    __radd__ = __add__
+
+    def __sub__(self, value):
+        if isinstance(value, (UTCDateTime, UTCDateTimeArray)):
+            precision = min(self.precision, value.precision)
+            return _round_ns(self.ns - _to_ns_array(value), precision) / 1e9
+        return self._new(self.ns - _seconds_to_ns(value))
+
+    def __rsub__(self, value):
+        if isinstance(value, UTCDateTime):
+            precision = min(self.precision, value.precision)
+            return _round_ns(value._ns - self.ns, precision) / 1e9
+        return NotImplemented
+
+    def _operate(self, other, op_func):
+        precision = min(self.precision,
+                        getattr(other, 'precision', self.precision))
+        try:
+            other = _to_ns_array(other)
+        except Exception:
+            return NotImplemented
+        return op_func(self._rounded_ns(precision),
+                       _round_ns(other, precision))
+
+    def __eq__(self, other):
+        return self._operate(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._operate(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._operate(other, operator.lt)
+
+    def __le__(self, other):
+        return self._operate(other, operator.le)
+
+    def __gt__(self, other):
+        return self._operate(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._operate(other, operator.ge)
+
+    def isoformat(self, sep="T"):
+        """
+        Returns ISO8601 string representations as a NumPy string array.
+
+        The number of fractional digits equals the precision, just like
+        ``str(UTCDateTime)``.
+
+        .. rubric:: Example
+
+        >>> times = UTCDateTimeArray(ns=[1222864235045020000, 0], precision=3)
+        >>> times.isoformat().tolist()
+        ['2008-10-01T12:30:35.045Z', '1970-01-01T00:00:00.000Z']
+        """
+        ns = self._rounded_ns()
+        strings = np.datetime_as_string(
+            ns.view('datetime64[ns]').astype('datetime64[s]'))
+        if self.precision > 0:
+            fraction = ns % 10**9 // 10**(9 - self.precision)
+            strings = np.char.add(np.char.add(strings, '.'), np.char.zfill(
+                fraction.astype(str), self.precision))
+        strings = np.char.add(strings, 'Z')
+        if sep != "T":
+            strings = np.char.replace(strings, 'T', sep)
+        return strings
+
+    def strftime(self, format):
+        """
+        Returns string representations controlled by an explicit format
+        string as a NumPy string array.
+
+        The directives ``%Y``, ``%m``, ``%d``, ``%j``, ``%H``, ``%M``, ``%S``,
+        ``%f`` and ``%%`` are formatted in a vectorized fashion, other
+        directives fall back to
+        :meth:`~obspy.core.utcdatetime.UTCDateTime.strftime` element by
+        element.
+
+        :type format: str
+        :param format: Format string.
+
+        .. rubric:: Example
+
+        >>> times = UTCDateTimeArray(["2008-10-01T12:30:35.045020Z"])
+        >>> times.strftime("%Y.%j %H:%M:%S.%f").tolist()
+        ['2008.275 12:30:35.045020']
+        """
+        result = np.full(self.shape, '', dtype='U1')
+        for part in re.split('(%.)', format):
+            if not part.startswith('%'):
+                result = np.char.add(result, part)
+            elif part == '%%':
+                result = np.char.add(result, '%')
+            elif part[1:] in _STRFTIME_VECTORIZED:
+                attr, width = _STRFTIME_VECTORIZED[part[1:]]
+                field = getattr(self, attr).astype(str)
+                result = np.char.add(result, np.char.zfill(field, width))
+            else:
+                strings = [t.strftime(format) for t in self]
+                return np.array(strings, dtype=str).reshape(self.shape)
+        return result
+
+
+_STRFTIME_VECTORIZED = {
+    'Y': ('year', 4), 'm': ('month', 2), 'd': ('day', 2), 'j': ('julday', 3),
+    'H': ('hour', 2), 'M': ('minute', 2), 'S': ('second', 2),
+    'f': ('microsecond', 6)}
+
+
+def _round_ns(ns, precision):
+    """
+    Round integer nanoseconds to given number of digits after the decimal
+    point of the corresponding seconds.
+
+    Works on arrays and rounds half to even, exactly like
+    ``round(ns, precision - 9)`` does on Python integers.
+    """
+    if precision >= 9:
+        return ns
+    factor = 10 ** (9 - precision)
+    quotient, remainder = np.divmod(ns, factor)
+    half = factor // 2
+    quotient += (remainder > half) | (
+        (remainder == half) & (quotient % 2 == 1))
+    return quotient * factor
+
+
+def _seconds_to_ns(value):
+    """
+    Convert a time span in seconds (scalar, array or timedelta) to integer
+    nanoseconds.
+    """
+    if isinstance(value, datetime.timedelta):
+        value = np.timedelta64(value)
+    value = np.asarray(value)
+    if value.dtype.kind == 'm':
+        return value.astype('timedelta64[ns]').view(np.int64)
+    if value.dtype.kind in 'iu':
+        return value.astype(np.int64) * 10**9
+    return np.round(value * 1e9).astype(np.int64)
+
+
+def _to_ns_array(values):
+    """
+    Convert any input accepted by
+    :class:`~obspy.core.utcdatetime.UTCDateTimeArray` to an integer
+    nanoseconds array.
+    """
+    if isinstance(values, UTCDateTimeArray):
+        return values.ns
+    if isinstance(values, UTCDateTime):
+        return np.array(values._ns, dtype=np.int64)
+    values = np.asarray(values)
+    kind = values.dtype.kind
+    if kind == 'M':
+        return values.astype('datetime64[ns]').view(np.int64)
+    if kind in 'iu':
+        return values.astype(np.int64) * 10**9
+    if kind == 'f':
+        return np.round(values * 1e9).astype(np.int64)
+    if kind in 'SU':
+        if kind == 'S':
+            values = np.char.decode(values)
+        values = np.char.strip(values)
+        # fast path: let NumPy parse ISO8601 calendar date strings, anything
+        # NumPy would interpret differently than UTCDateTime (e.g. a bare
+        # year or time zone offsets) falls back to UTCDateTime below
+        flat = values.ravel()
+        if flat.size and np.all(
+                (np.char.str_len(flat) >= 10) &
+                (np.char.find(flat, '-', 4, 5) == 4) &
+                (np.char.find(flat, '-', 7, 8) == 7)):
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('error')
+                    ns = np.char.rstrip(values, 'Zz').astype(
+                        'datetime64[ns]').view(np.int64)
+            except (ValueError, DeprecationWarning):
+                pass
+            else:
+                if not np.any(ns == np.iinfo(np.int64).min):
+                    return ns
+    return np.array([UTCDateTime(x)._ns for x in values.flat],
+                    dtype=np.int64).reshape(values.shape)
+
+
 def _datetime_to_ns(dt):
     """
     Use Python datetime object to return equivalent nanoseconds.
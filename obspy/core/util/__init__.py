@@ -29,8 +29,9 @@ from obspy.core.util.base import (ALL_MODULES, DEFAULT_MODULES,
                                   BASEMAP_VERSION, CARTOPY_VERSION,
                                   PROJ4_VERSION, CatchAndAssertWarnings)
 from obspy.core.util.misc import (BAND_CODE, CatchOutput, complexify_string,
-                                  guess_delta, loadtxt, score_at_percentile,
-                                  to_int_or_zero, SuppressOutput)
+                                  get_gaps_from_times, guess_delta, loadtxt,
+                                  score_at_percentile, to_int_or_zero,
+                                  SuppressOutput)
 from obspy.core.util.obspy_types import (ComplexWithUncertainties, Enum,
                                          FloatWithUncertainties)
 from obspy.core.util.testing import add_doctests, add_unittests
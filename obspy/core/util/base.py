@@ -8,7 +8,9 @@ Base utilities and constants for ObsPy.
     GNU Lesser General Public License, Version 3
     (https://www.gnu.org/copyleft/lesser.html)
 """
+import concurrent.futures
 import doctest
+import functools
 import glob
 import importlib
 import inspect
@@ -19,7 +21,7 @@ import sys
 import tempfile
 import unicodedata
 import warnings
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from pathlib import PurePath
 
 import numpy as np
@@ -646,7 +648,7 @@ def download_to_file(url, filename_or_buffer, chunk_size=1024):
 
 
 def _generic_reader(pathname_or_url=None, callback_func=None,
-                    **kwargs):
+                    workers=None, executor="thread", **kwargs):
     # convert pathlib.Path objects to str for compatibility.
     if isinstance(pathname_or_url, PurePath):
         pathname_or_url = str(pathname_or_url)
@@ -686,6 +688,14 @@ def _generic_reader(pathname_or_url=None, callback_func=None,
             elif not glob.has_magic(pathname) and not os.path.isfile(pathname):
                 raise IOError(2, "No such file or directory", pathname)
 
+        if workers is not None and workers > 1 and len(pathnames) > 1:
+            results = _map_files_parallel(callback_func, pathnames, kwargs,
+                                          workers=workers, executor=executor)
+            generic = next(results)
+            for result in results:
+                generic.extend(result)
+            return generic
+
         generic = callback_func(pathnames[0], **kwargs)
         if len(pathnames) > 1:
             for filename in pathnames[1:]:
@@ -693,6 +703,89 @@ def _generic_reader(pathname_or_url=None, callback_func=None,
         return generic
 
 
+def _map_files_parallel(callback_func, pathnames, kwargs, workers,
+                        executor="thread"):
+    """
+    Calls ``callback_func`` for every file name using a pool of threads or
+    processes and yields the results in the order of the file names.
+
+    :type workers: int
+    :param workers: Number of concurrent workers.
+    :type executor: str
+    :param executor: ``"thread"`` or ``"process"``. Processes circumvent the
+        global interpreter lock but require the callback function, its
+        keyword arguments and the results to be picklable.
+    """
+    if executor == "thread":
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    elif executor == "process":
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    else:
+        msg = "executor must be either 'thread' or 'process', not '%s'" % \
+            executor
+        raise ValueError(msg)
+    func = functools.partial(callback_func, **kwargs)
+    with pool:
+        # Executor.map() returns the results in the order of the inputs no
+        # matter which worker finishes first.
+        for result in pool.map(func, pathnames):
+            yield result
+
+
+def _map_threads(func, items, workers=None):
+    """
+    Calls ``func`` for every item using a pool of threads and returns the
+    results in the order of the items.
+
+    Useful for functions spending most of their time in code releasing the
+    global interpreter lock, e.g. C routines called via :mod:`ctypes` or
+    NumPy operations on large arrays.
+
+    :type workers: int
+    :param workers: Number of concurrent threads, defaults to the number of
+        CPUs. With ``1`` or less than two items all calls are made in the
+        calling thread.
+    :rtype: list
+    """
+    items = list(items)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(items) < 2:
+        return [func(item) for item in items]
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+def _imap_threads(func, items, workers=None):
+    """
+    Calls ``func`` for every item using a pool of threads and yields the
+    results in the order of the items as soon as they are available.
+
+    In contrast to :func:`_map_threads` items are consumed lazily, at most
+    twice as many calls as threads are in flight at any time, so that memory
+    use does not grow with the number of items.
+
+    :type workers: int
+    :param workers: Number of concurrent threads, defaults to the number of
+        CPUs. With ``1`` all calls are made in the calling thread.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+    pending = deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 class CatchAndAssertWarnings(warnings.catch_warnings):
     def __init__(self, clear=None, expected=None, show_all=True, **kwargs):
         """
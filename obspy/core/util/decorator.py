@@ -186,6 +186,9 @@ def uncompress_file(func, filename, *args, **kwargs):
             pass
     # handle results
     if obj_list:
+        # data can not be read lazily from temporary files
+        if kwargs.get('lazy'):
+            kwargs['lazy'] = False
         # write results to temporary files
         result = None
         for obj in obj_list:
@@ -507,6 +507,123 @@ def get_window_times(starttime, endtime, window_length, step, offset,
     return [(t(_i[0]), t(_i[1])) for _i in windows]
 
 
+def get_gaps_from_times(starttimes, endtimes, sampling_rates, ids=None,
+                        min_gap=None, max_gap=None):
+    """
+    Vectorized detection of gaps and overlaps between time segments.
+
+    Works on arrays of segment (e.g. trace) start and end times given as
+    POSIX timestamps in integer nanoseconds, see
+    :attr:`UTCDateTime.ns <obspy.core.utcdatetime.UTCDateTime.ns>`, and uses
+    the same definition of gaps and overlaps as
+    :meth:`Stream.get_gaps() <obspy.core.stream.Stream.get_gaps>`: Segments
+    are sorted by id, start time and end time and each segment is compared to
+    the following segment with the same id. Gaps shorter than half a sample
+    between segments of equal sampling rate are ignored, as are gaps that are
+    covered by an earlier segment.
+
+    :type starttimes: :class:`numpy.ndarray` of int
+    :param starttimes: Start times of the segments in nanoseconds.
+    :type endtimes: :class:`numpy.ndarray` of int
+    :param endtimes: End times (time of last sample) of the segments in
+        nanoseconds.
+    :type sampling_rates: :class:`numpy.ndarray` of float
+    :param sampling_rates: Sampling rates of the segments.
+    :type ids: :class:`numpy.ndarray`, optional
+    :param ids: Ids of the segments (e.g. SEED ids or integer codes), only
+        segments with equal id are compared. If not given, all segments are
+        assumed to have the same id.
+    :param min_gap: All gaps smaller than this value will be omitted. The
+        value is assumed to be in seconds. Defaults to None.
+    :param max_gap: All gaps larger than this value will be omitted. The
+        value is assumed to be in seconds. Defaults to None.
+    :rtype: :class:`numpy.ndarray`
+    :returns: Structured array with one item for each gap (positive
+        ``duration``) or overlap (negative ``duration``), sorted like the
+        segments, with fields ``index`` (index of the earlier segment),
+        ``next_index`` (index of the later segment), ``starttime`` (time of
+        the last sample before the gap, nanoseconds), ``endtime`` (time of the
+        first sample after the gap, nanoseconds), ``duration`` (seconds) and
+        ``nsamples`` (number of missing samples, negative for overlaps).
+
+    >>> starttimes = np.array([0, 10, 25, 40], dtype=np.int64) * 10**9
+    >>> endtimes = starttimes + 9 * 10**9
+    >>> gaps = get_gaps_from_times(starttimes, endtimes, np.ones(4))
+    >>> print(gaps["duration"].tolist())
+    [5.0, 5.0]
+    >>> print(gaps["nsamples"].tolist())
+    [5, 5]
+    """
+    starttimes = np.asarray(starttimes, dtype=np.int64)
+    endtimes = np.asarray(endtimes, dtype=np.int64)
+    sampling_rates = np.asarray(sampling_rates, dtype=np.float64)
+    if ids is None:
+        ids = np.zeros(len(starttimes), dtype=np.int64)
+    ids = np.asarray(ids)
+    dtype = [('index', np.int64), ('next_index', np.int64),
+             ('starttime', np.int64), ('endtime', np.int64),
+             ('duration', np.float64), ('nsamples', np.int64)]
+    # sort by id, start time and end time (stable, like Stream.sort())
+    order = np.lexsort((endtimes, starttimes, ids))
+    ids = ids[order]
+    starts = starttimes[order]
+    ends = endtimes[order]
+    sampling_rates = sampling_rates[order]
+    with np.errstate(divide='ignore'):
+        deltas = np.where(sampling_rates != 0, 1.0 / sampling_rates, 0.0)
+    # compare each segment to the next segment with the same id
+    first = np.nonzero(ids[1:] == ids[:-1])[0]
+    second = first + 1
+    stime = np.minimum(ends[first], ends[second])
+    etime = starts[second]
+    # last sample of earlier segment represents data up to time of last
+    # sample plus one delta
+    duration = etime / 1e9 - (stime / 1e9 + deltas[first])
+    # check that any overlap is not larger than the segment coverage
+    coverage = ends[second] / 1e9 - etime / 1e9
+    duration = np.where((duration < 0) & (-duration > coverage), -coverage,
+                        duration)
+    # number of missing samples, rounded half away from zero
+    nsamples = np.abs(duration) * sampling_rates[first]
+    floor = np.floor(nsamples)
+    ceil = np.ceil(nsamples)
+    half = (floor != ceil) & (nsamples - floor == ceil - nsamples)
+    nsamples = np.where(half, ceil, np.round(nsamples)).astype(np.int64)
+    nsamples[duration < 0] *= -1
+    # check gap/overlap criteria and skip gaps shorter than half a sample
+    keep = ~((deltas[first] == deltas[second]) & (nsamples == 0))
+    if min_gap:
+        keep &= ~(duration < min_gap)
+    if max_gap:
+        keep &= ~(duration > max_gap)
+    # check if a gap is already covered by an earlier segment of the same id,
+    # only gaps after a segment ending after the gap end can be covered
+    group_starts = np.concatenate(
+        [[0], np.nonzero(ids[1:] != ids[:-1])[0] + 1])
+    max_end = np.empty_like(ends)
+    for start, end in zip(group_starts,
+                          np.append(group_starts[1:], len(ends))):
+        max_end[start:end] = np.maximum.accumulate(ends[start:end])
+    group_start = group_starts[np.searchsorted(group_starts, first,
+                                               side='right') - 1]
+    candidates = keep & (first > group_start) & (stime < etime)
+    candidates[candidates] &= max_end[first[candidates] - 1] > \
+        etime[candidates]
+    for _i in np.nonzero(candidates)[0]:
+        previous = slice(group_start[_i], first[_i])
+        if np.any((starts[previous] < stime[_i]) &
+                  (ends[previous] > etime[_i])):
+            keep[_i] = False
+    gaps = np.empty(keep.sum(), dtype=dtype)
+    gaps['index'] = order[first[keep]]
+    gaps['next_index'] = order[second[keep]]
+    gaps['starttime'] = stime[keep]
+    gaps['endtime'] = etime[keep]
+    gaps['duration'] = duration[keep]
+    gaps['nsamples'] = nsamples[keep]
+    return gaps
+
+
 class MatplotlibBackend(object):
     """
     A helper class for switching the matplotlib backend.
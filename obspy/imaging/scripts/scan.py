@@ -44,7 +44,7 @@ from matplotlib.dates import date2num, num2date
 
 from obspy import UTCDateTime, __version__, read, Trace, Stream
 from obspy.core.util.base import ENTRY_POINTS
-from obspy.core.util.misc import MatplotlibBackend
+from obspy.core.util.misc import MatplotlibBackend, get_gaps_from_times
 from obspy.imaging.util import ObsPyAutoDateFormatter, \
     decimal_seconds_format_date_first_tick
 
@@ -109,6 +109,23 @@ def compress_start_end(x, stop_iteration, merge_overlaps=False,
     return x
 
 
+def _date2ns(x):
+    """
+    Convert matplotlib date numbers to POSIX timestamps in nanoseconds.
+    """
+    epoch = UTCDateTime(0).matplotlib_date
+    return np.round((np.asarray(x) - epoch) * (24 * 3600 * 1e9)).astype(
+        np.int64)
+
+
+def _ns2date(x):
+    """
+    Convert POSIX timestamps in nanoseconds to matplotlib date numbers.
+    """
+    epoch = UTCDateTime(0).matplotlib_date
+    return np.asarray(x) / (24 * 3600 * 1e9) + epoch
+
+
 def parse_file_to_dict(data_dict, samp_int_dict, file, counter, format=None,
                        verbose=False, quiet=False, ignore_links=False):
     if ignore_links and os.path.islink(file):
@@ -550,20 +567,22 @@ class Scanner(object):
                 gapsum += gap_at_end
                 has_gap = True
             info["percentage"] = (timerange - gapsum) / timerange * 100
-            # define a gap as over 0.8 delta after expected sample time
-            gap_indices = diffs > 0.8 * _samp_int[:-1]
-            gap_indices = np.append(gap_indices, False)
-            # define an overlap as over 0.8 delta before expected sample time
-            overlap_indices = diffs < -0.8 * _samp_int[:-1]
-            overlap_indices = np.append(overlap_indices, False)
-            has_gap |= any(gap_indices)
-            has_gap |= any(overlap_indices)
+            # find gaps and overlaps on nanosecond times (end times in
+            # `startend` are one delta after the last sample), a gap/overlap
+            # has to be over 0.8 delta after/before expected sample time
+            gaps = get_gaps_from_times(
+                _date2ns(startend[:, 0]), _date2ns(startend[:, 1] - _samp_int),
+                1.0 / (_samp_int * 24 * 3600))
+            gap_samp_int = _samp_int[gaps["index"]]
+            gaps = gaps[np.abs(gaps["duration"]) >
+                        0.8 * gap_samp_int * 24 * 3600]
+            has_gap |= len(gaps) > 0
             if has_gap:
-                # don't handle last end time as start of gap
-                gaps_start = startend[gap_indices, 1]
-                gaps_end = startend[np.roll(gap_indices, 1), 0]
-                overlaps_end = startend[overlap_indices, 1]
-                overlaps_start = startend[np.roll(overlap_indices, 1), 0]
+                # expected sample time after the earlier trace and time of the
+                # first sample of the later trace
+                gaps_start = (_ns2date(gaps["starttime"]) +
+                              _samp_int[gaps["index"]])
+                gaps_end = _ns2date(gaps["endtime"])
                 # but now, manually add start/end for gaps at start/end of user
                 # specified start/end times
                 if gap_at_start:
@@ -573,8 +592,8 @@ class Scanner(object):
                     gaps_start = np.append(gaps_start, data_end)
                     gaps_end = np.append(gaps_end, endtime)
 
-                _starts = np.concatenate((gaps_start, overlaps_end))
-                _ends = np.concatenate((gaps_end, overlaps_start))
+                _starts = gaps_start
+                _ends = gaps_end
                 sort_order = np.argsort(_starts)
                 _starts = _starts[sort_order]
                 _ends = _ends[sort_order]
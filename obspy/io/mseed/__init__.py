@@ -69,9 +69,23 @@ attribute of each trace.
 Several key word arguments are available which can be used for example to
 only read certain records from a file or force the header byteorder:
 ``starttime``, ``endtime``, ``headonly``, ``sourcename``, ``reclen``,
-``details``, and ``header_byteorder``. They are passed to the
-:meth:`~obspy.io.mseed.core._read_mseed` method so refer to it for details to
-each parameter.
+``details``, ``header_byteorder``, ``mmap``, and ``record_index``. They are
+passed to the :meth:`~obspy.io.mseed.core._read_mseed` method so refer to it
+for details to each parameter.
+
+Large files or never ending streams of records (e.g. from a socket) can be
+read iteratively in chunks of records with bounded memory usage using
+:func:`~obspy.io.mseed.core.iread_mseed`.
+
+>>> from obspy.core.util import get_example_file
+>>> from obspy.io.mseed import iread_mseed
+>>> filename = get_example_file("test.mseed")
+>>> for st in iread_mseed(filename, chunk_records=1):
+...     print(st)  # doctest: +ELLIPSIS
+1 Trace(s) in Stream:
+NL.HGN.00.BHZ | 2003-05-29T02:13:22.043400Z - ... | 40.0 Hz, 5980 samples
+1 Trace(s) in Stream:
+NL.HGN.00.BHZ | 2003-05-29T02:15:51.543400Z - ... | 40.0 Hz, 5967 samples
 
 Writing
 -------
@@ -140,6 +154,10 @@ some purposes. Refer to the documentation of each for details.
 +----------------------------------------------------------+--------------------------------------------------------------------------+
 | :func:`~obspy.io.mseed.util.set_flags_in_fixed_headers`  | Updates a given miniSEED file with some fixed header flags.              |
 +----------------------------------------------------------+--------------------------------------------------------------------------+
+| :func:`~obspy.io.mseed.util.build_record_index`          | Builds a sidecar index of all records for fast time window reading.      |
++----------------------------------------------------------+--------------------------------------------------------------------------+
+| :func:`~obspy.io.mseed.util.read_record_index`           | Reads a record index sidecar if it is still valid.                       |
++----------------------------------------------------------+--------------------------------------------------------------------------+
 """
 from obspy import ObsPyException, ObsPyReadingError
 
@@ -172,8 +190,11 @@ class ObsPyMSEEDFilesizeTooLargeError(ObsPyMSEEDReadingError):
     pass
 
 
+from .core import iread_mseed  # NOQA
+
+
 __all__ = ['InternalMSEEDError', 'InternalMSEEDWarning', 'ObsPyMSEEDError',
-           'ObsPyMSEEDFilesizeTooSmallError']
+           'ObsPyMSEEDFilesizeTooSmallError', 'iread_mseed']
 
 
 if __name__ == '__main__':
@@ -6,14 +6,18 @@ import ctypes as C  # NOQA
 import io
 import os
 import warnings
+from mmap import mmap as _mmap, ACCESS_READ
+from pathlib import PurePath
 from struct import pack
 
 import numpy as np
 
 from obspy import Stream, Trace, UTCDateTime
 from obspy.core.compatibility import from_buffer
+from obspy.core.trace import LazyData
 from obspy.core.util import NATIVE_BYTEORDER
-from . import (util, InternalMSEEDError, ObsPyMSEEDFilesizeTooSmallError,
+from . import (util, InternalMSEEDError, InternalMSEEDWarning,
+               ObsPyMSEEDFilesizeTooSmallError,
                ObsPyMSEEDFilesizeTooLargeError, ObsPyMSEEDError)
 from .headers import (DATATYPES, ENCODINGS, HPTERROR, HPTMODULUS, SAMPLETYPE,
                       SEED_CONTROL_HEADERS, UNSUPPORTED_ENCODINGS,
@@ -140,7 +144,8 @@ def __is_mseed(fp, file_size):  # NOQA
 
 def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
                 sourcename=None, reclen=None, details=False,
-                header_byteorder=None, verbose=None, **kwargs):
+                header_byteorder=None, verbose=None, mmap=False,
+                record_index=False, lazy=False, **kwargs):
     """
     Reads a Mini-SEED file and returns a Stream object.
 
@@ -186,6 +191,35 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
         little-endian, ``1`` or ``'>'`` for MBF or big-endian. ``'='`` is the
         native byte order. Used to enforce the header byte order. Useful in
         some rare cases where the automatic byte order detection fails.
+    :type mmap: bool, optional
+    :param mmap: If ``True``, memory map the file instead of reading it into
+        memory. If additionally ``starttime`` and/or ``endtime`` are given and
+        the file consists of records of a single record length, only the
+        record headers and the byte range spanning the records overlapping
+        the requested time window are touched. This also allows to read
+        time windows out of files larger than 2 GiB. For the uncompressed
+        encodings INT32, FLOAT32 and FLOAT64 the samples are taken directly
+        from the mapped pages: traces stored in a single record in native byte
+        order are returned as read-only views onto the mapping, all others
+        are copied exactly once. Only has an effect for file names and real
+        files, other file-like objects are read as usual.
+    :type record_index: bool or str, optional
+    :param record_index: If ``True`` or the file name of an index sidecar,
+        use a record index (see
+        :func:`~obspy.io.mseed.util.build_record_index`) to only pass the
+        records matching ``starttime``, ``endtime`` and ``sourcename`` to
+        libmseed. The records are located via binary search in the index and
+        read from the memory mapped file. A missing or outdated index
+        (modification time or size of the file changed) is (re-)built and
+        written. ``True`` uses the file name with ``.index.npz`` appended for
+        the sidecar. Only used for file names and if a selection is given.
+    :type lazy: bool, optional
+    :param lazy: If ``True``, only read the headers and attach a handle to
+        the records making up each trace which decodes the data on first
+        access of ``trace.data``. Trimming or slicing the traces before that
+        restricts decoding to the records overlapping the remaining time
+        window. Requires a file name of a file consisting of data records of
+        a single record length. All other files are read as usual.
 
     .. rubric:: Example
 
@@ -222,6 +256,18 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
 
     >>> print(len(st))
     101
+
+    Memory map the file and only decode the records overlapping the requested
+    time window with ``mmap=True``. Use ``record_index=True`` to additionally
+    store a sidecar index of all records next to the file which allows
+    locating the requested records without scanning the file.
+
+    >>> st = read("/path/to/BW.BGLD.__.EHE.D.2008.001.first_10_records",
+    ...           starttime=UTCDateTime("2008-01-01T00:00:05"),
+    ...           endtime=UTCDateTime("2008-01-01T00:00:07"), mmap=True)
+    >>> print(st)  # doctest: +ELLIPSIS
+    1 Trace(s) in Stream:
+    BW.BGLD..EHE | 2008-01-01T00:00:05.000000Z - ... | 200.0 Hz, 401 samples
     """
     # Parse the headonly and reclen flags.
     if headonly is True:
@@ -254,6 +300,18 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
     else:
         bo = None
 
+    # Read the headers and attach handles to the records of each trace,
+    # falls through to the usual reading if the records can not be mapped
+    # to the traces.
+    if lazy and not headonly and isinstance(mseed_object, str):
+        st = _read_mseed(
+            mseed_object, starttime=starttime, endtime=endtime,
+            headonly=True, sourcename=sourcename,
+            reclen=None if reclen == -1 else reclen, details=details,
+            header_byteorder=header_byteorder, verbose=verbose, mmap=True)
+        if _set_lazy_data(st, mseed_object, bo, header_byteorder):
+            return st
+
     # Determine total size. Either its a file-like object.
     if hasattr(mseed_object, "tell") and hasattr(mseed_object, "seek"):
         cur_pos = mseed_object.tell()
@@ -262,19 +320,41 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
         mseed_object.seek(cur_pos, 0)
     # Or a file name.
     else:
+        cur_pos = 0
         length = os.path.getsize(mseed_object)
 
     if length < 128:
         msg = "The smallest possible mini-SEED record is made up of 128 " \
               "bytes. The passed buffer or file contains only %i." % length
         raise ObsPyMSEEDFilesizeTooSmallError(msg)
-    elif length > 2 ** 31:
-        msg = ("ObsPy can currently not directly read mini-SEED files that "
-               "are larger than 2^31 bytes (2048 MiB). To still read it, "
-               "please read the file in chunks as documented here: "
-               "https://github.com/obspy/obspy/pull/1419"
-               "#issuecomment-221582369")
-        raise ObsPyMSEEDFilesizeTooLargeError(msg)
+
+    # Only use a record index if a selection is given.
+    index = None
+    if record_index and isinstance(mseed_object, str) and (
+            starttime is not None or endtime is not None or
+            sourcename is not None):
+        index = util._get_record_index(
+            mseed_object, index_filename=record_index
+            if isinstance(record_index, str) else None)
+
+    # Memory mapping requires a file descriptor.
+    if mmap or index is not None:
+        try:
+            if isinstance(mseed_object, str):
+                with io.open(mseed_object, "rb") as fh:
+                    mapping = _mmap(fh.fileno(), 0, access=ACCESS_READ)
+            else:
+                mapping = _mmap(mseed_object.fileno(), 0, access=ACCESS_READ)
+        except (AttributeError, io.UnsupportedOperation, OSError,
+                ValueError):
+            mapping = None
+        if mapping is None:
+            index = None
+        mmap = mmap and mapping is not None
+
+    # Memory mapped files are checked once the byte range is known.
+    if length > 2 ** 31 and not mmap and index is None:
+        _raise_filesize_too_large()
 
     info = util.get_record_information(mseed_object, endian=bo)
 
@@ -296,12 +376,42 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
         raise ValueError(msg)
 
     record_length = info["record_length"]
+    record_byteorder = info["byteorder"]
 
     # Only keep information relevant for the whole file.
     info = {'filesize': info['filesize']}
 
+    record_table = None
+    if index is not None:
+        # Collect the records located via the record index into a buffer
+        # with the same order of the records as in the file.
+        record_table = util._search_record_index(
+            index, starttime=starttime, endtime=endtime,
+            sourcename=sourcename)
+        if not len(record_table):
+            return Stream()
+        # Records of another length than the first record of the file or
+        # not aligned to it cannot be gathered - scan the whole file.
+        if (record_table["record_length"] != record_length).any() or \
+                (record_table["offset"] % record_length).any():
+            index = None
+            record_table = None
+            if length > 2 ** 31 and not mmap:
+                _raise_filesize_too_large()
+    if index is not None:
+        bfr_np = np.frombuffer(mapping, dtype=np.int8)
+        bfr_np = bfr_np[:len(bfr_np) // record_length * record_length]
+        bfr_np = bfr_np.reshape(-1, record_length)[
+            record_table["offset"] // record_length].ravel()
+        record_table["offset"] = \
+            np.arange(len(record_table)) * record_length
+    elif mmap:
+        # Zero-copy view on the mapped file.
+        bfr_np = np.frombuffer(mapping, dtype=np.int8, offset=cur_pos)
+        if not isinstance(mseed_object, str):
+            mseed_object.seek(0, 2)
     # If it's a file name just read it.
-    if isinstance(mseed_object, str):
+    elif isinstance(mseed_object, str):
         # Read to NumPy array which is used as a buffer.
         bfr_np = np.fromfile(mseed_object, dtype=np.int8)
     elif hasattr(mseed_object, 'read'):
@@ -329,8 +439,34 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
             continue
         break
     bfr_np = bfr_np[offset:]
+
+    # Restrict the mapped buffer to the records overlapping the time window.
+    # The record headers are parsed in one go which only touches the pages
+    # holding them.
+    if mmap and index is None:
+        record_table = util._get_record_table(
+            bfr_np, record_length, bo or record_byteorder)
+        if record_table is not None and \
+                (starttime is not None or endtime is not None):
+            record_table = util._select_records(record_table, starttime,
+                                                endtime)
+            if not len(record_table):
+                return Stream()
+            first = record_table["offset"][0]
+            bfr_np = bfr_np[first:record_table["offset"][-1] + record_length]
+            record_table["offset"] -= first
+    if len(bfr_np) > 2 ** 31:
+        _raise_filesize_too_large()
     buflen = len(bfr_np)
 
+    # Uncompressed samples are directly taken from the mapped buffer so
+    # libmseed only has to assemble the headers.
+    zero_copy = record_table is not None and not headonly and \
+        len(record_table) and \
+        np.in1d(record_table["encoding"], [3, 4, 5]).all()
+    if zero_copy:
+        unpack_data = 0
+
     # If no selection is given pass None to the C function.
     if starttime is None and endtime is None and sourcename is None:
         selections = None
@@ -367,6 +503,38 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
                 encode('ascii', 'ignore')
         else:
             selections.srcname = b'*'
+    try:
+        verbose = int(verbose)
+    except Exception:
+        verbose = 0
+
+    traces = _decode_buffer(bfr_np, buflen, selections, unpack_data, reclen,
+                            verbose, details, header_byteorder, offset, info)
+    if zero_copy:
+        for trace in traces:
+            data = _assemble_uncompressed_data(bfr_np, record_table,
+                                               trace.stats)
+            if data is not None:
+                trace.data = data
+            else:
+                # Let libmseed handle anything unusual.
+                traces = _decode_buffer(
+                    bfr_np, buflen, selections, 1, reclen, verbose, details,
+                    header_byteorder, offset, info)
+                break
+    del selections
+    return Stream(traces=traces)
+
+
+def _decode_buffer(bfr_np, buflen, selections, unpack_data, reclen, verbose,
+                   details, header_byteorder, offset, info):
+    """
+    Passes a buffer of MiniSEED records to libmseed and returns the assembled
+    traces.
+
+    If ``unpack_data`` is false only the headers are assembled and the traces
+    carry empty data arrays.
+    """
     all_data = []
 
     # Use a callback function to allocate the memory and keep track of the
@@ -385,11 +553,6 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
     # it hopefully works on 32 and 64 bit systems.
     alloc_data = C.CFUNCTYPE(C.c_longlong, C.c_int, C.c_char)(allocate_data)
 
-    try:
-        verbose = int(verbose)
-    except Exception:
-        verbose = 0
-
     clibmseed.verbose = bool(verbose)
     try:
         lil = clibmseed.readMSEEDBuffer(
@@ -413,8 +576,6 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
         # Make sure to reset the verbosity.
         clibmseed.verbose = True
 
-    del selections
-
     traces = []
     try:
         current_id = lil.contents
@@ -422,7 +583,7 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
     except ValueError:
         clibmseed.lil_free(lil)
         del lil
-        return Stream()
+        return traces
 
     while True:
         # Init header with the essential information.
@@ -456,7 +617,7 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
                     current_segment.calibration_type \
                     if current_segment.calibration_type != -1 else False
 
-            if headonly is False:
+            if unpack_data:
                 # The data always will be in sequential order.
                 data = all_data.pop(0)
                 header['npts'] = len(data)
@@ -488,7 +649,375 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
 
     clibmseed.lil_free(lil)  # NOQA
     del lil  # NOQA
-    return Stream(traces=traces)
+    return traces
+
+
+class _MSEEDLazyData(LazyData):
+    """
+    Deferred handle to the data records of a trace in a MiniSEED file.
+
+    Only the records overlapping the requested range of samples are read
+    from the file and decoded.
+
+    :type records: :class:`numpy.ndarray`
+    :param records: Record table entries of the records of the trace in
+        temporal order (see :func:`obspy.io.mseed.util._get_record_table`).
+    :type header_byteorder: int
+    :param header_byteorder: Header byte order as passed to libmseed.
+    """
+    def __init__(self, filename, records, dtype, header_byteorder):
+        super(_MSEEDLazyData, self).__init__(
+            filename, records["npts"].sum(), dtype)
+        self.offsets = records["offset"].copy()
+        self.record_length = int(records["record_length"][0])
+        # Index of the first sample of each record plus the total count.
+        self.first_samples = np.concatenate(
+            [[0], np.cumsum(records["npts"], dtype=np.int64)])
+        self.header_byteorder = header_byteorder
+
+    def _read(self, start, npts):
+        i = np.searchsorted(self.first_samples, start, side="right") - 1
+        j = np.searchsorted(self.first_samples, start + npts, side="left")
+        offsets = self.offsets[i:j]
+        reclen = self.record_length
+        bfr_np = np.empty(len(offsets) * reclen, dtype=np.int8)
+        # Read runs of consecutive records at once.
+        runs = np.split(np.arange(len(offsets)),
+                        np.nonzero(np.diff(offsets) != reclen)[0] + 1)
+        with io.open(self.filename, "rb") as fh:
+            for run in runs:
+                fh.seek(offsets[run[0]])
+                fh.readinto(bfr_np[run[0] * reclen:(run[-1] + 1) * reclen])
+        traces = _decode_buffer(bfr_np, len(bfr_np), None, 1, reclen, 0,
+                                False, self.header_byteorder, 0, {})
+        if len(traces) != 1:
+            msg = ("Records of lazily read trace in file '%s' could not be "
+                   "decoded to a single trace." % self.filename)
+            raise ObsPyMSEEDError(msg)
+        skip = start - self.first_samples[i]
+        return traces[0].data[skip:skip + npts]
+
+
+def _set_lazy_data(stream, filename, byteorder, header_byteorder):
+    """
+    Attaches a :class:`_MSEEDLazyData` handle to each header only trace
+    read from the given file.
+
+    The records of a trace are identified by their SEED identifier, data
+    quality and start times which have to line up with the samples of the
+    trace.
+
+    :rtype: bool
+    :return: ``False`` if the records of any trace could not be identified
+        unambiguously in which case no trace is changed.
+    """
+    try:
+        info = util.get_record_information(filename, endian=byteorder)
+        with io.open(filename, "rb") as fh:
+            mapping = _mmap(fh.fileno(), 0, access=ACCESS_READ)
+    except Exception:
+        return False
+    try:
+        bfr_np = np.frombuffer(mapping, dtype=np.int8)
+        table = util._get_record_table(bfr_np, info["record_length"],
+                                       byteorder or info["byteorder"])
+        del bfr_np
+    finally:
+        mapping.close()
+    if table is None:
+        return False
+    table = table[table["npts"] > 0]
+    keys = np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(
+        np.char.add(np.char.add(table["network"], b"."), table["station"]),
+        b"."), table["location"]), b"."), table["channel"]),
+        table["dataquality"])
+    order = np.lexsort((table["starttime"], keys))
+    table = table[order]
+    keys = keys[order]
+
+    handles = []
+    for tr in stream:
+        stats = tr.stats
+        if not stats.npts:
+            handles.append(None)
+            continue
+        if not stats.sampling_rate > 0:
+            return False
+        key = ("%s.%s.%s.%s%s" % (
+            stats.network, stats.station, stats.location, stats.channel,
+            stats.mseed.dataquality)).encode()
+        lo = np.searchsorted(keys, key, side="left")
+        hi = np.searchsorted(keys, key, side="right")
+        delta = 1e9 / stats.sampling_rate
+        start = stats.starttime._ns
+        times = table["starttime"][lo:hi]
+        i = lo + np.searchsorted(times, start - delta / 2.0, side="left")
+        j = lo + np.searchsorted(times, stats.endtime._ns + delta / 2.0,
+                                 side="right")
+        records = table[i:j]
+        if not len(records) or records["npts"].sum() != stats.npts or \
+                len(np.unique(records["encoding"])) != 1:
+            return False
+        # Start times of all records have to line up with the samples.
+        first = np.concatenate([[0], np.cumsum(records["npts"][:-1])])
+        expected = start + np.round(first * delta).astype(np.int64)
+        if (np.abs(records["starttime"] - expected) > delta / 2.0).any():
+            return False
+        sampletype = ENCODINGS[records["encoding"][0]][1]
+        dtype = np.dtype(DATATYPES[sampletype.encode()])
+        handles.append(_MSEEDLazyData(filename, records, dtype,
+                                      header_byteorder))
+    for tr, handle in zip(stream, handles):
+        if handle is not None:
+            tr.data = handle
+    return True
+
+
+def _raise_filesize_too_large():
+    msg = ("ObsPy can currently not directly read mini-SEED files that "
+           "are larger than 2^31 bytes (2048 MiB). To still read it, "
+           "please read the file in chunks as documented here: "
+           "https://github.com/obspy/obspy/pull/1419"
+           "#issuecomment-221582369")
+    raise ObsPyMSEEDFilesizeTooLargeError(msg)
+
+
+def _assemble_uncompressed_data(bfr_np, record_table, stats):
+    """
+    Assembles the data of a trace with uncompressed samples straight from
+    the records in the buffer.
+
+    The records are matched to the trace via their SEED identifier, data
+    quality and start time. A trace contained in a single record stored in
+    native byte order is returned as a view on the buffer, all others are
+    copied once into a new array.
+
+    :rtype: :class:`numpy.ndarray` or None
+    :return: The data of the trace or ``None`` if the records making up the
+        trace could not be identified unambiguously.
+    """
+    npts = stats.npts
+    mask = (record_table["npts"] > 0)
+    for key in ("network", "station", "location", "channel"):
+        mask &= record_table[key] == stats[key].encode()
+    mask &= record_table["dataquality"] == stats.mseed.dataquality.encode()
+    records = record_table[mask]
+    if not len(records) or not npts:
+        return None
+    records = records[np.argsort(records["starttime"], kind="mergesort")]
+    delta = 1e9 / stats.sampling_rate
+    starttime = stats.starttime._ns
+
+    chunks = []
+    count = 0
+    while count < npts:
+        expected = starttime + int(round(count * delta))
+        idx = np.searchsorted(records["starttime"], expected - delta / 2.0)
+        if idx == len(records) or \
+                abs(records["starttime"][idx] - expected) > delta / 2.0:
+            return None
+        record = records[idx]
+        dtype = np.dtype(ENCODINGS[record["encoding"]][2]).newbyteorder(
+            ">" if record["byteorder"] else "<")
+        start = record["offset"] + record["data_offset"]
+        end = start + record["npts"] * dtype.itemsize
+        if end > record["offset"] + record["record_length"]:
+            return None
+        chunks.append(bfr_np[start:end].view(dtype))
+        count += record["npts"]
+    if count != npts or len(set(_c.dtype for _c in chunks)) != 1:
+        return None
+
+    native = chunks[0].dtype.newbyteorder("=")
+    if len(chunks) == 1 and chunks[0].dtype.isnative:
+        return chunks[0]
+    data = np.empty(npts, dtype=native)
+    count = 0
+    for chunk in chunks:
+        data[count:count + len(chunk)] = chunk
+        count += len(chunk)
+    return data
+
+
+def iread_mseed(file, chunk_records=1024, starttime=None, endtime=None,
+                sourcename=None, headonly=False, reclen=None, details=False,
+                header_byteorder=None, verbose=None):
+    """
+    Iteratively read a MiniSEED file and yield small ObsPy Streams.
+
+    The records are read sequentially and decoded in chunks of
+    ``chunk_records`` records. Only a single chunk is held in memory at any
+    time - this function is thus suitable for processing arbitrarily large
+    MiniSEED files as well as never ending streams of records, e.g. arriving
+    on a socket. The input is never seeked.
+
+    Traces extending across chunk boundaries are split into one trace per
+    chunk. Merge consecutive streams if continuous traces are required.
+
+    >>> from obspy.core.util import get_example_file
+    >>> filename = get_example_file(
+    ...     "BW.BGLD.__.EHE.D.2008.001.first_10_records")
+    >>> from obspy.io.mseed import iread_mseed
+    >>> for st in iread_mseed(filename, chunk_records=4):
+    ...     print(st)  # doctest: +ELLIPSIS
+    1 Trace(s) in Stream:
+    BW.BGLD..EHE | 2007-12-31T23:59:59.915000Z - ... | 200.0 Hz, 1648 samples
+    1 Trace(s) in Stream:
+    BW.BGLD..EHE | 2008-01-01T00:00:08.155000Z - ... | 200.0 Hz, 1648 samples
+    1 Trace(s) in Stream:
+    BW.BGLD..EHE | 2008-01-01T00:00:16.395000Z - ... | 200.0 Hz, 824 samples
+
+    :param file: File name, open file like object or a connected socket.
+    :type chunk_records: int
+    :param chunk_records: Number of records decoded at once.
+    :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param starttime: Only yield records with data after or at the start
+        time.
+    :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param endtime: Only yield records with data before or at the end time.
+    :type sourcename: str
+    :param sourcename: Only yield data with matching SEED ID (can contain
+        wildcards "?" and "*", e.g. "BW.UH2.*" or "*.??Z").
+    :param headonly: Determines whether or not to unpack the data or just
+        read the headers.
+    :param reclen: Record length in bytes. Only required for records without
+        a blockette 1000 in their first 128 bytes, otherwise it is detected
+        for every record.
+    :type details: bool
+    :param details: See :func:`~obspy.io.mseed.core._read_mseed`.
+    :param header_byteorder: See :func:`~obspy.io.mseed.core._read_mseed`.
+    :rtype: generator of :class:`~obspy.core.stream.Stream`
+    """
+    if int(chunk_records) < 1:
+        msg = "chunk_records must be a positive integer."
+        raise ValueError(msg)
+    kwargs = dict(chunk_records=int(chunk_records), starttime=starttime,
+                  endtime=endtime, sourcename=sourcename, headonly=headonly,
+                  reclen=reclen, details=details,
+                  header_byteorder=header_byteorder, verbose=verbose)
+    if isinstance(file, PurePath):
+        file = str(file)
+    # Open the file if it is not a file like object.
+    if isinstance(file, str):
+        with io.open(file, 'rb') as open_file:
+            for st in _internal_iread_mseed(open_file, **kwargs):
+                yield st
+        return
+    # Sockets have to be wrapped in a buffered reader.
+    if not hasattr(file, 'read') and hasattr(file, 'makefile'):
+        with file.makefile('rb') as open_file:
+            for st in _internal_iread_mseed(open_file, **kwargs):
+                yield st
+        return
+    # Otherwise just read it.
+    for st in _internal_iread_mseed(file, **kwargs):
+        yield st
+
+
+def _internal_iread_mseed(file, chunk_records, reclen=None, **kwargs):
+    """
+    Internal version of iread_mseed() working only with open file-like
+    objects.
+    """
+    def decode(chunk):
+        st = _read_mseed(io.BytesIO(b"".join(chunk)), **kwargs)
+        for tr in st:
+            tr.stats._format = "MSEED"
+        return st
+
+    chunk = []
+    for record in _iter_mseed_records(file, reclen=reclen):
+        chunk.append(record)
+        if len(chunk) < chunk_records:
+            continue
+        st = decode(chunk)
+        chunk = []
+        if len(st):
+            yield st
+    if chunk:
+        st = decode(chunk)
+        if len(st):
+            yield st
+
+
+def _iter_mseed_records(file, reclen=None):
+    """
+    Sequentially reads an open file-like object and yields the raw bytes of
+    all data records.
+
+    The record length is detected for every record (or assumed to be
+    ``reclen`` if given). Blank/noise records and the control headers of
+    full SEED volumes are skipped.
+    """
+    minreclen = 128
+    # Bytes which have been read ahead while searching for the next record.
+    pending = [b""]
+
+    def read(size):
+        data = pending[0][:size]
+        pending[0] = pending[0][size:]
+        # Short reads are possible for pipes and sockets.
+        while len(data) < size:
+            _d = file.read(size - len(data))
+            if not _d:
+                break
+            data += _d
+        return data
+
+    def detect(data):
+        return clibmseed.ms_detect(from_buffer(data, dtype=np.int8),
+                                   len(data))
+
+    control_reclen = reclen
+    while True:
+        header = read(minreclen)
+        if len(header) < minreclen:
+            if header.strip(b" \x00"):
+                msg = ("Last record only has %i byte(s) which is not enough "
+                       "to constitute a full SEED record. It will be "
+                       "skipped." % len(header))
+                warnings.warn(msg, InternalMSEEDWarning)
+            return
+        code = header[6:7]
+        if code in (b"D", b"R", b"Q", b"M"):
+            length = reclen or detect(header)
+            if length > 0:
+                yield header + read(length - minreclen)
+                continue
+            # No blockette 1000 - the record ends where the next one starts.
+            record = header
+            while True:
+                block = read(minreclen)
+                if len(block) < minreclen or detect(block) >= 0:
+                    pending[0] = block + pending[0]
+                    break
+                record += block
+            yield record
+        elif not header[6:48].strip(b" "):
+            # Blank/noise record.
+            continue
+        elif ord(code) in SEED_CONTROL_HEADERS:
+            # The volume index control header knows the record length of all
+            # control headers.
+            position = 8
+            while code == b"V" and position + 13 <= minreclen:
+                try:
+                    if header[position:position + 3] in (b"005", b"008",
+                                                         b"010"):
+                        control_reclen = 2 ** int(
+                            header[position + 11:position + 13])
+                        break
+                    position += int(header[position + 3:position + 7])
+                except ValueError:
+                    break
+            if not control_reclen:
+                msg = ("Could not determine the record length of a SEED "
+                       "control header. Please specify reclen.")
+                raise ObsPyMSEEDError(msg)
+            read(control_reclen - minreclen)
+        else:
+            msg = 'Not a valid (Mini-)SEED file'
+            raise ObsPyMSEEDError(msg)
 
 
 def _np_copy_astype(data, dtype):
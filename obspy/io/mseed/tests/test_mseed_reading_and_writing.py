@@ -4,6 +4,8 @@ import glob
 import io
 import re
 import os
+import socket
+import threading
 import unittest
 import warnings
 from datetime import datetime
@@ -16,7 +18,7 @@ from obspy.core import AttribDict
 from obspy.core.compatibility import from_buffer
 from obspy.core.util import CatchOutput, NamedTemporaryFile
 from obspy.io.mseed import (util, InternalMSEEDWarning,
-                            InternalMSEEDError, ObsPyMSEEDError)
+                            InternalMSEEDError, ObsPyMSEEDError, iread_mseed)
 from obspy.io.mseed.core import _is_mseed, _read_mseed, _write_mseed
 from obspy.io.mseed.headers import ENCODINGS, clibmseed
 from obspy.io.mseed.msstruct import _MSStruct
@@ -1611,6 +1613,191 @@ class MSEEDReadingAndWritingTestCase(unittest.TestCase):
         del tr2.stats["mseed"]
         self.assertEqual(tr, tr2)
 
+    def test_read_with_mmap(self):
+        """
+        Reading memory mapped files must result in the same streams, with and
+        without time windows.
+        """
+        files = glob.glob(os.path.join(self.path, 'data', 'encoding',
+                                       '*.mseed'))
+        files += [os.path.join(self.path, 'data', _i) for _i in (
+            'gaps.mseed', 'two_channels.mseed', 'fullseed.mseed',
+            'timingquality.mseed', 'single_record_plus_noise_record.mseed')]
+        for filename in files:
+            st = read(filename)
+            self.assertEqual(read(filename, mmap=True), st)
+            # File-like objects are also accepted.
+            with io.open(filename, 'rb') as fh:
+                self.assertEqual(read(fh, mmap=True), st)
+            t1 = min(tr.stats.starttime for tr in st)
+            t2 = max(tr.stats.endtime for tr in st)
+            for start, end in ((0.1, 0.3), (0.6, 0.9), (0.0, 0.05)):
+                kwargs = {'starttime': t1 + (t2 - t1) * start,
+                          'endtime': t1 + (t2 - t1) * end}
+                self.assertEqual(read(filename, mmap=True, **kwargs),
+                                 read(filename, **kwargs))
+        # Time window without any data.
+        self.assertEqual(len(read(files[-1], mmap=True,
+                                  starttime=UTCDateTime(2100, 1, 1))), 0)
+
+    def test_read_with_mmap_uncompressed_data(self):
+        """
+        Uncompressed samples are directly taken from the memory mapped file.
+        """
+        tr = Trace(data=np.arange(20000, dtype=np.float64))
+        tr.stats.sampling_rate = 100.0
+        with NamedTemporaryFile() as tf:
+            tr.write(tf.name, format='MSEED', encoding='FLOAT64',
+                     reclen=512, byteorder='=')
+            st = read(tf.name, mmap=True)
+            np.testing.assert_array_equal(st[0].data, tr.data)
+            self.assertEqual(st[0].stats.npts, 20000)
+            self.assertTrue(st[0].data.flags.writeable)
+            t = UTCDateTime(0) + 100
+            st = read(tf.name, mmap=True, starttime=t, endtime=t + 5)
+            np.testing.assert_array_equal(st[0].data, np.arange(
+                10000, 10501, dtype=np.float64))
+            st = read(tf.name, mmap=True, starttime=t, endtime=t + 0.1)
+            del st
+
+            # A single record is a read-only view on the mapped file.
+            tr.data = tr.data[:50]
+            tr.write(tf.name, format='MSEED', encoding='FLOAT64',
+                     reclen=512, byteorder='=')
+            st = read(tf.name, mmap=True)
+            np.testing.assert_array_equal(st[0].data, tr.data)
+            self.assertFalse(st[0].data.flags.writeable)
+            self.assertEqual(st[0].data.dtype, np.float64)
+            del st
+
+    def test_get_record_table(self):
+        """
+        Tests the vectorized parsing of all record headers.
+        """
+        filename = os.path.join(self.path, 'data', 'gaps.mseed')
+        bfr_np = np.fromfile(filename, dtype=np.int8)
+        table = util._get_record_table(bfr_np, 512, '>')
+        self.assertEqual(len(table), 128)
+        np.testing.assert_array_equal(table['offset'],
+                                      np.arange(128) * 512)
+        st = read(filename)
+        self.assertEqual(table['starttime'][0], st[0].stats.starttime._ns)
+        self.assertEqual(table['endtime'][-1], st[-1].stats.endtime._ns)
+        self.assertEqual(table['npts'].sum(),
+                         sum(tr.stats.npts for tr in st))
+        self.assertTrue((table['encoding'] == 10).all())
+        self.assertTrue((table['station'] == b'BGLD').all())
+        # Wrong record length or byte order.
+        self.assertIsNone(util._get_record_table(bfr_np, 4096, '>'))
+        self.assertIsNone(util._get_record_table(bfr_np, 512, '<'))
+
+    def test_iread_mseed(self):
+        """
+        Iteratively reading files in chunks of records has to result in the
+        same data as reading it at once.
+        """
+        files = glob.glob(os.path.join(self.path, 'data', 'encoding',
+                                       '*.mseed'))
+        files += [os.path.join(self.path, 'data', _i) for _i in (
+            'gaps.mseed', 'two_channels.mseed', 'fullseed.mseed',
+            'various_noise_records.mseed',
+            'reclen_1024_without_sequence_numbers.mseed')]
+        for filename in files:
+            st = read(filename)
+            for chunk_records in (1, 3, 1000):
+                streams = list(iread_mseed(filename,
+                                           chunk_records=chunk_records))
+                got = Stream()
+                for _st in streams:
+                    self.assertLessEqual(
+                        max(tr.stats.mseed.number_of_records for tr in _st),
+                        chunk_records)
+                    got += _st
+                got.merge()
+                for tr in got:
+                    del tr.stats.mseed
+                expected = st.copy().merge()
+                for tr in expected:
+                    del tr.stats.mseed
+                self.assertEqual(got, expected)
+            # Open files and file-like objects.
+            with io.open(filename, 'rb') as fh:
+                self.assertEqual(len(list(iread_mseed(fh))), 1)
+            with io.open(filename, 'rb') as fh:
+                buf = io.BytesIO(fh.read())
+            self.assertEqual(len(list(iread_mseed(buf))), 1)
+
+        # Selections.
+        filename = os.path.join(self.path, 'data', 'two_channels.mseed')
+        t = UTCDateTime("2010-06-20T00:00:01")
+        for kwargs in ({'starttime': t}, {'endtime': t},
+                       {'sourcename': '*.?HZ'}, {'headonly': True}):
+            st = _read_mseed(filename, **kwargs)
+            got = Stream()
+            for _st in iread_mseed(filename, **kwargs):
+                got += _st
+            self.assertEqual(len(got), len(st))
+            for tr, tr2 in zip(got, st):
+                self.assertEqual(tr.stats.starttime, tr2.stats.starttime)
+                self.assertEqual(tr.stats.npts, tr2.stats.npts)
+        with self.assertRaises(ValueError):
+            next(iread_mseed(filename, chunk_records=0))
+
+    def test_iread_mseed_from_socket(self):
+        """
+        Records arriving on a socket are decoded as they come in.
+        """
+        filename = os.path.join(self.path, 'data', 'gaps.mseed')
+        with io.open(filename, 'rb') as fh:
+            data = fh.read()
+        sender, receiver = socket.socketpair()
+
+        def send():
+            # Send in odd sized packets to get short reads.
+            for i in range(0, len(data), 1000):
+                sender.sendall(data[i:i + 1000])
+            sender.close()
+
+        thread = threading.Thread(target=send)
+        thread.start()
+        try:
+            got = Stream()
+            for st in iread_mseed(receiver, chunk_records=16):
+                got += st
+        finally:
+            thread.join()
+            receiver.close()
+        expected = read(filename).merge()
+        got.merge()
+        self.assertEqual([tr.stats.npts for tr in got],
+                         [tr.stats.npts for tr in expected])
+        for tr, tr2 in zip(got, expected):
+            np.testing.assert_array_equal(tr.data, tr2.data)
+
+    def test_read_lazy(self):
+        """
+        Lazily read traces only decode the records overlapping the remaining
+        time window on first access of the data.
+        """
+        for name in ('gaps.mseed', 'two_channels.mseed',
+                     'timingquality.mseed'):
+            filename = os.path.join(self.path, 'data', name)
+            st = read(filename)
+            st_lazy = read(filename, lazy=True)
+            self.assertTrue(all('_lazy_data' in tr.__dict__
+                                for tr in st_lazy))
+            for tr, tr_lazy in zip(st, st_lazy):
+                t1 = tr.stats.starttime + (tr.stats.endtime -
+                                           tr.stats.starttime) * 0.3
+                t2 = tr.stats.starttime + (tr.stats.endtime -
+                                           tr.stats.starttime) * 0.6
+                tr_slice = tr_lazy.slice(t1, t2)
+                self.assertIn('_lazy_data', tr_slice.__dict__)
+                expected = tr.slice(t1, t2)
+                self.assertEqual(tr_slice.stats, expected.stats)
+                np.testing.assert_array_equal(tr_slice.data, expected.data)
+            self.assertEqual(st_lazy, st)
+
 
 def suite():
     return unittest.makeSuite(MSEEDReadingAndWritingTestCase, 'test')
@@ -7,6 +7,7 @@ import shutil
 import sys
 import unittest
 from datetime import datetime
+from unittest import mock
 from struct import pack, unpack
 import warnings
 
@@ -1334,6 +1335,107 @@ class MSEEDUtilTestCase(unittest.TestCase):
         self.assertEqual(
             str(e.exception), "No MiniSEED data record found in file.")
 
+    def test_record_index(self):
+        """
+        Tests building, reading and invalidating a record index sidecar and
+        reading with it.
+        """
+        tr = Trace(data=np.arange(50000, dtype=np.int32))
+        tr.stats.sampling_rate = 100.0
+        tr2 = tr.copy()
+        tr2.stats.channel = "EHN"
+        st = Stream(traces=[tr, tr2])
+        with NamedTemporaryFile() as tf:
+            st.write(tf.name, format="MSEED", reclen=512)
+            index_file = tf.name + ".index.npz"
+            try:
+                index = util.build_record_index(tf.name)
+                self.assertTrue(os.path.exists(index_file))
+                self.assertTrue(np.all(np.diff(index["starttime"]) >= 0))
+                self.assertEqual(index["npts"].sum(), 100000)
+                self.assertEqual(sorted(set(index["channel"])),
+                                 [b"", b"EHN"])
+                np.testing.assert_array_equal(
+                    util.read_record_index(tf.name), index)
+
+                # Reading with the index returns the same data.
+                t1 = UTCDateTime(0) + 123.45
+                for kwargs in ({"starttime": t1, "endtime": t1 + 30},
+                               {"starttime": t1},
+                               {"endtime": t1},
+                               {"sourcename": "*.EHN"},
+                               {"starttime": t1, "sourcename": "*.EHN"},
+                               {"starttime": UTCDateTime(2000, 1, 1)}):
+                    self.assertEqual(
+                        _read_mseed(tf.name, record_index=True, **kwargs),
+                        _read_mseed(tf.name, **kwargs))
+
+                # Changing the file invalidates the index which will then be
+                # rebuilt when reading.
+                st.write(tf.name, format="MSEED", reclen=4096)
+                os.utime(tf.name, ns=(0, 0))
+                self.assertIsNone(util.read_record_index(tf.name))
+                got = _read_mseed(tf.name, starttime=t1, endtime=t1 + 10,
+                                  record_index=True)
+                self.assertEqual(
+                    got, _read_mseed(tf.name, starttime=t1, endtime=t1 + 10))
+                index = util.read_record_index(tf.name)
+                self.assertEqual(index["record_length"][0], 4096)
+
+                # Sidecars that can not be written (e.g. in read-only
+                # archives) do not keep the file from being read.
+                kwargs = {"starttime": t1, "endtime": t1 + 10}
+                expected = _read_mseed(tf.name, **kwargs)
+                missing = os.path.join(os.path.dirname(tf.name), "missing",
+                                       "index.npz")
+                self.assertEqual(
+                    _read_mseed(tf.name, record_index=missing, **kwargs),
+                    expected)
+                os.remove(index_file)
+                with mock.patch("os.replace", side_effect=PermissionError):
+                    got = _read_mseed(tf.name, record_index=True, **kwargs)
+                self.assertEqual(got, expected)
+                self.assertEqual(
+                    [f for f in os.listdir(os.path.dirname(tf.name))
+                     if f.startswith(os.path.basename(index_file))], [])
+                # The index is then kept in memory until the file changes.
+                build = mock.MagicMock(wraps=util._build_record_table)
+                with mock.patch("os.replace", side_effect=PermissionError), \
+                        mock.patch.object(util, "_build_record_table",
+                                          build):
+                    got = _read_mseed(tf.name, record_index=True, **kwargs)
+                    self.assertEqual(got, expected)
+                    self.assertEqual(build.call_count, 0)
+                    os.utime(tf.name, ns=(1, 1))
+                    got = _read_mseed(tf.name, record_index=True, **kwargs)
+                    self.assertEqual(got, expected)
+                    self.assertEqual(build.call_count, 1)
+
+                # Records the index locates at other record lengths or at
+                # offsets not aligned to the record length are read by
+                # scanning the whole file.
+                index = util._build_record_table(tf.name)
+                for field, change in (("record_length", 512),
+                                      ("offset", 1)):
+                    broken = index.copy()
+                    broken[field] += change
+                    with mock.patch.object(util, "_get_record_index",
+                                           return_value=broken):
+                        got = _read_mseed(tf.name, record_index=True,
+                                          **kwargs)
+                    self.assertEqual(got, expected)
+            finally:
+                util._RECORD_INDEX_CACHE.clear()
+                if os.path.exists(index_file):
+                    os.remove(index_file)
+
+        # Files without blockettes 1000 can not be indexed.
+        filename = os.path.join(self.path, "data", "bizarre",
+                                "mseed_no_blkt_1000.mseed")
+        with NamedTemporaryFile(suffix=".npz") as tf:
+            with self.assertRaises(ValueError):
+                util.build_record_index(filename, tf.name)
+
 
 def suite():
     return unittest.makeSuite(MSEEDUtilTestCase, 'test')
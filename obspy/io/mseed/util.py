@@ -4,6 +4,8 @@ MiniSEED specific utilities.
 """
 import collections
 import ctypes as C  # NOQA
+import fnmatch
+import io
 import os
 import sys
 import warnings
@@ -19,8 +21,8 @@ from . import InternalMSEEDParseTimeError
 from .headers import (ENCODINGS, ENDIAN, FIXED_HEADER_ACTIVITY_FLAGS,
                       FIXED_HEADER_DATA_QUAL_FLAGS,
                       FIXED_HEADER_IO_CLOCK_FLAGS, HPTMODULUS,
-                      SAMPLESIZES, UNSUPPORTED_ENCODINGS, MSRecord,
-                      MS_NOERROR, clibmseed)
+                      SAMPLESIZES, SEED_CONTROL_HEADERS,
+                      UNSUPPORTED_ENCODINGS, MSRecord, MS_NOERROR, clibmseed)
 
 
 def get_start_and_end_time(file_or_file_object):
@@ -873,6 +875,390 @@ def _convert_mstime_to_datetime(timestring):
     return UTCDateTime(ns=int(round(timestring * 10**3)))
 
 
+def _gather_record_values(records, rows, positions, dtype):
+    """
+    Gathers one value of the given dtype per selected record.
+
+    :type records: :class:`numpy.ndarray`
+    :param records: Two dimensional uint8 array with one record per row.
+    :param rows: Indices of the records to read from.
+    :param positions: Byte positions of the values within each record.
+    :param dtype: NumPy dtype (including byte order) of the values.
+    """
+    dtype = np.dtype(dtype)
+    idx = positions[:, None] + np.arange(dtype.itemsize)
+    return np.ascontiguousarray(records[rows[:, None], idx]).view(dtype)[:, 0]
+
+
+def _get_record_table(bfr_np, record_length, byteorder):
+    """
+    Parses the fixed section data headers of all records in a buffer holding
+    MiniSEED records of one constant record length.
+
+    Only the headers and blockettes 100, 1000 and 1001 are read which means
+    that for memory mapped buffers only the pages containing the record
+    headers are touched.
+
+    :type bfr_np: :class:`numpy.ndarray`
+    :param bfr_np: One dimensional int8 buffer starting with a data record.
+    :type record_length: int
+    :param record_length: Record length in bytes.
+    :type byteorder: str
+    :param byteorder: Header byte order, either ``"<"`` or ``">"``.
+    :rtype: :class:`numpy.ndarray` or None
+    :return: Structured array with one entry per data record in file order.
+        Times are given as integer nanoseconds since the epoch, ``endtime``
+        is the time of the last sample. ``None`` is returned if the buffer
+        does not consist of records of a single record length and byte order
+        each carrying a blockette 1000, e.g. the layout has to be interpreted
+        by libmseed.
+    """
+    buflen = len(bfr_np)
+    if not record_length or record_length < 128 or buflen % record_length:
+        return None
+    records = bfr_np.view(np.uint8).reshape(-1, record_length)
+    bo = byteorder
+    header_dtype = np.dtype([
+        ('sequence_number', 'S6'), ('dataquality', 'S1'), ('reserved', 'S1'),
+        ('station', 'S5'), ('location', 'S2'), ('channel', 'S3'),
+        ('network', 'S2'), ('year', bo + 'u2'), ('julday', bo + 'u2'),
+        ('hour', 'u1'), ('minute', 'u1'), ('second', 'u1'), ('unused', 'u1'),
+        ('fract', bo + 'u2'), ('npts', bo + 'u2'),
+        ('samp_rate_factor', bo + 'i2'), ('samp_rate_mult', bo + 'i2'),
+        ('activity_flags', 'u1'), ('io_and_clock_flags', 'u1'),
+        ('data_quality_flags', 'u1'), ('number_of_blockettes', 'u1'),
+        ('time_correction', bo + 'i4'), ('data_offset', bo + 'u2'),
+        ('first_blockette', bo + 'u2')])
+    # Copying the fixed headers only touches the first bytes of each record.
+    fixed = np.ascontiguousarray(records[:, :48]).view(header_dtype)[:, 0]
+
+    # Blank/noise records are skipped by libmseed - everything else has to be
+    # a valid data record.
+    is_data = np.in1d(fixed['dataquality'], [b'D', b'R', b'Q', b'M'])
+    is_blank = (records[:, 6:48] == ord(' ')).all(axis=1)
+    if not (is_data | is_blank).all():
+        return None
+    fixed = fixed[is_data]
+    rows = np.nonzero(is_data)[0]
+    if ((fixed['julday'] < 1) | (fixed['julday'] > 366) |
+            (fixed['hour'] > 23) | (fixed['minute'] > 59) |
+            (fixed['second'] > 60)).any():
+        return None
+
+    days = (fixed['year'].astype(np.int64) - 1970).astype('datetime64[Y]')
+    days = days.astype('datetime64[D]').astype(np.int64) + \
+        fixed['julday'] - 1
+    starttime = (days * 86400 + fixed['hour'].astype(np.int64) * 3600 +
+                 fixed['minute'].astype(np.int64) * 60 +
+                 fixed['second'].astype(np.int64)) * 10 ** 9 + \
+        fixed['fract'].astype(np.int64) * 10 ** 5
+    # Time correction is in units of 0.0001 seconds and only applied if bit 1
+    # of the activity flags is not set.
+    not_applied = (fixed['activity_flags'] & 2) == 0
+    starttime += np.where(not_applied, fixed['time_correction'], 0) * 10 ** 5
+
+    factor = fixed['samp_rate_factor'].astype(np.float64)
+    mult = fixed['samp_rate_mult'].astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        samp_rate = np.select(
+            [(factor > 0) & (mult > 0), (factor > 0) & (mult < 0),
+             (factor < 0) & (mult > 0), (factor < 0) & (mult < 0)],
+            [factor * mult, -factor / mult, -mult / factor,
+             1.0 / (factor * mult)], default=0.0)
+
+    # Follow the blockette chains of all records simultaneously.
+    encoding = np.full(len(rows), -1, dtype=np.int16)
+    word_order = np.full(len(rows), -1, dtype=np.int16)
+    reclen_exp = np.zeros(len(rows), dtype=np.int16)
+    position = fixed['first_blockette'].astype(np.int64)
+    for _ in range(32):
+        active = np.nonzero((position >= 48) &
+                            (position + 8 <= record_length))[0]
+        if not len(active):
+            break
+        pos = position[active]
+        r = rows[active]
+        blkt_type = _gather_record_values(records, r, pos, bo + 'u2')
+        next_blkt = _gather_record_values(records, r, pos + 2, bo + 'u2')
+        _b = blkt_type == 1000
+        encoding[active[_b]] = records[r[_b], pos[_b] + 4]
+        word_order[active[_b]] = records[r[_b], pos[_b] + 5]
+        reclen_exp[active[_b]] = records[r[_b], pos[_b] + 6]
+        _b = blkt_type == 1001
+        starttime[active[_b]] += records[r[_b], pos[_b] + 5].view(
+            np.int8).astype(np.int64) * 1000
+        _b = (blkt_type == 100) & (pos + 8 <= record_length)
+        samp_rate[active[_b]] = _gather_record_values(
+            records, r[_b], pos[_b] + 4, bo + 'f4')
+        # Guard against loops in broken blockette chains.
+        next_blkt = next_blkt.astype(np.int64)
+        next_blkt[next_blkt <= pos] = 0
+        position[active] = next_blkt
+    if (encoding < 0).any() or ((word_order != 0) & (word_order != 1)).any():
+        return None
+    if (2 ** reclen_exp.astype(np.int64) != record_length).any():
+        return None
+
+    npts = fixed['npts'].astype(np.int64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        duration = np.where(samp_rate > 0,
+                            (npts - 1).clip(0) * 1e9 / samp_rate, 0.0)
+    table = np.empty(len(rows), dtype=_RECORD_TABLE_DTYPE)
+    table['offset'] = rows * record_length
+    table['record_length'] = record_length
+    for key in ('network', 'station', 'location', 'channel'):
+        table[key] = np.char.strip(fixed[key])
+    table['dataquality'] = fixed['dataquality']
+    table['starttime'] = starttime
+    table['endtime'] = starttime + np.round(duration).astype(np.int64)
+    table['sampling_rate'] = samp_rate
+    table['npts'] = npts
+    table['encoding'] = encoding
+    table['byteorder'] = word_order
+    table['data_offset'] = fixed['data_offset']
+    return table
+
+
+# Per record information as returned by _get_record_table().
+_RECORD_TABLE_DTYPE = np.dtype([
+    ('offset', np.int64), ('record_length', np.int32),
+    ('network', 'S2'), ('station', 'S5'), ('location', 'S2'),
+    ('channel', 'S3'), ('dataquality', 'S1'),
+    ('starttime', np.int64), ('endtime', np.int64),
+    ('sampling_rate', np.float64), ('npts', np.int32),
+    ('encoding', np.int8), ('byteorder', np.int8),
+    ('data_offset', np.int32)])
+
+
+# Version of the record index sidecar layout.
+_RECORD_INDEX_VERSION = 1
+
+# Record indices of files whose sidecar cannot be written, keyed by the
+# absolute file name and holding the size and modification time of the file
+# next to the index. Least recently used entries are dropped first.
+_RECORD_INDEX_CACHE = collections.OrderedDict()
+_RECORD_INDEX_CACHE_SIZE = 128
+
+
+def build_record_index(filename, index_filename=None):
+    """
+    Builds a record index for a MiniSEED file and stores it in a sidecar file.
+
+    The index holds the byte offset, SEED identifier, data quality, start and
+    end time, sampling rate, number of samples and encoding of every data
+    record of the file, sorted by start time. Reading with ``record_index``
+    (see :func:`~obspy.io.mseed.core._read_mseed`) uses it to binary search
+    the records overlapping the requested time window and only hands those
+    to libmseed instead of scanning the whole file.
+
+    The sidecar is a NumPy ``.npz`` file which also stores the size and the
+    modification time of the indexed file so stale indices are detected by
+    :func:`read_record_index`.
+
+    :type filename: str
+    :param filename: MiniSEED file name. Files with records of more than one
+        record length cannot be indexed.
+    :type index_filename: str, optional
+    :param index_filename: File name of the sidecar. Defaults to the file
+        name with ``.index.npz`` appended.
+    :rtype: :class:`numpy.ndarray`
+    :return: The record index as a structured array.
+
+    .. rubric:: Example
+
+    >>> from obspy.core.util import get_example_file
+    >>> from obspy.core.util import NamedTemporaryFile
+    >>> filename = get_example_file("gaps.mseed")
+    >>> with NamedTemporaryFile(suffix=".npz") as tf:
+    ...     index = build_record_index(filename, tf.name)
+    ...     print(len(read_record_index(filename, tf.name)))
+    128
+    >>> print(index["station"][0], UTCDateTime(ns=index["starttime"][0]))
+    b'BGLD' 2007-12-31T23:59:59.915000Z
+    """
+    if index_filename is None:
+        index_filename = _get_record_index_filename(filename)
+    stat = os.stat(filename)
+    table = _build_record_table(filename)
+    _write_record_index(index_filename, table, stat)
+    return table
+
+
+def _build_record_table(filename):
+    """
+    Returns the record table of a MiniSEED file sorted by start time.
+
+    Raises a ValueError if the file cannot be indexed, see
+    :func:`build_record_index`.
+    """
+    info = get_record_information(filename)
+    record_length = info["record_length"]
+    bfr_np = np.fromfile(filename, dtype=np.int8)
+    # Skip the control headers of full SEED files.
+    offset = 0
+    while offset < len(bfr_np) and \
+            bfr_np[offset + 6] in SEED_CONTROL_HEADERS:
+        offset += record_length
+    table = _get_record_table(bfr_np[offset:], record_length,
+                              info["byteorder"])
+    if table is None:
+        msg = ("Only files consisting of data records with a blockette 1000 "
+               "and a single record length and byte order can be indexed.")
+        raise ValueError(msg)
+    table["offset"] += offset
+    return table[np.argsort(table["starttime"], kind="mergesort")]
+
+
+def _write_record_index(index_filename, table, stat):
+    """
+    Writes a record index sidecar for a file with the given ``os.stat()``.
+    """
+    # Write to a temporary file first so concurrent readers never see a
+    # partially written index.
+    tmp_filename = index_filename + ".tmp%i" % os.getpid()
+    try:
+        with io.open(tmp_filename, "wb") as fh:
+            np.savez(fh, records=table, filesize=stat.st_size,
+                     mtime=stat.st_mtime_ns, version=_RECORD_INDEX_VERSION)
+        os.replace(tmp_filename, index_filename)
+    except BaseException:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+
+
+def read_record_index(filename, index_filename=None):
+    """
+    Reads the record index sidecar of a MiniSEED file.
+
+    See :func:`build_record_index` for details.
+
+    :type filename: str
+    :param filename: MiniSEED file name.
+    :type index_filename: str, optional
+    :param index_filename: File name of the sidecar. Defaults to the file
+        name with ``.index.npz`` appended.
+    :rtype: :class:`numpy.ndarray` or None
+    :return: The record index as a structured array or ``None`` if the
+        sidecar does not exist or the size or modification time of the
+        MiniSEED file changed since it has been written.
+    """
+    if index_filename is None:
+        index_filename = _get_record_index_filename(filename)
+    if not os.path.exists(index_filename):
+        return None
+    stat = os.stat(filename)
+    try:
+        with np.load(index_filename) as npz:
+            if int(npz["version"]) != _RECORD_INDEX_VERSION or \
+                    int(npz["filesize"]) != stat.st_size or \
+                    int(npz["mtime"]) != stat.st_mtime_ns:
+                return None
+            return npz["records"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _get_record_index_filename(filename):
+    return filename + ".index.npz"
+
+
+def _get_record_index(filename, index_filename=None):
+    """
+    Returns the record index of a MiniSEED file, (re-)building it if
+    the sidecar is missing or stale.
+
+    Returns ``None`` if the file cannot be indexed. If the sidecar cannot be
+    written (e.g. in a read-only archive) the index is kept in memory until
+    the size or modification time of the file changes.
+    """
+    index = read_record_index(filename, index_filename=index_filename)
+    if index is not None:
+        return index
+    if index_filename is None:
+        index_filename = _get_record_index_filename(filename)
+    stat = os.stat(filename)
+    key = (os.path.abspath(filename), os.path.abspath(index_filename))
+    cached = _RECORD_INDEX_CACHE.get(key)
+    if cached is not None and \
+            cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        try:
+            _RECORD_INDEX_CACHE.move_to_end(key)
+        except KeyError:
+            pass
+        return cached[2]
+    try:
+        index = _build_record_table(filename)
+    except ValueError:
+        return None
+    try:
+        _write_record_index(index_filename, index, stat)
+    except OSError:
+        _RECORD_INDEX_CACHE[key] = (stat.st_size, stat.st_mtime_ns, index)
+        while len(_RECORD_INDEX_CACHE) > _RECORD_INDEX_CACHE_SIZE:
+            try:
+                _RECORD_INDEX_CACHE.popitem(last=False)
+            except KeyError:
+                break
+    else:
+        _RECORD_INDEX_CACHE.pop(key, None)
+    return index
+
+
+def _select_records(record_table, starttime=None, endtime=None):
+    """
+    Returns all records of a record table overlapping the given time window.
+
+    The selection is generous by one sample on each side as libmseed does the
+    actual selection.
+    """
+    with np.errstate(divide='ignore'):
+        delta = np.where(record_table["sampling_rate"] > 0,
+                         1e9 / record_table["sampling_rate"], 0.0)
+    mask = np.ones(len(record_table), dtype=bool)
+    if starttime is not None:
+        mask &= record_table["endtime"] + delta >= starttime._ns
+    if endtime is not None:
+        mask &= record_table["starttime"] - delta <= endtime._ns
+    return record_table[mask]
+
+
+def _search_record_index(index, starttime=None, endtime=None,
+                         sourcename=None):
+    """
+    Returns all records of a record index (sorted by start time) that might
+    contain data in the given time window and match the given SEED
+    identifier, in file order.
+
+    The time window is located via binary search.
+    """
+    if len(index) and (starttime is not None or endtime is not None):
+        with np.errstate(divide='ignore'):
+            delta = np.where(index["sampling_rate"] > 0,
+                             1e9 / index["sampling_rate"], 0.0).max()
+        # Records are sorted by start time - thus the longest record bounds
+        # the earliest possible start of a record overlapping the window.
+        longest = (index["endtime"] - index["starttime"]).max()
+        start, end = 0, len(index)
+        if starttime is not None:
+            start = np.searchsorted(index["starttime"],
+                                    starttime._ns - longest - delta, "left")
+        if endtime is not None:
+            end = np.searchsorted(index["starttime"], endtime._ns + delta,
+                                  "right")
+        index = _select_records(index[start:end], starttime, endtime)
+    if sourcename is not None and len(index):
+        ids = np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(
+            np.char.add(index["network"], b"."), index["station"]), b"."),
+            index["location"]), b"."), index["channel"])
+        matches = dict(
+            (_id, fnmatch.fnmatchcase(_id.decode("ascii", "ignore"),
+                                      sourcename))
+            for _id in np.unique(ids))
+        index = index[np.array([matches[_id] for _id in ids], dtype=bool)]
+    return index[np.argsort(index["offset"], kind="mergesort")]
+
+
 def _unpack_steim_1(data, npts, swapflag=0, verbose=0):
     """
     Unpack steim1 compressed data given as numpy array.
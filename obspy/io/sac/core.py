@@ -13,8 +13,11 @@ import os
 import struct
 
 from obspy import Stream
+from obspy.core.compatibility import from_buffer
+from obspy.core.trace import LazyData
 
 from .sactrace import SACTrace
+from .util import SacIOError
 
 
 def _is_sac(filename):
@@ -303,7 +306,7 @@ def _internal_write_sac_xy(trace, buf, **kwargs):  # @UnusedVariable
 
 
 def _read_sac(filename, headonly=False, debug_headers=False, fsize=True,
-              **kwargs):  # @UnusedVariable
+              lazy=False, **kwargs):  # @UnusedVariable
     """
     Reads an SAC file and returns an ObsPy Stream object.
 
@@ -326,6 +329,9 @@ def _read_sac(filename, headonly=False, debug_headers=False, fsize=True,
     :param fsize: Check if file size is consistent with theoretical size
         from header. Defaults to ``True``.
     :type fsize: bool
+    :param lazy: If set to True, read only the header and decode the samples
+        on first access of the trace's data. Only used for file names.
+    :type lazy: bool
     :rtype: :class:`~obspy.core.stream.Stream`
     :return: A ObsPy Stream object.
 
@@ -340,10 +346,16 @@ def _read_sac(filename, headonly=False, debug_headers=False, fsize=True,
                                   debug_headers=debug_headers, fsize=fsize,
                                   **kwargs)
     elif isinstance(filename, (str, bytes)):
+        lazy = lazy and not headonly
         with open(filename, "rb") as fh:
-            return _internal_read_sac(buf=fh, headonly=headonly,
-                                      debug_headers=debug_headers, fsize=fsize,
-                                      **kwargs)
+            st = _internal_read_sac(buf=fh, headonly=headonly or lazy,
+                                    debug_headers=debug_headers, fsize=fsize,
+                                    **kwargs)
+        if lazy:
+            for tr in st:
+                # Header only traces carry an empty array of the final dtype.
+                tr.data = _SACLazyData(filename, tr.stats.npts, tr.data.dtype)
+        return st
     else:
         raise ValueError("Cannot open '%s'." % filename)
 
@@ -394,6 +406,20 @@ def _internal_read_sac(buf, headonly=False, debug_headers=False, fsize=True,
     return Stream([tr])
 
 
+class _SACLazyData(LazyData):
+    """
+    Deferred handle to the samples of a binary SAC file.
+    """
+    def _read(self, start, npts):
+        with open(self.filename, "rb") as fh:
+            # The data section follows the 632 byte header.
+            fh.seek(632 + start * 4)
+            data = from_buffer(fh.read(npts * 4), dtype=self.dtype)
+        if len(data) != npts:
+            raise SacIOError("Cannot read all data points")
+        return data
+
+
 def _write_sac(stream, filename, byteorder="<", **kwargs):  # @UnusedVariable
     """
     Writes a SAC file.
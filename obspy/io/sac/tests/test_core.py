@@ -926,6 +926,20 @@ class CoreTestCase(unittest.TestCase):
         tr0 = read(self.file_encode, encoding='cp1252')[0]
         self.assertEqual(tr0.stats.get('channel'), 'ÇÏÿÿÇÏÿÿ')
 
+    def test_read_lazy(self):
+        """
+        Samples of lazily read SAC files are read on first access.
+        """
+        for filename in (self.file, self.filebe):
+            st = read(filename)
+            tr = read(filename, lazy=True)[0]
+            self.assertIn('_lazy_data', tr.__dict__)
+            self.assertEqual(tr.stats, st[0].stats)
+            tr2 = tr.slice(tr.stats.starttime + 10, tr.stats.endtime - 10)
+            self.assertEqual(tr2.stats.npts, 80)
+            np.testing.assert_array_equal(tr2.data, st[0].data[10:90])
+            self.assertEqual(tr, st[0])
+
 
 def suite():
     return unittest.makeSuite(CoreTestCase, 'test')
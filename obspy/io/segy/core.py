@@ -127,7 +127,7 @@ def _is_segy(filename):
 
 def _read_segy(filename, headonly=False, byteorder=None,
                textual_header_encoding=None, unpack_trace_headers=False,
-               **kwargs):  # @UnusedVariable
+               lazy=False, **kwargs):  # @UnusedVariable
     """
     Reads a SEG Y file and returns an ObsPy Stream object.
 
@@ -156,6 +156,10 @@ def _read_segy(filename, headonly=False, byteorder=None,
         header values can still be accessed and will be calculated on the fly
         but tab completion will no longer work. Look in the headers.py for a
         list of all possible trace header values. Defaults to ``False``.
+    :type lazy: bool, optional
+    :param lazy: If set to True, read only the headers and read the samples
+        of a trace on first access of its data. Only used for file names.
+        Defaults to ``False``.
     :returns: A ObsPy :class:`~obspy.core.stream.Stream` object.
 
     .. rubric:: Example
@@ -168,11 +172,19 @@ def _read_segy(filename, headonly=False, byteorder=None,
     1 Trace(s) in Stream:
     Seq. No. in line:    1 | 2009-06-22T14:47:37.000000Z - ... 2001 samples
     """
+    lazy = lazy and not headonly and isinstance(filename, str)
     # Read file to the internal segy representation.
     segy_object = _read_segyrev1(
         filename, endian=byteorder,
         textual_header_encoding=textual_header_encoding,
-        unpack_headers=unpack_trace_headers)
+        unpack_headers=unpack_trace_headers, headonly=lazy)
+    # Data of unsupported encodings is read as usual to raise right away.
+    if lazy and segy_object.traces and segy_object.traces[0].data_encoding \
+            not in DATA_SAMPLE_FORMAT_CODE_DTYPE:
+        return _read_segy(
+            filename, byteorder=byteorder,
+            textual_header_encoding=textual_header_encoding,
+            unpack_trace_headers=unpack_trace_headers)
     # Create the stream object.
     stream = Stream()
     # SEGY has several file headers that apply to all traces. They will be
@@ -202,7 +214,7 @@ def _read_segy(filename, headonly=False, byteorder=None,
     for tr in segy_object.traces:
         stream.append(tr.to_obspy_trace(
             headonly=headonly,
-            unpack_trace_headers=unpack_trace_headers))
+            unpack_trace_headers=unpack_trace_headers, lazy=lazy))
 
     return stream
 
@@ -421,7 +433,8 @@ def _is_su(filename):
 
 
 def _read_su(filename, headonly=False, byteorder=None,
-             unpack_trace_headers=False, **kwargs):  # @UnusedVariable
+             unpack_trace_headers=False, lazy=False,
+             **kwargs):  # @UnusedVariable
     """
     Reads a Seismic Unix (SU) file and returns an ObsPy Stream object.
 
@@ -446,6 +459,10 @@ def _read_su(filename, headonly=False, byteorder=None,
         header values can still be accessed and will be calculated on the fly
         but tab completion will no longer work. Look in the headers.py for a
         list of all possible trace header values. Defaults to ``False``.
+    :type lazy: bool, optional
+    :param lazy: If set to True, read only the headers and read the samples
+        of a trace on first access of its data. Only used for file names.
+        Defaults to ``False``.
     :returns: A ObsPy :class:`~obspy.core.stream.Stream` object.
 
     .. rubric:: Example
@@ -458,9 +475,11 @@ def _read_su(filename, headonly=False, byteorder=None,
     1 Trace(s) in Stream:
     ... | 2005-12-19T15:07:54.000000Z - ... | 4000.0 Hz, 8000 samples
     """
+    lazy = lazy and not headonly and isinstance(filename, str)
     # Read file to the internal segy representation.
     su_object = _read_su_file(filename, endian=byteorder,
-                              unpack_headers=unpack_trace_headers)
+                              unpack_headers=unpack_trace_headers,
+                              headonly=lazy)
 
     # Create the stream object.
     stream = Stream()
@@ -476,6 +495,8 @@ def _read_su(filename, headonly=False, byteorder=None,
         # skip data if headonly is set
         if headonly:
             trace.stats.npts = tr.npts
+        elif lazy:
+            trace.data = tr._get_lazy_data()
         else:
             trace.data = tr.data
         trace.stats.su = AttribDict()
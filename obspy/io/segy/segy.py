@@ -21,11 +21,12 @@ from obspy import Trace, UTCDateTime
 from obspy.core import AttribDict
 
 from .header import (BINARY_FILE_HEADER_FORMAT,
+                     DATA_SAMPLE_FORMAT_CODE_DTYPE,
                      DATA_SAMPLE_FORMAT_PACK_FUNCTIONS,
                      DATA_SAMPLE_FORMAT_SAMPLE_SIZE,
                      DATA_SAMPLE_FORMAT_UNPACK_FUNCTIONS, ENDIAN,
                      TRACE_HEADER_FORMAT, TRACE_HEADER_KEYS)
-from .unpack import OnTheFlyDataUnpacker
+from .unpack import OnTheFlyDataUnpacker, _SEGYLazyData
 from .util import unpack_header_value, _pack_attribute_nicer_exception
 
 
@@ -708,11 +709,25 @@ class SEGYTrace(object):
                   (self.__class__.__name__, name)
             raise AttributeError(msg)
 
-    def to_obspy_trace(self, unpack_trace_headers=False, headonly=False):
+    def _get_lazy_data(self):
+        """
+        Returns a :class:`~obspy.core.trace.LazyData` handle to the samples of
+        a trace read with ``headonly=True``.
+        """
+        return _SEGYLazyData(
+            self.unpack_data,
+            DATA_SAMPLE_FORMAT_SAMPLE_SIZE[self.data_encoding],
+            DATA_SAMPLE_FORMAT_CODE_DTYPE[self.data_encoding])
+
+    def to_obspy_trace(self, unpack_trace_headers=False, headonly=False,
+                       lazy=False):
         """
         Convert the current Trace to an ObsPy Trace object.
 
         :param unpack_trace_headers:
+        :param lazy: Assign a handle that reads the samples on first access of
+            the data of the ObsPy Trace. Requires the trace to be read with
+            ``headonly=True``.
         """
         # Import here to avoid circular imports.
         from .core import LazyTraceHeaderAttribDict  # NOQA
@@ -723,6 +738,8 @@ class SEGYTrace(object):
         # skip data if headonly is set
         if headonly:
             trace.stats.npts = self.npts
+        elif lazy:
+            trace.data = self._get_lazy_data()
         else:
             trace.data = self.data
         trace.stats.segy = AttribDict()
@@ -687,6 +687,25 @@ class SEGYCoreTestCase(unittest.TestCase):
             "index 0):\n... | 1970-01-01T00:00:00.000000Z - "
             "1970-01-01T00:05:27.670000Z | 100.0 Hz, 32768 samples")
 
+    def test_read_lazy(self):
+        """
+        Samples of lazily read SEG Y and SU traces are read on first access
+        and only for the remaining time window.
+        """
+        for filename, format in (('1.sgy_first_trace', 'SEGY'),
+                                 ('00001034.sgy_first_trace', 'SEGY'),
+                                 ('1.su_first_trace', 'SU')):
+            file = os.path.join(self.path, filename)
+            st = read(file, format=format)
+            tr = read(file, format=format, lazy=True)[0]
+            self.assertIn('_lazy_data', tr.__dict__)
+            self.assertEqual(tr.stats.npts, st[0].stats.npts)
+            t = tr.stats.starttime
+            tr2 = tr.slice(t + 100 * tr.stats.delta, t + 199 * tr.stats.delta)
+            self.assertEqual(tr2.stats.npts, 100)
+            np.testing.assert_array_equal(tr2.data, st[0].data[100:200])
+            np.testing.assert_array_equal(tr.data, st[0].data)
+
 
 def suite():
     return unittest.makeSuite(SEGYCoreTestCase, 'test')
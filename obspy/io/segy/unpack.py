@@ -19,6 +19,7 @@ import warnings
 import numpy as np
 
 from obspy.core.compatibility import from_buffer
+from obspy.core.trace import LazyData
 from .util import clibsegy
 
 
@@ -155,3 +156,29 @@ class OnTheFlyDataUnpacker:
             fp.seek(self.seek)
             raw = self.unpack_function(fp, self.count, endian=self.endian)
         return raw
+
+
+class _SEGYLazyData(LazyData):
+    """
+    Deferred handle to the samples of a SEG Y or SU trace which is narrowed
+    down by trimming before any data is read.
+
+    :type unpacker: :class:`OnTheFlyDataUnpacker`
+    :param unpacker: Unpacker of the trace created while reading the headers.
+    :type sample_size: int
+    :param sample_size: Size of one sample in bytes.
+    :param dtype: Data type of the unpacked samples.
+    """
+    def __init__(self, unpacker, sample_size, dtype):
+        super(_SEGYLazyData, self).__init__(unpacker.filename,
+                                            unpacker.count, dtype)
+        self.unpack_function = unpacker.unpack_function
+        self.seek = unpacker.seek
+        self.endian = unpacker.endian
+        self.mtime = unpacker.mtime
+        self.sample_size = sample_size
+
+    def _read(self, start, npts):
+        with open(self.filename, 'rb') as fp:
+            fp.seek(self.seek + start * self.sample_size)
+            return self.unpack_function(fp, npts, endian=self.endian)
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Stateful processors for consecutive data packets.
+
+The processors in this module keep the state of recursive filters and
+triggers (filter delay lines, STA/LTA accumulators, open trigger onsets)
+between calls, so that feeding the data packet by packet gives the same
+result as processing the concatenated data in one go. The cost of each call
+is linear in the length of the packet, no data of previous packets has to be
+buffered or processed again.
+
+The data processors can be registered directly with
+:meth:`~obspy.realtime.rttrace.RtTrace.register_rt_process`, their memory is
+re-initialized when :meth:`~obspy.realtime.rttrace.RtTrace.append` detects
+a gap or overlap.
+
+>>> import numpy as np
+>>> from obspy.realtime.processors import RtFilter, RtRecursiveStaLta
+>>> from obspy.signal.filter import bandpass
+>>> data = np.random.RandomState(815).randn(3000)
+>>> rt_filter = RtFilter('bandpass', df=100.0, freqmin=1.0, freqmax=10.0)
+>>> filtered = np.concatenate([rt_filter(packet)
+...                            for packet in np.split(data, 3)])
+>>> np.allclose(filtered, bandpass(data, 1.0, 10.0, df=100.0))
+True
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+from collections import deque
+
+import numpy as np
+from scipy.signal import lfilter
+
+from obspy.signal.filter import (_bandpass_sos, _bandstop_sos, _highpass_sos,
+                                 _lowpass_sos, sosfilt)
+
+
+_FILTER_SOS = {
+    'bandpass': _bandpass_sos,
+    'bandstop': _bandstop_sos,
+    'lowpass': _lowpass_sos,
+    'highpass': _highpass_sos,
+}
+
+
+class RtFilter(object):
+    """
+    Butterworth filter keeping its state between consecutive data packets.
+
+    The filter coefficients are the same as used by
+    :func:`~obspy.signal.filter.bandpass`,
+    :func:`~obspy.signal.filter.bandstop`,
+    :func:`~obspy.signal.filter.lowpass` and
+    :func:`~obspy.signal.filter.highpass`. Filtering is causal only, a zero
+    phase filter would need the data following the packet.
+
+    :type type: str
+    :param type: One of ``'bandpass'``, ``'bandstop'``, ``'lowpass'`` and
+        ``'highpass'``.
+    :type df: float
+    :param df: Sampling rate in Hz.
+    :type corners: int
+    :param corners: Filter corners / order.
+    :param options: Corner frequencies of the filter, i.e. ``freqmin`` and
+        ``freqmax`` for band filters and ``freq`` for low- and highpass.
+    """
+    def __init__(self, type, df, corners=4, **options):
+        try:
+            design = _FILTER_SOS[type.lower()]
+        except KeyError:
+            msg = "Filter type '%s' not supported. Supported types: %s" % (
+                type, ", ".join(sorted(_FILTER_SOS)))
+            raise ValueError(msg)
+        self.type = type.lower()
+        self.sos = design(df=df, corners=corners, **options)
+        self.reset()
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.type)
+
+    def reset(self):
+        """
+        Clear the filter state, the next packet is filtered from rest.
+        """
+        self._zi = np.zeros((len(self.sos), 2), dtype=np.float64)
+
+    def __call__(self, data):
+        """
+        Filter the next data packet.
+
+        :type data: :class:`numpy.ndarray`
+        :param data: Data packet following the previous packet.
+        :rtype: :class:`numpy.ndarray`, dtype=float64
+        :return: Filtered data packet.
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if not len(data):
+            return data.copy()
+        filtered, self._zi = sosfilt(self.sos, data, zi=self._zi)
+        return filtered
+
+
+class RtRecursiveStaLta(object):
+    """
+    Recursive STA/LTA keeping its state between consecutive data packets.
+
+    The concatenated output is the same as the output of
+    :func:`~obspy.signal.trigger.recursive_sta_lta` on the concatenated data
+    (provided that it is longer than ``nlta`` samples), i.e. the first
+    ``nlta`` samples after the start or a :meth:`reset` are set to zero.
+
+    :type nsta: int
+    :param nsta: Length of short time average window in samples
+    :type nlta: int
+    :param nlta: Length of long time average window in samples
+    """
+    def __init__(self, nsta, nlta):
+        self.nsta = nsta
+        self.nlta = nlta
+        self.reset()
+
+    def __repr__(self):
+        return "%s(nsta=%d, nlta=%d)" % (self.__class__.__name__, self.nsta,
+                                         self.nlta)
+
+    def reset(self):
+        """
+        Clear the short and long time averages.
+        """
+        self._zi_sta = np.zeros(1, dtype=np.float64)
+        self._zi_lta = np.zeros(1, dtype=np.float64)
+        self._offset = 0
+
+    def __call__(self, data):
+        """
+        Compute the characteristic function of the next data packet.
+
+        :type data: :class:`numpy.ndarray`
+        :param data: Data packet following the previous packet.
+        :rtype: :class:`numpy.ndarray`, dtype=float64
+        :return: Characteristic function of recursive STA/LTA.
+        """
+        energy = np.square(np.asarray(data, dtype=np.float64))
+        if not len(energy):
+            return energy
+        if self._offset == 0:
+            # the recursion starts with the second sample
+            energy[0] = 0.0
+        csta = 1.0 / self.nsta
+        clta = 1.0 / self.nlta
+        sta, self._zi_sta = lfilter([csta], [1.0, csta - 1.0], energy,
+                                    zi=self._zi_sta)
+        lta, self._zi_lta = lfilter([clta], [1.0, clta - 1.0], energy,
+                                    zi=self._zi_lta)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            charfct = sta / lta
+        charfct[:max(self.nlta - self._offset, 0)] = 0.0
+        self._offset += len(charfct)
+        return charfct
+
+
+class RtTriggerOnset(object):
+    """
+    Trigger on and off times of consecutive characteristic function packets.
+
+    Triggers are reported with the packet in which the characteristic
+    function falls below ``thres2``. All triggers reported for the packets
+    and by a final call of :meth:`flush` are the same as the ones returned by
+    :func:`~obspy.signal.trigger.trigger_onset` for the concatenated
+    characteristic function.
+
+    :type thres1: float
+    :param thres1: Value above which trigger (of characteristic function)
+        is activated (higher threshold)
+    :type thres2: float
+    :param thres2: Value below which trigger (of characteristic function)
+        is deactivated (lower threshold)
+    :type max_len: int
+    :param max_len: Maximum length of triggered event in samples. A new
+        event will be triggered as soon as the signal reaches again above
+        thres1.
+    :type max_len_delete: bool
+    :param max_len_delete: Do not report events longer than max_len.
+    """
+    def __init__(self, thres1, thres2, max_len=9e99, max_len_delete=False):
+        self.thres1 = thres1
+        self.thres2 = thres2
+        self.max_len = max_len
+        self.max_len_delete = max_len_delete
+        self.reset()
+
+    def reset(self):
+        """
+        Drop open triggers and restart counting samples from zero.
+        """
+        # global index of next sample
+        self._offset = 0
+        # candidate trigger on times not yet paired with an off time
+        self._on = deque()
+        # off time of last trigger, on times have to be after it
+        self._last_off = -1
+        # whether the last sample was above thres1/thres2
+        self._above1 = False
+        self._above2 = False
+
+    def _pair(self, off, picks):
+        """
+        Pair candidate on times up to ``off`` with this off time (the first
+        off time following them) like
+        :func:`~obspy.signal.trigger.trigger_onset` does.
+        """
+        while self._on and self._on[0] <= off:
+            on = self._on.popleft()
+            if on <= self._last_off:
+                continue
+            if off - on > self.max_len:
+                if self.max_len_delete:
+                    self._last_off = off
+                    continue
+                picks.append([on, on + self.max_len])
+                self._last_off = on + self.max_len
+                continue
+            picks.append([on, off])
+            self._last_off = off
+
+    def __call__(self, charfct):
+        """
+        Process the next packet of the characteristic function.
+
+        :type charfct: :class:`numpy.ndarray`
+        :param charfct: Characteristic function packet following the
+            previous packet.
+        :rtype: :class:`numpy.ndarray`
+        :return: Completed triggers as ``[[on, off], ...]``, in samples
+            counted from the first packet.
+        """
+        charfct = np.asarray(charfct)
+        picks = []
+        if len(charfct):
+            above1 = np.concatenate([[self._above1], charfct > self.thres1])
+            above2 = np.concatenate([[self._above2], charfct > self.thres2])
+            # starts of runs above thres1
+            on = np.flatnonzero(above1[1:] & ~above1[:-1]) + self._offset
+            # ends of runs above thres2, i.e. last sample above thres2
+            off = np.flatnonzero(above2[:-1] & ~above2[1:]) + self._offset - 1
+            self._on.extend(on.tolist())
+            for off_ in off.tolist():
+                self._pair(off_, picks)
+            self._above1 = bool(above1[-1])
+            self._above2 = bool(above2[-1])
+            self._offset += len(charfct)
+        return np.array(picks, dtype=np.int64).reshape(-1, 2)
+
+    def flush(self):
+        """
+        End the characteristic function after the last processed sample.
+
+        A trigger that is still on is closed at the last sample, like
+        :func:`~obspy.signal.trigger.trigger_onset` does at the end of the
+        data. The processor is reset afterwards.
+
+        :rtype: :class:`numpy.ndarray`
+        :return: Triggers closed by the end of the data as
+            ``[[on, off], ...]``.
+        """
+        picks = []
+        if self._above2:
+            self._pair(self._offset - 1, picks)
+        self.reset()
+        return np.array(picks, dtype=np.int64).reshape(-1, 2)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)
@@ -264,6 +264,9 @@ class RtTrace(Trace):
             if gap_or_overlap and rtmemory_list is not None:
                 for n in range(len(rtmemory_list)):
                     rtmemory_list[n] = RtMemory()
+            # stateful processors, see obspy.realtime.processors
+            if gap_or_overlap and hasattr(process_name, 'reset'):
+                process_name.reset()
             # apply processing
             trace = trace.copy()
             dtype = trace.data.dtype
@@ -311,6 +314,7 @@ class RtTrace(Trace):
             %s. % REALTIME_PROCESS_FUNCTIONS.keys()
             or a non-recursive, time-domain NumPy or ObsPy function which takes
             a single array as an argument and returns an array
+            or a stateful processor of :mod:`obspy.realtime.processors`
 
         :type process: str or function
         :param process: Specifies which processing function is added,
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+The obspy.realtime.processors test suite.
+"""
+import os
+import unittest
+
+import numpy as np
+
+from obspy import read
+from obspy.realtime import RtTrace
+from obspy.realtime.processors import (RtFilter, RtRecursiveStaLta,
+                                       RtTriggerOnset)
+from obspy.signal.filter import bandpass, bandstop, highpass, lowpass
+from obspy.signal.trigger import recursive_sta_lta, trigger_onset
+
+
+class RealTimeProcessorsTestCase(unittest.TestCase):
+    """
+    The obspy.realtime.processors test suite.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.orig_trace = read(os.path.join(os.path.dirname(__file__), 'data',
+                                           'II.TLY.BHZ.SAC'),
+                              dtype=np.float64)[0]
+        cls.data = np.require(cls.orig_trace.data, np.float64)
+        # irregular packet lengths, including empty and single sample packets
+        bounds = [0, 1, 1, 17, 500, 2000, 2001, 4567, len(cls.data)]
+        cls.packets = [cls.data[i:j] for i, j in zip(bounds[:-1], bounds[1:])]
+
+    def test_filter(self):
+        """
+        Packet wise filtering is the same as filtering the whole data.
+        """
+        df = self.orig_trace.stats.sampling_rate
+        for type_, func, options in (
+                ('bandpass', bandpass, {'freqmin': 0.05, 'freqmax': 1.0}),
+                ('bandstop', bandstop, {'freqmin': 0.05, 'freqmax': 1.0}),
+                ('lowpass', lowpass, {'freq': 1.0}),
+                ('highpass', highpass, {'freq': 0.05})):
+            expected = func(self.data, df=df, corners=4, **options)
+            processor = RtFilter(type_, df=df, corners=4, **options)
+            got = np.concatenate([processor(p) for p in self.packets])
+            np.testing.assert_allclose(got, expected, rtol=1e-10,
+                                       atol=1e-10 * np.abs(expected).max())
+            # after reset filtering starts from rest again
+            processor.reset()
+            np.testing.assert_allclose(
+                processor(self.data[:100]), expected[:100], rtol=1e-10,
+                atol=1e-10 * np.abs(expected).max())
+        with self.assertRaises(ValueError):
+            RtFilter('lowpass_cheby_2', df=df, freq=1.0)
+
+    def test_recursive_sta_lta(self):
+        """
+        Packet wise recursive STA/LTA is the same as the one of the whole
+        data.
+        """
+        for nsta, nlta in ((5, 10), (20, 1000), (20, 2500)):
+            expected = recursive_sta_lta(self.data, nsta, nlta)
+            processor = RtRecursiveStaLta(nsta, nlta)
+            got = np.concatenate([processor(p) for p in self.packets])
+            np.testing.assert_allclose(got, expected, rtol=1e-10)
+            processor.reset()
+            np.testing.assert_allclose(processor(self.data), expected,
+                                       rtol=1e-10)
+
+    def test_trigger_onset(self):
+        """
+        Triggers of the packets are the same as for the whole characteristic
+        function.
+        """
+        df = self.orig_trace.stats.sampling_rate
+        cft = recursive_sta_lta(self.data, int(5 * df), int(50 * df))
+        thresholds = (cft.max() * 0.5, cft.max() * 0.3)
+        for max_len, max_len_delete in ((9e99, False), (100, False),
+                                        (100, True), (10000, True)):
+            expected = trigger_onset(cft, *thresholds, max_len=max_len,
+                                     max_len_delete=max_len_delete)
+            expected = np.array(expected, dtype=np.int64).reshape(-1, 2)
+            processor = RtTriggerOnset(*thresholds, max_len=max_len,
+                                       max_len_delete=max_len_delete)
+            got = [processor(cft[i:j]) for i, j in (
+                (0, 1), (1, 1), (1, 1000), (1000, 5000), (5000, len(cft)))]
+            got = np.concatenate(got + [processor.flush()])
+            np.testing.assert_array_equal(got, expected)
+        # synthetic characteristic function with triggers across packets and
+        # a trigger still on at the end
+        cft = np.zeros(100)
+        cft[[3, 8, 9, 10, 11, 12, 40, 41, 42, 43, 44, 45, 97, 98, 99]] = 3.0
+        cft[[4, 13, 14, 46]] = 1.5
+        expected = trigger_onset(cft, 2.0, 1.0)
+        processor = RtTriggerOnset(2.0, 1.0)
+        got = [processor(packet) for packet in np.split(cft, 10)]
+        self.assertEqual(np.concatenate(got).tolist(),
+                         [[3, 4], [8, 14], [40, 46]])
+        got = np.concatenate(got + [processor.flush()])
+        np.testing.assert_array_equal(got, expected)
+        self.assertEqual(got.tolist(),
+                         [[3, 4], [8, 14], [40, 46], [97, 99]])
+
+    def test_rttrace_register_processor(self):
+        """
+        Stateful processors registered with a RtTrace give the same result as
+        processing the whole trace and are reset on gaps.
+        """
+        df = self.orig_trace.stats.sampling_rate
+        rt_trace = RtTrace()
+        rt_trace.register_rt_process(
+            RtFilter('bandpass', df=df, freqmin=0.05, freqmax=1.0))
+        rt_trace.register_rt_process(RtRecursiveStaLta(20, 1000))
+        for tr in self.orig_trace / 5:
+            rt_trace.append(tr)
+        expected = recursive_sta_lta(
+            bandpass(self.data, 0.05, 1.0, df=df), 20, 1000)
+        np.testing.assert_allclose(rt_trace.data, expected, rtol=1e-8,
+                                   atol=1e-8 * np.abs(expected).max())
+        # appending after a gap starts processing from scratch
+        tr = self.orig_trace.copy()
+        tr.stats.starttime = rt_trace.stats.endtime + 100
+        processed = rt_trace.append(tr)
+        np.testing.assert_allclose(processed.data, expected, rtol=1e-8,
+                                   atol=1e-8 * np.abs(expected).max())
+
+
+def suite():
+    return unittest.makeSuite(RealTimeProcessorsTestCase, 'test')
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
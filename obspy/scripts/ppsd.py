@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compute PPSDs of many channels from a local waveform archive.
+
+Waveforms are read from an SDS archive or a tsindex database and processed
+in daily chunks by a pool of worker processes. The results are merged into
+one PPSD per channel and saved as ``<SEED id>.npz`` in the output directory,
+see :func:`obspy.signal.spectral_estimation.compute_ppsds`.
+
+Example
+=======
+
+Process one year of all broad-band channels of network ``BW`` with eight
+worker processes:
+
+.. code-block:: bash
+
+    $ obspy-ppsd -r /bay200/mseed_online/archive -i inventory.xml \
+-s 2019-01-01 -e 2020-01-01 -o /tmp/ppsd --id "BW.*..HH?" --workers 8
+"""
+from argparse import ArgumentParser, RawDescriptionHelpFormatter
+
+from obspy import __version__, UTCDateTime, read_inventory
+from obspy.core.util.base import ENTRY_POINTS
+from obspy.signal.spectral_estimation import compute_ppsds
+
+
+def main(argv=None):
+    parser = ArgumentParser(
+        prog='obspy-ppsd', description=__doc__,
+        formatter_class=RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        '-r', '--sds-root', dest='sds_root',
+        help='Root folder of SDS archive to read waveforms from.')
+    source.add_argument(
+        '-t', '--tsindex', dest='tsindex_database',
+        help='Path of tsindex SQLite database to read waveforms with.')
+    parser.add_argument(
+        '-i', '--inventory', dest='inventory', required=True,
+        help='StationXML (or any other inventory format) file with the '
+             'channels to process and their instrument responses.')
+    parser.add_argument(
+        '-s', '--starttime', dest='starttime', required=True,
+        type=UTCDateTime, help='Start of time span to process.')
+    parser.add_argument(
+        '-e', '--endtime', dest='endtime', required=True,
+        type=UTCDateTime, help='End of time span to process.')
+    parser.add_argument(
+        '-o', '--output-dir', dest='output_dir', required=True,
+        help='Directory to save the PPSD npz files to.')
+    parser.add_argument(
+        '--id', dest='ids', action="append", default=[],
+        help='Only process channels with SEED IDs matching this UNIX style '
+             'wildcard pattern (e.g. ``BW.*..HHZ``). This option can be '
+             'provided multiple times. By default all channels in the '
+             'inventory are processed.')
+    parser.add_argument(
+        '-w', '--workers', dest='workers', type=int, default=None,
+        help='Number of worker processes (default: number of CPUs).')
+    parser.add_argument(
+        '-f', '--format', default="MSEED", choices=ENTRY_POINTS['waveform'],
+        help='Waveform format of SDS archive.')
+    parser.add_argument(
+        '--ppsd-length', dest='ppsd_length', type=float, default=3600.0,
+        help='Length of PPSD segments in seconds.')
+    parser.add_argument(
+        '--overlap', dest='overlap', type=float, default=0.5,
+        help='Overlap of PPSD segments.')
+    parser.add_argument(
+        '--skip-on-gaps', dest='skip_on_gaps', default=False,
+        action="store_true",
+        help='Skip segments with gaps instead of padding them with zeros.')
+    parser.add_argument('-V', '--version', action='version',
+                        version='%(prog)s ' + __version__)
+
+    args = parser.parse_args(argv)
+
+    inventory = read_inventory(args.inventory)
+    filenames = compute_ppsds(
+        inventory, args.starttime, args.endtime, args.output_dir,
+        sds_root=args.sds_root, tsindex_database=args.tsindex_database,
+        ids=args.ids or None, sds_format=args.format, workers=args.workers,
+        ppsd_length=args.ppsd_length, overlap=args.overlap,
+        skip_on_gaps=args.skip_on_gaps)
+    for seed_id, sampling_rate in sorted(filenames):
+        print("%s (%g Hz): %s" % (seed_id, sampling_rate,
+                                  filenames[seed_id, sampling_rate]))
+
+
+if __name__ == "__main__":
+    main()
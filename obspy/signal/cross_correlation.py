@@ -22,7 +22,9 @@ from distutils.version import LooseVersion
 import warnings
 
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
 import scipy
+from scipy.fftpack import next_fast_len
 
 from obspy import Stream, Trace
 from obspy.core.util.misc import MatplotlibBackend
@@ -320,6 +322,164 @@ def correlate_template(data, template, mode='valid', normalize='full',
     return cc
 
 
+def _correlate_overlap_save(data, ftemplate, lent, nfft, max_blocks=64):
+    """
+    Cross-correlation with mode 'valid' by overlap-save FFT blocks.
+
+    :param data: data array
+    :param ftemplate: complex conjugate of the Fourier transform of the
+        template with length ``nfft``
+    :param lent: length of template
+    :param nfft: length of FFT blocks
+    :param max_blocks: maximal number of blocks transformed at once
+    """
+    n = len(data) - lent + 1
+    step = nfft - lent + 1
+    nblocks = -(-n // step)
+    # pad zeros to complete the last block
+    data = _pad_zeros(data, 0, nblocks * step + lent - 1 - len(data))
+    blocks = as_strided(data, shape=(nblocks, nfft),
+                        strides=(step * data.strides[0], data.strides[0]))
+    cc = np.empty(nblocks * step)
+    for i in range(0, nblocks, max_blocks):
+        fblocks = np.fft.rfft(blocks[i:i + max_blocks], nfft, axis=1)
+        fblocks *= ftemplate
+        cc_blocks = np.fft.irfft(fblocks, nfft, axis=1)[:, :step]
+        cc[i * step:i * step + cc_blocks.size] = cc_blocks.ravel()
+    return cc[:n]
+
+
+def iter_correlate_template(data, template, normalize='full', demean=True,
+                            block_size=None):
+    """
+    Normalized cross-correlation of a template with a continuous signal
+    arriving in consecutive chunks.
+
+    The streaming counterpart to
+    :func:`~obspy.signal.cross_correlation.correlate_template` with
+    ``mode='valid'``. The cross-correlation is calculated with overlap-save
+    FFT blocks and yielded chunk by chunk, the last samples of each chunk
+    are kept to complete the windows extending into the next chunk. Memory
+    use only depends on the size of the chunks and not on the overall
+    length of the data, so the data can be read e.g. by
+    :func:`~obspy.io.mseed.core.iread_mseed`.
+
+    If Traces are passed, the start times of consecutive Traces are checked
+    and the calculation is restarted after gaps or overlaps, i.e. windows
+    including a gap are not correlated.
+
+    :type data: iterable of :class:`~numpy.ndarray`,
+        :class:`~obspy.core.trace.Trace` or :class:`~obspy.core.stream.Stream`
+    :param data: Consecutive chunks of the signal of a single channel.
+    :type template: :class:`~numpy.ndarray`, :class:`~obspy.core.trace.Trace`
+    :param template: Template to correlate with the signal.
+    :param normalize:
+        One of ``'full'`` or ``None``, see
+        :func:`~obspy.signal.cross_correlation.correlate_template`.
+        ``'naive'`` normalization needs the whole data and is not available.
+    :param demean: Demean template beforehand. For ``normalize='full'``
+        data is demeaned in different windows for each correlation value.
+    :param int block_size: Length of the FFT blocks, has to be larger than
+        the template. By default eight times the template length, at least
+        32768 samples, rounded up to an efficient FFT length.
+
+    :return: Generator of cross-correlation segments, one for each chunk of
+        data completing at least one window. Arrays for array input, Traces
+        with the start time of the first window otherwise.
+
+    .. rubric:: Example
+
+    >>> from obspy import read
+    >>> data = read()[0]
+    >>> template = data[450:550]
+    >>> chunks = [data[i:i + 1000] for i in range(0, len(data), 1000)]
+    >>> cc = np.concatenate(list(iter_correlate_template(chunks, template)))
+    >>> len(cc)
+    2901
+    >>> index = np.argmax(cc)
+    >>> index
+    450
+    >>> round(cc[index], 9)
+    1.0
+    """
+    if normalize not in ('full', None):
+        raise ValueError("normalize has to be one of ('full', None)")
+    sampling_rate = None
+    if isinstance(template, Trace):
+        sampling_rate = template.stats.sampling_rate
+        template = template.data
+    template = np.asarray(template, dtype=np.float64)
+    lent = len(template)
+    if demean:
+        template = template - np.mean(template)
+    if block_size is None:
+        block_size = next_fast_len(max(8 * lent, 2 ** 15))
+    elif block_size <= lent:
+        raise ValueError('block_size must be larger than the template.')
+    ftemplate = np.fft.rfft(template, block_size).conj()
+    tnorm = np.sum(template ** 2)
+
+    # data not yet correlated, its start time and the stats and SEED ID of
+    # the last trace
+    tail = np.empty(0)
+    starttime = None
+    stats = None
+    seed_id = None
+
+    def _chunks():
+        for chunk in data:
+            if isinstance(chunk, Stream):
+                for tr in sorted(chunk, key=lambda tr: tr.stats.starttime):
+                    yield tr
+            else:
+                yield chunk
+
+    for chunk in _chunks():
+        if isinstance(chunk, Trace):
+            if seed_id is not None and chunk.id != seed_id:
+                raise ValueError('Data must belong to a single channel.')
+            seed_id = chunk.id
+            if sampling_rate is None:
+                sampling_rate = chunk.stats.sampling_rate
+            elif chunk.stats.sampling_rate != sampling_rate:
+                raise ValueError('Traces have different sampling rate')
+            # restart after gaps and overlaps
+            if (stats is None or abs(chunk.stats.starttime - stats.endtime -
+                                     stats.delta) > 0.5 * stats.delta):
+                tail = np.empty(0)
+            if not len(tail):
+                starttime = chunk.stats.starttime
+            stats = chunk.stats
+            chunk = chunk.data
+        chunk = np.asarray(chunk, dtype=np.float64)
+        tail = np.concatenate((tail, chunk)) if len(tail) else chunk
+        if len(tail) < lent:
+            continue
+        cc = _correlate_overlap_save(tail, ftemplate, lent, block_size)
+        if normalize == 'full':
+            # see correlate_template
+            data_ = _pad_zeros(tail, 1, 0)
+            if demean:
+                norm = _window_sum(data_, lent) ** 2
+                norm /= lent
+                np.subtract(_window_sum(data_ ** 2, lent), norm, out=norm)
+            else:
+                norm = _window_sum(data_ ** 2, lent)
+            norm *= tnorm
+            np.sqrt(norm, out=norm)
+            mask = norm <= np.finfo(float).eps
+            cc[~mask] /= norm[~mask]
+            cc[mask] = 0
+        tail = tail[len(cc):].copy()
+        if stats is None:
+            yield cc
+        else:
+            header = stats.copy()
+            header.starttime = starttime
+            yield Trace(data=cc, header=header)
+            starttime += len(cc) * stats.delta
+
+
 def xcorr_3c(st1, st2, shift_len, components=["Z", "N", "E"],
              full_xcorr=False, abs_max=True):
     """
@@ -749,12 +909,14 @@ def templates_max_similarity(st, time, streams_templates):
         return 0
 
 
-def _prep_streams_correlate(stream, template, template_time=None):
+def _get_template_windows(stream, template, template_time=None):
     """
-    Prepare stream and template for cross-correlation.
+    Select traces in stream and template with the same seed id and determine
+    the time windows of the stream traces to correlate.
 
-    Select traces in stream and template with the same seed id and trim
-    stream to correct start and end times.
+    :return: sorted stream and template with selected traces, list of
+        (start, end) time windows for each stream trace and start time of
+        the cross-correlations.
     """
     if len({tr.stats.sampling_rate for tr in stream + template}) > 1:
         raise ValueError('Traces have different sampling rate')
@@ -785,9 +947,22 @@ def _prep_streams_correlate(stream, template, template_time=None):
              for trt in template]
     trim1 = [t - min(trim1) for t in trim1]
     trim2 = [t - max(trim2) for t in trim2]
-    for i, tr in enumerate(stream):
-        tr = tr.slice(starttime + trim1[i], endtime + trim2[i])
-        tr.stats.starttime = starttime + template_offset
+    windows = [(starttime + t1, endtime + t2) for t1, t2 in zip(trim1, trim2)]
+    return stream, template, windows, starttime + template_offset
+
+
+def _prep_streams_correlate(stream, template, template_time=None):
+    """
+    Prepare stream and template for cross-correlation.
+
+    Select traces in stream and template with the same seed id and trim
+    stream to correct start and end times.
+    """
+    stream, template, windows, starttime = _get_template_windows(
+        stream, template, template_time=template_time)
+    for i, (tr, (t1, t2)) in enumerate(zip(stream, windows)):
+        tr = tr.slice(t1, t2)
+        tr.stats.starttime = starttime
         stream.traces[i] = tr
     return stream, template
 
@@ -870,6 +1045,137 @@ def _calc_mean(stream):
     return Trace(data=np.mean(matrix, axis=0), header=header)
 
 
+class _BatchCorrelator(object):
+    """
+    Cross-correlation of the traces in a stream with many template streams.
+
+    Equivalent to :func:`correlate_stream_template` with
+    ``normalize='full'`` or ``normalize=None`` and FFT method, but the
+    Fourier transform of each data trace and the normalization for each
+    template length are calculated only once and reused for all templates.
+
+    :param stream: Stream with data traces.
+    :param normalize: ``'full'`` or ``None``,
+        see :func:`~obspy.signal.cross_correlation.correlate_template`.
+    :param demean: Demean templates beforehand,
+        see :func:`~obspy.signal.cross_correlation.correlate_template`.
+    """
+    def __init__(self, stream, normalize='full', demean=True):
+        if normalize not in ('full', None):
+            raise ValueError("normalize has to be one of ('full', None)")
+        self.stream = stream
+        self.normalize = normalize
+        self.demean = demean
+        # Fourier transforms of data traces and normalizations for each
+        # template length, keyed by id of the data trace object
+        self._ffts = {}
+        self._norms = {}
+
+    def _get_fft(self, tr):
+        key = id(tr)
+        if key not in self._ffts:
+            nfft = next_fast_len(len(tr.data))
+            self._ffts[key] = (nfft, np.fft.rfft(tr.data, nfft))
+        return self._ffts[key]
+
+    def _get_norm(self, tr, lent):
+        """
+        Normalization of cross-correlations without template energy.
+        """
+        key = (id(tr), lent)
+        if key not in self._norms:
+            data = _pad_zeros(np.asarray(tr.data, dtype=np.float64), 1, 0)
+            # see correlate_template
+            if self.demean:
+                norm = _window_sum(data, lent) ** 2
+                norm /= lent
+                np.subtract(_window_sum(data ** 2, lent), norm, out=norm)
+            else:
+                norm = _window_sum(data ** 2, lent)
+            self._norms[key] = norm
+        return self._norms[key]
+
+    def _iter_correlations(self, template, template_time=None):
+        """
+        Yield data traces and their cross-correlations with the template.
+        """
+        stream, template, windows, starttime = _get_template_windows(
+            self.stream, template, template_time=template_time)
+        slices = []
+        for tr, trt, (t1, t2) in zip(stream, template, windows):
+            # sample indices of the window, see Trace.slice
+            sr = tr.stats.sampling_rate
+            i1 = max(int(round((t1 - tr.stats.starttime) * sr)), 0)
+            i2 = min(int(round((t2 - tr.stats.starttime) * sr)),
+                     len(tr) - 1)
+            if i2 - i1 + 1 < len(trt):
+                raise ValueError('Data must not be shorter than template.')
+            slices.append((i1, i2 - i1 + 2 - len(trt)))
+        # make sure xcorrs have the same length, can differ by one sample
+        lens = {n for _, n in slices}
+        if len(lens) > 1:
+            warnings.warn('Samples of traces are slightly misaligned. '
+                          'Use Stream.interpolate if this is not intended.')
+            if max(lens) - min(lens) > 1:
+                msg = 'This should not happen. Please contact the developers.'
+                raise RuntimeError(msg)
+        n = min(lens)
+        for tr, trt, (i1, _) in zip(stream, template, slices):
+            tdata = np.asarray(trt.data, dtype=np.float64)
+            if self.demean:
+                tdata = tdata - np.mean(tdata)
+            lent = len(tdata)
+            nfft, fdata = self._get_fft(tr)
+            cc = np.fft.irfft(fdata * np.fft.rfft(tdata, nfft).conj(), nfft)
+            cc = cc[i1:i1 + n]
+            if self.normalize == 'full':
+                norm = self._get_norm(tr, lent)[i1:i1 + n] * np.sum(tdata ** 2)
+                np.sqrt(norm, out=norm)
+                mask = norm <= np.finfo(float).eps
+                cc[~mask] /= norm[~mask]
+                cc[mask] = 0
+            yield tr, cc, starttime
+
+    def correlate(self, template, template_time=None):
+        """
+        Calculate cross-correlation of traces in stream with traces in
+        template.
+
+        See :func:`correlate_stream_template`.
+
+        :return: Stream with cross-correlations.
+        """
+        ccs = Stream()
+        for tr, cc, starttime in self._iter_correlations(
+                template, template_time=template_time):
+            header = tr.stats.copy()
+            header.starttime = starttime
+            ccs.append(Trace(data=cc, header=header))
+        return ccs
+
+    def mean(self, template, template_time=None):
+        """
+        Calculate the mean of the cross-correlations of traces in stream
+        with traces in template.
+
+        The cross-correlations are stacked in place, the result is the same
+        as :func:`_calc_mean` of :meth:`correlate`.
+
+        :return: Trace with mean of cross-correlations.
+        """
+        stack = None
+        for count, (tr, cc, starttime) in enumerate(self._iter_correlations(
+                template, template_time=template_time), 1):
+            if stack is None:
+                stack = cc
+            else:
+                stack += cc
+        stack /= count
+        header = dict(sampling_rate=tr.stats.sampling_rate,
+                      starttime=starttime)
+        return Trace(data=stack, header=header)
+
+
 def _find_peaks(data, height, holdon_samples, holdoff_samples):
     """
     Peak finding function used for Scipy versions smaller than 1.1.
@@ -1052,6 +1358,13 @@ def correlation_detector(stream, templates, heights, distance,
         :func:`~obspy.signal.cross_correlation.correlate_template` function.
         All other kwargs are passed to :func:`~scipy.signal.find_peaks`.
 
+    .. note::
+        For more than one template and ``method`` other than ``'direct'``,
+        the Fourier transforms of the data traces and the normalization of
+        the cross-correlations are calculated only once and reused for all
+        templates. With the default `similarity_func` and without details
+        the cross-correlations are stacked in place.
+
     :return: List of event detections sorted chronologically and
         list of similarity traces - one for each template.
         Each detection is a dictionary with the following keys:
@@ -1081,20 +1394,37 @@ def correlation_detector(stream, templates, heights, distance,
     cckeys = ('normalize', 'demean', 'method')
     cckwargs = {k: v for k, v in kwargs.items() if k in cckeys}
     pfkwargs = {k: v for k, v in kwargs.items() if k not in cckeys}
+    # reuse Fourier transforms of data and normalization for many templates
+    if (len(templates) > 1 and cckwargs.get('method') != 'direct' and
+            cckwargs.get('normalize', 'full') in ('full', None)):
+        correlator = _BatchCorrelator(
+            stream, normalize=cckwargs.get('normalize', 'full'),
+            demean=cckwargs.get('demean', True))
+    else:
+        correlator = None
     possible_detections = []
     similarities = []
     for template_id, template in enumerate(templates):
         template_time = _get_item(template_times, template_id)
         try:
-            ccs = correlate_stream_template(stream, template,
-                                            template_time=template_time,
-                                            **cckwargs)
+            if correlator is None:
+                ccs = correlate_stream_template(stream, template,
+                                                template_time=template_time,
+                                                **cckwargs)
+            elif similarity_func is _calc_mean and not details:
+                ccs = None
+                similarity = correlator.mean(template,
+                                             template_time=template_time)
+            else:
+                ccs = correlator.correlate(template,
+                                           template_time=template_time)
         except ValueError as ex:
             msg = '{} -> do not use template {}'.format(ex, template_id)
             warnings.warn(msg)
             similarities.append(None)
             continue
-        similarity = similarity_func(ccs)
+        if ccs is not None:
+            similarity = similarity_func(ccs)
         height = _get_item(heights, template_id)
         detections_template = _similarity_detector(
             similarity, height, distance, details=details,
@@ -18,7 +18,8 @@ def simple(data):
     Detrend signal simply by subtracting a line through the first and last
     point of the trace
 
-    :param data: Data to detrend, type numpy.ndarray.
+    :param data: Data to detrend, type numpy.ndarray. Multi-dimensional
+        arrays are detrended along the last axis.
     :return: Detrended data. Returns the original array which has been
         modified in-place if possible but it might have to return a copy in
         case the dtype has to be changed.
@@ -26,8 +27,8 @@ def simple(data):
     # Convert data if it's not a floating point type.
     if not np.issubdtype(data.dtype, np.floating):
         data = np.require(data, dtype=np.float64)
-    ndat = len(data)
-    x1, x2 = data[0], data[-1]
+    ndat = data.shape[-1]
+    x1, x2 = data[..., :1], data[..., -1:]
     data -= x1 + np.arange(ndat) * (x2 - x1) / float(ndat - 1)
     return data
 
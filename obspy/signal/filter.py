@@ -41,7 +41,8 @@ def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False):
     and :func:`scipy.signal.sosfilt` (for applying the filter).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multi-dimensional arrays are filtered
+        along the last axis.
     :param freqmin: Pass band low corner frequency.
     :param freqmax: Pass band high corner frequency.
     :param df: Sampling rate in Hz.
@@ -51,26 +52,10 @@ def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False):
         the resulting filtered trace.
     :return: Filtered data.
     """
-    fe = 0.5 * df
-    low = freqmin / fe
-    high = freqmax / fe
-    # raise for some bad scenarios
-    if high - 1.0 > -1e-6:
-        msg = ("Selected high corner frequency ({}) of bandpass is at or "
-               "above Nyquist ({}). Applying a high-pass instead.").format(
-            freqmax, fe)
-        warnings.warn(msg)
-        return highpass(data, freq=freqmin, df=df, corners=corners,
-                        zerophase=zerophase)
-    if low > 1:
-        msg = "Selected low corner frequency is above Nyquist."
-        raise ValueError(msg)
-    z, p, k = iirfilter(corners, [low, high], btype='band',
-                        ftype='butter', output='zpk')
-    sos = zpk2sos(z, p, k)
+    sos = _bandpass_sos(freqmin, freqmax, df, corners)
     if zerophase:
         firstpass = sosfilt(sos, data)
-        return sosfilt(sos, firstpass[::-1])[::-1]
+        return sosfilt(sos, firstpass[..., ::-1])[..., ::-1]
     else:
         return sosfilt(sos, data)
 
@@ -85,7 +70,8 @@ def bandstop(data, freqmin, freqmax, df, corners=4, zerophase=False):
     and :func:`scipy.signal.sosfilt` (for applying the filter).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multi-dimensional arrays are filtered
+        along the last axis.
     :param freqmin: Stop band low corner frequency.
     :param freqmax: Stop band high corner frequency.
     :param df: Sampling rate in Hz.
@@ -95,24 +81,10 @@ def bandstop(data, freqmin, freqmax, df, corners=4, zerophase=False):
         the resulting filtered trace.
     :return: Filtered data.
     """
-    fe = 0.5 * df
-    low = freqmin / fe
-    high = freqmax / fe
-    # raise for some bad scenarios
-    if high > 1:
-        high = 1.0
-        msg = "Selected high corner frequency is above Nyquist. " + \
-              "Setting Nyquist as high corner."
-        warnings.warn(msg)
-    if low > 1:
-        msg = "Selected low corner frequency is above Nyquist."
-        raise ValueError(msg)
-    z, p, k = iirfilter(corners, [low, high],
-                        btype='bandstop', ftype='butter', output='zpk')
-    sos = zpk2sos(z, p, k)
+    sos = _bandstop_sos(freqmin, freqmax, df, corners)
     if zerophase:
         firstpass = sosfilt(sos, data)
-        return sosfilt(sos, firstpass[::-1])[::-1]
+        return sosfilt(sos, firstpass[..., ::-1])[..., ::-1]
     else:
         return sosfilt(sos, data)
 
@@ -127,7 +99,8 @@ def lowpass(data, freq, df, corners=4, zerophase=False):
     and :func:`scipy.signal.sosfilt` (for applying the filter).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multi-dimensional arrays are filtered
+        along the last axis.
     :param freq: Filter corner frequency.
     :param df: Sampling rate in Hz.
     :param corners: Filter corners / order.
@@ -136,20 +109,10 @@ def lowpass(data, freq, df, corners=4, zerophase=False):
         the resulting filtered trace.
     :return: Filtered data.
     """
-    fe = 0.5 * df
-    f = freq / fe
-    # raise for some bad scenarios
-    if f > 1:
-        f = 1.0
-        msg = "Selected corner frequency is above Nyquist. " + \
-              "Setting Nyquist as high corner."
-        warnings.warn(msg)
-    z, p, k = iirfilter(corners, f, btype='lowpass', ftype='butter',
-                        output='zpk')
-    sos = zpk2sos(z, p, k)
+    sos = _lowpass_sos(freq, df, corners)
     if zerophase:
         firstpass = sosfilt(sos, data)
-        return sosfilt(sos, firstpass[::-1])[::-1]
+        return sosfilt(sos, firstpass[..., ::-1])[..., ::-1]
     else:
         return sosfilt(sos, data)
 
@@ -164,7 +127,8 @@ def highpass(data, freq, df, corners=4, zerophase=False):
     and :func:`scipy.signal.sosfilt` (for applying the filter).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multi-dimensional arrays are filtered
+        along the last axis.
     :param freq: Filter corner frequency.
     :param df: Sampling rate in Hz.
     :param corners: Filter corners / order.
@@ -173,6 +137,82 @@ def highpass(data, freq, df, corners=4, zerophase=False):
         the resulting filtered trace.
     :return: Filtered data.
     """
+    sos = _highpass_sos(freq, df, corners)
+    if zerophase:
+        firstpass = sosfilt(sos, data)
+        return sosfilt(sos, firstpass[..., ::-1])[..., ::-1]
+    else:
+        return sosfilt(sos, data)
+
+
+def _bandpass_sos(freqmin, freqmax, df, corners=4):
+    """
+    Returns second-order sections of the Butterworth bandpass, see
+    :func:`bandpass`.
+    """
+    fe = 0.5 * df
+    low = freqmin / fe
+    high = freqmax / fe
+    # raise for some bad scenarios
+    if high - 1.0 > -1e-6:
+        msg = ("Selected high corner frequency ({}) of bandpass is at or "
+               "above Nyquist ({}). Applying a high-pass instead.").format(
+            freqmax, fe)
+        warnings.warn(msg)
+        return _highpass_sos(freqmin, df, corners)
+    if low > 1:
+        msg = "Selected low corner frequency is above Nyquist."
+        raise ValueError(msg)
+    z, p, k = iirfilter(corners, [low, high], btype='band',
+                        ftype='butter', output='zpk')
+    return zpk2sos(z, p, k)
+
+
+def _bandstop_sos(freqmin, freqmax, df, corners=4):
+    """
+    Returns second-order sections of the Butterworth bandstop, see
+    :func:`bandstop`.
+    """
+    fe = 0.5 * df
+    low = freqmin / fe
+    high = freqmax / fe
+    # raise for some bad scenarios
+    if high > 1:
+        high = 1.0
+        msg = "Selected high corner frequency is above Nyquist. " + \
+              "Setting Nyquist as high corner."
+        warnings.warn(msg)
+    if low > 1:
+        msg = "Selected low corner frequency is above Nyquist."
+        raise ValueError(msg)
+    z, p, k = iirfilter(corners, [low, high],
+                        btype='bandstop', ftype='butter', output='zpk')
+    return zpk2sos(z, p, k)
+
+
+def _lowpass_sos(freq, df, corners=4):
+    """
+    Returns second-order sections of the Butterworth lowpass, see
+    :func:`lowpass`.
+    """
+    fe = 0.5 * df
+    f = freq / fe
+    # raise for some bad scenarios
+    if f > 1:
+        f = 1.0
+        msg = "Selected corner frequency is above Nyquist. " + \
+              "Setting Nyquist as high corner."
+        warnings.warn(msg)
+    z, p, k = iirfilter(corners, f, btype='lowpass', ftype='butter',
+                        output='zpk')
+    return zpk2sos(z, p, k)
+
+
+def _highpass_sos(freq, df, corners=4):
+    """
+    Returns second-order sections of the Butterworth highpass, see
+    :func:`highpass`.
+    """
     fe = 0.5 * df
     f = freq / fe
     # raise for some bad scenarios
@@ -181,12 +221,7 @@ def highpass(data, freq, df, corners=4, zerophase=False):
         raise ValueError(msg)
     z, p, k = iirfilter(corners, f, btype='highpass', ftype='butter',
                         output='zpk')
-    sos = zpk2sos(z, p, k)
-    if zerophase:
-        firstpass = sosfilt(sos, data)
-        return sosfilt(sos, firstpass[::-1])[::-1]
-    else:
-        return sosfilt(sos, data)
+    return zpk2sos(z, p, k)
 
 
 def envelope(data):
@@ -359,7 +394,8 @@ def lowpass_cheby_2(data, freq, df, maxorder=12, ba=False,
     values above the stop band frequency are lower than -96dB.
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multi-dimensional arrays are filtered
+        along the last axis.
     :param freq: The frequency above which signals are attenuated
         with 95 dB
     :param df: Sampling rate in Hz.
@@ -18,9 +18,16 @@ Various Routines Related to Spectral Estimation
     (https://www.gnu.org/copyleft/lesser.html)
 """
 import bisect
+import concurrent.futures
+import copy
+import fnmatch
+import functools
 import glob
+import itertools
 import math
+import multiprocessing.util
 import os
+import threading
 import warnings
 
 import numpy as np
@@ -136,6 +143,62 @@ earthquake_models = {
                  4.9050000e-06, 1.9620000e-06]]}
 
 
+# Maximum number of samples of all detrended and tapered FFT segments that
+# are processed at once when computing PPSD segments in batches.
+_PSD_BATCH_SIZE = 2 ** 23
+
+
+def _psd_batch(data, nfft, fs, noverlap=0):
+    """
+    Power spectral density of every row of a 2-D array using Welch's method.
+
+    Equivalent to calling :func:`matplotlib.mlab.psd` with
+    ``detrend=mlab.detrend_linear``, ``window=fft_taper``,
+    ``sides='onesided'`` and ``scale_by_freq=True`` on every row, but
+    detrends, tapers and transforms the overlapping FFT segments of all rows
+    with single vectorized calls on a strided view of the data.
+
+    :type data: :class:`~numpy.ndarray`
+    :param data: 2-D float array with one data segment per row, all rows
+        must have at least ``nfft`` samples.
+    :type nfft: int
+    :param nfft: Number of samples of the FFT segments.
+    :type fs: float
+    :param fs: Sampling rate.
+    :type noverlap: int
+    :param noverlap: Number of samples consecutive FFT segments overlap.
+    :returns: Power spectral densities (one row per row of ``data``) and
+        corresponding frequencies.
+    """
+    nrows, npts = data.shape
+    step = nfft - noverlap
+    num_segments = (npts - noverlap) // step
+    segments = np.lib.stride_tricks.as_strided(
+        data, shape=(nrows, num_segments, nfft),
+        strides=(data.strides[0], step * data.strides[1], data.strides[1]),
+        writeable=False)
+    # linear detrend of every FFT segment (like mlab.detrend_linear)
+    x = np.arange(nfft, dtype=np.float64)
+    x -= x.mean()
+    slope = np.dot(segments, x) / np.dot(x, x)
+    result = segments - segments.mean(axis=-1)[..., np.newaxis]
+    result -= slope[..., np.newaxis] * x
+    window = fft_taper(np.ones(nfft, dtype=np.float64))
+    result *= window
+    result = np.fft.rfft(result, n=nfft, axis=-1)
+    psd = result.real ** 2 + result.imag ** 2
+    del result
+    # one-sided spectrum, double all but the DC and Nyquist components
+    if nfft % 2:
+        psd[..., 1:] *= 2
+    else:
+        psd[..., 1:-1] *= 2
+    psd /= fs
+    psd /= (np.abs(window) ** 2).sum()
+    freqs = np.fft.rfftfreq(nfft, 1.0 / fs)
+    return psd.mean(axis=1), freqs
+
+
 def fft_taper(data):
     """
     Cosine taper, 10 percent at each end (like done by [McNamara2004]_).
@@ -201,6 +264,102 @@ def welch_window(n):
     return taper
 
 
+class ResponseCache(object):
+    """
+    Cache for instrument responses evaluated during PPSD processing.
+
+    The frequency response of a channel only changes with a new channel
+    epoch of the metadata, so it is evaluated once per metadata object,
+    SEED id, channel epoch, sampling interval and FFT length instead of once
+    per processed segment. By default every :class:`PPSD` uses its own
+    cache, one cache can be passed to multiple :class:`PPSD` instances (e.g.
+    all channels of a station) via their ``response_cache`` argument to
+    share the evaluated responses. Responses are only shared between PPSDs
+    using the very same metadata object, responses of e.g. a corrected copy
+    of an inventory are evaluated anew. The cache keeps references to the
+    metadata objects of the cached responses.
+
+    >>> from obspy import UTCDateTime
+    >>> cache = ResponseCache()
+    >>> resp = np.ones(5, dtype=np.complex128)
+    >>> metadata = {"sensitivity": 1.0}
+    >>> cache.add(metadata, "BW.RJOB..EHZ", UTCDateTime(2001, 1, 1), None,
+    ...           0.01, 8, resp)
+    >>> len(cache.get(metadata, "BW.RJOB..EHZ", UTCDateTime(2009, 8, 24),
+    ...               0.01, 8))
+    5
+    >>> print(cache.get(metadata, "BW.RJOB..EHZ", UTCDateTime(2000, 1, 1),
+    ...                 0.01, 8))
+    None
+    >>> print(cache.get({"sensitivity": 2.0}, "BW.RJOB..EHZ",
+    ...                 UTCDateTime(2009, 8, 24), 0.01, 8))
+    None
+    """
+    def __init__(self):
+        # (id of metadata, seed id, delta, nfft) -> list of (metadata,
+        # starttime, endtime, response), holding the metadata keeps its id
+        # from being reused
+        self._responses = {}
+
+    def __len__(self):
+        return sum(len(epochs) for epochs in self._responses.values())
+
+    def get(self, metadata, seed_id, time, delta, nfft):
+        """
+        Return the cached response of the channel epoch including given time.
+
+        :param metadata: Metadata the response was evaluated from.
+        :type seed_id: str
+        :param seed_id: SEED id of the channel.
+        :type time: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param time: Time the response has to be valid for.
+        :type delta: float
+        :param delta: Sampling interval the response was evaluated for.
+        :type nfft: int
+        :param nfft: FFT length the response was evaluated for.
+        :rtype: :class:`~numpy.ndarray` or None
+        :returns: Read-only complex frequency response or ``None`` if not
+            cached.
+        """
+        for metadata_, starttime, endtime, resp in self._responses.get(
+                (id(metadata), seed_id, delta, nfft), []):
+            if metadata_ is not metadata:
+                continue
+            if starttime <= time and (endtime is None or time <= endtime):
+                return resp
+        return None
+
+    def add(self, metadata, seed_id, starttime, endtime, delta, nfft, resp):
+        """
+        Store the response of a channel epoch.
+
+        :param metadata: Metadata the response was evaluated from.
+        :type seed_id: str
+        :param seed_id: SEED id of the channel.
+        :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param starttime: Start of the channel epoch.
+        :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime` or None
+        :param endtime: End of the channel epoch, ``None`` for open epochs.
+        :type delta: float
+        :param delta: Sampling interval the response was evaluated for.
+        :type nfft: int
+        :param nfft: FFT length the response was evaluated for.
+        :type resp: :class:`~numpy.ndarray`
+        :param resp: Complex frequency response.
+        """
+        resp = np.asarray(resp)
+        resp.flags.writeable = False
+        self._responses.setdefault(
+            (id(metadata), seed_id, delta, nfft), []).append(
+            (metadata, starttime, endtime, resp))
+
+    def clear(self):
+        """
+        Remove all cached responses.
+        """
+        self._responses.clear()
+
+
 class PPSD(object):
     """
     Class to compile probabilistic power spectral densities for one combination
@@ -310,12 +469,15 @@ class PPSD(object):
     NPZ_SIMPLE_TYPE_MAP_R = {v: i for i, v in NPZ_SIMPLE_TYPE_MAP.items()}
     # Add current version as a class attribute to avoid hard coding it.
     _CURRENT_VERSION = 3
+    # Name of the file holding settings and list of months of PPSDs saved
+    # with save_npz_store()
+    NPZ_STORE_INDEX = "index.npz"
 
     def __init__(self, stats, metadata, skip_on_gaps=False,
                  db_bins=(-200, -50, 1.), ppsd_length=3600.0, overlap=0.5,
                  special_handling=None, period_smoothing_width_octaves=1.0,
                  period_step_octaves=0.125, period_limits=None,
-                 **kwargs):  # @UnusedVariable
+                 response_cache=None, **kwargs):  # @UnusedVariable
         """
         Initialize the PPSD object setting all fixed information on the station
         that should not change afterwards to guarantee consistent spectral
@@ -397,11 +559,21 @@ class PPSD(object):
             specified period range, no more additional bins will be added after
             the bin whose center frequency exceeds the given upper end for the
             first time.
+        :type response_cache:
+            :class:`~obspy.signal.spectral_estimation.ResponseCache`
+        :param response_cache: Cache for the instrument responses evaluated
+            from Inventory, Parser or RESP file metadata, which are evaluated
+            only once per channel epoch. Pass the same cache to multiple PPSD
+            instances to share it, responses are shared between instances
+            with the same metadata object. By default a new cache is used.
         """
         # save things related to args
         self.id = "%(network)s.%(station)s.%(location)s.%(channel)s" % stats
         self.sampling_rate = stats.sampling_rate
         self.metadata = metadata
+        if response_cache is None:
+            response_cache = ResponseCache()
+        self.response_cache = response_cache
 
         # save things related to kwargs
         self.skip_on_gaps = skip_on_gaps
@@ -478,6 +650,12 @@ class PPSD(object):
         self._current_times_used = []
         self._current_times_all_details = []
 
+        # monthly npz store the processed data is read from on demand, see
+        # load_npz_store()
+        self._npz_store = None
+        self._npz_store_months = []
+        self._npz_store_months_loaded = set()
+
     @property
     def network(self):
         return self.id.split(".")[0]
@@ -877,25 +1055,12 @@ class PPSD(object):
                 continue
             t1 = tr.stats.starttime
             t2 = tr.stats.endtime
+            times = []
             while t1 + self.ppsd_length - tr.stats.delta <= t2:
-                if self.__check_time_present(t1):
-                    msg = "Already covered time spans detected (e.g. %s), " + \
-                          "skipping these slices."
-                    msg = msg % t1
-                    warnings.warn(msg)
-                else:
-                    # throw warnings if trace length is different
-                    # than ppsd_length..!?!
-                    slice = tr.slice(t1, t1 + self.ppsd_length -
-                                     tr.stats.delta)
-                    # XXX not good, should be working in place somehow
-                    # XXX how to do it with the padding, though?
-                    success = self.__process(slice)
-                    if success:
-                        if verbose:
-                            print(t1)
-                        changed = True
+                times.append(t1)
                 t1 += (1 - self.overlap) * self.ppsd_length  # advance
+            if self.__process_windows(tr, times, verbose=verbose):
+                changed = True
 
             # enforce time limits, pad zeros if gaps
             # tr.trim(t, t+PPSD_LENGTH, pad=True)
@@ -903,36 +1068,91 @@ class PPSD(object):
             self.__invalidate_histogram()
         return changed
 
-    def __process(self, tr):
+    def __process_windows(self, tr, times, verbose=False):
         """
-        Processes a segment of data and save the psd information.
+        Processes all PPSD segments of a trace starting at given times and
+        saves the psd information.
         Whether `Trace` is compatible (station, channel, ...) has to
         checked beforehand.
 
+        The spectra of the segments are computed in batches of segments with
+        one vectorized call. Segments overlapping already processed data are
+        skipped.
+
         :type tr: :class:`~obspy.core.trace.Trace`
-        :param tr: Compatible Trace with data of one PPSD segment
-        :returns: `True` if segment was successfully processed,
-            `False` otherwise.
+        :param tr: Compatible Trace with data of one or more PPSD segments
+        :type times: list of :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param times: Start times of the segments to process in temporal
+            order.
+        :returns: `True` if any segment was successfully processed, `False`
+            otherwise.
+        """
+        # skip segments overlapping previously processed data right away,
+        # segments of this trace are checked again before insertion
+        candidates = []
+        for t1 in times:
+            if self.__check_time_present(t1):
+                msg = "Already covered time spans detected (e.g. %s), " + \
+                      "skipping these slices."
+                msg = msg % t1
+                warnings.warn(msg)
+            else:
+                candidates.append(t1)
+        # limit the memory used by the detrended and tapered FFT segments
+        num_fft_segments = (self.len - self.nlap) // (self.nfft - self.nlap)
+        chunk_size = max(1, _PSD_BATCH_SIZE // (num_fft_segments * self.nfft))
+
+        changed = False
+        for i in range(0, len(candidates), chunk_size):
+            starttimes = []
+            slices = []
+            for t1 in candidates[i:i + chunk_size]:
+                # throw warnings if trace length is different
+                # than ppsd_length..!?!
+                slice = tr.slice(t1, t1 + self.ppsd_length - tr.stats.delta)
+                # XXX DIRTY HACK!!
+                if len(slice) == self.len + 1:
+                    slice.data = slice.data[:-1]
+                # one last check..
+                if len(slice) != self.len:
+                    msg = ("Got a piece of data with wrong length. "
+                           "Skipping:\n" + str(slice))
+                    warnings.warn(msg)
+                    continue
+                starttimes.append(t1)
+                slices.append(slice)
+            if not slices:
+                continue
+            spectra = self.__process(slices)
+            for t1, slice, spectrum in zip(starttimes, slices, spectra):
+                if spectrum is None:
+                    continue
+                if self.__check_time_present(t1):
+                    msg = "Already covered time spans detected (e.g. %s), " + \
+                          "skipping these slices."
+                    msg = msg % t1
+                    warnings.warn(msg)
+                    continue
+                self.__insert_processed_data(slice.stats.starttime, spectrum)
+                if verbose:
+                    print(t1)
+                changed = True
+        return changed
+
+    def __process(self, traces):
         """
+        Processes segments of data and returns the smoothed psd information.
 
-        # XXX DIRTY HACK!!
-        if len(tr) == self.len + 1:
-            tr.data = tr.data[:-1]
-        # one last check..
-        if len(tr) != self.len:
-            msg = ("Got a piece of data with wrong length. Skipping:\n" +
-                   str(tr))
-            warnings.warn(msg)
-            return False
+        :type traces: list of :class:`~obspy.core.trace.Trace`
+        :param traces: Compatible Traces with data of one PPSD segment each.
+        :returns: List with a smoothed psd for each segment or `None` if the
+            segment could not be processed.
+        """
         # being paranoid, only necessary if in-place operations would follow
-        tr.data = tr.data.astype(np.float64)
-        # if trace has a masked array we fill in zeros
-        try:
-            tr.data[tr.data.mask] = 0.0
-        # if it is no masked array, we get an AttributeError
-        # and have nothing to do
-        except AttributeError:
-            pass
+        data = np.empty((len(traces), self.len), dtype=np.float64)
+        for row, tr in zip(data, traces):
+            # if trace has a masked array we fill in zeros
+            row[:] = np.ma.filled(tr.data, 0)
 
         # restitution:
         # mcnamara apply the correction at the end in freq-domain,
@@ -941,17 +1161,15 @@ class PPSD(object):
         # Yes, you should avoid removing the response until after you
         # have estimated the spectra to avoid elevated lp noise
 
-        spec, _freq = mlab.psd(tr.data, self.nfft, self.sampling_rate,
-                               detrend=mlab.detrend_linear, window=fft_taper,
-                               noverlap=self.nlap, sides='onesided',
-                               scale_by_freq=True)
+        spec, _freq = _psd_batch(data, self.nfft, self.sampling_rate,
+                                 noverlap=self.nlap)
+        del data
 
         # leave out first entry (offset)
-        spec = spec[1:]
-
         # working with the periods not frequencies later so reverse spectrum
-        spec = spec[::-1]
+        spec = np.ascontiguousarray(spec[:, :0:-1])
 
+        ok = np.ones(len(traces), dtype=bool)
         # Here we remove the response using the same conventions
         # since the power is squared we want to square the sensitivity
         # we can also convert to acceleration if we have non-rotational data
@@ -961,29 +1179,37 @@ class PPSD(object):
         # special_handling "hydrophone" does instrument correction same as
         # "normal" data
         else:
-            # determine instrument response from metadata
-            try:
-                resp = self._get_response(tr)
-            except Exception as e:
-                msg = ("Error getting response from provided metadata:\n"
-                       "%s: %s\n"
-                       "Skipping time segment(s).")
-                msg = msg % (e.__class__.__name__, str(e))
-                warnings.warn(msg)
-                return False
-
-            resp = resp[1:]
-            resp = resp[::-1]
-            # Now get the amplitude response (squared)
-            respamp = np.absolute(resp * np.conjugate(resp))
             # Make omega with the same conventions as spec
             w = 2.0 * math.pi * _freq[1:]
             w = w[::-1]
-            # Here we do the response removal
-            if self.special_handling in ("hydrophone", "infrasound"):
-                spec = spec / respamp
-            else:
-                spec = (w ** 2) * spec / respamp
+            # amplitude responses (squared) of segments sharing a response
+            # object (e.g. from the response cache) are only computed once
+            respamps = {}
+            for i, tr in enumerate(traces):
+                # determine instrument response from metadata
+                try:
+                    resp = self._get_response(tr)
+                except Exception as e:
+                    msg = ("Error getting response from provided metadata:\n"
+                           "%s: %s\n"
+                           "Skipping time segment(s).")
+                    msg = msg % (e.__class__.__name__, str(e))
+                    warnings.warn(msg)
+                    ok[i] = False
+                    continue
+                if id(resp) not in respamps:
+                    r = resp[1:]
+                    r = r[::-1]
+                    # Now get the amplitude response (squared), keep a
+                    # reference to the response so that its id stays unique
+                    respamps[id(resp)] = (
+                        resp, np.absolute(r * np.conjugate(r)))
+                respamp = respamps[id(resp)][1]
+                # Here we do the response removal
+                if self.special_handling in ("hydrophone", "infrasound"):
+                    spec[i] = spec[i] / respamp
+                else:
+                    spec[i] = (w ** 2) * spec[i] / respamp
 
         # avoid calculating log of zero
         idx = spec < dtiny
@@ -993,16 +1219,17 @@ class PPSD(object):
         spec = np.log10(spec)
         spec *= 10
 
-        smoothed_psd = []
-        # do this for the whole period range and append the values to our lists
-        for per_left, per_right in zip(self.period_bin_left_edges,
-                                       self.period_bin_right_edges):
-            specs = spec[(per_left <= self.psd_periods) &
-                         (self.psd_periods <= per_right)]
-            smoothed_psd.append(specs.mean())
-        smoothed_psd = np.array(smoothed_psd, dtype=np.float32)
-        self.__insert_processed_data(tr.stats.starttime, smoothed_psd)
-        return True
+        # do this for the whole period range and append the values to our
+        # lists, periods are sorted so every bin is a contiguous range
+        left = np.searchsorted(self.psd_periods, self.period_bin_left_edges,
+                               side="left")
+        right = np.searchsorted(self.psd_periods,
+                                self.period_bin_right_edges, side="right")
+        smoothed_psds = np.empty((len(traces), len(left)), dtype=np.float32)
+        for j, (i1, i2) in enumerate(zip(left, right)):
+            smoothed_psds[:, j] = spec[:, i1:i2].mean(axis=1)
+        return [smoothed_psd if ok_ else None
+                for smoothed_psd, ok_ in zip(smoothed_psds, ok)]
 
     def _get_times_all_details(self):
         # check if we can reuse a previously cached array of all times as
@@ -1117,6 +1344,11 @@ class PPSD(object):
             Time restrictions only check the starttime of the individual psd
             pieces.
 
+        .. note::
+            For a PPSD loaded with :meth:`PPSD.load_npz_store`, the monthly
+            files of the requested time span that were not loaded yet are
+            read, other files are not touched.
+
         :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
         :param starttime: If set, data before the specified time is excluded
             from the returned stack.
@@ -1180,6 +1412,9 @@ class PPSD(object):
 
         # determine which psd pieces should be used in the stack,
         # based on all selection criteria specified by user
+        # read data of the requested time span not loaded from the npz store
+        # yet
+        self._load_npz_store(starttime=starttime, endtime=endtime)
         selected = self._stack_selection(
             starttime=starttime, endtime=endtime,
             time_of_weekday=time_of_weekday, year=year, month=month,
@@ -1255,16 +1490,75 @@ class PPSD(object):
         #   self._get_response = self._get_response_from_inventory
         # but that makes the object non-picklable
         if isinstance(self.metadata, Inventory):
-            return self._get_response_from_inventory(tr)
+            get_response = self._get_response_from_inventory
         elif isinstance(self.metadata, Parser):
-            return self._get_response_from_parser(tr)
+            get_response = self._get_response_from_parser
         elif isinstance(self.metadata, dict):
             return self._get_response_from_paz_dict(tr)
         elif isinstance(self.metadata, str):
-            return self._get_response_from_resp(tr)
+            get_response = self._get_response_from_resp
         else:
             msg = "Unexpected type for `metadata`: %s" % type(self.metadata)
             raise TypeError(msg)
+        # responses of time dependent metadata are evaluated once per epoch
+        time = tr.stats.starttime
+        cache = self.response_cache
+        if cache is not None:
+            resp = cache.get(self.metadata, self.id, time, self.delta,
+                             self.nfft)
+            if resp is not None:
+                return resp
+        resp = get_response(tr)
+        if cache is not None:
+            epoch = self._get_response_epoch(time)
+            if epoch is not None:
+                cache.add(self.metadata, self.id, epoch[0], epoch[1],
+                          self.delta, self.nfft, resp)
+        return resp
+
+    def _get_response_epoch(self, time):
+        """
+        Return start and end of the channel epoch in the metadata that is
+        valid at given time or ``None`` if it can not be determined
+        unambiguously.
+        """
+        if isinstance(self.metadata, Inventory):
+            inv = self.metadata.select(
+                network=self.network, station=self.station,
+                location=self.location, channel=self.channel, time=time)
+            channels = [cha for net in inv for sta in net for cha in sta]
+            if len(channels) != 1:
+                return None
+            return channels[0].start_date, channels[0].end_date
+        try:
+            if isinstance(self.metadata, Parser):
+                parser = self.metadata
+            else:
+                parser = Parser(self.metadata)
+        except Exception:
+            return None
+        # look up matching channel blockettes like Parser._select() but
+        # without reinitializing the parser
+        epochs = []
+        for station in parser.stations:
+            station_flag = False
+            for blkt in station:
+                if blkt.id == 50:
+                    station_flag = (
+                        blkt.network_code == self.network and
+                        blkt.station_call_letters == self.station)
+                elif blkt.id == 52 and station_flag:
+                    if blkt.location_identifier != self.location or \
+                            blkt.channel_identifier != self.channel:
+                        continue
+                    if blkt.start_date > time:
+                        continue
+                    if blkt.end_date and blkt.end_date < time:
+                        continue
+                    epochs.append((blkt.start_date, blkt.end_date or None))
+        if len(epochs) != 1:
+            return None
+        return epochs[0]
 
     def _get_response_from_inventory(self, tr):
         inventory = self.metadata
@@ -1487,31 +1781,8 @@ class PPSD(object):
         See :meth:`PPSD.add_npz()`.
         """
         def _add(data):
-            # check ppsd_version version and raise if higher than current
-            _check_npz_ppsd_version(self, data)
-            # check if all metadata agree
-            for key in self.NPZ_STORE_KEYS_SIMPLE_TYPES:
-                value_ = data[key].item()
-                value = self.NPZ_SIMPLE_TYPE_MAP_R.get(value_, value_)
-                if getattr(self, key) != value:
-                    msg = ("Mismatch in '%s' attribute.\n\tCurrent:\n\t%s\n\t"
-                           "Loaded:\n\t%s")
-                    msg = msg % (key, getattr(self, key), data[key].item())
-                    raise AssertionError(msg)
-            for key in self.NPZ_STORE_KEYS_ARRAY_TYPES:
-                try:
-                    np.testing.assert_array_equal(getattr(self, key),
-                                                  data[key])
-                except AssertionError as e:
-                    msg = ("Mismatch in '%s' attribute.\n") % key
-                    raise AssertionError(msg + str(e))
+            self._check_npz_settings(data)
             # load new psd data
-            for key in self.NPZ_STORE_KEYS_VERSION_NUMBERS:
-                if getattr(self, key) != data[key].item():
-                    msg = ("Mismatch in version numbers (%s) between current "
-                           "data (%s) and loaded data (%s).") % (
-                               key, getattr(self, key), data[key].item())
-                    warnings.warn(msg)
             _times_data = data["_times_data"].tolist()
             _times_gaps = data["_times_gaps"].tolist()
             _times_processed = [d_ for d_ in data["_times_processed"]]
@@ -1526,15 +1797,8 @@ class PPSD(object):
                 _times_processed = [
                     UTCDateTime(t)._ns for t in _times_processed]
             # add new data
-            self._times_data.extend(_times_data)
-            self._times_gaps.extend(_times_gaps)
-            duplicates = 0
-            for t, psd in zip(_times_processed, _binned_psds):
-                t = UTCDateTime(ns=t)
-                if self.__check_time_present(t):
-                    duplicates += 1
-                    continue
-                self.__insert_processed_data(t, psd)
+            duplicates = self._add_processed_data(
+                _times_data, _times_gaps, _times_processed, _binned_psds)
             # warn if some segments were omitted
             if duplicates:
                 msg = ("%d/%d segments omitted in file '%s' "
@@ -1564,6 +1828,243 @@ class PPSD(object):
             finally:
                 data.close()
 
+    def _check_npz_settings(self, data):
+        """
+        Checks that data loaded from an npz file was computed with the same
+        settings as the current PPSD.
+
+        Raises if settings differ and warns if version numbers differ.
+        """
+        # check ppsd_version version and raise if higher than current
+        _check_npz_ppsd_version(self, data)
+        # check if all metadata agree
+        for key in self.NPZ_STORE_KEYS_SIMPLE_TYPES:
+            value_ = data[key].item()
+            value = self.NPZ_SIMPLE_TYPE_MAP_R.get(value_, value_)
+            if getattr(self, key) != value:
+                msg = ("Mismatch in '%s' attribute.\n\tCurrent:\n\t%s\n\t"
+                       "Loaded:\n\t%s")
+                msg = msg % (key, getattr(self, key), data[key].item())
+                raise AssertionError(msg)
+        for key in self.NPZ_STORE_KEYS_ARRAY_TYPES:
+            try:
+                np.testing.assert_array_equal(getattr(self, key),
+                                              data[key])
+            except AssertionError as e:
+                msg = ("Mismatch in '%s' attribute.\n") % key
+                raise AssertionError(msg + str(e))
+        for key in self.NPZ_STORE_KEYS_VERSION_NUMBERS:
+            if getattr(self, key) != data[key].item():
+                msg = ("Mismatch in version numbers (%s) between current "
+                       "data (%s) and loaded data (%s).") % (
+                           key, getattr(self, key), data[key].item())
+                warnings.warn(msg)
+
+    def save_npz_store(self, path):
+        """
+        Saves the PPSD to a directory of monthly npz files, adding to the data
+        already saved there.
+
+        In contrast to :meth:`PPSD.save_npz`, the processed data is split into
+        one compressed npz file per calendar month (``YYYY-MM.npz``, each
+        segment goes to the month it starts in) and an ``index.npz`` file
+        holding the PPSD settings and the list of months. If the directory
+        already holds a PPSD computed with the same settings, the data is
+        merged into it and only the files of months with new data are
+        rewritten, so that regularly adding new data does not require loading
+        and rewriting the complete history:
+
+        >>> ppsd = PPSD.load_npz_store(
+        ...     "/path/to/store", metadata=inv,
+        ...     starttime=UTCDateTime() - 86400)  # doctest: +SKIP
+        >>> ppsd.add(st)  # doctest: +SKIP
+        >>> ppsd.save_npz_store("/path/to/store")  # doctest: +SKIP
+
+        Segments overlapping data already saved are omitted. The files are
+        replaced only after being written completely.
+
+        :type path: str
+        :param path: Directory to save the monthly npz files to, it is created
+            if it does not exist.
+        """
+        index_filename = os.path.join(path, self.NPZ_STORE_INDEX)
+        months = set()
+        if os.path.exists(index_filename):
+            with np.load(index_filename) as data:
+                self._check_npz_settings(data)
+                months.update(data["months"].tolist())
+        elif not os.path.isdir(path):
+            os.makedirs(path)
+
+        split = self._split_months()
+        for month, (times_data, times_gaps, times_processed,
+                    binned_psds) in sorted(split.items()):
+            if month in months:
+                # merge into the saved data of this month on a shallow copy
+                # that only holds the saved data
+                saved = copy.copy(self)
+                (saved._times_data, saved._times_gaps,
+                 saved._times_processed, saved._binned_psds) = \
+                    _read_npz_store_month(path, month)
+                known = set(map(tuple, saved._times_data))
+                times_data = [t for t in times_data if tuple(t) not in known]
+                known = set(map(tuple, saved._times_gaps))
+                times_gaps = [t for t in times_gaps if tuple(t) not in known]
+                duplicates = saved._add_processed_data(
+                    times_data, times_gaps, times_processed, binned_psds)
+                # nothing new in this month, leave file untouched
+                if (duplicates == len(times_processed) and not times_data and
+                        not times_gaps):
+                    continue
+                times_data, times_gaps, times_processed, binned_psds = (
+                    saved._times_data, saved._times_gaps,
+                    saved._times_processed, saved._binned_psds)
+            _write_npz(_npz_store_month_filename(path, month),
+                       {"_times_data": times_data, "_times_gaps": times_gaps,
+                        "_times_processed": times_processed,
+                        "_binned_psds": binned_psds})
+            months.add(month)
+
+        out = {}
+        for key in (self.NPZ_STORE_KEYS_ARRAY_TYPES +
+                    self.NPZ_STORE_KEYS_SIMPLE_TYPES +
+                    self.NPZ_STORE_KEYS_VERSION_NUMBERS):
+            value = getattr(self, key)
+            if key in self.NPZ_STORE_KEYS_SIMPLE_TYPES:
+                value = self.NPZ_SIMPLE_TYPE_MAP.get(value, value)
+            out[key] = value
+        out["months"] = np.array(sorted(months), dtype=np.int64)
+        _write_npz(index_filename, out)
+        # all months in memory are in the store now
+        if self._npz_store == path:
+            self._npz_store_months = sorted(months)
+            self._npz_store_months_loaded.update(split)
+
+    @staticmethod
+    def load_npz_store(path, metadata=None, starttime=None, endtime=None):
+        """
+        Load PPSD results saved with :meth:`PPSD.save_npz_store`.
+
+        Only the monthly files holding segments that start in the given time
+        span are read. Data of other months is read on demand by
+        :meth:`PPSD.calculate_histogram` when restricted to a time span (or
+        for all months, if not restricted), all other methods only see the
+        data loaded so far.
+
+        :type path: str
+        :param path: Directory with the monthly npz files.
+        :type metadata: :class:`~obspy.core.inventory.inventory.Inventory` or
+            :class:`~obspy.io.xseed Parser` or str or dict
+        :param metadata: Response information of instrument. See notes in
+            :meth:`PPSD.__init__` for details.
+        :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param starttime: If set, months before the specified time are not
+            read.
+        :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param endtime: If set, months after the specified time are not read.
+        """
+        # the information regarding stats is set from the index
+        ppsd = PPSD(Stats(), metadata=metadata)
+        with np.load(os.path.join(path, PPSD.NPZ_STORE_INDEX)) as data:
+            # check ppsd_version version and raise if higher than current
+            _check_npz_ppsd_version(ppsd, data)
+            for key in ppsd.NPZ_STORE_KEYS_ARRAY_TYPES:
+                setattr(ppsd, key, data[key])
+            for key in (ppsd.NPZ_STORE_KEYS_SIMPLE_TYPES +
+                        ppsd.NPZ_STORE_KEYS_VERSION_NUMBERS):
+                value = data[key].item()
+                value = ppsd.NPZ_SIMPLE_TYPE_MAP_R.get(value, value)
+                setattr(ppsd, key, value)
+            ppsd._npz_store_months = data["months"].tolist()
+        ppsd._npz_store = path
+        ppsd._load_npz_store(starttime=starttime, endtime=endtime)
+        return ppsd
+
+    def _load_npz_store(self, starttime=None, endtime=None):
+        """
+        Reads the months of the npz store in the given time span that were
+        not read yet, see :meth:`PPSD.load_npz_store`.
+        """
+        if self._npz_store is None:
+            return
+        first = starttime is not None and _npz_store_month(starttime._ns)[0]
+        last = endtime is not None and _npz_store_month(endtime._ns)[0]
+        for month in self._npz_store_months:
+            if (month in self._npz_store_months_loaded or
+                    (first and month < first) or (last and month > last)):
+                continue
+            self._add_processed_data(
+                *_read_npz_store_month(self._npz_store, month))
+            self._npz_store_months_loaded.add(month)
+
+    def _split_months(self):
+        """
+        Splits processed data by calendar month for
+        :meth:`PPSD.save_npz_store`.
+
+        Segments go to the month they start in, data and gap time spans are
+        split at month boundaries.
+
+        :rtype: dict
+        :returns: Dictionary mapping months (e.g. ``202001``) to lists of
+            data times, gap times, processed times and binned psds.
+        """
+        months = {}
+
+        def _get(month):
+            return months.setdefault(month, ([], [], [], []))
+
+        for i, key in enumerate(("_times_data", "_times_gaps")):
+            for start, end in getattr(self, key):
+                while True:
+                    month, _, month_end = _npz_store_month(start)
+                    if end <= month_end:
+                        _get(month)[i].append([start, end])
+                        break
+                    _get(month)[i].append([start, month_end])
+                    start = month_end
+        # processed times are sorted, so split them at month boundaries
+        times = self._times_processed
+        i = 0
+        while i < len(times):
+            month, _, month_end = _npz_store_month(times[i])
+            j = bisect.bisect_left(times, month_end, lo=i)
+            _get(month)[2].extend(times[i:j])
+            _get(month)[3].extend(self._binned_psds[i:j])
+            i = j
+        return months
+
+    def _add_processed_data(self, times_data, times_gaps, times_processed,
+                            binned_psds):
+        """
+        Adds processed data of a PPSD computed with the same settings.
+
+        Segments overlapping already processed data are omitted.
+
+        :type times_data: list
+        :param times_data: Start and end times of data as integer nanoseconds.
+        :type times_gaps: list
+        :param times_gaps: Start and end times of gaps as integer nanoseconds.
+        :type times_processed: list of int
+        :param times_processed: Start times of processed segments as integer
+            nanoseconds.
+        :type binned_psds: list of :class:`~numpy.ndarray`
+        :param binned_psds: Smoothed psds of the processed segments.
+        :returns: Number of omitted segments.
+        """
+        self._times_data.extend(times_data)
+        self._times_gaps.extend(times_gaps)
+        duplicates = 0
+        for t, psd in zip(times_processed, binned_psds):
+            t = UTCDateTime(ns=t)
+            if self.__check_time_present(t):
+                duplicates += 1
+                continue
+            self.__insert_processed_data(t, psd)
+        if len(times_processed) > duplicates:
+            self.__invalidate_histogram()
+        return duplicates
+
     def _split_lists(self, times, psds):
         """
         """
@@ -2207,6 +2708,321 @@ class PPSD(object):
         ax.autoscale_view()
 
 
+def compute_ppsds(inventory, starttime, endtime, output_dir, sds_root=None,
+                  tsindex_database=None, ids=None, sds_format="MSEED",
+                  workers=None, executor="process", **kwargs):
+    """
+    Compute PPSDs of many channels and days with a pool of workers.
+
+    Waveforms are read from a local SDS archive or a tsindex database, the
+    instrument responses are taken from the given inventory. Every worker
+    processes the data of one channel and one day (the first and last day
+    restricted to the requested time span) and the results are merged in
+    temporal order into one PPSD per channel. Each channel is saved as soon
+    as all of its chunks are done as ``<SEED id>.npz`` in the output
+    directory (``<SEED id>_<rate>Hz.npz`` for each sampling rate of channels
+    with several sampling rates, existing files are overwritten). The
+    results do not depend on the number of workers or on the order in which
+    they finish.
+
+    PPSD segments start at the beginning of each day and after gaps, data of
+    the next day is read to complete the last segments of a day.
+
+    >>> from obspy import read_inventory, UTCDateTime
+    >>> inv = read_inventory("/path/to/inventory.xml")  # doctest: +SKIP
+    >>> compute_ppsds(
+    ...     inv, UTCDateTime(2010, 1, 1), UTCDateTime(2020, 1, 1),
+    ...     "/tmp/ppsd", sds_root="/path/to/SDS", ids=["BW.*..HH?"],
+    ...     workers=8)  # doctest: +SKIP
+
+    :type inventory: :class:`~obspy.core.inventory.inventory.Inventory`
+    :param inventory: Channels to process and their instrument responses.
+        Every channel with a sampling rate that is active during the time
+        span is processed.
+    :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param starttime: Start of time span to process.
+    :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param endtime: End of time span to process, only segments starting
+        before the end time are processed.
+    :type output_dir: str
+    :param output_dir: Directory to save the PPSD npz files to, it is created
+        if it does not exist.
+    :type sds_root: str
+    :param sds_root: Root directory of an SDS archive to read waveforms from.
+    :type tsindex_database: str
+    :param tsindex_database: Path of a tsindex SQLite database to read
+        waveforms with, see :class:`obspy.clients.filesystem.tsindex.Client`.
+        Exactly one of ``sds_root`` and ``tsindex_database`` has to be given.
+    :type ids: list of str
+    :param ids: Only process channels whose SEED id matches any of these
+        UNIX style wildcard patterns (e.g. ``["BW.*..HHZ"]``).
+    :type sds_format: str
+    :param sds_format: File format of the SDS archive.
+    :type workers: int
+    :param workers: Number of concurrent workers, defaults to the number of
+        CPUs. ``1`` processes all chunks in the current process.
+    :type executor: str
+    :param executor: Kind of worker pool, ``"process"`` or ``"thread"``. Code
+        using processes has to be guarded by ``if __name__ == "__main__":``
+        on platforms spawning new processes.
+    :param kwargs: Additional keyword arguments passed on to :class:`PPSD`
+        (e.g. ``ppsd_length`` or ``skip_on_gaps``).
+    :rtype: dict
+    :returns: Dictionary mapping ``(SEED id, sampling rate)`` tuples to the
+        npz file names written. Channels without any processed data are
+        omitted.
+    """
+    if (sds_root is None) == (tsindex_database is None):
+        msg = "Exactly one of 'sds_root' and 'tsindex_database' is required."
+        raise ValueError(msg)
+    if sds_root is not None:
+        source = ("SDS", sds_root, sds_format)
+    else:
+        source = ("TSINDEX", tsindex_database, None)
+    starttime = UTCDateTime(starttime)
+    endtime = UTCDateTime(endtime)
+
+    # all channels to process with their sampling rates
+    channels = {}
+    for net in inventory:
+        for sta in net:
+            for cha in sta:
+                seed_id = ".".join((net.code, sta.code, cha.location_code,
+                                    cha.code))
+                if not cha.sample_rate:
+                    continue
+                if ids and not any(fnmatch.fnmatch(seed_id, pattern)
+                                   for pattern in ids):
+                    continue
+                if cha.start_date and cha.start_date >= endtime:
+                    continue
+                if cha.end_date and cha.end_date < starttime:
+                    continue
+                channels.setdefault(seed_id, set()).add(cha.sample_rate)
+    # daily chunks
+    days = []
+    t = starttime
+    while t < endtime:
+        day_end = min(UTCDateTime(t.date) + 86400, endtime)
+        days.append((t, day_end))
+        t = day_end
+    # ppsd segment length to read beyond the end of every chunk
+    ppsd_length = kwargs.get("ppsd_length", 3600.0)
+
+    tasks = []
+    for seed_id in sorted(channels):
+        network, station, location, channel = seed_id.split(".")
+        metadata = inventory.select(network=network, station=station,
+                                    location=location, channel=channel)
+        for sampling_rate in sorted(channels[seed_id]):
+            for t1, t2 in days:
+                tasks.append((source, seed_id, sampling_rate, t1, t2,
+                              t2 + ppsd_length, metadata, kwargs))
+
+    # waveform clients of this call, one per thread
+    clients = _WaveformClients()
+    if workers == 1:
+        results = ((i, _compute_ppsd_chunk(task, clients))
+                   for i, task in enumerate(tasks))
+    else:
+        if executor == "thread":
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+            function = functools.partial(_compute_ppsd_chunk,
+                                         clients=clients)
+        elif executor == "process":
+            pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers)
+            # worker processes use their own clients
+            function = _compute_ppsd_chunk
+        else:
+            msg = "executor must be either 'thread' or 'process', not '%s'" \
+                % executor
+            raise ValueError(msg)
+        # only submit a few tasks ahead so that completed chunks of a channel
+        # do not pile up before they can be merged
+        results = _iter_completed(pool, function, tasks,
+                                  2 * (workers or os.cpu_count() or 1))
+
+    try:
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir)
+        # merge the chunks of every channel in temporal order as they
+        # complete, each channel is saved and released once all of its chunks
+        # are merged
+        channel_chunks = {}
+        filenames = {}
+        for i, result in results:
+            _, seed_id, sampling_rate, _, _, _, metadata, _ = tasks[i]
+            key = (seed_id, sampling_rate)
+            merged, pending, ppsd = channel_chunks.get(key, (0, {}, None))
+            # the tasks of a channel are consecutive, one per day
+            pending[i % len(days)] = result
+            while merged in pending:
+                result = pending.pop(merged)
+                merged += 1
+                if result is None:
+                    continue
+                if ppsd is None:
+                    ppsd = PPSD(_ppsd_stats(seed_id, sampling_rate),
+                                metadata=metadata, **kwargs)
+                ppsd._add_processed_data(*result)
+            if merged < len(days):
+                channel_chunks[key] = (merged, pending, ppsd)
+                continue
+            channel_chunks.pop(key, None)
+            if ppsd is None or not ppsd._times_processed:
+                continue
+            if len(channels[seed_id]) > 1:
+                name = "%s_%gHz.npz" % (seed_id, sampling_rate)
+            else:
+                name = "%s.npz" % seed_id
+            filename = os.path.join(output_dir, name)
+            ppsd.save_npz(filename)
+            filenames[key] = filename
+    finally:
+        # shuts down the pool
+        results.close()
+        clients.close()
+    return dict(sorted(filenames.items()))
+
+
+def _iter_completed(pool, function, tasks, limit):
+    """
+    Applies a function to all tasks with a pool of workers.
+
+    Yields the index of every task with its result as soon as it completes,
+    at most ``limit`` tasks are submitted to the pool at a time. The pool is
+    shut down when all tasks are done.
+    """
+    tasks = enumerate(tasks)
+    with pool:
+        futures = {}
+        while True:
+            for i, task in itertools.islice(tasks, limit - len(futures)):
+                futures[pool.submit(function, task)] = i
+            if not futures:
+                return
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                yield futures.pop(future), future.result()
+
+
+def _ppsd_stats(seed_id, sampling_rate):
+    """
+    Returns a :class:`~obspy.core.trace.Stats` object to initialize a PPSD.
+    """
+    network, station, location, channel = seed_id.split(".")
+    return Stats({"network": network, "station": station,
+                  "location": location, "channel": channel,
+                  "sampling_rate": sampling_rate})
+
+
+class _WaveformClients(object):
+    """
+    Waveform clients of the workers of :func:`compute_ppsds`.
+
+    Every thread gets its own client for each waveform source, all clients
+    are closed by :meth:`close`.
+    """
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._clients = []
+
+    def get(self, source):
+        """
+        Returns the client of the current thread for a waveform source.
+        """
+        clients = self._local.__dict__.setdefault("clients", {})
+        if source not in clients:
+            client = _create_waveform_client(source)
+            with self._lock:
+                self._clients.append(client)
+            clients[source] = client
+        return clients[source]
+
+    def close(self):
+        """
+        Closes all clients.
+        """
+        with self._lock:
+            clients, self._clients = self._clients, []
+        self._local = threading.local()
+        for client in clients:
+            _close_waveform_client(client)
+
+
+def _create_waveform_client(source):
+    kind, path, format = source
+    if kind == "SDS":
+        from obspy.clients.filesystem.sds import Client
+        return Client(path, format=format)
+    from obspy.clients.filesystem.tsindex import Client
+    return Client(path)
+
+
+def _close_waveform_client(client):
+    # tsindex clients hold a database connection pool
+    request_handler = getattr(client, "request_handler", None)
+    if request_handler is not None:
+        request_handler.engine.dispose()
+
+
+# waveform clients of a worker process of a process pool
+_worker_clients = None
+
+
+def _compute_ppsd_chunk(task, clients=None):
+    """
+    Computes the PPSD segments of one channel starting in a given time span.
+
+    See :func:`compute_ppsds`.
+
+    :type clients: :class:`_WaveformClients`
+    :param clients: Waveform clients to use. Defaults to the clients of the
+        current worker process, which are closed when the process exits at
+        the shutdown of the pool.
+    :returns: ``None`` if no data is available, otherwise arguments for
+        :meth:`PPSD._add_processed_data`.
+    """
+    global _worker_clients
+    source, seed_id, sampling_rate, t1, t2, t3, metadata, kwargs = task
+    if clients is None:
+        if _worker_clients is None:
+            _worker_clients = _WaveformClients()
+            multiprocessing.util.Finalize(None, _worker_clients.close,
+                                          exitpriority=0)
+        clients = _worker_clients
+    client = clients.get(source)
+    network, station, location, channel = seed_id.split(".")
+    st = client.get_waveforms(network, station, location, channel, t1, t3)
+    st = st.select(sampling_rate=sampling_rate)
+    if not st:
+        return None
+    ppsd = PPSD(_ppsd_stats(seed_id, sampling_rate), metadata=metadata,
+                **kwargs)
+    ppsd.add(st)
+    # only keep segments starting in this chunk, the data read beyond its end
+    # only completes the last segments
+    times_processed = []
+    binned_psds = []
+    for t, psd in zip(ppsd._times_processed, ppsd._binned_psds):
+        if t < t2._ns:
+            times_processed.append(t)
+            binned_psds.append(psd)
+    # keep the samples in [t1, t2), a sample at t2 belongs to the next chunk
+    st.trim(t1, t2, nearest_sample=False)
+    for tr in st:
+        if tr.stats.endtime >= t2:
+            tr.data = tr.data[:-1]
+    st.traces = [tr for tr in st if tr.stats.npts]
+    times_data = [[tr.stats.starttime._ns, tr.stats.endtime._ns]
+                  for tr in st]
+    times_gaps = [[gap[4]._ns, gap[5]._ns] for gap in st.get_gaps()]
+    return times_data, times_gaps, times_processed, binned_psds
+
+
 def get_nlnm():
     """
     Returns periods and psd values for the New Low Noise Model.
@@ -2251,6 +3067,48 @@ def get_idc_infra_hi_noise():
     return (periods, nhnm)
 
 
+def _npz_store_month(t):
+    """
+    Returns the month (e.g. ``202001``) of a time given as integer
+    nanoseconds and start and end of that month as integer nanoseconds.
+    """
+    t = UTCDateTime(ns=int(t))
+    start = UTCDateTime(t.year, t.month, 1)
+    end = UTCDateTime(t.year + t.month // 12, t.month % 12 + 1, 1)
+    return t.year * 100 + t.month, start._ns, end._ns
+
+
+def _npz_store_month_filename(path, month):
+    """
+    Returns the file name of a month of a PPSD npz store.
+    """
+    return os.path.join(path, "%04d-%02d.npz" % divmod(month, 100))
+
+
+def _read_npz_store_month(path, month):
+    """
+    Reads the processed data of a month of a PPSD npz store.
+
+    :returns: Lists of data times, gap times, processed times and binned
+        psds.
+    """
+    with np.load(_npz_store_month_filename(path, month)) as data:
+        return (data["_times_data"].tolist(), data["_times_gaps"].tolist(),
+                [d for d in data["_times_processed"]],
+                [d for d in data["_binned_psds"]])
+
+
+def _write_npz(filename, data):
+    """
+    Writes a compressed npz file, replacing an existing file only after the
+    new file was written completely.
+    """
+    tmp_filename = filename + ".tmp"
+    with open(tmp_filename, "wb") as fh:
+        np.savez_compressed(fh, **data)
+    os.replace(tmp_filename, filename)
+
+
 def _check_npz_ppsd_version(ppsd, npzfile):
     # add some future-proofing and show a warning if older ObsPy
     # versions should read a more recent ppsd npz file, since this is very
@@ -47,12 +47,12 @@ void spr_bp_fast_bworth(float *tr, int ndat, float tsa, float flo, float fhi, in
 {
     int k;                   /* index */
     int n,m,mm;
-    static double a[MAX_SEC+1];
-    static double b[MAX_SEC+1];
-    static double c[MAX_SEC+1];
-    static double d[MAX_SEC+1];
-    static double e[MAX_SEC+1];
-    static double f[MAX_SEC+1][6];
+    double a[MAX_SEC+1];
+    double b[MAX_SEC+1];
+    double c[MAX_SEC+1];
+    double d[MAX_SEC+1];
+    double e[MAX_SEC+1];
+    double f[MAX_SEC+1][6];
 
     double temp;
     double c1,c2,c3;
@@ -153,10 +153,10 @@ void spr_hp_fast_bworth(float *tr, int ndat, float tsa, float fc, int ns, int zp
 {
     int k;                   /* index */
     int n,m,mm;
-    static double a[MAX_SEC+1];
-    static double b[MAX_SEC+1];
-    static double c[MAX_SEC+1];
-    static double f[MAX_SEC+1][6];
+    double a[MAX_SEC+1];
+    double b[MAX_SEC+1];
+    double c[MAX_SEC+1];
+    double f[MAX_SEC+1][6];
  
     double temp;
     double wcp,cs;
@@ -240,10 +240,10 @@ void spr_lp_fast_bworth(float *tr, int ndat, float tsa, float fc, int ns, int zp
 {
     int k;                       /* index */
     int n,m,mm;
-    static double a[MAX_SEC+1];
-    static double b[MAX_SEC+1];
-    static double c[MAX_SEC+1];
-    static double f[MAX_SEC+1][6];
+    double a[MAX_SEC+1];
+    double b[MAX_SEC+1];
+    double c[MAX_SEC+1];
+    double f[MAX_SEC+1][6];
  
     double temp;
     double wcp,cs,x;
@@ -8,14 +8,15 @@ import os
 import unittest
 import warnings
 
-from obspy import UTCDateTime, read, Trace
+from obspy import UTCDateTime, read, Stream, Trace
 from obspy.core.util.libnames import _load_cdll
 from obspy.core.util.testing import ImageComparison
 from obspy.signal.cross_correlation import (
     correlate, correlate_template, correlate_stream_template,
-    correlation_detector,
+    correlation_detector, iter_correlate_template,
     xcorr_pick_correction, xcorr_3c, xcorr_max,
-    _xcorr_padzeros, _xcorr_slice, _find_peaks)
+    _xcorr_padzeros, _xcorr_slice, _find_peaks, _BatchCorrelator,
+    _calc_mean)
 from obspy.signal.trigger import coincidence_trigger
 
 
@@ -594,6 +595,114 @@ class CrossCorrelationTestCase(unittest.TestCase):
         self.assertIsInstance(sims[0], Trace)
         self.assertIs(sims[1], None)
 
+    def test_iter_correlate_template(self):
+        """
+        Cross-correlation of chunks of data is the same as of the whole data.
+        """
+        tr = read()[0]
+        template = tr.data[450:750]
+        for normalize in ('full', None):
+            for demean in (True, False):
+                kwargs = dict(normalize=normalize, demean=demean)
+                cc1 = correlate_template(tr, template, method='fft',
+                                         **kwargs)
+                atol = 1e-7 * np.abs(cc1).max()
+                # chunks shorter and longer than template and FFT blocks
+                for chunk_length in (100, 1000, 3000):
+                    chunks = [tr.data[i:i + chunk_length]
+                              for i in range(0, len(tr), chunk_length)]
+                    ccs = list(iter_correlate_template(
+                        chunks, template, block_size=512, **kwargs))
+                    if chunk_length < len(template):
+                        self.assertLess(len(ccs), len(chunks))
+                    np.testing.assert_allclose(np.concatenate(ccs), cc1,
+                                               rtol=1e-7, atol=atol)
+        # traces with a gap, correlation is restarted after the gap
+        st = Stream([tr.slice(None, tr.stats.starttime + 10),
+                     tr.slice(tr.stats.starttime + 10.01,
+                              tr.stats.starttime + 15),
+                     tr.slice(tr.stats.starttime + 20)])
+        ccs = list(iter_correlate_template(st, template, block_size=1024))
+        t0 = tr.stats.starttime
+        self.assertEqual(len(ccs), 3)
+        self.assertEqual(ccs[0].stats.starttime, t0)
+        self.assertEqual(ccs[1].stats.starttime,
+                         t0 + len(ccs[0]) * tr.stats.delta)
+        self.assertEqual(ccs[2].stats.starttime, t0 + 20)
+        cc1 = correlate_template(tr.data[:1501], template)
+        np.testing.assert_allclose(
+            np.concatenate([ccs[0].data, ccs[1].data]), cc1, atol=1e-7)
+        cc2 = correlate_template(tr.slice(t0 + 20), template)
+        np.testing.assert_allclose(ccs[2].data, cc2, atol=1e-7)
+        # contiguous traces give the same result as the whole trace
+        cc1 = correlate_template(tr, template)
+        chunks = [tr.slice(t0 + i, t0 + i + 5 - tr.stats.delta)
+                  for i in range(0, 30, 5)]
+        ccs = list(iter_correlate_template(chunks, template, block_size=1024))
+        self.assertEqual(ccs[0].stats.starttime, t0)
+        self.assertEqual(ccs[0].id, tr.id)
+        np.testing.assert_allclose(
+            np.concatenate([cc.data for cc in ccs]), cc1, atol=1e-7)
+        # traces of different channels
+        other = tr.slice(t0 + 5)
+        other.stats.channel = 'EHN'
+        with self.assertRaises(ValueError):
+            list(iter_correlate_template([chunks[0], other], template))
+        with self.assertRaises(ValueError):
+            list(iter_correlate_template([tr], template, block_size=100))
+
+    def test_batch_correlator(self):
+        """
+        Cross-correlations with many templates reusing the Fourier transforms
+        of the data give the same results as correlate_stream_template.
+        """
+        stream = read().filter('highpass', freq=5)
+        # trace with different length
+        stream[1].trim(stream[1].stats.starttime + 1, None)
+        pick = UTCDateTime('2009-08-24T00:20:07.73')
+        templates = [stream.slice(pick, pick + 5),
+                     stream.slice(pick + 5, pick + 10)]
+        # shift one template trace
+        templates[1][0].trim(pick + 6, pick + 11)
+        for normalize in ('full', None):
+            for demean in (True, False):
+                kwargs = dict(normalize=normalize, demean=demean)
+                correlator = _BatchCorrelator(stream, **kwargs)
+                for template in templates:
+                    ccs1 = correlate_stream_template(stream, template,
+                                                     method='fft', **kwargs)
+                    ccs2 = correlator.correlate(template)
+                    self.assertEqual(len(ccs2), len(ccs1))
+                    for tr1, tr2 in zip(ccs1, ccs2):
+                        self.assertEqual(tr2.id, tr1.id)
+                        self.assertEqual(tr2.stats.starttime,
+                                         tr1.stats.starttime)
+                        atol = 1e-7 * np.abs(tr1.data).max()
+                        np.testing.assert_allclose(tr2.data, tr1.data,
+                                                   rtol=1e-7, atol=atol)
+                    sim1 = _calc_mean(ccs1)
+                    sim2 = correlator.mean(template)
+                    self.assertEqual(sim2.stats.starttime,
+                                     sim1.stats.starttime)
+                    atol = 1e-7 * np.abs(sim1.data).max()
+                    np.testing.assert_allclose(sim2.data, sim1.data,
+                                               rtol=1e-7, atol=atol)
+        # Fourier transforms of data are calculated once per trace
+        self.assertEqual(len(correlator._ffts), len(stream))
+        # detections are the same as without reusing Fourier transforms
+        detections1, sims1 = correlation_detector(
+            stream, templates, 0.5, 1, method='direct')
+        detections2, sims2 = correlation_detector(stream, templates, 0.5, 1)
+        self.assertGreater(len(detections1), 0)
+        self.assertEqual(len(detections2), len(detections1))
+        for d1, d2 in zip(detections1, detections2):
+            self.assertEqual(sorted(d2), sorted(d1))
+            self.assertEqual(d2['time'], d1['time'])
+            self.assertEqual(d2['template_id'], d1['template_id'])
+            self.assertAlmostEqual(d2['similarity'], d1['similarity'])
+        for sim1, sim2 in zip(sims1, sims2):
+            np.testing.assert_allclose(sim2.data, sim1.data, atol=1e-7)
+
 
 def suite():
     return unittest.makeSuite(CrossCorrelationTestCase, 'test')
@@ -9,7 +9,8 @@ from obspy import Stream, Trace, UTCDateTime
 from obspy.core.util import AttribDict
 from obspy.signal.array_analysis import (array_processing,
                                          array_transff_freqslowness,
-                                         array_transff_wavenumber, get_spoint)
+                                         array_transff_wavenumber, get_spoint,
+                                         iter_array_processing)
 from obspy.signal.util import util_lon_lat
 
 
@@ -18,7 +19,7 @@ class SonicTestCase(unittest.TestCase):
     Test fk analysis, main function is sonic() in array_analysis.py
     """
 
-    def array_processing(self, prewhiten, method):
+    def synthetic_stream(self):
         np.random.seed(2348)
 
         geometry = np.array([[0.0, 0.0, 0.0],
@@ -61,7 +62,10 @@ class SonicTestCase(unittest.TestCase):
             tr.filter("lowpass", freq=df / 4.)
             trl.append(tr)
 
-        st = Stream(trl)
+        return Stream(trl)
+
+    def array_processing(self, prewhiten, method, store=None):
+        st = self.synthetic_stream()
 
         stime = UTCDateTime(1970, 1, 1, 0, 0)
         etime = UTCDateTime(1970, 1, 1, 0, 0) + 4.0
@@ -85,7 +89,7 @@ class SonicTestCase(unittest.TestCase):
         args = (st, win_len, step_frac, sll_x, slm_x, sll_y, slm_y, sl_s,
                 semb_thres, vel_thres, frqlow, frqhigh, stime, etime)
         kwargs = dict(prewhiten=prewhiten, coordsys='xy', verbose=False,
-                      method=method)
+                      method=method, store=store)
         out = array_processing(*args, **kwargs)
         if False:  # 1 for debugging
             print('\n', out[:, 1:])
@@ -145,6 +149,35 @@ class SonicTestCase(unittest.TestCase):
         # XXX relative tolerance should be lower!
         self.assertTrue(np.allclose(ref, out[:, 1:], rtol=4e-5))
 
+    def test_iter_array_processing(self):
+        """
+        Batched and threaded power maps are the same as the ones of
+        array_processing.
+        """
+        st = self.synthetic_stream()
+        stime = UTCDateTime(1970, 1, 1, 0, 0)
+        etime = stime + 4.0
+        for prewhiten in (0, 1):
+            for method in (0, 1):
+                expected = []
+
+                def store(relpow_map, abspow_map, offset):
+                    expected.append((relpow_map.copy(), abspow_map.copy()))
+
+                out = self.array_processing(prewhiten, method, store=store)
+                got = list(iter_array_processing(
+                    st, 2., 0.2, -3.0, 3.0, -3.0, 3.0, 0.1, 1.0, 8.0, stime,
+                    etime, prewhiten=prewhiten, coordsys='xy', method=method,
+                    batch_size=4, workers=2))
+                self.assertEqual(len(got), len(expected))
+                self.assertEqual(len(got), len(out))
+                for i, (t, relpow_map, abspow_map) in enumerate(got):
+                    self.assertEqual(t, stime + i * 0.4)
+                    np.testing.assert_allclose(relpow_map, expected[i][0],
+                                               rtol=1e-6)
+                    np.testing.assert_allclose(abspow_map, expected[i][1],
+                                               rtol=1e-6)
+
     def test_get_spoint(self):
         stime = UTCDateTime(1970, 1, 1, 0, 0)
         etime = UTCDateTime(1970, 1, 1, 0, 0) + 10
@@ -6,21 +6,29 @@ The psd test suite.
 import gzip
 import io
 import os
+import shutil
+import tempfile
 import unittest
 import warnings
 from copy import deepcopy
+from unittest import mock
 
 import numpy as np
 from obspy import Stream, Trace, UTCDateTime, read, read_inventory, Inventory
 from obspy.core import Stats
 from obspy.core.inventory import Response
 from obspy.core.util import NUMPY_VERSION
+from obspy.clients.filesystem.sds import SDS_FMTSTR
 from obspy.core.util.base import NamedTemporaryFile, MATPLOTLIB_VERSION
 from obspy.core.util.obspy_types import ObsPyException
 from obspy.core.util.testing import (
     ImageComparison, ImageComparisonException)
 from obspy.io.xseed import Parser
-from obspy.signal.spectral_estimation import (PPSD, welch_taper, welch_window)
+from obspy.signal import spectral_estimation
+from obspy.signal.spectral_estimation import (PPSD, ResponseCache,
+                                              _psd_batch, compute_ppsds,
+                                              fft_taper,
+                                              welch_taper, welch_window)
 from obspy.signal.spectral_estimation import earthquake_models
 from obspy.signal.spectral_estimation import get_idc_infra_low_noise
 from obspy.signal.spectral_estimation import get_idc_infra_hi_noise
@@ -165,6 +173,27 @@ class PsdTestCase(unittest.TestCase):
         np.testing.assert_array_almost_equal(psd_obspy[5:], psd_pitsa[5:],
                                              decimal=6)
 
+    def test_psd_batch_vs_mlab(self):
+        """
+        Batched psd computation of PPSD segments gives the same results as
+        :func:`matplotlib.mlab.psd` for every segment.
+        """
+        from matplotlib import mlab
+        noise = np.load(os.path.join(self.path, "pitsa_noise.npy"),
+                        **allow_pickle)
+        data = np.array([noise[:4096], noise[2048:6144], noise[4096:]])
+        for nfft, noverlap in ((512, 0), (512, 384), (1024, 768)):
+            got, freqs = _psd_batch(data, nfft, 100.0, noverlap=noverlap)
+            self.assertEqual(got.shape, (3, nfft // 2 + 1))
+            for row, psd_got in zip(data, got):
+                expected, expected_freqs = mlab.psd(
+                    row.copy(), nfft, 100.0, detrend=mlab.detrend_linear,
+                    window=fft_taper, noverlap=noverlap, sides='onesided',
+                    scale_by_freq=True)
+                np.testing.assert_allclose(psd_got, expected, rtol=1e-10,
+                                           atol=1e-12 * expected.max())
+                np.testing.assert_allclose(freqs, expected_freqs)
+
     def test_welch_window_vs_pitsa(self):
         """
         Test that the helper function to generate the welch window delivers the
@@ -405,6 +434,157 @@ class PsdTestCase(unittest.TestCase):
                 self.assertEqual(getattr(ppsd, key),
                                  getattr(results_full, key))
 
+    def test_ppsd_response_cache(self):
+        """
+        Responses are evaluated once per channel epoch and can be shared
+        between PPSD instances.
+        """
+        st = read(os.path.join(self.path, 'IUANMO.seed'))
+        resp = os.path.join(self.path, 'IUANMO.resp')
+        parser = Parser(os.path.join(self.path, 'IUANMO.dataless'))
+        inv = read_inventory(os.path.join(self.path, 'IUANMO.xml'))
+        for metadata, method in (
+                (parser, '_get_response_from_parser'),
+                (inv, '_get_response_from_inventory'),
+                (resp, '_get_response_from_resp')):
+            cache = ResponseCache()
+            ppsd = PPSD(st[0].stats, metadata, response_cache=cache)
+            with mock.patch.object(PPSD, method,
+                                   wraps=getattr(ppsd, method)) as p:
+                ppsd.add(st)
+            self.assertGreater(len(ppsd.times_processed), 1)
+            self.assertEqual(p.call_count, 1)
+            self.assertEqual(len(cache), 1)
+            # second PPSD takes the response from the shared cache
+            ppsd2 = PPSD(st[0].stats, metadata, response_cache=cache)
+            with mock.patch.object(PPSD, method) as p:
+                ppsd2.add(st)
+            self.assertEqual(p.call_count, 0)
+            np.testing.assert_array_equal(ppsd2._binned_psds,
+                                          ppsd._binned_psds)
+        # other metadata with a different response for the same SEED id
+        # does not use the cached response
+        inv2 = inv.copy()
+        inv2[0][0][0].response.response_stages[0].stage_gain *= 10.0
+        cache = ResponseCache()
+        ppsd = PPSD(st[0].stats, inv, response_cache=cache)
+        ppsd.add(st)
+        ppsd2 = PPSD(st[0].stats, inv2, response_cache=cache)
+        with mock.patch.object(PPSD, '_get_response_from_inventory',
+                               wraps=ppsd2._get_response_from_inventory) as p:
+            ppsd2.add(st)
+        self.assertEqual(p.call_count, 1)
+        self.assertEqual(len(cache), 2)
+        np.testing.assert_allclose(
+            np.array(ppsd2._binned_psds) + 20.0,
+            np.array(ppsd._binned_psds), atol=0.5)
+
+    def test_compute_ppsds(self):
+        """
+        PPSDs computed in daily chunks by a pool of workers are merged
+        deterministically into one npz file per channel.
+        """
+        st = read(os.path.join(self.path, 'IUANMO.seed'))
+        inv = read_inventory(os.path.join(self.path, 'IUANMO.xml'))
+        # shift data to span a day break
+        for tr in st:
+            tr.stats.starttime += 6 * 3600
+        t1 = min(tr.stats.starttime for tr in st)
+        t2 = max(tr.stats.endtime for tr in st)
+        tempdir = tempfile.mkdtemp(prefix='obspy-ppsdtest-')
+        try:
+            for day in (UTCDateTime(t1.date), UTCDateTime(t2.date)):
+                for tr in st.slice(day, day + 86400 - 1e-6):
+                    filename = os.path.join(tempdir, SDS_FMTSTR.format(
+                        year=day.year, doy=day.julday, sds_type="D",
+                        **tr.stats))
+                    if not os.path.isdir(os.path.dirname(filename)):
+                        os.makedirs(os.path.dirname(filename))
+                    tr.write(filename, format="MSEED")
+            results = []
+            for workers, executor in ((1, "process"), (2, "thread")):
+                output_dir = os.path.join(tempdir, "ppsd_%d" % workers)
+                # the waveform clients of every thread are closed at the end
+                with warnings.catch_warnings(), mock.patch.object(
+                        spectral_estimation, "_create_waveform_client",
+                        wraps=spectral_estimation._create_waveform_client) \
+                        as create, mock.patch.object(
+                        spectral_estimation, "_close_waveform_client",
+                        wraps=spectral_estimation._close_waveform_client) \
+                        as close:
+                    warnings.simplefilter("ignore")
+                    filenames = compute_ppsds(
+                        inv, t1, t2, output_dir, sds_root=tempdir,
+                        ids=[st[0].id], workers=workers, executor=executor)
+                self.assertGreaterEqual(create.call_count, 1)
+                self.assertLessEqual(create.call_count, workers)
+                self.assertEqual(close.call_count, create.call_count)
+                self.assertEqual(list(filenames), [(st[0].id, 1.0)])
+                results.append(PPSD.load_npz(filenames[st[0].id, 1.0]))
+            # chunks completing in reverse order are merged the same way
+            iter_completed = spectral_estimation._iter_completed
+
+            def _iter_reversed(*args):
+                for result in reversed(list(iter_completed(*args))):
+                    yield result
+
+            output_dir = os.path.join(tempdir, "ppsd_reversed")
+            with warnings.catch_warnings(), \
+                    mock.patch.object(spectral_estimation, "_iter_completed",
+                                      side_effect=_iter_reversed) as p:
+                warnings.simplefilter("ignore")
+                filenames = compute_ppsds(
+                    inv, t1, t2, output_dir, sds_root=tempdir,
+                    ids=[st[0].id], workers=2, executor="thread")
+            self.assertEqual(p.call_count, 1)
+            results.append(PPSD.load_npz(filenames[st[0].id, 1.0]))
+            # a channel with a lower sampling rate on the second day gets
+            # one file per sampling rate
+            day = UTCDateTime(t2.date)
+            tr = st.slice(day, day + 86400 - 1e-6)[0]
+            tr.decimate(2, no_filter=True)
+            tr.write(os.path.join(tempdir, SDS_FMTSTR.format(
+                year=day.year, doy=day.julday, sds_type="D", **tr.stats)),
+                format="MSEED")
+            inv2 = inv.copy()
+            channels = inv2[0][0].channels
+            channels.append(channels[0].copy())
+            channels[0].end_date = day
+            channels[1].start_date = day
+            channels[1].sample_rate = 0.5
+            output_dir = os.path.join(tempdir, "ppsd_rates")
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                filenames = compute_ppsds(
+                    inv2, t1, t2, output_dir, sds_root=tempdir,
+                    ids=[st[0].id], workers=1)
+            self.assertEqual(sorted(filenames),
+                             [(st[0].id, 0.5), (st[0].id, 1.0)])
+            self.assertEqual(
+                sorted(os.listdir(output_dir)),
+                [st[0].id + "_0.5Hz.npz", st[0].id + "_1Hz.npz"])
+            for (_, sampling_rate), filename in filenames.items():
+                self.assertEqual(
+                    PPSD.load_npz(filename).sampling_rate, sampling_rate)
+        finally:
+            shutil.rmtree(tempdir)
+        ppsd = results[0]
+        times = ppsd._times_processed
+        self.assertGreater(len(times), 2)
+        self.assertEqual(times, sorted(set(times)))
+        # segments of both days are present
+        self.assertLess(times[0], UTCDateTime(t2.date)._ns)
+        self.assertGreaterEqual(times[-1], UTCDateTime(t2.date)._ns)
+        # the data of both days does not overlap at the day break
+        times_data = sorted(ppsd._times_data)
+        for (_, end), (start, _) in zip(times_data[:-1], times_data[1:]):
+            self.assertLess(end, start)
+        for ppsd2 in results[1:]:
+            self.assertEqual(ppsd2._times_processed, times)
+            np.testing.assert_array_equal(ppsd2._binned_psds,
+                                          ppsd._binned_psds)
+            self.assertEqual(ppsd2._times_data, ppsd._times_data)
+
     def test_ppsd_save_and_load_npz(self):
         """
         Test PPSD.load_npz() and PPSD.save_npz()
@@ -427,6 +607,79 @@ class PsdTestCase(unittest.TestCase):
             else:
                 self.assertEqual(getattr(ppsd, key), getattr(ppsd_loaded, key))
 
+    def test_ppsd_npz_store(self):
+        """
+        Test PPSD.save_npz_store() and PPSD.load_npz_store() adding data
+        incrementally and reading only the months needed.
+        """
+        def _bogus_ppsd(times):
+            ppsd = PPSD(stats=Stats(dict(sampling_rate=150)), metadata=None,
+                        db_bins=(-200, -50, 20.), period_step_octaves=1.4)
+            np.random.seed(1234)
+            ppsd._times_processed = list(times)
+            ppsd._binned_psds = [
+                arr for arr in np.random.uniform(
+                    -200, -50, (len(times), len(ppsd.period_bin_centers)))]
+            ppsd._times_data = [
+                [times[0], times[-1] + int(ppsd.ppsd_length * 1e9)]]
+            return ppsd
+
+        times = [
+            UTCDateTime(t)._ns for t in np.load(
+                os.path.join(self.path, "ppsd_times_processed.npy")).tolist()]
+        months = sorted(set(UTCDateTime(ns=t).strftime("%Y-%m")
+                            for t in times))
+        # first and second half of data
+        middle = len(times) // 2
+        ppsd1 = _bogus_ppsd(times[:middle])
+        ppsd2 = _bogus_ppsd(times[middle:])
+        ppsd = _bogus_ppsd(times)
+        ppsd._binned_psds = ppsd1._binned_psds + ppsd2._binned_psds
+        tempdir = tempfile.mkdtemp(prefix='obspy-ppsdtest-')
+        try:
+            ppsd1.save_npz_store(tempdir)
+            ppsd2.save_npz_store(tempdir)
+            self.assertEqual(
+                sorted(os.listdir(tempdir)),
+                sorted([month + ".npz" for month in months] + ["index.npz"]))
+            loaded = PPSD.load_npz_store(tempdir)
+            self.assertEqual(loaded._times_processed, times)
+            np.testing.assert_array_equal(loaded._binned_psds,
+                                          ppsd._binned_psds)
+            for key in (PPSD.NPZ_STORE_KEYS_ARRAY_TYPES +
+                        PPSD.NPZ_STORE_KEYS_SIMPLE_TYPES):
+                np.testing.assert_equal(getattr(loaded, key),
+                                        getattr(ppsd, key))
+            # data times are split at month boundaries
+            self.assertEqual(loaded._times_data[0][0], times[0])
+            self.assertEqual(loaded._times_data[-1][1],
+                             ppsd._times_data[0][1])
+            # saving again only rewrites the index
+            with mock.patch('obspy.signal.spectral_estimation._write_npz',
+                            wraps=spectral_estimation._write_npz) as write:
+                ppsd2.save_npz_store(tempdir)
+            self.assertEqual([os.path.basename(call[0][0])
+                              for call in write.call_args_list],
+                             ["index.npz"])
+            # only the month of the requested time span is read, other
+            # months are read on demand for histograms
+            t = UTCDateTime(ns=times[-1])
+            loaded = PPSD.load_npz_store(tempdir, starttime=t, endtime=t)
+            self.assertEqual(loaded._npz_store_months_loaded,
+                             set([t.year * 100 + t.month]))
+            t1, t2 = UTCDateTime(ns=times[0]), UTCDateTime(ns=times[10])
+            loaded.calculate_histogram(starttime=t1, endtime=t2)
+            ppsd.calculate_histogram(starttime=t1, endtime=t2)
+            np.testing.assert_array_equal(loaded.current_histogram,
+                                          ppsd.current_histogram)
+            self.assertEqual(
+                loaded._npz_store_months_loaded,
+                set([t_.year * 100 + t_.month for t_ in (t, t1, t2)]))
+            loaded.calculate_histogram()
+            self.assertEqual(loaded._times_processed, times)
+        finally:
+            shutil.rmtree(tempdir)
+
     def test_ppsd_restricted_stacks(self):
         """
         Test PPSD.calculate_histogram() with restrictions to what data should
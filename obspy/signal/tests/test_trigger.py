@@ -12,8 +12,9 @@ import numpy as np
 
 from obspy import Stream, UTCDateTime, read
 from obspy.signal.trigger import (
-    ar_pick, classic_sta_lta, classic_sta_lta_py, coincidence_trigger, pk_baer,
-    recursive_sta_lta, recursive_sta_lta_py, trigger_onset)
+    ar_pick, ar_pick_batch, classic_sta_lta, classic_sta_lta_batch,
+    classic_sta_lta_py, coincidence_trigger, pk_baer, recursive_sta_lta,
+    recursive_sta_lta_batch, recursive_sta_lta_py, trigger_onset)
 from obspy.signal.util import clibsignal
 
 
@@ -541,6 +542,80 @@ class TriggerTestCase(unittest.TestCase):
         ref = np.array([0.38012302, 0.37704431, 0.47674533, 0.67992292])
         self.assertTrue(np.allclose(ref, c2[99:103]))
 
+    def test_sta_lta_batch(self):
+        """
+        Test STA/LTA of many arrays computed in parallel threads
+        """
+        data = self.data.reshape((10, -1))
+        for func, func_batch in (
+                (recursive_sta_lta, recursive_sta_lta_batch),
+                (classic_sta_lta, classic_sta_lta_batch)):
+            for workers in (1, 4):
+                # 2-D array with common window lengths
+                cfts = func_batch(data, 5, 10, workers=workers)
+                self.assertEqual(cfts.shape, data.shape)
+                for d, cft in zip(data, cfts):
+                    np.testing.assert_array_equal(cft, func(d, 5, 10))
+                # list of arrays with different window lengths
+                arrays = [self.data[:1000], self.data[1000:3000]]
+                cfts = func_batch(arrays, [5, 10], [10, 20], workers=workers)
+                self.assertEqual(len(cfts), 2)
+                np.testing.assert_array_equal(cfts[0],
+                                              func(arrays[0], 5, 10))
+                np.testing.assert_array_equal(cfts[1],
+                                              func(arrays[1], 10, 20))
+            with self.assertRaises(ValueError):
+                func_batch(data, [5, 10], 10)
+
+    def test_ar_pick_batch(self):
+        """
+        Test ar_pick for many stations in parallel threads
+        """
+        data = []
+        for channel in ['z', 'n', 'e']:
+            file = os.path.join(self.path,
+                                'loc_RJOB20050801145719850.' + channel)
+            data.append(np.loadtxt(file, dtype=np.float32))
+        args = (200.0, 1.0, 20.0, 1.0, 0.1, 4.0, 1.0, 2, 8, 0.1, 0.2)
+        picks = ar_pick(data[0], data[1], data[2], *args)
+        # second station with lower amplitudes
+        a, b, c = ([d, d / 10.0] for d in data)
+        batch_picks = ar_pick_batch(a, b, c, *args, workers=2)
+        self.assertEqual(len(batch_picks), 2)
+        self.assertEqual(batch_picks[0], picks)
+        self.assertEqual(batch_picks[1],
+                         ar_pick(a[1], b[1], c[1], *args))
+        # concurrent pickers must not share the work arrays of the filters
+        scales = [1.0, 0.1, 3.0, 0.5, 7.0, 0.2, 2.0, 0.7]
+        a, b, c = ([d * scale for scale in scales] for d in data)
+        picks = [ar_pick(*arg, *args) for arg in zip(a, b, c)]
+        for _ in range(5):
+            self.assertEqual(ar_pick_batch(a, b, c, *args, workers=4),
+                             picks)
+
+    def test_stream_trigger_workers(self):
+        """
+        Test that triggering traces in parallel threads does not change the
+        results
+        """
+        st = read()
+        st.filter("highpass", freq=1.0)
+        for trigger_type in ('recstalta', 'classicstalta', 'zdetect'):
+            options = {'sta': 1} if trigger_type == 'zdetect' else \
+                {'sta': 1, 'lta': 4}
+            st1 = st.copy().trigger(trigger_type, workers=1, **options)
+            st2 = st.copy().trigger(trigger_type, workers=3, **options)
+            self.assertEqual(st1, st2)
+            for tr in st2:
+                self.assertIn(trigger_type, tr.stats.processing[-1])
+        # the same trace twice is triggered twice, one after the other
+        tr = st[0].copy()
+        expected = tr.copy().trigger('recstalta', sta=1, lta=4) \
+            .trigger('recstalta', sta=1, lta=4)
+        Stream([tr, tr]).trigger('recstalta', workers=2, sta=1, lta=4)
+        self.assertEqual(tr, expected)
+        self.assertRaises(ValueError, st.copy().trigger, 'xxx', workers=2)
+
 
 def suite():
     return unittest.makeSuite(TriggerTestCase, 'test')
@@ -32,6 +32,7 @@ import numpy as np
 import scipy
 
 from obspy import UTCDateTime
+from obspy.core.util.base import _map_threads
 from obspy.signal.cross_correlation import templates_max_similarity
 from obspy.signal.headers import clibsignal, head_stalta_t
 
@@ -194,6 +195,83 @@ def classic_sta_lta(a, nsta, nlta):
     return charfct
 
 
+def _broadcast(value, n):
+    """
+    Returns a list of ``n`` values for scalars, otherwise checks the length.
+    """
+    if np.ndim(value) == 0:
+        return [value] * n
+    value = list(value)
+    if len(value) != n:
+        msg = 'Expected %d values, got %d.' % (n, len(value))
+        raise ValueError(msg)
+    return value
+
+
+def _sta_lta_batch(func, data, nsta, nlta, workers):
+    """
+    Runs an STA/LTA function on many arrays in a pool of threads.
+    """
+    n = len(data)
+    args = list(zip(data, _broadcast(nsta, n), _broadcast(nlta, n)))
+    charfcts = _map_threads(lambda arg: func(*arg), args, workers=workers)
+    if isinstance(data, np.ndarray) and data.ndim == 2:
+        return np.array(charfcts).reshape(data.shape)
+    return charfcts
+
+
+def recursive_sta_lta_batch(data, nsta, nlta, workers=None):
+    """
+    Recursive STA/LTA of many arrays computed in parallel.
+
+    The C routine of :func:`recursive_sta_lta` is run for each array in a
+    pool of threads. The global interpreter lock is released during the
+    calls into C, so all CPUs can be used.
+
+    :type data: 2-D :class:`numpy.ndarray` or list of
+        :class:`numpy.ndarray`
+    :param data: Seismic traces, one per row or list item.
+    :type nsta: int or list of int
+    :param nsta: Length of short time average window in samples, a single
+        value for all or one value per trace.
+    :type nlta: int or list of int
+    :param nlta: Length of long time average window in samples, a single
+        value for all or one value per trace.
+    :type workers: int
+    :param workers: Number of threads, defaults to the number of CPUs.
+    :rtype: 2-D :class:`numpy.ndarray` or list of :class:`numpy.ndarray`
+    :return: Characteristic functions of recursive STA/LTA, of the same type
+        as ``data``.
+    """
+    return _sta_lta_batch(recursive_sta_lta, data, nsta, nlta, workers)
+
+
+def classic_sta_lta_batch(data, nsta, nlta, workers=None):
+    """
+    Classic STA/LTA of many arrays computed in parallel.
+
+    The C routine of :func:`classic_sta_lta` is run for each array in a pool
+    of threads. The global interpreter lock is released during the calls
+    into C, so all CPUs can be used.
+
+    :type data: 2-D :class:`numpy.ndarray` or list of
+        :class:`numpy.ndarray`
+    :param data: Seismic traces, one per row or list item.
+    :type nsta: int or list of int
+    :param nsta: Length of short time average window in samples, a single
+        value for all or one value per trace.
+    :type nlta: int or list of int
+    :param nlta: Length of long time average window in samples, a single
+        value for all or one value per trace.
+    :type workers: int
+    :param workers: Number of threads, defaults to the number of CPUs.
+    :rtype: 2-D :class:`numpy.ndarray` or list of :class:`numpy.ndarray`
+    :return: Characteristic functions of classic STA/LTA, of the same type
+        as ``data``.
+    """
+    return _sta_lta_batch(classic_sta_lta, data, nsta, nlta, workers)
+
+
 def classic_sta_lta_py(a, nsta, nlta):
     """
     Computes the standard STA/LTA from a given input array a. The length of
@@ -559,12 +637,51 @@ def plot_trigger(trace, cft, thr_on, thr_off, show=True):
         plt.show()
 
 
+def ar_pick_batch(a, b, c, samp_rate, f1, f2, lta_p, sta_p, lta_s, sta_s,
+                  m_p, m_s, l_p, l_s, s_pick=True, workers=None):
+    """
+    Pick P and S arrivals of many stations in parallel with :func:`ar_pick`.
+
+    The picker is run for each station in a pool of threads. The global
+    interpreter lock is released during the calls into C, so all CPUs can be
+    used.
+
+    :type a: 2-D :class:`numpy.ndarray` or list of :class:`numpy.ndarray`
+    :param a: Z signals, one per row or list item.
+    :type b: 2-D :class:`numpy.ndarray` or list of :class:`numpy.ndarray`
+    :param b: N signals, one per row or list item.
+    :type c: 2-D :class:`numpy.ndarray` or list of :class:`numpy.ndarray`
+    :param c: E signals, one per row or list item.
+    :type samp_rate: float or list of float
+    :param samp_rate: Number of samples per second, a single value for all
+        or one value per station.
+    :param f1, f2, lta_p, sta_p, lta_s, sta_s, m_p, m_s, l_p, l_s, s_pick:
+        See :func:`ar_pick`, the same values are used for all stations.
+    :type workers: int
+    :param workers: Number of threads, defaults to the number of CPUs.
+    :rtype: list of tuple
+    :returns: A tuple with the P and the S arrival for each station.
+    """
+    n = len(a)
+    if not (len(b) == len(c) == n):
+        msg = "The same number of Z, N and E signals is required."
+        raise ValueError(msg)
+    args = list(zip(a, b, c, _broadcast(samp_rate, n)))
+
+    def _pick(arg):
+        return ar_pick(*arg, f1=f1, f2=f2, lta_p=lta_p, sta_p=sta_p,
+                       lta_s=lta_s, sta_s=sta_s, m_p=m_p, m_s=m_s, l_p=l_p,
+                       l_s=l_s, s_pick=s_pick)
+
+    return _map_threads(_pick, args, workers=workers)
+
+
 def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
                         thr_coincidence_sum, trace_ids=None,
                         max_trigger_length=1e6, delete_long_trigger=False,
                         trigger_off_extension=0, details=False,
                         event_templates={}, similarity_threshold=0.7,
-                        **options):
+                        workers=None, **options):
     """
     Perform a network coincidence trigger.
 
@@ -660,6 +777,10 @@ def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
         trigger list. A common threshold can be set for all stations (float) or
         a dictionary mapping station names to float values for each station.
     :type similarity_threshold: float or dict
+    :type workers: int
+    :param workers: Number of threads computing the characteristic functions
+        of the traces in parallel, defaults to the number of CPUs. See
+        :meth:`~obspy.core.stream.Stream.trigger`.
     :rtype: list
     :returns: List of event triggers sorted chronologically.
     """
@@ -684,9 +805,11 @@ def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
             msg = "At least one trace's ID was not found in the " + \
                   "trace ID list and was disregarded (%s)" % tr.id
             warnings.warn(msg, UserWarning)
-            continue
-        if trigger_type is not None:
-            tr.trigger(trigger_type, **options)
+    st.traces = [tr for tr in st if tr.id in trace_ids]
+    # characteristic functions of all traces in parallel
+    if trigger_type is not None:
+        st.trigger(trigger_type, workers=workers, **options)
+    for tr in st:
         kwargs['max_len'] = int(
             max_trigger_length * tr.stats.sampling_rate + 0.5)
         tmp_triggers = trigger_onset(tr.data, thr_on, thr_off, **kwargs)
@@ -63,6 +63,37 @@ clibtau.seismic_phase_calc_time_inner_loop.argtypes = [
 clibtau.seismic_phase_calc_time_inner_loop.restype = C.c_int
 
 
+clibtau.seismic_phase_calc_time_batch_inner_loop.argtypes = [
+    # degrees
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=1,
+                           flags='C_CONTIGUOUS'),
+    # number of degrees
+    C.c_int,
+    # max_distance
+    C.c_double,
+    # dist
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=1,
+                           flags='C_CONTIGUOUS'),
+    # ray_param
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=1,
+                           flags='C_CONTIGUOUS'),
+    # search_dist_results
+    np.ctypeslib.ndpointer(dtype=np.float64, ndim=1,
+                           flags='C_CONTIGUOUS'),
+    # ray_num_results
+    np.ctypeslib.ndpointer(dtype=np.int32, ndim=1,
+                           flags='C_CONTIGUOUS'),
+    # degree_index_results
+    np.ctypeslib.ndpointer(dtype=np.int32, ndim=1,
+                           flags='C_CONTIGUOUS'),
+    # count
+    C.c_int,
+    # max_results
+    C.c_int
+]
+clibtau.seismic_phase_calc_time_batch_inner_loop.restype = C.c_int
+
+
 clibtau.bullen_radial_slowness_inner_loop.argtypes = [
     # layer, record array, 64bit floats. 2D array in memory
     np.ctypeslib.ndpointer(dtype=SlownessLayer, ndim=1,
@@ -49,6 +49,25 @@ TimeDistGeo = np.dtype([
 ])
 
 
+"""
+Holds arrivals of batches of travel time calculations: the index of the
+query, its source depth and distance, the phase name, the travel time, the
+ray parameter (in s/radian), the purist distance (in degrees) and the takeoff
+and incident angles (in degrees).
+"""
+ArrivalRecord = np.dtype([
+    ('index', np.int_),
+    ('source_depth', np.float_),
+    ('distance', np.float_),
+    ('name', 'U32'),
+    ('time', np.float_),
+    ('ray_param', np.float_),
+    ('purist_distance', np.float_),
+    ('takeoff_angle', np.float_),
+    ('incident_angle', np.float_),
+])
+
+
 """
 Tracks critical points (discontinuities or reversals in slowness gradient)
 within slowness and velocity models.
@@ -93,6 +112,19 @@ class DepthRange:
         return depth_range
 
 
+"""
+Holds the arrivals and their ray paths or pierce points of batches of
+source/receiver pairs: a structured array of arrivals
+(:const:`ArrivalRecord`), offsets of the points of each arrival and the
+points of all arrivals concatenated (:const:`TimeDistGeo`). The points of
+arrival ``i`` are ``points[offsets[i]:offsets[i + 1]]``.
+"""
+GeoPointsBatch = namedtuple(
+    'GeoPointsBatch',
+    ['arrivals', 'offsets', 'points']
+)
+
+
 SplitLayerInfo = namedtuple(
     'SplitLayerInfo',
     ['s_mod', 'needed_split', 'moved_sample', 'ray_param']
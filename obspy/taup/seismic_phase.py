@@ -1030,6 +1030,125 @@ class SeismicPhase(object):
                 self._settings["max_recursion"]))
         return arrivals
 
+    def calc_time_batch(self, degrees):
+        """
+        Calculate arrival times for this phase for many distances.
+
+        The arrivals are the same as the ones of :meth:`calc_time` for each
+        distance, but the branches of the phase are searched for all
+        distances in one call of the C inner loop and the arrivals are
+        interpolated and refined for all distances at once, shooting the rays
+        of each refinement step together.
+
+        :type degrees: :class:`numpy.ndarray`
+        :param degrees: Epicentral distances in degrees.
+        :returns: Indices of the distances of the arrivals (increasing) and
+            list of the arrivals.
+        """
+        batch = self._calc_time_batch(degrees)
+        arrivals = [
+            Arrival(self, float(degrees[i]), time, purist_dist, ray_param,
+                    ray_param_index, self.name, self.purist_name,
+                    self.source_depth, self.receiver_depth, takeoff_angle,
+                    incident_angle)
+            for i, time, purist_dist, ray_param, ray_param_index,
+            takeoff_angle, incident_angle in zip(
+                batch['index'], batch['time'], batch['purist_dist'],
+                batch['ray_param'], batch['ray_param_index'],
+                batch['takeoff_angle'], batch['incident_angle'])]
+        return batch['index'], arrivals
+
+    def _calc_time_batch(self, degrees):
+        """
+        Array version of :meth:`calc_time_batch`.
+
+        :returns: Dictionary of arrays of the index of the distance, the
+            time, purist distance (in radians), ray parameter, ray parameter
+            index, takeoff and incident angle of every arrival.
+        """
+        degrees = np.ascontiguousarray(degrees, dtype=np.float64)
+        size = max(2 * len(degrees), 100)
+        while True:
+            r_dist = np.empty(size, dtype=np.float64)
+            r_ray_num = np.empty(size, dtype=np.int32)
+            r_index = np.empty(size, dtype=np.int32)
+            phase_count = clibtau.seismic_phase_calc_time_batch_inner_loop(
+                degrees,
+                len(degrees),
+                self.max_distance,
+                self.dist,
+                self.ray_param,
+                r_dist,
+                r_ray_num,
+                r_index,
+                len(self.dist),
+                size
+            )
+            if phase_count <= size:
+                break
+            # result arrays were too small, repeat with the needed size
+            size = phase_count
+
+        # The recursion of refine_arrival() for all arrivals at once.
+        # Estimates are tuples of arrays of times, purist distances, ray
+        # parameters and ray parameter indices.
+        search_dist = r_dist[:phase_count]
+        ray_num = r_ray_num[:phase_count].astype(np.int_)
+        left = (self.time[ray_num], self.dist[ray_num],
+                self.ray_param[ray_num], ray_num)
+        right = (self.time[ray_num + 1], self.dist[ray_num + 1],
+                 self.ray_param[ray_num + 1], ray_num)
+        time = np.empty(phase_count)
+        ray_param = np.empty(phase_count)
+        ray_param_index = np.empty(phase_count, dtype=np.int_)
+        degenerate = np.empty(phase_count, dtype=np.bool_)
+
+        def store(which, estimate, is_degenerate):
+            time[which] = estimate[0]
+            ray_param[which] = estimate[2]
+            ray_param_index[which] = estimate[3]
+            degenerate[which] = is_degenerate
+
+        # can't shoot/refine for non-body waves
+        refine = not (self.name.endswith('kmps') or
+                      any(phase in self.name
+                          for phase in ['Pdiff', 'Sdiff', 'Pn', 'Sn']))
+        recursion_limit = self._settings["max_recursion"]
+        active = np.arange(phase_count)
+        while len(active):
+            dist = search_dist[active]
+            estimate, is_degenerate = self._linear_interp_arrivals(
+                dist, left, right)
+            if recursion_limit <= 0 or not refine:
+                store(active, estimate, is_degenerate)
+                break
+            shoot = self._shoot_rays(estimate[2])
+            # search between left and shoot, otherwise between shoot and
+            # right
+            towards_left = (left[1] - dist) * (dist - shoot[1]) > 0
+            done = np.abs(shoot[1] - estimate[1]) < REFINE_DIST_RADIAN_TOL
+            for mask, left_, right_ in (
+                    (done & towards_left, left, shoot),
+                    (done & ~towards_left, shoot, right)):
+                store(active[mask], *self._linear_interp_arrivals(
+                    dist[mask], tuple(a[mask] for a in left_),
+                    tuple(a[mask] for a in right_)))
+            left = tuple(np.where(towards_left, a, b)[~done]
+                         for a, b in zip(left, shoot))
+            right = tuple(np.where(towards_left, a, b)[~done]
+                          for a, b in zip(shoot, right))
+            active = active[~done]
+            recursion_limit -= 1
+
+        takeoff_angle, incident_angle = self._calc_angles(ray_param)
+        takeoff_angle[degenerate] = 0
+        incident_angle[degenerate] = 0
+        return {'index': r_index[:phase_count].astype(np.int_),
+                'time': time, 'purist_dist': search_dist.copy(),
+                'ray_param': ray_param, 'ray_param_index': ray_param_index,
+                'takeoff_angle': takeoff_angle,
+                'incident_angle': incident_angle}
+
     def calc_pierce(self, degrees):
         """
         Calculate pierce points for this phase.
@@ -1403,19 +1522,89 @@ class SeismicPhase(object):
                        left.ray_param_index, self.name, self.purist_name,
                        self.source_depth, self.receiver_depth)
 
-    def calc_ray_param_for_takeoff(self, takeoff_degree):
-        v_mod = self.tau_model.s_mod.v_mod
-        try:
-            if self.down_going[0]:
-                takeoff_velocity = v_mod.evaluate_below(self.source_depth,
-                                                        self.name[0])
-            else:
-                takeoff_velocity = v_mod.evaluate_above(self.source_depth,
-                                                        self.name[0])
-        except (IndexError, LookupError) as e:
+    def _linear_interp_arrivals(self, search_dist, left, right):
+        """
+        Array version of :meth:`linear_interp_arrival`.
+
+        The estimates are tuples of arrays of times, purist distances, ray
+        parameters and ray parameter indices. Returns the interpolated
+        estimates and a mask of the degenerate ones.
+        """
+        left_time, left_dist, left_ray_param, left_index = left
+        right_time, right_dist, right_ray_param, _ = right
+        degenerate = (left_index == 0) & (search_dist == self.dist[0])
+        at_left = ~degenerate & (left_dist == search_dist)
+        interp = ~(degenerate | at_left)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            arrival_time = ((search_dist - left_dist) /
+                            (right_dist - left_dist) *
+                            (right_time - left_time)) + left_time
+            ray_param = ((search_dist - right_dist) /
+                         (left_dist - right_dist) *
+                         (left_ray_param - right_ray_param)) + right_ray_param
+        nan = np.flatnonzero(interp & np.isnan(arrival_time))
+        if len(nan):
+            i = nan[0]
+            msg = ('Time is NaN, search=%f leftDist=%f leftTime=%f '
+                   'rightDist=%f rightTime=%f')
+            raise RuntimeError(msg % (search_dist[i], left_dist[i],
+                                      left_time[i], right_dist[i],
+                                      right_time[i]))
+        arrival_time = np.where(interp, arrival_time, np.where(
+            degenerate, self.time[0], left_time))
+        ray_param = np.where(interp, ray_param, np.where(
+            degenerate, self.ray_param[0], left_ray_param))
+        index = np.where(degenerate, 0, left_index)
+        return (arrival_time, search_dist, ray_param, index), degenerate
+
+    def _shoot_rays(self, ray_param):
+        """
+        Array version of :meth:`shoot_ray` for body waves.
+
+        :returns: Tuple of arrays of times, purist distances, ray parameters
+            and ray parameter indices.
+        """
+        outside = (ray_param < self.min_ray_param) | \
+            (self.max_ray_param < ray_param)
+        if outside.any():
+            msg = 'Ray param %f is outside range for this phase: min=%f max=%f'
+            error = SlownessModelError(msg % (
+                ray_param[outside][0], self.min_ray_param,
+                self.max_ray_param))
             msg = 'Please contact the developers. This error should not occur.'
-            raise RuntimeError(msg) from e
+            raise RuntimeError(msg) from error
+
+        # first index with the next ray parameter below the shot one
+        min_ray_param = np.minimum.accumulate(self.ray_param[1:])
+        ray_param_index = np.minimum(
+            np.searchsorted(-min_ray_param, -ray_param, side='right'),
+            len(min_ray_param) - 1)
+
+        tau_model = self.tau_model
+        s_mod = tau_model.s_mod
+
+        # counter for passes through each branch. 0 is P and 1 is S.
+        times_branches = self.calc_branch_mult(tau_model)
+        time = np.zeros(len(ray_param))
+        dist = np.zeros(len(ray_param))
 
+        # Sum the branches with the appropriate multiplier.
+        for j in range(tau_model.tau_branches.shape[1]):
+            for k, is_p_wave in ((0, s_mod.p_wave), (1, s_mod.s_wave)):
+                if times_branches[k, j] == 0:
+                    continue
+                br = tau_model.get_tau_branch(j, is_p_wave)
+                top_layer = s_mod.layer_number_below(br.top_depth, is_p_wave)
+                bot_layer = s_mod.layer_number_above(br.bot_depth, is_p_wave)
+                td = br.calc_time_dist(s_mod, top_layer, bot_layer, ray_param,
+                                       allow_turn_in_layer=True)
+                time += times_branches[k, j] * td['time']
+                dist += times_branches[k, j] * td['dist']
+
+        return time, dist, ray_param, ray_param_index
+
+    def calc_ray_param_for_takeoff(self, takeoff_degree):
+        takeoff_velocity = self._takeoff_velocity()
         return ((self.tau_model.radius_of_planet - self.source_depth) *
                 math.sin(np.radians(takeoff_degree)) / takeoff_velocity)
 
@@ -1423,18 +1612,7 @@ class SeismicPhase(object):
         if self.name.endswith('kmps'):
             return 0
 
-        v_mod = self.tau_model.s_mod.v_mod
-        try:
-            if self.down_going[0]:
-                takeoff_velocity = v_mod.evaluate_below(self.source_depth,
-                                                        self.name[0])
-            else:
-                takeoff_velocity = v_mod.evaluate_above(self.source_depth,
-                                                        self.name[0])
-        except (IndexError, LookupError) as e:
-            msg = 'Please contact the developers. This error should not occur.'
-            raise RuntimeError(msg) from e
-
+        takeoff_velocity = self._takeoff_velocity()
         takeoff_angle = np.degrees(math.asin(np.clip(
             takeoff_velocity * ray_param /
             (self.tau_model.radius_of_planet - self.source_depth), -1.0, 1.0)))
@@ -1448,29 +1626,62 @@ class SeismicPhase(object):
         if self.name.endswith('kmps'):
             return 0
 
+        incident_velocity = self._incident_velocity()
+        incident_angle = np.degrees(math.asin(np.clip(
+            incident_velocity * ray_param /
+            (self.tau_model.radius_of_planet - self.receiver_depth),
+            -1.0, 1.0)))
+        if self.down_going[-1]:
+            incident_angle = 180 - incident_angle
+
+        return incident_angle
+
+    def _calc_angles(self, ray_param):
+        """
+        Array version of :meth:`calc_takeoff_angle` and
+        :meth:`calc_incident_angle`.
+        """
+        if self.name.endswith('kmps') or not len(ray_param):
+            return np.zeros(len(ray_param)), np.zeros(len(ray_param))
+
+        radius = self.tau_model.radius_of_planet
+        takeoff_angle = np.degrees(np.arcsin(np.clip(
+            self._takeoff_velocity() * ray_param /
+            (radius - self.source_depth), -1.0, 1.0)))
+        if not self.down_going[0]:
+            # upgoing, so angle is in 90-180 range
+            takeoff_angle = 180 - takeoff_angle
+        incident_angle = np.degrees(np.arcsin(np.clip(
+            self._incident_velocity() * ray_param /
+            (radius - self.receiver_depth), -1.0, 1.0)))
+        if self.down_going[-1]:
+            incident_angle = 180 - incident_angle
+        return takeoff_angle, incident_angle
+
+    def _takeoff_velocity(self):
+        v_mod = self.tau_model.s_mod.v_mod
+        try:
+            if self.down_going[0]:
+                return v_mod.evaluate_below(self.source_depth, self.name[0])
+            else:
+                return v_mod.evaluate_above(self.source_depth, self.name[0])
+        except (IndexError, LookupError) as e:
+            msg = 'Please contact the developers. This error should not occur.'
+            raise RuntimeError(msg) from e
+
+    def _incident_velocity(self):
         v_mod = self.tau_model.s_mod.v_mod
         # Very last item is "END", assume first char is P or S
         last_leg = self.legs[-2][0]
         try:
             if self.down_going[-1]:
-                incident_velocity = v_mod.evaluate_above(self.receiver_depth,
-                                                         last_leg)
+                return v_mod.evaluate_above(self.receiver_depth, last_leg)
             else:
-                incident_velocity = v_mod.evaluate_below(self.receiver_depth,
-                                                         last_leg)
+                return v_mod.evaluate_below(self.receiver_depth, last_leg)
         except (IndexError, LookupError) as e:
             msg = 'Please contact the developers. This error should not occur.'
             raise RuntimeError(msg) from e
 
-        incident_angle = np.degrees(math.asin(np.clip(
-            incident_velocity * ray_param /
-            (self.tau_model.radius_of_planet - self.receiver_depth),
-            -1.0, 1.0)))
-        if self.down_going[-1]:
-            incident_angle = 180 - incident_angle
-
-        return incident_angle
-
     @classmethod
     def get_earliest_arrival(cls, rel_phases, degrees):
         raise NotImplementedError("baaa")
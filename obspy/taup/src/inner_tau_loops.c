@@ -7,6 +7,7 @@
 # Copyright (C) 2015 L. Krischer
 #---------------------------------------------------------------------*/
 #define _USE_MATH_DEFINES  // for Visual Studio
+#include <limits.h>
 #include <math.h>
 
 #ifndef M_PI
@@ -94,14 +95,21 @@ void tau_branch_calc_time_dist_inner_loop(
 }
 
 
-int seismic_phase_calc_time_inner_loop(
+/*
+ * Find the ray parameter intervals of a phase containing a distance.
+ *
+ * Results are only stored while fewer than max_results have been found, the
+ * return value is the number of all results.
+ */
+static int calc_time_search(
     double degree,
     double max_distance,
     double *dist,
     double *ray_param,
     double *search_dist_results,
     int *ray_num_results,
-    int count) {
+    int count,
+    int max_results) {
 
     double temp_deg, rad_dist, search_dist;
     int n = 0;
@@ -132,8 +140,10 @@ int seismic_phase_calc_time_inner_loop(
                     count > 2) {
                     continue;
                 }
-                search_dist_results[r] = search_dist;
-                ray_num_results[r] = ray_num;
+                if (r < max_results) {
+                    search_dist_results[r] = search_dist;
+                    ray_num_results[r] = ray_num;
+                }
                 r += 1;
             }
         }
@@ -152,8 +162,10 @@ int seismic_phase_calc_time_inner_loop(
                         count > 2) {
                         continue;
                     }
-                    search_dist_results[r] = search_dist;
-                    ray_num_results[r] = ray_num;
+                    if (r < max_results) {
+                        search_dist_results[r] = search_dist;
+                        ray_num_results[r] = ray_num;
+                    }
                     r += 1;
                 }
             }
@@ -165,6 +177,66 @@ int seismic_phase_calc_time_inner_loop(
 }
 
 
+int seismic_phase_calc_time_inner_loop(
+    double degree,
+    double max_distance,
+    double *dist,
+    double *ray_param,
+    double *search_dist_results,
+    int *ray_num_results,
+    int count) {
+
+    return calc_time_search(degree, max_distance, dist, ray_param,
+                            search_dist_results, ray_num_results, count,
+                            INT_MAX);
+}
+
+
+/*
+ * Search the ray parameter intervals of a phase for many distances.
+ *
+ * The results of all distances are stored one after the other together with
+ * the index of their distance. Returns the total number of results, if it is
+ * larger than max_results only the first max_results have been stored and
+ * the call has to be repeated with larger result arrays.
+ */
+int seismic_phase_calc_time_batch_inner_loop(
+    double *degrees,
+    int ndegrees,
+    double max_distance,
+    double *dist,
+    double *ray_param,
+    double *search_dist_results,
+    int *ray_num_results,
+    int *degree_index_results,
+    int count,
+    int max_results) {
+
+    int i, j, found;
+    int r = 0;
+    int space;
+
+    for (i=0; i < ndegrees; i++) {
+        space = (r < max_results) ? max_results - r : 0;
+        if (space > 0) {
+            found = calc_time_search(degrees[i], max_distance, dist,
+                                     ray_param, search_dist_results + r,
+                                     ray_num_results + r, count, space);
+        }
+        else {
+            found = calc_time_search(degrees[i], max_distance, dist,
+                                     ray_param, search_dist_results,
+                                     ray_num_results, count, 0);
+        }
+        for (j=r; j < r + found && j < max_results; j++) {
+            degree_index_results[j] = i;
+        }
+        r += found;
+    }
+    return r;
+}
+
+
 void bullen_radial_slowness_inner_loop(
         double *layer,
         double *p,
@@ -2,7 +2,9 @@
 """
 High-level interface to travel-time calculation routines.
 """
+import concurrent.futures
 import copy
+import os
 import warnings
 
 import matplotlib as mpl
@@ -11,12 +13,14 @@ from matplotlib.cm import get_cmap
 import matplotlib.text
 import numpy as np
 
-from .helper_classes import Arrival
+from .helper_classes import (Arrival, ArrivalRecord, GeoPointsBatch,
+                             TimeDistGeo)
 from .tau_model import TauModel
 from .taup_path import TauPPath
 from .taup_pierce import TauPPierce
 from .taup_time import TauPTime
-from .taup_geo import calc_dist, add_geo_to_arrivals
+from .taup_geo import (calc_dist, calc_dist_azi, add_geo_to_arrivals,
+                       _arc_positions)
 from .utils import parse_phase_list
 import obspy.geodetics.base as geodetics
 
@@ -581,7 +585,7 @@ class TauPyModel(object):
     """
 
     def __init__(self, model="iasp91", verbose=False, planet_flattening=0.0,
-                 cache=None):
+                 cache=None, disk_cache=None):
         """
         Loads an already created TauPy model.
 
@@ -603,6 +607,15 @@ class TauPyModel(object):
             behave correctly. If ``False`` is specified, then no cache will be
             used.
         :type cache: :class:`collections.OrderedDict` or bool
+        :param disk_cache: A directory to persistently cache models split at
+            source depths in, in addition to ``cache``. Models split by one
+            process are memory mapped from the directory by all later
+            processes using it, e.g. workers of a pool or short-lived
+            scripts. See
+            :class:`~obspy.taup.tau_model.TauModelDiskCache` for control
+            over its maximum size.
+        :type disk_cache: str or
+            :class:`~obspy.taup.tau_model.TauModelDiskCache`
 
         Usage:
 
@@ -616,7 +629,8 @@ class TauPyModel(object):
         2
         """
         self.verbose = verbose
-        self.model = TauModel.from_file(model, cache=cache)
+        self.model = TauModel.from_file(model, cache=cache,
+                                        disk_cache=disk_cache)
         self.planet_flattening = planet_flattening
 
     def get_travel_times(self, source_depth_in_km, distance_in_degree=None,
@@ -649,6 +663,77 @@ class TauPyModel(object):
         return Arrivals(sorted(tt.arrivals, key=lambda x: x.time),
                         model=self.model)
 
+    def get_travel_times_batch(self, source_depth_in_km, distance_in_degree,
+                               phase_list=("ttall",),
+                               receiver_depth_in_km=0.0):
+        """
+        Return travel times of every given phase for arrays of queries.
+
+        The arrivals are the same as the ones returned by
+        :meth:`get_travel_times` for each pair of source depth and distance,
+        but the phases are only set up once per distinct source depth and the
+        arrivals of each phase are computed for all distances at once with
+        array operations (see
+        :meth:`~obspy.taup.seismic_phase.SeismicPhase.calc_time_batch`)
+        instead of one distance at a time.
+
+        :param source_depth_in_km: Source depths in km, broadcast against
+            the distances.
+        :type source_depth_in_km: float or array_like
+        :param distance_in_degree: Epicentral distances in degrees.
+        :type distance_in_degree: float or array_like
+        :param phase_list: List of phases for which travel times should be
+            calculated.
+        :type phase_list: list of str
+        :param receiver_depth_in_km: Receiver depth in km
+        :type receiver_depth_in_km: float
+
+        :return: Structured array of all arrivals (see
+            :const:`~obspy.taup.helper_classes.ArrivalRecord`), sorted by the
+            index of the query in the flattened broadcast source depths and
+            distances and by time. A query may have any number of arrivals.
+        :rtype: :class:`numpy.ndarray`
+
+        >>> model = TauPyModel()
+        >>> arrivals = model.get_travel_times_batch(
+        ...     10.0, [40.0, 60.0, 80.0], phase_list=["P", "S"])
+        >>> print(arrivals['index'])
+        [0 0 1 1 2 2]
+        >>> print(arrivals['name'])
+        ['P' 'S' 'P' 'S' 'P' 'S']
+        >>> arrival = model.get_travel_times(10.0, 60.0, ["P"])[0]
+        >>> arrivals['time'][2] == arrival.time
+        True
+        """
+        depths, distances = np.broadcast_arrays(
+            np.asarray(source_depth_in_km, dtype=np.float64),
+            np.asarray(distance_in_degree, dtype=np.float64))
+        depths = depths.ravel()
+        distances = distances.ravel()
+        unique_depths, depth_index = np.unique(depths, return_inverse=True)
+        records = []
+        for i, depth in enumerate(unique_depths):
+            queries = np.flatnonzero(depth_index == i)
+            tt = TauPTime(self.model, phase_list, depth, None,
+                          receiver_depth_in_km)
+            tt.depth_correct(depth)
+            tt.recalc_phases()
+            for phase in tt.phases:
+                batch = phase._calc_time_batch(distances[queries])
+                record = np.empty(len(batch['index']), dtype=ArrivalRecord)
+                record['index'] = queries[batch['index']]
+                record['source_depth'] = depth
+                record['distance'] = distances[record['index']]
+                record['name'] = phase.name
+                for key in ('time', 'ray_param', 'takeoff_angle',
+                            'incident_angle'):
+                    record[key] = batch[key]
+                record['purist_distance'] = \
+                    batch['purist_dist'] * 180.0 / np.pi
+                records.append(record)
+        result = np.concatenate(records or [np.empty(0, dtype=ArrivalRecord)])
+        return result[np.lexsort((result['time'], result['index']))]
+
     def get_pierce_points(self, source_depth_in_km, distance_in_degree,
                           phase_list=("ttall",), receiver_depth_in_km=0.0):
         """
@@ -878,6 +963,219 @@ class TauPyModel(object):
 
         return arrivals
 
+    def get_ray_paths_geo_batch(self, source_depth_in_km,
+                                source_latitude_in_deg,
+                                source_longitude_in_deg,
+                                receiver_latitude_in_deg,
+                                receiver_longitude_in_deg,
+                                phase_list=("ttall",),
+                                receiver_depth_in_km=0.0, workers=None):
+        """
+        Return ray paths with geographical info for many source/receiver
+        pairs.
+
+        All arguments describing the pairs are broadcast against each other.
+        The phases are set up once per distinct source depth and the pairs
+        are distributed over a pool of processes, each holding a copy of the
+        model (inherited without copying where processes are forked). On a
+        spherical planet the geographical coordinates of each path are
+        computed with a few array operations instead of point by point.
+
+        Instead of lists of ``Arrival`` objects the result consists of three
+        arrays: the arrivals (see
+        :const:`~obspy.taup.helper_classes.ArrivalRecord`) sorted by the index
+        of the pair in the flattened broadcast arguments and by time, the
+        offsets of the path of each arrival and the points of all paths
+        concatenated (see :const:`~obspy.taup.helper_classes.TimeDistGeo`).
+
+        .. note::
+
+            Code calling this method with more than one worker has to be
+            guarded by ``if __name__ == "__main__":`` on platforms spawning
+            new processes.
+
+        :param source_depth_in_km: Source depths in km
+        :type source_depth_in_km: float or array_like
+        :param source_latitude_in_deg: Source latitudes in degrees
+        :type source_latitude_in_deg: float or array_like
+        :param source_longitude_in_deg: Source longitudes in degrees
+        :type source_longitude_in_deg: float or array_like
+        :param receiver_latitude_in_deg: Receiver latitudes in degrees
+        :type receiver_latitude_in_deg: float or array_like
+        :param receiver_longitude_in_deg: Receiver longitudes in degrees
+        :type receiver_longitude_in_deg: float or array_like
+        :param phase_list: List of phases for which ray paths should be
+            calculated.
+        :type phase_list: list of str
+        :param receiver_depth_in_km: Receiver depth in km
+        :type receiver_depth_in_km: float
+        :param workers: Number of worker processes, defaults to the number
+            of CPUs. With ``1`` all paths are computed in the calling
+            process.
+        :type workers: int
+
+        :return: Arrivals, offsets and points; the path of arrival ``i`` is
+            ``points[offsets[i]:offsets[i + 1]]``.
+        :rtype: :class:`~obspy.taup.helper_classes.GeoPointsBatch`
+
+        >>> model = TauPyModel()
+        >>> batch = model.get_ray_paths_geo_batch(
+        ...     10.0, 0.0, 0.0, [0.0, 30.0], [40.0, 60.0], phase_list=["P"],
+        ...     workers=1)
+        >>> print(batch.arrivals['index'])
+        [0 1]
+        >>> path = batch.points[batch.offsets[1]:batch.offsets[2]]
+        >>> print(round(path['lat'][-1], 3), round(path['lon'][-1], 3))
+        30.0 60.0
+        """
+        return self._get_geo_batch(
+            'path', source_depth_in_km, source_latitude_in_deg,
+            source_longitude_in_deg, receiver_latitude_in_deg,
+            receiver_longitude_in_deg, phase_list, receiver_depth_in_km,
+            workers)
+
+    def get_pierce_points_geo_batch(self, source_depth_in_km,
+                                    source_latitude_in_deg,
+                                    source_longitude_in_deg,
+                                    receiver_latitude_in_deg,
+                                    receiver_longitude_in_deg,
+                                    phase_list=("ttall",),
+                                    receiver_depth_in_km=0.0, workers=None):
+        """
+        Return pierce points with geographical info for many
+        source/receiver pairs.
+
+        Same as :meth:`get_ray_paths_geo_batch` but returning the pierce
+        points of the arrivals instead of their ray paths.
+
+        :return: Arrivals, offsets and points; the pierce points of arrival
+            ``i`` are ``points[offsets[i]:offsets[i + 1]]``.
+        :rtype: :class:`~obspy.taup.helper_classes.GeoPointsBatch`
+        """
+        return self._get_geo_batch(
+            'pierce', source_depth_in_km, source_latitude_in_deg,
+            source_longitude_in_deg, receiver_latitude_in_deg,
+            receiver_longitude_in_deg, phase_list, receiver_depth_in_km,
+            workers)
+
+    def _get_geo_batch(self, kind, source_depth_in_km, source_latitude_in_deg,
+                       source_longitude_in_deg, receiver_latitude_in_deg,
+                       receiver_longitude_in_deg, phase_list,
+                       receiver_depth_in_km, workers):
+        arrays = np.broadcast_arrays(*[
+            np.asarray(x, dtype=np.float64) for x in (
+                source_depth_in_km, source_latitude_in_deg,
+                source_longitude_in_deg, receiver_latitude_in_deg,
+                receiver_longitude_in_deg)])
+        depths = arrays[0].ravel()
+        coordinates = np.column_stack([a.ravel() for a in arrays[1:]])
+        if workers is None:
+            workers = os.cpu_count() or 1
+        # a few tasks per worker to balance the load, all pairs of a task
+        # share the source depth and thus the phases
+        chunk_size = max(1, int(np.ceil(len(depths) / (4.0 * workers))))
+        unique_depths, depth_index = np.unique(depths, return_inverse=True)
+        tasks = []
+        for i, depth in enumerate(unique_depths):
+            indices = np.flatnonzero(depth_index == i)
+            for start in range(0, len(indices), chunk_size):
+                chunk = indices[start:start + chunk_size]
+                tasks.append((kind, depth, list(phase_list),
+                              receiver_depth_in_km, chunk,
+                              coordinates[chunk]))
+        if workers <= 1 or len(tasks) < 2:
+            results = [_geo_batch_task(task, model=self) for task in tasks]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=min(workers, len(tasks)),
+                    initializer=_geo_batch_init,
+                    initargs=(self, )) as pool:
+                results = list(pool.map(_geo_batch_task, tasks))
+
+        arrivals = np.concatenate(
+            [np.empty(0, dtype=ArrivalRecord)] + [r[0] for r in results])
+        counts = np.concatenate(
+            [np.empty(0, dtype=np.int_)] + [r[1] for r in results])
+        points = np.concatenate(
+            [np.empty(0, dtype=TimeDistGeo)] + [r[2] for r in results])
+        # sort arrivals by pair and time and their points accordingly
+        starts = np.cumsum(counts) - counts
+        order = np.lexsort((arrivals['time'], arrivals['index']))
+        counts = counts[order]
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int_)
+        point_order = np.repeat(starts[order] - offsets[:-1], counts) + \
+            np.arange(offsets[-1])
+        return GeoPointsBatch(arrivals[order], offsets, points[point_order])
+
+
+#: Model used by :func:`_geo_batch_task` in worker processes.
+_GEO_BATCH_MODEL = None
+
+
+def _geo_batch_init(model):
+    """
+    Store the model in a worker process of a batch of geographic queries.
+    """
+    global _GEO_BATCH_MODEL
+    _GEO_BATCH_MODEL = model
+
+
+def _geo_batch_task(task, model=None):
+    """
+    Compute ray paths or pierce points for pairs sharing a source depth.
+
+    :returns: Arrivals, number of points of each arrival and the points of
+        all arrivals.
+    """
+    kind, depth, phase_list, receiver_depth_in_km, indices, coordinates = \
+        task
+    if model is None:
+        model = _GEO_BATCH_MODEL
+    radius = model.model.radius_of_planet
+    if kind == 'path':
+        calc = TauPPath(model.model, phase_list, depth, None,
+                        receiver_depth_in_km)
+    else:
+        calc = TauPPierce(model.model, phase_list, depth, None,
+                          receiver_depth_in_km)
+    calc.depth_correct(depth)
+    calc.recalc_phases()
+    records = []
+    counts = []
+    points = []
+    for index, (src_lat, src_lon, rcv_lat, rcv_lon) in zip(indices,
+                                                           coordinates):
+        distance, azimuth, _ = calc_dist_azi(src_lat, src_lon, rcv_lat,
+                                             rcv_lon, radius,
+                                             model.planet_flattening)
+        arrivals = []
+        for phase in calc.phases:
+            if kind == 'path':
+                arrivals += phase.calc_path(distance)
+            else:
+                arrivals += phase.calc_pierce(distance)
+        for arrival in sorted(arrivals, key=lambda x: x.time):
+            arrival_points = arrival.path if kind == 'path' \
+                else arrival.pierce
+            # major arc arrivals leave the source in the other direction
+            sign = -1 if arrival.purist_distance % 360.0 > 180.0 else 1
+            geo = np.empty(len(arrival_points), dtype=TimeDistGeo)
+            for key in ('p', 'time', 'dist', 'depth'):
+                geo[key] = arrival_points[key]
+            geo['lat'], geo['lon'] = _arc_positions(
+                src_lat, src_lon, azimuth,
+                np.degrees(sign * arrival_points['dist']), radius,
+                model.planet_flattening)
+            records.append((index, depth, distance, arrival.name,
+                            arrival.time, arrival.ray_param,
+                            arrival.purist_distance, arrival.takeoff_angle,
+                            arrival.incident_angle))
+            counts.append(len(geo))
+            points.append(geo)
+    return (np.array(records, dtype=ArrivalRecord),
+            np.array(counts, dtype=np.int_),
+            np.concatenate([np.empty(0, dtype=TimeDistGeo)] + points))
+
 
 def plot_travel_times(source_depth, phase_list=("ttbasic",), min_degrees=0,
                       max_degrees=180, npoints=50, model='iasp91',
@@ -3,7 +3,11 @@
 Internal TauModel class.
 """
 from collections import OrderedDict
+import hashlib
 import os
+import re
+import tempfile
+import zipfile
 from copy import deepcopy
 from itertools import count
 from math import pi
@@ -21,7 +25,7 @@ class TauModel(object):
     Provides storage of all the TauBranches comprising a model.
     """
     def __init__(self, s_mod, radius_of_planet, is_spherical=True, cache=None,
-                 debug=False, skip_calc=False):
+                 debug=False, skip_calc=False, disk_cache=None):
         self.debug = debug
         # Depth for which tau model as constructed.
         self.source_depth = 0.0
@@ -58,6 +62,11 @@ class TauModel(object):
             self._depth_cache = cache
         else:
             self._depth_cache = None
+        # Persistent cache of depth corrected models shared by processes.
+        if disk_cache is None or isinstance(disk_cache, TauModelDiskCache):
+            self._disk_cache = disk_cache
+        else:
+            self._disk_cache = TauModelDiskCache(disk_cache)
 
         if not skip_calc:
             self.calc_tau_inc_from()
@@ -232,10 +241,16 @@ class TauModel(object):
             return self._load_from_depth_cache(depth)
 
     def _load_from_depth_cache(self, depth):
+        if self._disk_cache is not None:
+            depth_corrected = self._disk_cache.get(self, depth)
+            if depth_corrected is not None:
+                return depth_corrected
         depth_corrected = self.split_branch(depth)
         depth_corrected.source_depth = depth
         depth_corrected.source_branch = depth_corrected.find_branch(depth)
         depth_corrected.validate()
+        if self._disk_cache is not None:
+            self._disk_cache.put(self, depth, depth_corrected)
         return depth_corrected
 
     def split_branch(self, depth):
@@ -397,10 +412,13 @@ class TauModel(object):
             for i in range(1, len(self.tau_branches[0]))]
         return branch_depths
 
-    def serialize(self, filename):
+    def serialize(self, filename, compressed=True):
         """
         Serialize model to numpy npz binary file.
 
+        Uncompressed files (``compressed=False``) are larger but faster to
+        load and can be memory mapped by :meth:`deserialize`.
+
         Summary of contents that have to be handled during serialization::
 
             TauModel
@@ -532,15 +550,26 @@ class TauModel(object):
         arrays['v_mod.layers'] = self.s_mod.v_mod.layers
 
         # finally save the collection of (structured) arrays to a binary file
-        np.savez_compressed(filename, **arrays)
+        if compressed:
+            np.savez_compressed(filename, **arrays)
+        else:
+            np.savez(filename, **arrays)
 
     @staticmethod
-    def deserialize(filename, cache=None):
+    def deserialize(filename, cache=None, mmap_mode=None):
         """
         Deserialize model from numpy npz binary file.
+
+        If ``mmap_mode`` is given (see :func:`numpy.load`), the arrays of
+        files written with ``compressed=False`` are memory mapped instead of
+        being read.
         """
-        # XXX: Make this a with statement when old NumPy support is dropped.
-        npz = np.load(filename)
+        if mmap_mode is not None:
+            npz = _load_npz_memmap(filename, mmap_mode)
+        else:
+            # XXX: Make this a with statement when old NumPy support is
+            # dropped.
+            npz = np.load(filename)
         try:
             model = TauModel(s_mod=None,
                              radius_of_planet=float(npz["radius_of_planet"]),
@@ -604,8 +633,12 @@ class TauModel(object):
                 setattr(slowness_model, key, data)
 
             # e) handle .s_mod.v_mod
+            # model names are stored as bytes in older files
+            model_name = npz["v_mod"]["model_name"].item()
+            if isinstance(model_name, bytes):
+                model_name = model_name.decode()
             velocity_model = VelocityModel(
-                model_name=npz["v_mod"]["model_name"],
+                model_name=model_name,
                 radius_of_planet=float(npz["v_mod"]["radius_of_planet"]),
                 min_radius=float(npz["v_mod"]["min_radius"]),
                 max_radius=float(npz["v_mod"]["max_radius"]),
@@ -625,10 +658,205 @@ class TauModel(object):
         return model
 
     @staticmethod
-    def from_file(model_name, cache=None):
+    def from_file(model_name, cache=None, disk_cache=None):
         if os.path.exists(model_name):
             filename = model_name
         else:
             filename = os.path.join(os.path.dirname(__file__), "data",
                                     model_name.lower() + ".npz")
-        return TauModel.deserialize(filename, cache=cache)
+        model = TauModel.deserialize(filename, cache=cache)
+        if disk_cache is not None:
+            if not isinstance(disk_cache, TauModelDiskCache):
+                disk_cache = TauModelDiskCache(disk_cache)
+            model._disk_cache = disk_cache
+        return model
+
+    def model_hash(self):
+        """
+        Return a hash identifying the model for persistent caches.
+
+        The hash covers the velocity and slowness layers, the ray parameters
+        and the branch boundaries, i.e. everything depth corrected models
+        are computed from.
+        """
+        sha = hashlib.sha1()
+        sha.update(repr((TauModelDiskCache.FORMAT_VERSION,
+                         float(self.radius_of_planet),
+                         bool(self.is_spherical), float(self.source_depth),
+                         [float(d) for d in self.get_branch_depths()])
+                        ).encode())
+        for arr in (self.ray_params, self.s_mod.p_layers,
+                    self.s_mod.s_layers, self.s_mod.v_mod.layers):
+            sha.update(np.ascontiguousarray(arr).tobytes())
+        return sha.hexdigest()
+
+
+class TauModelDiskCache(object):
+    """
+    Persistent cache of depth corrected models in a directory.
+
+    Splitting a model at a source depth is expensive and the in-memory LRU
+    cache of :class:`TauModel` is lost with every new process. A disk cache
+    keeps the depth corrected models as uncompressed ``.npz`` files (see
+    :meth:`TauModel.serialize`) that are memory mapped when they are loaded,
+    so short-lived processes and pools of workers sharing the directory
+    only split a model at each depth once.
+
+    Files are named after the model name, :meth:`TauModel.model_hash` and
+    the source depth, so models of the same name but different content
+    never share entries. Files are written atomically, so several processes
+    can use the same directory. If the total size of the files exceeds
+    ``max_size`` the least recently used files are removed.
+
+    :type path: str
+    :param path: Cache directory, created if it does not exist.
+    :type max_size: int
+    :param max_size: Maximum total size of the cached files in bytes.
+    :type mmap_mode: str
+    :param mmap_mode: Memory mapping mode of loaded files (see
+        :func:`numpy.load`), ``None`` to read the files into memory.
+    """
+    #: Version of the cached files, part of the model hash.
+    FORMAT_VERSION = 1
+
+    def __init__(self, path, max_size=1024 ** 3, mmap_mode='c'):
+        self.path = path
+        self.max_size = max_size
+        self.mmap_mode = mmap_mode
+        os.makedirs(path, exist_ok=True)
+
+    def __repr__(self):
+        return "%s(%r, max_size=%d)" % (self.__class__.__name__, self.path,
+                                        self.max_size)
+
+    def _filename(self, model, depth):
+        # hash once per model, surface source models are not modified
+        if getattr(model, '_model_hash', None) is None:
+            model._model_hash = model.model_hash()
+        name = re.sub(r'[^\w.-]', '_',
+                      str(getattr(model.s_mod.v_mod, 'model_name', '')))
+        return os.path.join(self.path, "%s_%s_%r.npz" % (
+            name, model._model_hash[:16], float(depth)))
+
+    def get(self, model, depth):
+        """
+        Return the cached model corrected for a source depth or ``None``.
+
+        :type model: :class:`TauModel`
+        :param model: Model for a surface source.
+        :type depth: float
+        :param depth: Source depth in km.
+        """
+        filename = self._filename(model, depth)
+        if not os.path.exists(filename):
+            return None
+        try:
+            depth_corrected = TauModel.deserialize(
+                filename, cache=False, mmap_mode=self.mmap_mode)
+            # mark as recently used
+            os.utime(filename, None)
+        except (OSError, ValueError, KeyError, IndexError,
+                zipfile.BadZipFile):
+            # incomplete or corrupt file
+            self._remove(filename)
+            return None
+        depth_corrected.debug = model.debug
+        return depth_corrected
+
+    def put(self, model, depth, depth_corrected):
+        """
+        Store a model corrected for a source depth.
+
+        :type model: :class:`TauModel`
+        :param model: Model for a surface source.
+        :type depth: float
+        :param depth: Source depth in km.
+        :type depth_corrected: :class:`TauModel`
+        :param depth_corrected: ``model`` corrected for ``depth``.
+        """
+        filename = self._filename(model, depth)
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=self.path)
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                depth_corrected.serialize(fh, compressed=False)
+            os.replace(tmp, filename)
+        except Exception:
+            self._remove(tmp)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used files exceeding the maximum size.
+        """
+        files = []
+        for name in os.listdir(self.path):
+            if not name.endswith('.npz'):
+                continue
+            filename = os.path.join(self.path, name)
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, filename))
+        total = sum(size for _, size, _ in files)
+        for _, size, filename in sorted(files):
+            if total <= self.max_size:
+                break
+            self._remove(filename)
+            total -= size
+
+    def clear(self):
+        """
+        Remove all cached files.
+        """
+        for name in os.listdir(self.path):
+            if name.endswith('.npz'):
+                self._remove(os.path.join(self.path, name))
+
+    @staticmethod
+    def _remove(filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            # removed by another process or still mapped (Windows)
+            pass
+
+
+def _load_npz_memmap(filename, mmap_mode):
+    """
+    Load the arrays of a npz file, memory mapping uncompressed arrays.
+
+    :func:`numpy.load` ignores ``mmap_mode`` for npz files. Arrays stored
+    without compression are plain ``.npy`` files inside the zip archive and
+    can be mapped at their offset in the archive. Like :func:`numpy.load`,
+    object arrays are refused.
+    """
+    arrays = {}
+    with zipfile.ZipFile(filename) as zf, open(filename, 'rb') as fh:
+        for info in zf.infolist():
+            key = info.filename[:-4] if info.filename.endswith('.npy') \
+                else info.filename
+            arr = None
+            if info.compress_type == zipfile.ZIP_STORED:
+                # skip local file header to the start of the .npy file
+                fh.seek(info.header_offset + 26)
+                name_len, extra_len = np.frombuffer(fh.read(4), dtype='<u2')
+                fh.seek(info.header_offset + 30 + int(name_len) +
+                        int(extra_len))
+                version = np.lib.format.read_magic(fh)
+                if version == (1, 0):
+                    header = np.lib.format.read_array_header_1_0(fh)
+                else:
+                    header = np.lib.format.read_array_header_2_0(fh)
+                shape, fortran_order, dtype = header
+                if not dtype.hasobject and int(np.prod(shape)) > 0:
+                    arr = np.memmap(fh, dtype=dtype, mode=mmap_mode,
+                                    offset=fh.tell(), shape=shape,
+                                    order='F' if fortran_order else 'C')
+            if arr is None:
+                with zf.open(info) as member:
+                    arr = np.lib.format.read_array(member,
+                                                   allow_pickle=False)
+            arrays[key] = arr
+    return arrays
@@ -267,3 +267,42 @@ def add_geo_to_arrivals(arrivals, source_latitude_in_deg,
         raise ImportError(msg)
 
     return arrivals
+
+
+def _arc_positions(latitude_in_deg, longitude_in_deg, azimuth_in_deg,
+                   distances_in_deg, radius_of_planet_in_km,
+                   flattening_of_planet):
+    """
+    Positions at signed distances along the great circle (geodesic) leaving
+    a point in a given azimuth.
+
+    For a spherical planet the positions of all distances are computed at
+    once, otherwise point by point with geographiclib like
+    :func:`add_geo_to_arrivals` does.
+
+    :returns: Latitudes and longitudes in degrees.
+    :rtype: tuple of two :class:`numpy.ndarray`
+    """
+    distances = np.radians(np.asarray(distances_in_deg, dtype=np.float64))
+    if flattening_of_planet == 0.0:
+        lat1 = np.radians(latitude_in_deg)
+        azimuth = np.radians(azimuth_in_deg)
+        sin_lat2 = np.clip(np.sin(lat1) * np.cos(distances) +
+                           np.cos(lat1) * np.sin(distances) *
+                           np.cos(azimuth), -1.0, 1.0)
+        lon2 = np.degrees(np.arctan2(
+            np.sin(azimuth) * np.sin(distances) * np.cos(lat1),
+            np.cos(distances) - np.sin(lat1) * sin_lat2))
+        lon2 = (longitude_in_deg + lon2 + 180.0) % 360.0 - 180.0
+        return np.degrees(np.arcsin(sin_lat2)), lon2
+    if not geodetics.HAS_GEOGRAPHICLIB:
+        msg = "You need to install the Python module 'geographiclib' in " + \
+              "order to add geographical information on an ellipsoid."
+        raise ImportError(msg)
+    ellipsoid = Geodesic(a=radius_of_planet_in_km * 1000.0,
+                         f=flattening_of_planet)
+    line = ellipsoid.Line(latitude_in_deg, longitude_in_deg, azimuth_in_deg)
+    positions = [line.ArcPosition(distance)
+                 for distance in np.degrees(distances)]
+    return (np.array([pos['lat2'] for pos in positions], dtype=np.float64),
+            np.array([pos['lon2'] for pos in positions], dtype=np.float64))
@@ -3,11 +3,14 @@
 """
 Tests the SeismicPhase class.
 """
+import os
 import unittest
 
 import numpy as np
 
-from obspy.taup.tau_model import TauModel
+from obspy.core.util.misc import TemporaryWorkingDirectory
+from obspy.taup import TauPyModel
+from obspy.taup.tau_model import TauModel, TauModelDiskCache
 
 
 class SplitTauModelTestCase(unittest.TestCase):
@@ -113,6 +116,99 @@ class SplitTauModelTestCase(unittest.TestCase):
                                        above.dist[i] + below.dist[i],
                                        delta=0.000000001)
 
+    def test_serialize_round_trip(self):
+        """
+        Models read from files can be written and read again, also
+        uncompressed and memory mapped.
+        """
+        tau_model = TauModel.from_file('iasp91', cache=False)
+        self.assertEqual(tau_model.s_mod.v_mod.model_name, 'iasp91')
+        with TemporaryWorkingDirectory():
+            for compressed, mmap_mode in ((True, None), (False, 'r')):
+                tau_model.serialize('model.npz', compressed=compressed)
+                model = TauModel.deserialize('model.npz', cache=False,
+                                             mmap_mode=mmap_mode)
+                self.assertEqual(model.s_mod.v_mod.model_name, 'iasp91')
+                np.testing.assert_array_equal(model.ray_params,
+                                              tau_model.ray_params)
+                np.testing.assert_array_equal(model.s_mod.v_mod.layers,
+                                              tau_model.s_mod.v_mod.layers)
+                for got, exp in zip(model.tau_branches.ravel(),
+                                    tau_model.tau_branches.ravel()):
+                    np.testing.assert_array_equal(got.time, exp.time)
+                    np.testing.assert_array_equal(got.dist, exp.dist)
+                del model
+            # files with object arrays are not unpickled
+            np.savez('object.npz', radius_of_planet=np.array([None]))
+            with self.assertRaises(ValueError):
+                TauModel.deserialize('object.npz', cache=False,
+                                     mmap_mode='r')
+
+    def test_disk_cache(self):
+        """
+        Depth corrected models are stored in and memory mapped from a disk
+        cache and give the same travel times.
+        """
+        with TemporaryWorkingDirectory():
+            disk_cache = TauModelDiskCache('cache', max_size=10 ** 9)
+            tau_model = TauModel.from_file('iasp91', cache=False,
+                                           disk_cache=disk_cache)
+            expected = TauModel.from_file('iasp91', cache=False) \
+                .depth_correct(110.0)
+            first = tau_model.depth_correct(110.0)
+            files = os.listdir('cache')
+            self.assertEqual(len(files), 1)
+            self.assertTrue(files[0].startswith('iasp91_'))
+            # a new model (e.g. in another process) loads the cached file
+            tau_model = TauModel.from_file('iasp91', cache=False,
+                                           disk_cache='cache')
+            cached = tau_model.depth_correct(110.0)
+            self.assertIsInstance(cached.ray_params, np.memmap)
+            for model in (first, cached):
+                self.assertEqual(model.source_depth, 110.0)
+                self.assertEqual(model.source_branch, expected.source_branch)
+                np.testing.assert_array_equal(model.ray_params,
+                                              expected.ray_params)
+                for got, exp in zip(model.tau_branches.ravel(),
+                                    expected.tau_branches.ravel()):
+                    np.testing.assert_array_equal(got.time, exp.time)
+                    np.testing.assert_array_equal(got.dist, exp.dist)
+            for depth in (10.0, 300.0):
+                model = TauPyModel('iasp91', cache=False,
+                                   disk_cache=disk_cache)
+                # second model reads from the disk cache
+                for arrivals in [model.get_travel_times(depth, 50.0,
+                                                        ['P', 'sS'])
+                                 for _ in range(2)]:
+                    self.assertEqual(
+                        [a.time for a in arrivals],
+                        [a.time for a in TauPyModel('iasp91').get_travel_times(
+                            depth, 50.0, ['P', 'sS'])])
+            self.assertEqual(len(os.listdir('cache')), 3)
+            # models of other content do not share files
+            tau_model.s_mod.v_mod.layers = \
+                tau_model.s_mod.v_mod.layers.copy()
+            tau_model.s_mod.v_mod.layers['top_p_velocity'][0] += 0.1
+            tau_model._model_hash = None
+            self.assertIsNone(disk_cache.get(tau_model, 110.0))
+            # least recently used files are removed beyond the maximum size
+            size = os.path.getsize(os.path.join('cache', files[0]))
+            os.utime(os.path.join('cache', files[0]), (0, 0))
+            disk_cache.max_size = 2.5 * size
+            disk_cache.evict()
+            remaining = os.listdir('cache')
+            self.assertEqual(len(remaining), 2)
+            self.assertNotIn(files[0], remaining)
+            # corrupt files are ignored and removed
+            with open(os.path.join('cache', remaining[0]), 'wb') as fh:
+                fh.write(b'garbage')
+            depth = float(remaining[0].rsplit('_', 1)[1][:-4])
+            tau_model = TauModel.from_file('iasp91', cache=False)
+            self.assertIsNone(disk_cache.get(tau_model, depth))
+            self.assertEqual(len(os.listdir('cache')), 1)
+            disk_cache.clear()
+            self.assertEqual(os.listdir('cache'), [])
+
 
 def suite():
     return unittest.makeSuite(SplitTauModelTestCase, 'test')
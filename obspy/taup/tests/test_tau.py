@@ -266,6 +266,97 @@ class TauPyModelTestCase(unittest.TestCase):
             self._compare_arrivals_with_file(
                 arrivals, "taup_time_-h_10_-ph_ttall_-deg_35_-mod_ak135")
 
+    def test_get_travel_times_batch(self):
+        """
+        Batched travel times are the same as the ones of single queries.
+        """
+        m = TauPyModel(model="iasp91")
+        depths = np.array([[10.0], [120.0]])
+        distances = np.array([0.0, 18.5, 35.0, 97.0, 150.0, 183.0, 360.0])
+        phase_list = ["P", "S", "PKiKP", "PP", "Pdiff", "ScS", "p", "Pn",
+                      "2kmps"]
+        arrivals = m.get_travel_times_batch(depths, distances,
+                                            phase_list=phase_list)
+        self.assertTrue(np.all(np.diff(arrivals['index']) >= 0))
+        for index, (depth, distance) in enumerate(zip(
+                *[a.ravel() for a in np.broadcast_arrays(depths,
+                                                         distances)])):
+            got = arrivals[arrivals['index'] == index]
+            expected = m.get_travel_times(depth, distance,
+                                          phase_list=phase_list)
+            self.assertEqual(len(got), len(expected))
+            for record, arrival in zip(got, expected):
+                self.assertEqual(record['source_depth'], depth)
+                self.assertEqual(record['distance'], distance)
+                self.assertEqual(record['name'], arrival.name)
+                self.assertAlmostEqual(record['time'], arrival.time, 10)
+                self.assertAlmostEqual(record['ray_param'],
+                                       arrival.ray_param, 10)
+                self.assertAlmostEqual(record['purist_distance'],
+                                       arrival.purist_distance, 10)
+                self.assertAlmostEqual(record['takeoff_angle'],
+                                       arrival.takeoff_angle, 10)
+                self.assertAlmostEqual(record['incident_angle'],
+                                       arrival.incident_angle, 10)
+        # no arrivals at all
+        arrivals = m.get_travel_times_batch(10.0, [], phase_list=["P"])
+        self.assertEqual(len(arrivals), 0)
+
+    @unittest.skipIf(not geodetics.GEOGRAPHICLIB_VERSION_AT_LEAST_1_34,
+                     'test needs geographiclib >= 1.34')
+    def test_geo_batch(self):
+        """
+        Batched ray paths and pierce points are the same as the ones of
+        single source/receiver pairs, also when computed by several
+        processes.
+        """
+        m = TauPyModel(model="iasp91")
+        source = (np.array([[10.0], [300.0]]), -80.0, -60.0)
+        receivers = (np.array([-45.0, 10.0, 75.0]),
+                     np.array([-60.0, 150.0, 100.0]))
+        phase_list = ["P", "PP", "PKIKP", "SKS"]
+        pairs = [a.ravel() for a in np.broadcast_arrays(
+            source[0], source[1], source[2], *receivers)]
+        for method, single, key in (
+                (m.get_ray_paths_geo_batch, m.get_ray_paths_geo, 'path'),
+                (m.get_pierce_points_geo_batch, m.get_pierce_points_geo,
+                 'pierce')):
+            batches = [method(*(source + receivers), phase_list=phase_list,
+                              workers=workers) for workers in (1, 2)]
+            for field in batches[0].arrivals.dtype.names:
+                np.testing.assert_array_equal(batches[0].arrivals[field],
+                                              batches[1].arrivals[field])
+            np.testing.assert_array_equal(batches[0].offsets,
+                                          batches[1].offsets)
+            for field in batches[0].points.dtype.names:
+                np.testing.assert_array_equal(batches[0].points[field],
+                                              batches[1].points[field])
+            batch = batches[0]
+            self.assertEqual(len(batch.offsets), len(batch.arrivals) + 1)
+            self.assertEqual(batch.offsets[-1], len(batch.points))
+            for index, pair in enumerate(zip(*pairs)):
+                expected = single(*pair, phase_list=phase_list)
+                selected = np.flatnonzero(batch.arrivals['index'] == index)
+                self.assertEqual(len(selected), len(expected))
+                for i, arrival in zip(selected, expected):
+                    record = batch.arrivals[i]
+                    self.assertEqual(record['name'], arrival.name)
+                    self.assertAlmostEqual(record['time'], arrival.time, 8)
+                    points = batch.points[batch.offsets[i]:
+                                          batch.offsets[i + 1]]
+                    expected_points = getattr(arrival, key)
+                    self.assertEqual(len(points), len(expected_points))
+                    for field in ('dist', 'depth', 'time', 'lat', 'lon'):
+                        np.testing.assert_allclose(
+                            points[field], expected_points[field],
+                            rtol=1e-8, atol=1e-6)
+        # empty batches
+        batch = m.get_ray_paths_geo_batch(10.0, 0.0, 0.0, [], [],
+                                          phase_list=["P"])
+        self.assertEqual(len(batch.arrivals), 0)
+        self.assertEqual(batch.offsets.tolist(), [0])
+        self.assertEqual(len(batch.points), 0)
+
     def test_pierce_p_iasp91(self):
         """
         Test single pierce point against output from TauP.
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests the TravelTimeTable class.
+"""
+import unittest
+
+import numpy as np
+
+from obspy.core.util import NamedTemporaryFile
+from obspy.taup import TauPyModel
+from obspy.taup.travel_time_table import TravelTimeTable
+
+
+class TravelTimeTableTestCase(unittest.TestCase):
+    """
+    Test suite for precomputed travel time tables.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.model = TauPyModel('iasp91')
+        cls.depths = np.array([0.0, 10.0, 20.0, 30.0])
+        cls.distances = np.arange(30.0, 91.0, 5.0)
+        cls.table = TravelTimeTable.build(cls.model, ['P', 'S'], cls.depths,
+                                          cls.distances)
+
+    def _assert_matches_taup(self, phase, depths, distances, time_tol,
+                             angle_tol):
+        result = self.table.lookup(phase, depths, distances)
+        for depth, distance, got in zip(depths, distances, result):
+            arrival = self.model.get_travel_times(depth, distance, [phase])[0]
+            self.assertAlmostEqual(got['time'], arrival.time,
+                                   delta=time_tol)
+            self.assertAlmostEqual(got['ray_param_sec_degree'],
+                                   arrival.ray_param_sec_degree,
+                                   delta=time_tol)
+            self.assertAlmostEqual(got['takeoff_angle'],
+                                   arrival.takeoff_angle, delta=angle_tol)
+            self.assertAlmostEqual(got['incident_angle'],
+                                   arrival.incident_angle, delta=angle_tol)
+
+    def test_grid_nodes(self):
+        """
+        Values at the grid nodes are the ones of the first arrival.
+        """
+        depths, distances = np.meshgrid(self.depths[::3],
+                                        self.distances[::4], indexing='ij')
+        for phase in ('P', 'S'):
+            self._assert_matches_taup(phase, depths.ravel(),
+                                      distances.ravel(), 1e-6, 1e-6)
+
+    def test_interpolation(self):
+        """
+        Values between the grid nodes are close to the ones of TauP.
+        """
+        depths = np.array([3.0, 12.5, 27.0, 17.3, 0.0])
+        distances = np.array([32.1, 47.5, 58.3, 81.9, 87.5])
+        for phase in ('P', 'S'):
+            self._assert_matches_taup(phase, depths, distances, 0.05, 0.5)
+
+    def test_broadcasting_and_outside(self):
+        """
+        Queries are broadcast and NaN outside of the table.
+        """
+        result = self.table.lookup('P', [[5.0], [50.0]], [20.0, 40.0, 95.0])
+        self.assertEqual(result.shape, (2, 3))
+        self.assertTrue(np.isnan(result['time'][1]).all())
+        self.assertTrue(np.isnan(result['time'][0, [0, 2]]).all())
+        self.assertFalse(np.isnan(result['time'][0, 1]))
+        scalar = self.table.lookup('S', 10.0, 40.0)
+        self.assertEqual(scalar.shape, ())
+        self.assertRaises(ValueError, self.table.lookup, 'PcP', 10.0, 40.0)
+
+    def test_save_load(self):
+        """
+        Saving and loading a table gives the same lookups.
+        """
+        with NamedTemporaryFile(suffix='.npz') as tf:
+            self.table.save(tf.name)
+            table = TravelTimeTable.load(tf.name)
+        self.assertEqual(table.phases, self.table.phases)
+        self.assertEqual(table.model_name, 'iasp91')
+        self.assertEqual(table.model_name, self.table.model_name)
+        self.assertEqual(table.radius_of_planet, self.table.radius_of_planet)
+        np.testing.assert_array_equal(table.layers, self.table.layers)
+        np.testing.assert_array_equal(table.depths, self.depths)
+        np.testing.assert_array_equal(table.distances, self.distances)
+        np.testing.assert_array_equal(table.branches, self.table.branches)
+        for field in table.data.dtype.names:
+            np.testing.assert_array_equal(table.data[field],
+                                          self.table.data[field])
+
+    def test_triplication(self):
+        """
+        The first arrival in the upper mantle triplication is followed
+        across branches without mixing them.
+        """
+        distances = np.arange(14.0, 27.0, 1.0)
+        table = TravelTimeTable.build(self.model, ['P'], [0.0, 50.0],
+                                      distances)
+        queries = np.arange(14.25, 26.0, 0.5)
+        result = table.lookup('P', 25.0, queries)
+        for distance, got in zip(queries, result):
+            arrival = self.model.get_travel_times(25.0, distance, ['P'])[0]
+            self.assertAlmostEqual(got['time'], arrival.time, delta=0.5)
+
+    def test_invalid_grid(self):
+        """
+        Tables need at least two increasing depths and distances.
+        """
+        self.assertRaises(ValueError, TravelTimeTable.build, self.model,
+                          ['P'], [10.0], self.distances)
+        self.assertRaises(ValueError, TravelTimeTable.build, self.model,
+                          ['P'], self.depths, [40.0, 30.0])
+
+
+def suite():
+    return unittest.makeSuite(TravelTimeTableTestCase, 'test')
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
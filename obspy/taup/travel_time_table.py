@@ -0,0 +1,477 @@
+# -*- coding: utf-8 -*-
+"""
+Precomputed travel time tables with fast interpolation.
+
+A :class:`TravelTimeTable` holds travel time, ray parameter, takeoff and
+incident angle of the first arrival of some phases on a grid of source depths
+and epicentral distances. Once built (which takes a full TauP calculation per
+grid node) it can be saved to a compressed ``.npz`` file and arrays of
+queries are interpolated with a few vectorized NumPy operations.
+
+>>> from obspy.taup import TauPyModel
+>>> from obspy.taup.travel_time_table import TravelTimeTable
+>>> model = TauPyModel('iasp91')
+>>> table = TravelTimeTable.build(model, ['P', 'S'], depths=[0.0, 20.0],
+...                               distances=[40.0, 50.0, 60.0])
+>>> table.phases
+['P', 'S']
+>>> result = table.lookup('P', [10.0, 15.0], [45.0, 55.0])
+>>> result.shape
+(2,)
+>>> arrival = model.get_travel_times(10.0, 45.0, ['P'])[0]
+>>> abs(result['time'][0] - arrival.time) < 0.05
+True
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+import numpy as np
+
+from .taup_time import TauPTime
+from .utils import get_phase_names
+from .velocity_layer import VelocityLayer, evaluate_velocity_at
+
+
+#: Version of the file format written by :meth:`TravelTimeTable.save`.
+TABLE_FORMAT_VERSION = 1
+
+#: Fields of the arrays returned by :meth:`TravelTimeTable.lookup`.
+TravelTimeTableResult = np.dtype([
+    ('time', np.float64),
+    ('ray_param_sec_degree', np.float64),
+    ('takeoff_angle', np.float64),
+    ('incident_angle', np.float64),
+])
+
+
+class TravelTimeTable(object):
+    """
+    First arrivals of phases on a grid of source depths and distances.
+
+    Use :meth:`build` to compute a table and :meth:`load` to read a table
+    saved with :meth:`save`.
+
+    Travel times are interpolated with cubic Hermite polynomials in distance
+    (the ray parameter being the derivative of the travel time). In depth,
+    the travel times of the neighboring depths are carried to the source
+    depth by integrating the vertical slowness of the source leg through the
+    velocity model, and the takeoff angle is computed from the ray parameter
+    and the velocity at the source depth, so discontinuities of the model
+    between the tabulated depths are honored. The branch of the travel time
+    curve each grid node's first arrival belongs to is stored as well: where
+    neighboring nodes belong to different branches, e.g. at the crossover
+    of a triplication, the travel time is the earlier of both branches and
+    the ray parameter and angles are the ones of that branch, instead of a
+    mix of both. Queries outside of the grid or closer to a node without an
+    arrival of the phase than to a node with one give NaN.
+
+    :type model_name: str
+    :param model_name: Name of the velocity model.
+    :type phases: list of str
+    :param phases: Phase names, each may also be a group of phases like
+        ``"ttp"`` in which case the first arrival of all phases of the group
+        is tabulated.
+    :type depths: :class:`numpy.ndarray`
+    :param depths: Increasing source depths in km.
+    :type distances: :class:`numpy.ndarray`
+    :param distances: Increasing epicentral distances in degrees.
+    :type data: :class:`numpy.ndarray`
+    :param data: Structured array of shape ``(len(phases), len(depths),
+        len(distances))`` with the fields of :const:`TravelTimeTableResult`,
+        NaN where a phase does not arrive.
+    :type branches: :class:`numpy.ndarray`
+    :param branches: Integer labels of the travel time branches of the
+        arrivals in ``data``.
+    :type layers: :class:`numpy.ndarray`
+    :param layers: Layers of the velocity model (dtype =
+        :const:`~obspy.taup.velocity_layer.VelocityLayer`).
+    :type radius_of_planet: float
+    :param radius_of_planet: Radius of the planet in km.
+    :type receiver_depth_in_km: float
+    :param receiver_depth_in_km: Receiver depth in km.
+    """
+    def __init__(self, model_name, phases, depths, distances, data, branches,
+                 layers, radius_of_planet, receiver_depth_in_km=0.0):
+        self.model_name = model_name
+        self.phases = list(phases)
+        self.depths = np.asarray(depths, dtype=np.float64)
+        self.distances = np.asarray(distances, dtype=np.float64)
+        self.data = data
+        self.branches = branches
+        self.layers = np.asarray(layers, dtype=VelocityLayer)
+        self.radius_of_planet = float(radius_of_planet)
+        self.receiver_depth_in_km = receiver_depth_in_km
+        _check_grid(self.depths, self.distances)
+        shape = (len(self.phases), len(self.depths), len(self.distances))
+        if data.shape != shape or branches.shape != shape:
+            msg = "Table data must be of shape %s." % (shape, )
+            raise ValueError(msg)
+        # direction of the source leg (-1 down, 1 up, 0 for velocity phases)
+        # and whether it is an S leg for each phase of each group, indexed by
+        # the phase number encoded in the branch labels
+        self._source_legs = []
+        for phase in self.phases:
+            names = sorted(set(get_phase_names(phase)))
+            signs = np.array([0 if name.endswith('kmps') else
+                              1 if name[0] in 'ps' else -1
+                              for name in names])
+            is_s = np.array([name[0] in 'sS' for name in names])
+            self._source_legs.append((signs, is_s))
+        # velocity discontinuities within the depth range of the table
+        top_p = self.layers['top_p_velocity'][1:]
+        top_s = self.layers['top_s_velocity'][1:]
+        jumps = (self.layers['bot_p_velocity'][:-1] != top_p) | \
+            (self.layers['bot_s_velocity'][:-1] != top_s)
+        discontinuities = self.layers['bot_depth'][:-1][jumps]
+        self._discontinuities = discontinuities[
+            (discontinuities > self.depths[0]) &
+            (discontinuities < self.depths[-1])]
+
+    def __str__(self):
+        return ("Travel time table of model %s for phases %s, %d depths "
+                "(%g - %g km), %d distances (%g - %g deg)") % (
+            self.model_name, ", ".join(self.phases), len(self.depths),
+            self.depths[0], self.depths[-1], len(self.distances),
+            self.distances[0], self.distances[-1])
+
+    @classmethod
+    def build(cls, model, phases, depths, distances,
+              receiver_depth_in_km=0.0):
+        """
+        Compute a travel time table.
+
+        :type model: :class:`~obspy.taup.tau.TauPyModel`
+        :param model: The model to compute travel times with.
+        :type phases: list of str
+        :param phases: Phase names or groups like ``"ttp"``, the first
+            arrival of each is tabulated.
+        :type depths: array_like
+        :param depths: Increasing source depths in km.
+        :type distances: array_like
+        :param distances: Increasing epicentral distances in degrees.
+        :type receiver_depth_in_km: float
+        :param receiver_depth_in_km: Receiver depth in km.
+        :rtype: :class:`TravelTimeTable`
+        """
+        phases = list(phases)
+        depths = np.asarray(depths, dtype=np.float64)
+        distances = np.asarray(distances, dtype=np.float64)
+        _check_grid(depths, distances)
+        shape = (len(phases), len(depths), len(distances))
+        data = np.empty(shape, dtype=TravelTimeTableResult)
+        for field in TravelTimeTableResult.names:
+            data[field] = np.nan
+        branches = np.full(shape, -1, dtype=np.int32)
+        groups = [sorted(set(get_phase_names(phase))) for phase in phases]
+        names = sorted(set(name for group in groups for name in group))
+        for i, depth in enumerate(depths):
+            # phases are set up once per depth and used for all distances
+            tt = TauPTime(model.model, names, depth, None,
+                          receiver_depth_in_km)
+            tt.depth_correct(depth)
+            tt.recalc_phases()
+            seismic_phases = {phase.name: phase for phase in tt.phases}
+            for k, group in enumerate(groups):
+                group = [(n, seismic_phases[name]) for n, name in
+                         enumerate(group) if name in seismic_phases]
+                first = [None] * len(distances)
+                for n, phase in group:
+                    label = _branch_labels(phase)
+                    for j, arrival in zip(*phase.calc_time_batch(distances)):
+                        if first[j] is None or arrival.time < first[j][0].time:
+                            first[j] = (arrival, n, label)
+                for j, first_ in enumerate(first):
+                    if first_ is None:
+                        continue
+                    arrival, n, label = first_
+                    data[k, i, j] = (arrival.time,
+                                     arrival.ray_param_sec_degree,
+                                     arrival.takeoff_angle,
+                                     arrival.incident_angle)
+                    # phase of group, branch of the phase's travel time
+                    # curve and whether it is a minor or major arc arrival
+                    lap = int(arrival.purist_distance // 180.0)
+                    branches[k, i, j] = (
+                        (n * 10000 + label[arrival.ray_param_index]) * 4 +
+                        min(lap, 3))
+        v_mod = model.model.s_mod.v_mod
+        # may be a 0-d bytes array for models read from .npz files
+        model_name = np.asarray(getattr(v_mod, 'model_name', '')).item()
+        if isinstance(model_name, bytes):
+            model_name = model_name.decode()
+        return cls(str(model_name), phases, depths, distances, data,
+                   branches, v_mod.layers, model.model.radius_of_planet,
+                   receiver_depth_in_km=receiver_depth_in_km)
+
+    def save(self, filename):
+        """
+        Save the table to a compressed ``.npz`` file.
+
+        :type filename: str
+        :param filename: Name of the file to write.
+        """
+        np.savez_compressed(
+            filename, version=TABLE_FORMAT_VERSION,
+            model_name=self.model_name, phases=np.array(self.phases),
+            depths=self.depths, distances=self.distances,
+            receiver_depth_in_km=self.receiver_depth_in_km,
+            branches=self.branches, layers=self.layers,
+            radius_of_planet=self.radius_of_planet,
+            **{field: self.data[field] for field in self.data.dtype.names})
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load a table saved with :meth:`save`.
+
+        :type filename: str
+        :param filename: Name of the file to read.
+        :rtype: :class:`TravelTimeTable`
+        """
+        with np.load(filename) as npz:
+            version = int(npz['version'])
+            if version > TABLE_FORMAT_VERSION:
+                msg = ("Travel time table file format version %d is not "
+                       "supported, please update ObsPy.") % version
+                raise ValueError(msg)
+            data = np.empty(npz['branches'].shape,
+                            dtype=TravelTimeTableResult)
+            for field in TravelTimeTableResult.names:
+                data[field] = npz[field]
+            return cls(str(npz['model_name']), npz['phases'].tolist(),
+                       npz['depths'], npz['distances'], data,
+                       npz['branches'], npz['layers'],
+                       float(npz['radius_of_planet']),
+                       receiver_depth_in_km=float(
+                           npz['receiver_depth_in_km']))
+
+    def lookup(self, phase, source_depth_in_km, distance_in_degree):
+        """
+        Interpolate the first arrival of a phase for arrays of queries.
+
+        :type phase: str
+        :param phase: One of the phases of the table.
+        :type source_depth_in_km: float or array_like
+        :param source_depth_in_km: Source depths in km.
+        :type distance_in_degree: float or array_like
+        :param distance_in_degree: Epicentral distances in degrees, broadcast
+            against the source depths.
+        :rtype: :class:`numpy.ndarray`
+        :returns: Structured array with the fields of
+            :const:`TravelTimeTableResult` in the broadcast shape of the
+            queries, NaN where the phase does not arrive or the query is
+            outside of the table.
+        """
+        try:
+            k = self.phases.index(phase)
+        except ValueError:
+            msg = "Phase '%s' is not in the table (%s)." % (
+                phase, ", ".join(self.phases))
+            raise ValueError(msg)
+        depth, distance = np.broadcast_arrays(
+            np.asarray(source_depth_in_km, dtype=np.float64),
+            np.asarray(distance_in_degree, dtype=np.float64))
+        shape = depth.shape
+        depth = depth.ravel()
+        distance = distance.ravel()
+        i, wd, outside_d = _grid_position(self.depths, depth)
+        j, u, outside_x = _grid_position(self.distances, distance)
+        h = self.distances[j + 1] - self.distances[j]
+
+        rows = []
+        for i_ in (i, i + 1):
+            values, valid, branch = self._interpolate_row(k, i_, j, u, h)
+            # carry the travel time to the source depth along the source leg
+            values['time'] += self._source_leg_time(
+                k, values['ray_param_sec_degree'], branch, valid,
+                self.depths[i_], depth)
+            rows.append((values, valid, branch))
+        (top, top_valid, top_branch), (bot, bot_valid, bot_branch) = rows
+        both = top_valid & bot_valid
+        same = both & (top_branch == bot_branch)
+        # earlier of both branches, the branch of a grid node at its depth
+        use_top = (both & ~same &
+                   (((top['time'] <= bot['time']) & (wd < 1.0)) |
+                    (wd == 0.0))) | \
+            (top_valid & ~bot_valid & (wd <= 0.5))
+        use_bot = (both & ~same & ~use_top) | \
+            (bot_valid & ~top_valid & (wd >= 0.5))
+        invalid = ~(same | use_top | use_bot) | outside_d | outside_x
+        result = np.empty(len(depth), dtype=TravelTimeTableResult)
+        for field in TravelTimeTableResult.names:
+            values = (1.0 - wd) * top[field] + wd * bot[field]
+            values[use_top] = top[field][use_top]
+            values[use_bot] = bot[field][use_bot]
+            result[field] = values
+        branch = np.where(use_bot, bot_branch, top_branch)
+        result['takeoff_angle'] = self._takeoff_angle(
+            k, result['ray_param_sec_degree'], branch, ~invalid, depth)
+        for field in TravelTimeTableResult.names:
+            result[field][invalid] = np.nan
+        return result.reshape(shape)
+
+    def _interpolate_row(self, k, i, j, u, h):
+        """
+        Interpolate in distance at the depths of the given depth indices.
+
+        :returns: Interpolated values, mask of valid values and branch
+            labels of the interpolated values.
+        """
+        a = self.data[k, i, j]
+        b = self.data[k, i, j + 1]
+        a_branch = self.branches[k, i, j]
+        b_branch = self.branches[k, i, j + 1]
+        a_valid = ~np.isnan(a['time'])
+        b_valid = ~np.isnan(b['time'])
+        same = a_valid & b_valid & (a_branch == b_branch)
+        result = np.empty(len(u), dtype=TravelTimeTableResult)
+        # cubic Hermite polynomial on the same branch
+        u2 = u * u
+        u3 = u2 * u
+        with np.errstate(invalid='ignore'):
+            result['time'] = (
+                (2 * u3 - 3 * u2 + 1) * a['time'] +
+                (u3 - 2 * u2 + u) * h * a['ray_param_sec_degree'] +
+                (-2 * u3 + 3 * u2) * b['time'] +
+                (u3 - u2) * h * b['ray_param_sec_degree'])
+            for field in TravelTimeTableResult.names[1:]:
+                result[field] = (1.0 - u) * a[field] + u * b[field]
+            # earlier tangent of the branches of both nodes otherwise, the
+            # branch of a node at its distance
+            tangent_a = a['time'] + a['ray_param_sec_degree'] * u * h
+            tangent_b = b['time'] - b['ray_param_sec_degree'] * (1.0 - u) * h
+            use_a = ~same & a_valid & (
+                (b_valid & (((tangent_a <= tangent_b) & (u < 1.0)) |
+                            (u == 0.0))) |
+                (~b_valid & (u <= 0.5)))
+            use_b = ~same & b_valid & ~use_a & (a_valid | (u >= 0.5))
+        result['time'][use_a] = tangent_a[use_a]
+        result['time'][use_b] = tangent_b[use_b]
+        for field in TravelTimeTableResult.names[1:]:
+            result[field][use_a] = a[field][use_a]
+            result[field][use_b] = b[field][use_b]
+        valid = same | use_a | use_b
+        branch = np.where(use_b, b_branch, a_branch)
+        branch[~valid] = -1
+        return result, valid, branch
+
+    def _source_legs_of(self, k, branch, valid):
+        """
+        Direction and wave type of the source legs of the given branches.
+        """
+        signs, is_s = self._source_legs[k]
+        n = np.where(valid, branch, 0) // 40000
+        return np.where(valid, signs[n], 0), is_s[n]
+
+    def _velocity(self, depth, is_s, above=False):
+        """
+        Velocity of the P or S wave at the given depths.
+
+        Takes the layer above (``above=True``) or below a discontinuity.
+        """
+        if above:
+            index = np.searchsorted(self.layers['top_depth'], depth,
+                                    side='left') - 1
+        else:
+            index = np.searchsorted(self.layers['bot_depth'], depth,
+                                    side='right')
+        layer = self.layers[np.clip(index, 0, len(self.layers) - 1)]
+        return np.where(is_s, evaluate_velocity_at(layer, depth, 's'),
+                        evaluate_velocity_at(layer, depth, 'p'))
+
+    def _source_leg_time(self, k, ray_param_sec_degree, branch, valid,
+                         from_depth, to_depth):
+        """
+        Change of travel time if the source moves between the given depths.
+
+        This is the vertical slowness of the source leg integrated over
+        depth (with Gauss-Legendre quadrature between the discontinuities of
+        the velocity model).
+        """
+        signs, is_s = self._source_legs_of(k, branch, valid)
+        # ray parameter in s/radian
+        p = np.degrees(ray_param_sec_degree)
+        lower = np.minimum(from_depth, to_depth)[:, np.newaxis]
+        upper = np.maximum(from_depth, to_depth)[:, np.newaxis]
+        bounds = np.sort(np.concatenate(
+            [lower, np.clip(self._discontinuities, lower, upper), upper],
+            axis=1), axis=1)
+        nodes, weights = np.polynomial.legendre.leggauss(4)
+        center = 0.5 * (bounds[:, 1:] + bounds[:, :-1])
+        half = 0.5 * (bounds[:, 1:] - bounds[:, :-1])
+        z = center[..., np.newaxis] + half[..., np.newaxis] * nodes
+        with np.errstate(invalid='ignore', divide='ignore'):
+            v = self._velocity(z, is_s[:, np.newaxis, np.newaxis])
+            r = self.radius_of_planet - z
+            q = np.sqrt(np.clip(
+                v ** -2 - (p[:, np.newaxis, np.newaxis] / r) ** 2, 0.0,
+                None))
+            integral = np.sum(half * np.sum(weights * q, axis=-1), axis=-1)
+            delta = signs * np.sign(to_depth - from_depth) * integral
+        # invalid values are NaN anyway
+        return np.where(valid, delta, 0.0)
+
+    def _takeoff_angle(self, k, ray_param_sec_degree, branch, valid, depth):
+        """
+        Takeoff angle at the source depths for the given ray parameters.
+        """
+        signs, is_s = self._source_legs_of(k, branch, valid)
+        # ray parameter in s/radian
+        p = np.degrees(ray_param_sec_degree)
+        with np.errstate(invalid='ignore'):
+            v = np.where(signs > 0, self._velocity(depth, is_s, above=True),
+                         self._velocity(depth, is_s))
+            angle = np.degrees(np.arcsin(np.clip(
+                v * p / (self.radius_of_planet - depth), -1.0, 1.0)))
+        angle = np.where(signs > 0, 180.0 - angle, angle)
+        return np.where(signs == 0, 0.0, angle)
+
+
+def _check_grid(depths, distances):
+    """
+    Raise a ValueError if the depths or distances of a table are invalid.
+    """
+    for name, values in (('depths', depths), ('distances', distances)):
+        if values.ndim != 1 or len(values) < 2 or \
+                np.any(np.diff(values) <= 0):
+            msg = "At least two increasing %s are required." % name
+            raise ValueError(msg)
+
+
+def _grid_position(grid, values):
+    """
+    Index of the grid cell and relative position within it for each value.
+
+    :returns: Cell indices, relative positions and mask of values outside of
+        the grid.
+    """
+    index = np.clip(np.searchsorted(grid, values, side='right') - 1, 0,
+                    len(grid) - 2)
+    position = (values - grid[index]) / (grid[index + 1] - grid[index])
+    outside = ~((values >= grid[0]) & (values <= grid[-1]))
+    return index, position, outside
+
+
+def _branch_labels(phase):
+    """
+    Label the monotonic segments of the distance curve of a phase.
+
+    Consecutive ray parameter samples on the same branch of the travel time
+    curve get the same label, the label changes where the distance as a
+    function of ray parameter turns around (e.g. at caustics of
+    triplications).
+    """
+    dist = np.asarray(phase.dist)
+    if len(dist) < 2:
+        return np.zeros(len(dist), dtype=np.int64)
+    direction = np.sign(np.diff(dist))
+    # segments of constant distance do not start a new branch
+    for n in range(1, len(direction)):
+        if direction[n] == 0:
+            direction[n] = direction[n - 1]
+    turns = np.concatenate([[0], np.cumsum(direction[1:] !=
+                                           direction[:-1])])
+    return np.append(turns, turns[-1])
@@ -140,6 +140,7 @@ ENTRY_POINTS = {
         'obspy-reftek-rescue = obspy.scripts.reftekrescue:main',
         'obspy-print = obspy.scripts._print:main',
         'obspy-sds-report = obspy.scripts.sds_html_report:main',
+        'obspy-ppsd = obspy.scripts.ppsd:main',
         'obspy-indexer = obspy.db.scripts.indexer:main',
         'obspy-scan = obspy.imaging.scripts.scan:main',
         'obspy-plot = obspy.imaging.scripts.plot:main',